@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Benchmarks hashing dataframes for caching the Mito backend in streamlit.
+
+Reports, for each number of rows:
+- sampled: the previous hash, which sampled 10,000 rows of large dataframes
+- exact: get_dataframe_hash, which hashes every row of the dataframe
+"""
+import hashlib
+import pickle
+from timeit import default_timer as timer
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.streamlit.v1.spreadsheet import get_dataframe_hash
+
+NUM_ROWS = [1_000_000, 10_000_000]
+
+
+def get_sampled_dataframe_hash(df: pd.DataFrame) -> bytes:
+    if len(df) >= 100_000:
+        df = df.sample(n=10_000, random_state=0)
+
+    try:
+        return hashlib.md5(
+            bytes(str(pd.util.hash_pandas_object(df.columns)), 'utf-8') +
+            bytes(str(pd.util.hash_pandas_object(df)), 'utf-8')
+        ).digest()
+    except TypeError:
+        return b"%s" % pickle.dumps(df, pickle.HIGHEST_PROTOCOL)
+
+
+def get_time_ms(f: Callable[[], object]) -> float:
+    start = timer()
+    f()
+    return (timer() - start) * 1000
+
+
+def main() -> None:
+    print(f'{"rows":>12} {"sampled (ms)":>14} {"exact (ms)":>12}')
+    for num_rows in NUM_ROWS:
+        df = pd.DataFrame({
+            'int': np.arange(num_rows),
+            'float': np.random.default_rng(0).random(num_rows),
+            'category': pd.Categorical(np.arange(num_rows) % 100),
+            'date': pd.date_range('2000-01-01', periods=num_rows, freq='s'),
+        })
+
+        sampled_ms = get_time_ms(lambda: get_sampled_dataframe_hash(df))
+        exact_ms = get_time_ms(lambda: get_dataframe_hash(df))
+
+        print(f'{num_rows:>12} {sampled_ms:>14.2f} {exact_ms:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
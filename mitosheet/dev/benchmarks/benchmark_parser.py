@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Benchmarks parsing a formula on sheets with 10 to 10,000 columns.
+
+Reports:
+- build: building the column header matcher for the sheet, which happens once per set of column headers
+- parse: parsing a new formula once the matcher is built (e.g. as the user types a formula)
+- regex scan: the previous approach of scanning the formula once per column header, for comparison
+"""
+import re
+from timeit import default_timer as timer
+from typing import Callable
+
+import pandas as pd
+
+from mitosheet.column_headers import ColumnHeaderMatcher, get_column_header_display, get_column_header_matcher
+from mitosheet.formula_cache import FORMULA_CACHE
+from mitosheet.parser import parse_formula
+
+NUM_COLUMNS = [10, 100, 1_000, 10_000]
+NUM_ITERATIONS = 20
+
+
+def time_ms(function: Callable[[int], None], iterations: int=NUM_ITERATIONS) -> float:
+    start = timer()
+    for i in range(iterations):
+        function(i)
+    return (timer() - start) / iterations * 1000
+
+
+def regex_scan(df: pd.DataFrame, formula: str) -> None:
+    column_headers = sorted(df.columns.to_list(), key=lambda ch: len(str(ch)), reverse=True)
+    for column_header in column_headers:
+        re.sub(re.escape(get_column_header_display(column_header)), lambda match: match.group(), formula)
+
+
+def main() -> None:
+    print(f'{"columns":>10} {"build (ms)":>12} {"parse (ms)":>12} {"regex scan (ms)":>16}')
+    for num_columns in NUM_COLUMNS:
+        df = pd.DataFrame({f'column_{i}': [i] for i in range(num_columns)})
+        last_column = f'column_{num_columns - 1}'
+
+        def build(i: int) -> None:
+            ColumnHeaderMatcher(df.columns)
+
+        def parse(i: int) -> None:
+            # A different formula each time, so we don't just measure the formula cache
+            FORMULA_CACHE.clear()
+            parse_formula(f'=IF(column_1 > {i}, {last_column}, column_0 * 2)', 'column_0', 0, {'type': 'entire_column'}, df)
+
+        def scan(i: int) -> None:
+            regex_scan(df, f'=IF(column_1 > {i}, {last_column}, column_0 * 2)')
+
+        build_ms = time_ms(build, iterations=3)
+        get_column_header_matcher(df.columns)
+        parse_ms = time_ms(parse)
+        scan_ms = time_ms(scan, iterations=3)
+
+        print(f'{num_columns:>10} {build_ms:>12.2f} {parse_ms:>12.2f} {scan_ms:>16.2f}')
+
+
+if __name__ == '__main__':
+    main()
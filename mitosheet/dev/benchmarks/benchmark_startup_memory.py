@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Benchmarks the memory and time it takes to create a Mito backend from large
+dataframes, as happens when calling mitosheet.sheet().
+
+Reports, for each number of rows:
+- df (MB): the memory used by the passed dataframe
+- peak (MB): the most memory allocated while creating the backend
+- copies: the peak memory divided by the memory of the dataframe, which is
+  the number of copies of the dataframe that exist at once
+- time (ms): the time to create the backend
+"""
+import gc
+import tracemalloc
+from timeit import default_timer as timer
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.mito_backend import MitoBackend
+
+NUM_ROWS = [1_000_000, 10_000_000]
+
+
+def main() -> None:
+    print(f'{"rows":>12} {"df (MB)":>10} {"peak (MB)":>10} {"copies":>8} {"time (ms)":>10}')
+    for num_rows in NUM_ROWS:
+        df = pd.DataFrame({
+            'int': np.arange(num_rows),
+            'float': np.random.default_rng(0).random(num_rows),
+            'date': pd.date_range('2000-01-01', periods=num_rows, freq='s'),
+        })
+        df_mb = df.memory_usage(index=True, deep=True).sum() / 1_000_000
+
+        gc.collect()
+        tracemalloc.start()
+        start = timer()
+        mito_backend = MitoBackend(df)
+        time_ms = (timer() - start) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = peak / 1_000_000
+
+        print(f'{num_rows:>12} {df_mb:>10.1f} {peak_mb:>10.1f} {peak_mb / df_mb:>8.2f} {time_ms:>10.2f}')
+
+        del mito_backend
+
+
+if __name__ == '__main__':
+    main()
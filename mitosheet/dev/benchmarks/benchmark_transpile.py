@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Benchmarks the time it takes to create the analysis data that is sent to the
+frontend after an edit, for analyses with 10 to 1,000 steps.
+
+Reports:
+- edit: adding a column to the end of the analysis, and creating the analysis data
+- analysis data: creating the analysis data (the code and step summaries) again,
+  as happens after each edit, undo and redo
+- undo: undoing the last step, and creating the analysis data
+"""
+from timeit import default_timer as timer
+from typing import Any, Callable, Dict
+
+import pandas as pd
+
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+NUM_STEPS = [10, 100, 500, 1_000]
+NUM_ITERATIONS = 10
+
+
+def time_ms(function: Callable[[int], None], iterations: int=NUM_ITERATIONS) -> float:
+    start = timer()
+    for i in range(iterations):
+        function(i)
+    return (timer() - start) / iterations * 1000
+
+
+def get_add_column_event(column_header: str, column_header_index: int) -> Dict[str, Any]:
+    return {
+        'event': 'edit_event',
+        'id': column_header,
+        'type': 'add_column_edit',
+        'step_id': column_header,
+        'params': {
+            'sheet_index': 0,
+            'column_header': column_header,
+            'column_header_index': column_header_index
+        }
+    }
+
+
+def main() -> None:
+    print(f'{"steps":>10} {"edit (ms)":>12} {"analysis data (ms)":>20} {"undo (ms)":>12}')
+    for num_steps in NUM_STEPS:
+        mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+        steps_manager = mito.mito_backend.steps_manager
+        for i in range(num_steps):
+            # NOTE: we use the steps manager directly, as the test wrapper does a lot of
+            # checking after each edit, which we don't want to measure
+            steps_manager.handle_edit_event(get_add_column_event(f'column_{i}', i + 1))
+        steps_manager.analysis_data_json
+
+        def edit(i: int) -> None:
+            steps_manager.handle_edit_event(get_add_column_event(f'new_column_{i}', num_steps + 1 + i))
+            steps_manager.analysis_data_json
+
+        def analysis_data(i: int) -> None:
+            steps_manager.analysis_data_json
+
+        def undo(i: int) -> None:
+            steps_manager.execute_undo()
+            steps_manager.analysis_data_json
+
+        edit_ms = time_ms(edit)
+        analysis_data_ms = time_ms(analysis_data)
+        undo_ms = time_ms(undo)
+
+        print(f'{num_steps:>10} {edit_ms:>12.2f} {analysis_data_ms:>20.2f} {undo_ms:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Benchmarks how often the user.json is read while handling events, and how long
+handling the events takes.
+
+Reports, per event:
+- reads: the number of times the user.json file is opened
+- time: the time to handle the event, including creating the user profile
+  that is sent to the frontend with it
+"""
+import builtins
+from timeit import default_timer as timer
+from typing import Any, Dict
+
+import pandas as pd
+
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.user.db import USER_JSON_PATH
+
+NUM_EVENTS = 100
+
+
+def get_add_column_event(column_header: str) -> Dict[str, Any]:
+    return {
+        'event': 'edit_event',
+        'id': column_header,
+        'type': 'add_column_edit',
+        'step_id': column_header,
+        'params': {
+            'sheet_index': 0,
+            'column_header': column_header,
+            'column_header_index': -1
+        }
+    }
+
+
+def main() -> None:
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    mito_backend = mito.mito_backend
+
+    num_reads = 0
+    original_open = builtins.open
+    def counting_open(file, *args, **kwargs):
+        nonlocal num_reads
+        if file == USER_JSON_PATH:
+            num_reads += 1
+        return original_open(file, *args, **kwargs)
+
+    builtins.open = counting_open
+    try:
+        start = timer()
+        for i in range(NUM_EVENTS):
+            mito_backend.receive_message(get_add_column_event(f'column_{i}'))
+            mito_backend.get_user_profile_json()
+        time_ms = (timer() - start) / NUM_EVENTS * 1000
+    finally:
+        builtins.open = original_open
+
+    print(f'{"events":>10} {"reads / event":>15} {"time / event (ms)":>20}')
+    print(f'{NUM_EVENTS:>10} {num_reads / NUM_EVENTS:>15.2f} {time_ms:>20.2f}')
+
+
+if __name__ == '__main__':
+    main()
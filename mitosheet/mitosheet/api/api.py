@@ -15,7 +15,9 @@ from mitosheet.types import MitoWidgetType
 from mitosheet.api.get_column_describe import get_column_describe
 from mitosheet.api.get_column_summary_graph import get_column_summary_graph
 from mitosheet.api.get_csv_files_metadata import get_csv_files_metadata
-from mitosheet.api.get_dataframe_as_csv import get_dataframe_as_csv
+from mitosheet.api.get_dataframe_as_csv import (
+    cancel_dataframe_as_csv_download, get_dataframe_as_csv,
+    get_dataframe_as_csv_chunk, get_dataframe_as_csv_download)
 from mitosheet.api.get_dataframe_as_excel import get_dataframe_as_excel
 from mitosheet.api.get_defined_df_names import get_defined_df_names
 from mitosheet.api.get_excel_file_metadata import get_excel_file_metadata
@@ -37,6 +39,7 @@ from mitosheet.api.get_available_snowflake_options_and_defaults import get_avail
 from mitosheet.api.get_validate_snowflake_credentials import get_validate_snowflake_credentials
 from mitosheet.api.get_ai_completion import get_ai_completion
 from mitosheet.api.get_parameterizable_params import get_parameterizable_params
+from mitosheet.api.get_sheet_data_viewport import get_sheet_data_viewport
 # AUTOGENERATED LINE: API.PY IMPORT (DO NOT DELETE)
 from mitosheet.telemetry.telemetry_utils import log_event_processed
 from mitosheet.user.location import is_jupyterlite, is_streamlit
@@ -160,6 +163,12 @@ def handle_api_event(
             result = get_path_join(params)
         elif event["type"] == "get_dataframe_as_csv":
             result = get_dataframe_as_csv(params, steps_manager)
+        elif event["type"] == "get_dataframe_as_csv_download":
+            result = get_dataframe_as_csv_download(params, steps_manager)
+        elif event["type"] == "get_dataframe_as_csv_chunk":
+            result = get_dataframe_as_csv_chunk(params, steps_manager)
+        elif event["type"] == "cancel_dataframe_as_csv_download":
+            result = cancel_dataframe_as_csv_download(params, steps_manager)
         elif event["type"] == "get_column_summary_graph":
             result = get_column_summary_graph(params, steps_manager)
         elif event["type"] == "get_column_describe":
@@ -196,6 +205,8 @@ def handle_api_event(
             result = get_ai_completion(params, steps_manager)
         elif event["type"] == "get_parameterizable_params":
             result = get_parameterizable_params(params, steps_manager)
+        elif event["type"] == "get_sheet_data_viewport":
+            result = get_sheet_data_viewport(params, steps_manager)
         # AUTOGENERATED LINE: API.PY CALL (DO NOT DELETE)
         else:
             raise Exception(f"Event: {event} is not a valid API call")
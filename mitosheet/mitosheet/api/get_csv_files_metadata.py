@@ -9,16 +9,19 @@ from typing import Any, Dict
 
 import pandas as pd
 from mitosheet.code_chunks.step_performers.import_steps.simple_import_code_chunk import DEFAULT_DECIMAL, DEFAULT_DELIMETER, DEFAULT_ENCODING, DEFAULT_SKIPROWS
-from mitosheet.step_performers.import_steps.simple_import import read_csv_get_delimiter_and_encoding
+from mitosheet.step_performers.import_steps.simple_import import get_csv_metadata, is_url_to_file
 from mitosheet.types import StepsManagerType
 
 
 def get_csv_files_metadata(params: Dict[str, Any], steps_manager: StepsManagerType) -> Dict[str, Any]:
     """
     Given a list of 'file_names' that should be CSV files,
-    this returns our guesses for delimeters and encodings
+    this returns our guesses for delimeters, encodings and decimals
     for these files, as well as other default parameters that we 
-    don't try to guess
+    don't try to guess.
+
+    NOTE: we only read the start of each file to guess these, so this
+    is fast even for very large files.
     """
     file_names = params['file_names']
 
@@ -27,17 +30,24 @@ def get_csv_files_metadata(params: Dict[str, Any], steps_manager: StepsManagerTy
     decimals = []
     skiprows = []
     for file_name in file_names:
-        try:
-            _, delimiter, encoding = read_csv_get_delimiter_and_encoding(file_name)
-            delimeters.append(delimiter)
-            encodings.append(encoding)
-        except:
+        csv_metadata = None
+        if not is_url_to_file(file_name):
+            try:
+                csv_metadata = get_csv_metadata(file_name)
+            except:
+                pass
+
+        if csv_metadata is not None:
+            delimeters.append(csv_metadata.delimeter)
+            encodings.append(csv_metadata.encoding)
+            decimals.append(csv_metadata.decimal)
+        else:
             # The default values displayed in the UI
             delimeters.append(DEFAULT_DELIMETER)
             encodings.append(DEFAULT_ENCODING)
+            decimals.append(DEFAULT_DECIMAL)
 
         # We don't have a good way to guess these params, so we always use the defaults
-        decimals.append(DEFAULT_DECIMAL)
         skiprows.append(DEFAULT_SKIPROWS)
 
     return {
@@ -3,9 +3,74 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
-from typing import Any, Dict
+import base64
+import zlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Iterator, Optional
+from uuid import uuid4
+
+import pandas as pd
+
 from mitosheet.types import StepsManagerType
 
+# The number of rows of the dataframe written to CSV in each chunk of a download
+CSV_DOWNLOAD_CHUNK_SIZE = 50_000
+
+# The most downloads we keep open at once. If the frontend starts downloads
+# and never finishes or cancels them, the oldest ones are dropped
+MAX_OPEN_CSV_DOWNLOADS = 5
+
+
+class CSVDownload:
+    """
+    A download of a dataframe as a CSV, that is produced a chunk of rows at a
+    time, so the entire CSV is never held in memory or sent in a single message.
+    """
+
+    def __init__(self, df: pd.DataFrame, compress: bool):
+        self.num_chunks = max((len(df) + CSV_DOWNLOAD_CHUNK_SIZE - 1) // CSV_DOWNLOAD_CHUNK_SIZE, 1)
+        self.compress = compress
+        self.chunks = self._get_chunks(df)
+        self.last_chunk_index = -1
+        self.last_chunk: Optional[str] = None
+
+    def _get_chunks(self, df: pd.DataFrame) -> Iterator[str]:
+        # A gzip stream, so the concatenated chunks are a single .csv.gz file
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if self.compress else None
+
+        for chunk_index in range(self.num_chunks):
+            start_row = chunk_index * CSV_DOWNLOAD_CHUNK_SIZE
+            csv_string = df.iloc[start_row:start_row + CSV_DOWNLOAD_CHUNK_SIZE].to_csv(index=False, header=chunk_index == 0)
+
+            if compressor is None:
+                yield csv_string
+            else:
+                compressed = compressor.compress(csv_string.encode('utf-8'))
+                if chunk_index == self.num_chunks - 1:
+                    compressed += compressor.flush()
+                # Each chunk is base64 encoded on its own, and so must be decoded on its own
+                yield base64.b64encode(compressed).decode('ascii')
+
+    def get_chunk(self, chunk_index: int) -> str:
+        """
+        Returns the chunk at chunk_index. Chunks must be requested in order, but the
+        last chunk can be requested again, in case its response was lost.
+        """
+        if chunk_index == self.last_chunk_index and self.last_chunk is not None:
+            return self.last_chunk
+
+        if chunk_index != self.last_chunk_index + 1:
+            raise ValueError(f'Expected chunk {self.last_chunk_index + 1} of the download, but got chunk {chunk_index}')
+
+        self.last_chunk = next(self.chunks)
+        self.last_chunk_index = chunk_index
+        return self.last_chunk
+
+
+csv_downloads: 'OrderedDict[str, CSVDownload]' = OrderedDict()
+csv_downloads_lock = Lock()
+
 
 def get_dataframe_as_csv(params: Dict[str, Any], steps_manager: StepsManagerType) -> str:
     """
@@ -15,3 +80,65 @@ def get_dataframe_as_csv(params: Dict[str, Any], steps_manager: StepsManagerType
     df = steps_manager.dfs[sheet_index]
 
     return df.to_csv(index=False)
+
+
+def get_dataframe_as_csv_download(params: Dict[str, Any], steps_manager: StepsManagerType) -> Dict[str, Any]:
+    """
+    Starts downloading a dataframe as a CSV, and sends back the id of the download
+    and the number of chunks the frontend should request with get_dataframe_as_csv_chunk.
+
+    If compress is True, the chunks are a gzip compressed CSV, base64 encoded chunk by chunk.
+    """
+    sheet_index = params['sheet_index']
+    compress = params.get('compress', False)
+    df = steps_manager.dfs[sheet_index]
+
+    download_id = str(uuid4())
+    download = CSVDownload(df, compress)
+
+    with csv_downloads_lock:
+        csv_downloads[download_id] = download
+        while len(csv_downloads) > MAX_OPEN_CSV_DOWNLOADS:
+            csv_downloads.popitem(last=False)
+
+    return {
+        'download_id': download_id,
+        'num_chunks': download.num_chunks,
+        'compress': compress
+    }
+
+
+def get_dataframe_as_csv_chunk(params: Dict[str, Any], steps_manager: StepsManagerType) -> Dict[str, Any]:
+    """
+    Sends the next chunk of a CSV download, along with the progress through the download.
+
+    A finished download is kept, so its last chunk can be requested again, until the
+    frontend cancels it or it is dropped for being one of the oldest open downloads.
+    """
+    download_id = params['download_id']
+    chunk_index = params['chunk_index']
+
+    with csv_downloads_lock:
+        download = csv_downloads[download_id]
+
+    chunk = download.get_chunk(chunk_index)
+
+    return {
+        'chunk': chunk,
+        'chunk_index': chunk_index,
+        'num_chunks': download.num_chunks,
+        'progress': (chunk_index + 1) / download.num_chunks,
+        'done': chunk_index == download.num_chunks - 1
+    }
+
+
+def cancel_dataframe_as_csv_download(params: Dict[str, Any], steps_manager: StepsManagerType) -> bool:
+    """
+    Cancels a CSV download, so no more chunks of it are produced. The frontend also
+    cancels a download once it has all of its chunks, so it is not kept any longer.
+    Returns True if the download was still open.
+    """
+    download_id = params['download_id']
+
+    with csv_downloads_lock:
+        return csv_downloads.pop(download_id, None) is not None
@@ -4,7 +4,8 @@
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
 import base64
-import io
+import os
+import tempfile
 from typing import Any, Dict
 
 from mitosheet.types import StepsManagerType
@@ -12,6 +13,8 @@ from mitosheet.user import is_pro
 from mitosheet.user.utils import is_running_test
 from mitosheet.utils import write_to_excel
 
+EXCEL_ENCODING_CHUNK_SIZE = 3 * 1024 * 1024
+
 
 def get_dataframe_as_excel(params: Dict[str, Any], steps_manager: StepsManagerType) -> str:
     """
@@ -22,15 +25,22 @@ def get_dataframe_as_excel(params: Dict[str, Any], steps_manager: StepsManagerTy
     # Formatting is a Mito pro feature, but we also allow it for testing
     allow_formatting = is_pro() or is_running_test()
 
-    # We write to a buffer so that we don't have to save the file
-    # to the file system for no reason
-    buffer = io.BytesIO()
-    write_to_excel(buffer, sheet_indexes, steps_manager.curr_step.post_state, allow_formatting=allow_formatting)    
-    # Go back to the start of the buffer
-    buffer.seek(0)
-    
-    # First, we take the buffer, and base64 encode it in bytes,
-    # and then we covert this to ASCII. On the front-end, we 
-    # turn it back into base64, then back to bytes, before 
-    # creating a Blob out of it
-    return base64.b64encode(buffer.read()).decode('ascii')
+    # We write the workbook to a temporary file, rather than a buffer, so that
+    # the workbook does not have to be held in memory as it is written
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, 'export.xlsx')
+        write_to_excel(file_path, sheet_indexes, steps_manager.curr_step.post_state, allow_formatting=allow_formatting)
+
+        # We base64 encode the file in chunks, and then we covert this to ASCII. On 
+        # the front-end, we turn it back into base64, then back to bytes, before 
+        # creating a Blob out of it
+        encoded_chunks = []
+        with open(file_path, 'rb') as f:
+            while True:
+                # NOTE: the chunk size is a multiple of 3, so each encoded chunk has no padding
+                chunk = f.read(EXCEL_ENCODING_CHUNK_SIZE)
+                if not chunk:
+                    break
+                encoded_chunks.append(base64.b64encode(chunk).decode('ascii'))
+
+    return ''.join(encoded_chunks)
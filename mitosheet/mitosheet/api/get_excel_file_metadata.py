@@ -5,28 +5,52 @@
 # Distributed under the terms of the GPL License.
 import json
 import os
+import zipfile
 from typing import Any, Dict
+from xml.etree.ElementTree import ParseError
 
 import pandas as pd
+from mitosheet.errors import MitoError
+from mitosheet.excel_utils import get_col_and_row_indexes_from_range, read_xlsx_sheet_names_and_dimensions
 from mitosheet.types import StepsManagerType
 
 
 def get_excel_file_metadata(params: Dict[str, Any], steps_manager: StepsManagerType) -> Dict[str, Any]:
     """
-    Given a 'file_name' that should be an XLSX file, 
-    will get the metadata for that XLSX file. 
+    Given a 'file_name' that should be an XLSX file,
+    will get the metadata for that XLSX file.
 
-    For now, this is just the sheets this file contains, 
-    but in the future we may be able to request more about 
-    the workbook
+    This is the sheets this file contains, and the number of
+    rows and columns in each sheet, as saved in the file. We
+    only read the start of the file to get these, so that it's
+    fast even for large workbooks.
     """
     file_path = params['file_path']
 
-    file = pd.ExcelFile(file_path, engine='openpyxl')
-    sheet_names = file.sheet_names
+    try:
+        sheet_names, sheet_dimensions = read_xlsx_sheet_names_and_dimensions(file_path)
+    except (zipfile.BadZipFile, KeyError, ParseError):
+        # If we can't read the parts of the workbook directly, we let openpyxl try
+        file = pd.ExcelFile(file_path, engine='openpyxl')
+        sheet_names = file.sheet_names
+        sheet_dimensions = {}
+
+    sheet_sizes = {}
+    for sheet_name, dimension in sheet_dimensions.items():
+        try:
+            ((start_col_index, start_row_index), (end_col_index, end_row_index)) = get_col_and_row_indexes_from_range(
+                dimension if ':' in dimension else f'{dimension}:{dimension}'
+            )
+        except MitoError:
+            continue
+        sheet_sizes[sheet_name] = {
+            'num_rows': end_row_index - start_row_index + 1,
+            'num_columns': end_col_index - start_col_index + 1
+        }
 
     return {
         'sheet_names': sheet_names,
+        'sheet_sizes': sheet_sizes,
         'size': os.path.getsize(file_path)
     }
 
@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+from typing import Any, Dict
+
+from mitosheet.types import StepsManagerType
+from mitosheet.utils import df_viewport_to_json_dumpsable
+
+
+def get_sheet_data_viewport(params: Dict[str, Any], steps_manager: StepsManagerType) -> Dict[str, Any]:
+    """
+    Sends back the rows [start_row, end_row) of the columns [start_column, end_column)
+    of the dataframe at sheet_index, so that the frontend can page through dataframes
+    that are larger than the MAX_ROWS x MAX_COLUMNS window in the sheet data.
+    """
+    sheet_index = params['sheet_index']
+    start_row = params['start_row']
+    end_row = params['end_row']
+    start_column = params['start_column']
+    end_column = params['end_column']
+
+    return df_viewport_to_json_dumpsable(
+        steps_manager.curr_step.final_defined_state,
+        sheet_index,
+        start_row,
+        end_row,
+        start_column,
+        end_column
+    )
@@ -48,6 +48,7 @@ class AddColumnSetFormulaCodeChunk(CodeChunk):
             self.post_state.dfs[self.sheet_index],
             df_name=self.post_state.df_names[self.sheet_index],
             include_df_set=False,
+            sheet_version=self.post_state.sheet_versions[self.sheet_index],
         )
 
         transpiled_column_header = column_header_to_transpiled_code(self.column_header)
@@ -6,7 +6,7 @@
 
 
 from copy import copy
-from typing import TYPE_CHECKING, List, Optional, Any, Type
+from typing import TYPE_CHECKING, List, Optional, Any, Tuple, Type
 
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.code_chunks.step_performers.column_steps.delete_column_code_chunk import DeleteColumnsCodeChunk
@@ -20,13 +20,92 @@ else:
     Step = Any
     
 
-def get_code_chunks(all_steps: List[Step], optimize: bool=True) -> List[CodeChunk]:
+# The number of optimized lists of code chunks that we keep around, so that
+# we can optimize from them after an undo or redo, and not just after an edit
+MAX_CACHED_OPTIMIZATIONS = 5
+
+def optimize_code_chunks_into_optimized_prefix(optimized_prefix_code_chunks: List[CodeChunk], new_code_chunks: List[CodeChunk]) -> List[CodeChunk]:
+    """
+    Returns the same code chunks as optimize_code_chunks(optimized_prefix_code_chunks + new_code_chunks),
+    but without looking at all of the optimized prefix.
+
+    As the optimized prefix cannot be optimized further on its own, no two adjacent code chunks in it
+    can be combined. So, we optimize the new code chunks together with just the last code chunk of
+    the prefix. If this code chunk is unchanged, then nothing before it can be combined with the 
+    result either. Otherwise, we try again with twice as many code chunks from the end of the prefix.
+    """
+    num_prefix_code_chunks = 1
+    while num_prefix_code_chunks < len(optimized_prefix_code_chunks):
+        first_code_chunk_index = len(optimized_prefix_code_chunks) - num_prefix_code_chunks
+        optimized_code_chunks = optimize_code_chunks(optimized_prefix_code_chunks[first_code_chunk_index:] + new_code_chunks)
+        if len(optimized_code_chunks) > 0 and optimized_code_chunks[0] is optimized_prefix_code_chunks[first_code_chunk_index]:
+            return optimized_prefix_code_chunks[:first_code_chunk_index] + optimized_code_chunks
+        num_prefix_code_chunks *= 2
+
+    return optimize_code_chunks(optimized_prefix_code_chunks + new_code_chunks)
+
+class OptimizedCodeChunksCache:
+    """
+    Caches the result of optimizing lists of code chunks. 
+
+    Optimizing the code chunks of an analysis takes time proportional to the length of
+    the analysis, and we do it on every update. But most updates only add or change the
+    last few steps, and so the code chunks of the steps before them are the same as the
+    last time we optimized. As such, we find the longest list of code chunks we've already
+    optimized that the new list starts with, and then only optimize the new code chunks
+    together with the end of the already optimized ones. See optimize_code_chunks_into_optimized_prefix.
+
+    NOTE: the code chunks are compared by identity, which works as each step caches
+    its code chunks until it is reexecuted. See Step.get_code_chunks.
+    """
+
+    def __init__(self, max_cached_optimizations: int=MAX_CACHED_OPTIMIZATIONS):
+        self.max_cached_optimizations = max_cached_optimizations
+        # A list of (code chunks, optimized code chunks), with the most recently used last
+        self.cached_optimizations: List[Tuple[List[CodeChunk], List[CodeChunk]]] = []
+
+    def _get_longest_optimized_prefix(self, code_chunks: List[CodeChunk]) -> Optional[Tuple[List[CodeChunk], List[CodeChunk]]]:
+        longest_optimized_prefix = None
+        for cached_optimization in self.cached_optimizations:
+            cached_code_chunks, _ = cached_optimization
+            if len(cached_code_chunks) > len(code_chunks):
+                continue
+            if longest_optimized_prefix is not None and len(cached_code_chunks) <= len(longest_optimized_prefix[0]):
+                continue
+            if all(cached_code_chunk is code_chunk for cached_code_chunk, code_chunk in zip(cached_code_chunks, code_chunks)):
+                longest_optimized_prefix = cached_optimization
+        return longest_optimized_prefix
+
+    def optimize(self, code_chunks: List[CodeChunk]) -> List[CodeChunk]:
+        longest_optimized_prefix = self._get_longest_optimized_prefix(code_chunks)
+
+        if longest_optimized_prefix is None:
+            optimized_code_chunks = optimize_code_chunks(code_chunks)
+        else:
+            self.cached_optimizations.remove(longest_optimized_prefix)
+            prefix_code_chunks, optimized_prefix_code_chunks = longest_optimized_prefix
+            if len(prefix_code_chunks) == len(code_chunks):
+                optimized_code_chunks = optimized_prefix_code_chunks
+            else:
+                optimized_code_chunks = optimize_code_chunks_into_optimized_prefix(optimized_prefix_code_chunks, code_chunks[len(prefix_code_chunks):])
+                self.cached_optimizations.append(longest_optimized_prefix)
+
+        self.cached_optimizations.append((copy(code_chunks), optimized_code_chunks))
+        while len(self.cached_optimizations) > self.max_cached_optimizations:
+            self.cached_optimizations.pop(0)
+
+        return copy(optimized_code_chunks)
+
+
+def get_code_chunks(all_steps: List[Step], optimize: bool=True, optimized_code_chunks_cache: Optional[OptimizedCodeChunksCache]=None) -> List[CodeChunk]:
     """
     A utility for taking all the steps in the steps manager, and returning a list
     of CodeChunks that correspond to these steps. 
 
     optimize is by default True, which results in these CodeChunks being optimized
     down to the smallest possible list of CodeChunks that implements the same ops.
+    If an optimized_code_chunks_cache is passed, it is used to only optimize the 
+    CodeChunks that have changed since the last optimization.
     """
     from mitosheet.steps_manager import get_step_indexes_to_skip
     step_indexes_to_skip = get_step_indexes_to_skip(all_steps)
@@ -37,15 +116,13 @@ def get_code_chunks(all_steps: List[Step], optimize: bool=True) -> List[CodeChun
         if step.step_type == 'initialize' or step_index in step_indexes_to_skip:
             continue
 
-        all_code_chunks.extend(step.step_performer.transpile(
-            step.prev_state, # type: ignore
-            step.post_state, # type: ignore
-            step.params,
-            step.execution_data,
-        ))
+        all_code_chunks.extend(step.get_code_chunks())
 
     if optimize:
-        code_chunks_list = optimize_code_chunks(all_code_chunks)
+        if optimized_code_chunks_cache is not None:
+            code_chunks_list = optimized_code_chunks_cache.optimize(all_code_chunks)
+        else:
+            code_chunks_list = optimize_code_chunks(all_code_chunks)
     else:
         code_chunks_list = all_code_chunks
 
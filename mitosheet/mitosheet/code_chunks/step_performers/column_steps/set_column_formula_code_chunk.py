@@ -51,6 +51,7 @@ class SetColumnFormulaCodeChunk(CodeChunk):
             self.index_labels_formula_is_applied_to,
             self.post_state.dfs[self.sheet_index],
             df_name=self.post_state.df_names[self.sheet_index],
+            sheet_version=self.post_state.sheet_versions[self.sheet_index],
         )
 
         return [
@@ -139,13 +139,7 @@ class ExcelRangeImportCodeChunk(CodeChunk):
         code = []
 
         transpiled_sheet_name = column_header_to_transpiled_code(self.sheet['value'])
-
-        if self.convert_csv_to_xlsx:
-            code.append(f'xlsx_file_path = convert_csv_file_to_xlsx_file(\'{self.file_path}\', {transpiled_sheet_name})')
-            transpiled_file_path = f'xlsx_file_path'
-        else:
-            transpiled_file_path = f'r\'{self.file_path}\''
-
+        transpiled_file_path = f'r\'{self.file_path}\''
 
         for idx, range_import in enumerate(self.range_imports):
 
@@ -155,11 +149,14 @@ class ExcelRangeImportCodeChunk(CodeChunk):
             # If it's an explicit range, then just import that exact range
             if range_import['type'] == EXCEL_RANGE_IMPORT_TYPE_RANGE:
                 _range = range_import['value'] #type: ignore
-                skiprows, nrows, usecols = get_read_excel_params_from_range(_range)
-                
-                code.append(
-                    f'{df_name} = pd.read_excel({transpiled_file_path}, sheet_name={transpiled_sheet_name}, skiprows={skiprows}, nrows={nrows}, usecols=\'{usecols}\')'
-                )
+
+                if self.convert_csv_to_xlsx:
+                    code.append(f'{df_name} = read_csv_range({transpiled_file_path}, \'{_range}\')')
+                else:
+                    skiprows, nrows, usecols = get_read_excel_params_from_range(_range)
+                    code.append(
+                        f'{df_name} = pd.read_excel({transpiled_file_path}, sheet_name={transpiled_sheet_name}, skiprows={skiprows}, nrows={nrows}, usecols=\'{usecols}\')'
+                    )
 
             else:
                 # Otherwise, if you're importing based on values, we generate dynamic code
@@ -168,13 +165,23 @@ class ExcelRangeImportCodeChunk(CodeChunk):
                 column_end_condition = range_import['column_end_condition'] #type: ignore
 
                 params = get_table_range_params(self.sheet, start_condition, end_condition, column_end_condition)
-                params_code = param_dict_to_code(params, as_single_line=True)
 
-                code.extend([
-                    f'_range = get_table_range({transpiled_file_path}, {params_code})',
-                    'skiprows, nrows, usecols = get_read_excel_params_from_range(_range)',
-                    f'{df_name} = pd.read_excel({transpiled_file_path}, sheet_name={transpiled_sheet_name}, skiprows=skiprows, nrows=nrows, usecols=usecols)'
-                ])
+                if self.convert_csv_to_xlsx:
+                    # A CSV has no sheets, so we find and read the range from the CSV directly
+                    params.pop('sheet_name', None)
+                    params.pop('sheet_index', None)
+                    params_code = param_dict_to_code(params, as_single_line=True)
+                    code.extend([
+                        f'_range = get_table_range_from_csv({transpiled_file_path}, {params_code})',
+                        f'{df_name} = read_csv_range({transpiled_file_path}, _range)'
+                    ])
+                else:
+                    params_code = param_dict_to_code(params, as_single_line=True)
+                    code.extend([
+                        f'_range = get_table_range({transpiled_file_path}, {params_code})',
+                        'skiprows, nrows, usecols = get_read_excel_params_from_range(_range)',
+                        f'{df_name} = pd.read_excel({transpiled_file_path}, sheet_name={transpiled_sheet_name}, skiprows=skiprows, nrows=nrows, usecols=usecols)'
+                    ])
                 
 
             # Add a new line in between different imports otherwise the code looks bad
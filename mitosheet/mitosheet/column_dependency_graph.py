@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+
+"""
+When a step in the middle of an analysis changes (e.g. it is edited and so
+skipped, or an undo unskips it), every step after it is reexecuted. Often,
+most of these steps are formulas that do not read any of the data that
+actually changed, and so reexecuting them just computes the same column again.
+
+Each set_column_formula step is an edge in a graph from the column it sets to
+the columns it reads, which parse_formula returns as the column_header_dependencies.
+As the steps are already in a topological order of this graph, we can walk
+them in order, tracking which columns may now be different from the last time
+the steps were executed. A formula that reads none of these changed columns
+would compute the exact same result, so we reuse the column it computed last
+time rather than reexecuting it.
+"""
+
+from typing import Optional, Set, Tuple
+
+from mitosheet.parser import parse_formula
+from mitosheet.state import State
+from mitosheet.step import Step
+from mitosheet.enterprise.step_performers.one_hot_encoding import OneHotEncodingStepPerformer
+from mitosheet.pro.step_performers.set_dataframe_format import SetDataframeFormatStepPerformer
+from mitosheet.step_performers.column_headers_transform import ColumnHeadersTransformStepPerformer
+from mitosheet.step_performers.column_steps.add_column import AddColumnStepPerformer
+from mitosheet.step_performers.column_steps.change_column_dtype import ChangeColumnDtypeStepPerformer
+from mitosheet.step_performers.column_steps.delete_column import DeleteColumnStepPerformer
+from mitosheet.step_performers.column_steps.rename_column import RenameColumnStepPerformer
+from mitosheet.step_performers.column_steps.reorder_column import ReorderColumnStepPerformer
+from mitosheet.step_performers.column_steps.set_column_formula import (
+    SetColumnFormulaStepPerformer, copy_column_formula_result)
+from mitosheet.step_performers.column_steps.split_text_to_columns import SplitTextToColumnsStepPerformer
+from mitosheet.step_performers.dataframe_steps.dataframe_rename import DataframeRenameStepPerformer
+from mitosheet.step_performers.delete_row import DeleteRowStepPerformer
+from mitosheet.step_performers.drop_duplicates import DropDuplicatesStepPerformer
+from mitosheet.step_performers.export_to_file import ExportToFileStepPerformer
+from mitosheet.step_performers.fill_na import FillNaStepPerformer
+from mitosheet.step_performers.filter import FilterStepPerformer
+from mitosheet.step_performers.graph_steps.graph import GraphStepPerformer
+from mitosheet.step_performers.graph_steps.graph_delete import GraphDeleteStepPerformer
+from mitosheet.step_performers.graph_steps.graph_duplicate import GraphDuplicateStepPerformer
+from mitosheet.step_performers.graph_steps.graph_rename import GraphRenameStepPerformer
+from mitosheet.step_performers.promote_row_to_header import PromoteRowToHeaderStepPerformer
+from mitosheet.step_performers.reset_index import ResetIndexStepPerformer
+from mitosheet.step_performers.set_cell_value import SetCellValueStepPerformer
+from mitosheet.step_performers.sort import SortStepPerformer
+from mitosheet.types import FORMULA_ENTIRE_COLUMN_TYPE, ColumnID
+
+# Steps that only change the values in a single column, and not the index of the sheet
+SINGLE_COLUMN_STEP_TYPES = {
+    SetColumnFormulaStepPerformer.step_type(),
+    SetCellValueStepPerformer.step_type(),
+}
+
+# Steps that only read the sheets they modify, and so give the same result as
+# last time if none of these sheets have changed
+SINGLE_SHEET_STEP_TYPES = {
+    *SINGLE_COLUMN_STEP_TYPES,
+    AddColumnStepPerformer.step_type(),
+    ChangeColumnDtypeStepPerformer.step_type(),
+    ColumnHeadersTransformStepPerformer.step_type(),
+    DataframeRenameStepPerformer.step_type(),
+    DeleteColumnStepPerformer.step_type(),
+    DeleteRowStepPerformer.step_type(),
+    DropDuplicatesStepPerformer.step_type(),
+    FillNaStepPerformer.step_type(),
+    FilterStepPerformer.step_type(),
+    OneHotEncodingStepPerformer.step_type(),
+    PromoteRowToHeaderStepPerformer.step_type(),
+    RenameColumnStepPerformer.step_type(),
+    ReorderColumnStepPerformer.step_type(),
+    ResetIndexStepPerformer.step_type(),
+    SetDataframeFormatStepPerformer.step_type(),
+    SortStepPerformer.step_type(),
+    SplitTextToColumnsStepPerformer.step_type(),
+}
+
+# Steps that do not change any dataframes
+NO_DATAFRAME_STEP_TYPES = {
+    ExportToFileStepPerformer.step_type(),
+    GraphStepPerformer.step_type(),
+    GraphDeleteStepPerformer.step_type(),
+    GraphDuplicateStepPerformer.step_type(),
+    GraphRenameStepPerformer.step_type(),
+}
+
+
+class ColumnDependencyGraph:
+    """
+    Tracks which columns may have changed since the last execution of the
+    steps that are being reexecuted.
+    """
+
+    def __init__(self) -> None:
+        # If the sheets themselves may have changed, e.g. a sheet was added or removed
+        self.all_changed = False
+        # The sheets where any column, the index, or the order of the columns may have changed
+        self.changed_sheet_indexes: Set[int] = set()
+        # The specific columns whose values may have changed
+        self.changed_column_ids: Set[Tuple[int, ColumnID]] = set()
+
+    def mark_all_changed(self) -> None:
+        self.all_changed = True
+
+    def mark_step_changed(self, step: Step) -> None:
+        """
+        Marks the data that the step modifies as changed, either because the step
+        was reexecuted or because it is now skipped.
+        """
+        if step.step_type in NO_DATAFRAME_STEP_TYPES:
+            return
+
+        if step.step_type in SINGLE_COLUMN_STEP_TYPES:
+            self.changed_column_ids.add((step.params['sheet_index'], step.params['column_id']))
+            return
+
+        modified_sheet_indexes = step.step_performer.get_modified_dataframe_indexes(step.params)
+        # If no sheets are returned, or new sheets are created, then any sheet might be different
+        if len(modified_sheet_indexes) == 0 or -1 in modified_sheet_indexes:
+            self.all_changed = True
+        else:
+            self.changed_sheet_indexes.update(modified_sheet_indexes)
+
+    def mark_step_reexecuted(self, step: Step) -> None:
+        """
+        Marks the data that the reexecuted step modifies as changed, unless the step
+        was executed on exactly the same data as last time.
+        """
+        if not self.all_changed and step.step_type in SINGLE_SHEET_STEP_TYPES:
+            modified_sheet_indexes = step.step_performer.get_modified_dataframe_indexes(step.params)
+            if not any(self.is_sheet_changed(sheet_index) for sheet_index in modified_sheet_indexes):
+                return
+
+        self.mark_step_changed(step)
+
+    def is_sheet_changed(self, sheet_index: int) -> bool:
+        return self.all_changed \
+            or sheet_index in self.changed_sheet_indexes \
+            or any(changed_sheet_index == sheet_index for changed_sheet_index, _ in self.changed_column_ids)
+
+    def get_column_id_dependencies(self, prev_state: State, step: Step) -> Optional[Set[ColumnID]]:
+        """
+        Returns the column ids that the formula in the set_column_formula step reads,
+        or None if they cannot be determined.
+        """
+        sheet_index = step.params['sheet_index']
+        column_id = step.params['column_id']
+        index_labels_formula_is_applied_to = step.params['index_labels_formula_is_applied_to']
+
+        try:
+            column_header = prev_state.column_ids.get_column_header_by_id(sheet_index, column_id)
+            _, _, column_header_dependencies, _ = parse_formula(
+                step.params['new_formula'],
+                column_header,
+                step.params['formula_label'],
+                index_labels_formula_is_applied_to,
+                prev_state.dfs[sheet_index],
+                throw_errors=False,
+                sheet_version=prev_state.sheet_versions[sheet_index]
+            )
+            column_id_dependencies = {
+                prev_state.column_ids.get_column_id_by_header(sheet_index, column_header_dependency)
+                for column_header_dependency in column_header_dependencies
+            }
+        except Exception:
+            return None
+
+        # If the formula only sets some of the rows, then the rest of the column is also an input
+        if index_labels_formula_is_applied_to['type'] != FORMULA_ENTIRE_COLUMN_TYPE:
+            column_id_dependencies.add(column_id)
+
+        return column_id_dependencies
+
+    def can_reuse_step(self, previous_step: Step, new_prev_state: State) -> bool:
+        """
+        Returns True if the previous execution of this step would give the same
+        result if it was executed on the new_prev_state.
+
+        NOTE: this assumes that the new_prev_state only differs from the prev_state
+        of the previous execution in the columns marked as changed.
+        """
+        if self.all_changed or previous_step.step_type != SetColumnFormulaStepPerformer.step_type():
+            return False
+
+        # We need the result of the previous execution, and rebuilding an evicted
+        # state would cost more than just reexecuting this step
+        if previous_step.prev_state is None or previous_step.post_state is None \
+            or previous_step.post_state is previous_step.prev_state \
+            or previous_step.post_state.are_dfs_evicted:
+            return False
+
+        sheet_index = previous_step.params['sheet_index']
+        if sheet_index in self.changed_sheet_indexes or sheet_index >= len(new_prev_state.dfs):
+            return False
+
+        column_id_dependencies = self.get_column_id_dependencies(new_prev_state, previous_step)
+        if column_id_dependencies is None:
+            return False
+
+        return all(
+            (sheet_index, column_id) not in self.changed_column_ids
+            for column_id in column_id_dependencies
+        )
+
+    def reuse_step(self, previous_step: Step, new_step: Step, new_prev_state: State) -> None:
+        """
+        Sets the new_step to have the result of the previous_step, without executing it.
+        Should only be called if can_reuse_step is True.
+        """
+        new_step.prev_state = new_prev_state
+        new_step.post_state = copy_column_formula_result(new_prev_state, previous_step.post_state, previous_step.params)  # type: ignore
+        new_step.post_state.update_sheet_versions({previous_step.params['sheet_index']})
+        new_step.execution_data = previous_step.execution_data
+
+        # If the formula sets the entire column, then the column is the same as
+        # the previous execution, even if it was changed by earlier steps
+        if previous_step.params['index_labels_formula_is_applied_to']['type'] == FORMULA_ENTIRE_COLUMN_TYPE:
+            self.changed_column_ids.discard((previous_step.params['sheet_index'], previous_step.params['column_id']))
@@ -18,7 +18,8 @@ of the column header. For string column headers, they are just
 themselves.
 """
 import random
-from typing import Any, Collection, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Collection, Dict, List, Optional, Tuple
 import numpy as np
 
 import pandas as pd
@@ -46,6 +47,106 @@ def get_column_header_display(column_header: ColumnHeader) -> str:
     return str(column_header)
 
 
+class ColumnHeaderMatcher():
+    """
+    Finds all the places that the column headers appear in a formula, in a 
+    single pass over the formula, no matter how many column headers there are. 
+    
+    It does so with an Aho-Corasick automaton over the display strings of the 
+    column headers, which is a trie of all the display strings, where each node 
+    also links to the node for the longest suffix of it that is also in the trie.
+    """
+
+    def __init__(self, column_headers: Collection[ColumnHeader]):
+        # We return column headers from longest to shortest, so that callers can make 
+        # sure that they match the longest column header when one contains another
+        self.column_headers: List[ColumnHeader] = sorted(column_headers, key=lambda ch: len(str(ch)), reverse=True)
+        self.column_header_displays: List[str] = [get_column_header_display(column_header) for column_header in self.column_headers]
+
+        # For each node in the trie, the children, the suffix link, and the display strings that end here
+        self.children: List[Dict[str, int]] = [dict()]
+        self.suffix_links: List[int] = [0]
+        self.outputs: List[List[str]] = [[]]
+
+        for column_header_display in set(self.column_header_displays):
+            if column_header_display == '':
+                continue
+            
+            node = 0
+            for char in column_header_display:
+                if char not in self.children[node]:
+                    self.children.append(dict())
+                    self.suffix_links.append(0)
+                    self.outputs.append([])
+                    self.children[node][char] = len(self.children) - 1
+                node = self.children[node][char]
+            self.outputs[node].append(column_header_display)
+
+        # Then, we set the suffix links breadth first, so the suffix links of shorter strings are set first
+        nodes_to_visit = list(self.children[0].values())
+        while len(nodes_to_visit) > 0:
+            next_nodes_to_visit = []
+            for node in nodes_to_visit:
+                for char, child in self.children[node].items():
+                    suffix_link = self.suffix_links[node]
+                    while suffix_link != 0 and char not in self.children[suffix_link]:
+                        suffix_link = self.suffix_links[suffix_link]
+                    if node != 0 and char in self.children[suffix_link]:
+                        suffix_link = self.children[suffix_link][char]
+                    self.suffix_links[child] = suffix_link if suffix_link != child else 0
+                    self.outputs[child] = self.outputs[child] + self.outputs[self.suffix_links[child]]
+                    next_nodes_to_visit.append(child)
+            nodes_to_visit = next_nodes_to_visit
+
+    def get_match_ranges(self, formula: str) -> List[Tuple[ColumnHeader, List[Tuple[int, int]]]]:
+        """
+        Returns (column_header, match_ranges) for each column header in the formula, from 
+        longest to shortest column header. The match ranges for each column header are 
+        in order, and do not overlap eachother, the same as the matches from re.finditer.
+        """
+        match_starts: Dict[str, List[int]] = dict()
+
+        node = 0
+        for index, char in enumerate(formula):
+            while node != 0 and char not in self.children[node]:
+                node = self.suffix_links[node]
+            node = self.children[node].get(char, 0)
+            for column_header_display in self.outputs[node]:
+                match_starts.setdefault(column_header_display, []).append(index + 1 - len(column_header_display))
+        
+        match_ranges: List[Tuple[ColumnHeader, List[Tuple[int, int]]]] = []
+        for column_header, column_header_display in zip(self.column_headers, self.column_header_displays):
+            # An empty display string matches at every position
+            if column_header_display == '':
+                match_ranges.append((column_header, [(index, index) for index in range(len(formula) + 1)]))
+                continue
+            
+            if column_header_display not in match_starts:
+                continue
+
+            non_overlapping_match_ranges: List[Tuple[int, int]] = []
+            for start in match_starts[column_header_display]:
+                if len(non_overlapping_match_ranges) == 0 or start >= non_overlapping_match_ranges[-1][1]:
+                    non_overlapping_match_ranges.append((start, start + len(column_header_display)))
+            match_ranges.append((column_header, non_overlapping_match_ranges))
+
+        return match_ranges
+
+
+@lru_cache(maxsize=32)
+def _get_column_header_matcher(column_headers: Tuple[ColumnHeader, ...], column_header_types: Tuple[type, ...]) -> ColumnHeaderMatcher:
+    return ColumnHeaderMatcher(column_headers)
+
+
+def get_column_header_matcher(column_headers: Collection[ColumnHeader]) -> ColumnHeaderMatcher:
+    """
+    Returns a ColumnHeaderMatcher for these column headers. Matchers are cached 
+    by the column headers, so a new one is only built when the column headers change.
+    """
+    # NOTE: we include the type, as otherwise 1 and True are the same column header
+    return _get_column_header_matcher(tuple(column_headers), tuple(map(type, column_headers)))
+
+
 def get_column_header_ids(column_headers: List[ColumnHeader]) -> List[ColumnID]:
     return [
         get_column_header_id(column_header) for column_header in column_headers
@@ -111,6 +212,27 @@ class ColumnIDMap():
                 self.column_id_to_column_header[sheet_index][column_id] = column_header
                 self.column_header_to_column_id[sheet_index][column_header] = column_id
 
+    def copy(self, deep_sheet_indexes: Optional[Collection[int]]=None) -> "ColumnIDMap":
+        """
+        Returns a copy of this column id map, where only the mappings for the sheets
+        in deep_sheet_indexes are copied, and the rest are shared with this map.
+
+        See State.copy for why this is safe.
+        """
+        if deep_sheet_indexes is None:
+            deep_sheet_indexes = []
+
+        new_column_id_map = ColumnIDMap([])
+        new_column_id_map.column_id_to_column_header = [
+            dict(column_id_to_column_header) if sheet_index in deep_sheet_indexes else column_id_to_column_header
+            for sheet_index, column_id_to_column_header in enumerate(self.column_id_to_column_header)
+        ]
+        new_column_id_map.column_header_to_column_id = [
+            dict(column_header_to_column_id) if sheet_index in deep_sheet_indexes else column_header_to_column_id
+            for sheet_index, column_header_to_column_id in enumerate(self.column_header_to_column_id)
+        ]
+        return new_column_id_map
+
     def set_column_header(self, sheet_index: int, column_id: ColumnID, column_header: ColumnHeader) -> None:
         """
         Sets a column id and column header to match to eachother. 
@@ -27,6 +27,7 @@ MITO_CONFIG_FEATURE_TELEMETRY = 'MITO_CONFIG_FEATURE_TELEMETRY'
 MITO_CONFIG_PRO = 'MITO_CONFIG_PRO'
 MITO_CONFIG_LLM_URL = 'MITO_CONFIG_LLM_URL'
 MITO_CONFIG_ANALYTICS_URL = 'MITO_CONFIG_ANALYTICS_URL'
+MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB = 'MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB'
 
 # Note: The below keys can change since they are not set by the user.
 MITO_CONFIG_CODE_SNIPPETS = 'MITO_CONFIG_CODE_SNIPPETS'
@@ -34,6 +35,7 @@ MITO_CONFIG_CODE_SNIPPETS = 'MITO_CONFIG_CODE_SNIPPETS'
 # The default values to use if the mec does not define them
 DEFAULT_MITO_CONFIG_SUPPORT_EMAIL = 'founders@sagacollab.com'
 DEFAULT_MITO_CONFIG_CODE_SNIPPETS_SUPPORT_EMAIL = 'founders@sagacollab.com'
+DEFAULT_MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB = 2048
 
 def upgrade_mec_1_to_2(mec: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -69,7 +71,7 @@ def upgrade_mec_1_to_2(mec: Dict[str, Any]) -> Dict[str, Any]:
         MITO_CONFIG_ANALYTICS_URL: None,
         MITO_CONFIG_FEATURE_TELEMETRY: None,
         MITO_CONFIG_PRO: None,
-
+        MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB: None,
     }
 
 """
@@ -120,7 +122,8 @@ MEC_VERSION_KEYS = {
         MITO_CONFIG_LLM_URL,
         MITO_CONFIG_ANALYTICS_URL,
         MITO_CONFIG_FEATURE_TELEMETRY,
-        MITO_CONFIG_PRO
+        MITO_CONFIG_PRO,
+        MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB
     ]
 }
 
@@ -285,6 +288,22 @@ class MitoConfig:
         pro = is_env_variable_set_to_true(self.mec[MITO_CONFIG_PRO])
         return pro
 
+    def get_max_step_states_memory_mb(self) -> int:
+        """
+        The memory, in megabytes, that the dataframes of the step states can use before 
+        the least recently used ones are evicted. If not set, defaults to 2048 MB.
+        """
+        if self.mec is None or self.mec[MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB] is None:
+            return DEFAULT_MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB
+
+        try:
+            return int(self.mec[MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB])
+        except ValueError:
+            log('mito_config_error', {'mito_config_error_reason': 'mito_config_max_step_states_memory_mb not an integer'})
+            raise ValueError(
+                f"The MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB environment variable must be an integer, but got {self.mec[MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB]}."
+            )
+
     # Add new mito configuration options here ...
 
     def get_mito_config(self) -> Dict[str, Any]:
@@ -299,6 +318,7 @@ class MitoConfig:
             MITO_CONFIG_LLM_URL: self.get_llm_url(),
             MITO_CONFIG_ANALYTICS_URL: self.get_analytics_url(),
             MITO_CONFIG_FEATURE_TELEMETRY: self.get_feature_telemetry(),
-            MITO_CONFIG_PRO: self.get_pro()
+            MITO_CONFIG_PRO: self.get_pro(),
+            MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB: self.get_max_step_states_memory_mb(),
         }
 
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains utilities for streaming dataframes into write-only Excel workbooks,
+so that large dataframes can be exported without building the entire workbook
+in memory.
+"""
+import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+
+# The largest sheet Excel supports
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_MAX_COLUMNS = 16_384
+
+# The number of rows of a dataframe converted to Python values at once
+EXCEL_EXPORT_CHUNK_SIZE = 10_000
+
+# The same formats that pandas uses when it writes to Excel
+DATETIME_NUMBER_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+DATE_NUMBER_FORMAT = 'YYYY-MM-DD'
+TIMEDELTA_NUMBER_FORMAT = '0'
+
+
+def get_excel_value_and_number_format(value: Any) -> Tuple[Any, Optional[str]]:
+    """
+    Converts a value in a dataframe to a value that can be written to an Excel cell,
+    and the number format to write it with, in the same way that pandas does in
+    df.to_excel. Missing values are returned as None.
+    """
+    if pd.api.types.is_scalar(value) and pd.isna(value):
+        return None, None
+
+    if getattr(value, "tzinfo", None) is not None:
+        raise ValueError(
+            "Excel does not support datetimes with "
+            "timezones. Please ensure that datetimes "
+            "are timezone unaware before writing to Excel."
+        )
+
+    if pd.api.types.is_integer(value):
+        return int(value), None
+    elif pd.api.types.is_float(value):
+        if np.isposinf(value):
+            return 'inf', None
+        elif np.isneginf(value):
+            return '-inf', None
+        return float(value), None
+    elif pd.api.types.is_bool(value):
+        return bool(value), None
+    elif isinstance(value, datetime.datetime):
+        return value, DATETIME_NUMBER_FORMAT
+    elif isinstance(value, datetime.date):
+        return value, DATE_NUMBER_FORMAT
+    elif isinstance(value, datetime.timedelta):
+        return value.total_seconds() / 86400, TIMEDELTA_NUMBER_FORMAT
+
+    return str(value), None
+
+
+def get_excel_column_values_and_number_formats(series: pd.Series) -> Tuple[List[Any], Optional[List[Optional[str]]]]:
+    """
+    Returns the Excel values for each element of the series, and the number format for
+    each element, or None if no elements have a number format. Columns with numeric dtypes
+    are converted all at once, and all others element by element.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iub':
+        return series.tolist(), None
+
+    if isinstance(dtype, np.dtype) and dtype.kind == 'f':
+        float_values = series.to_numpy()
+        values = float_values.tolist()
+        for index in np.flatnonzero(~np.isfinite(float_values)):
+            values[index] = get_excel_value_and_number_format(values[index])[0]
+        return values, None
+
+    values_and_number_formats = [get_excel_value_and_number_format(value) for value in series]
+    values = [value for value, _ in values_and_number_formats]
+    number_formats = [number_format for _, number_format in values_and_number_formats]
+    if all(number_format is None for number_format in number_formats):
+        return values, None
+    return values, number_formats
+
+
+def get_default_header_cell(sheet: Any, value: Any) -> WriteOnlyCell:
+    """
+    Returns a header cell styled as pandas styles the headers it writes to Excel.
+    """
+    cell = WriteOnlyCell(sheet, value=value)
+    cell.font = Font(bold=True)
+    cell.border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
+    cell.alignment = Alignment(horizontal='center', vertical='top')
+    return cell
+
+
+def get_cell(sheet: Any, value: Any, style_name: Optional[str], number_format: Optional[str]) -> Any:
+    """
+    Returns the value if it needs no styling, and otherwise a styled cell.
+    """
+    if style_name is None and number_format is None:
+        return value
+
+    cell = WriteOnlyCell(sheet, value=value)
+    if style_name is not None:
+        cell.style = style_name
+    if number_format is not None:
+        cell.number_format = number_format
+    return cell
+
+
+def write_df_to_write_only_sheet(
+        workbook: Workbook,
+        sheet_name: str,
+        df: pd.DataFrame,
+        header_style_name: Optional[str]=None,
+        row_style_names: Optional[Tuple[str, str]]=None,
+    ) -> Any:
+    """
+    Writes the dataframe to a new sheet in the write-only workbook, as df.to_excel(index=False)
+    would, and returns the sheet.
+
+    The rows are converted and written chunk by chunk, so the entire dataframe is never held
+    as Python values at once. If the header_style_name is given, the header cells are styled with
+    it instead of the pandas header style. If the row_style_names are given, every cell in the even
+    and odd rows is styled with the first and second style respectively, as the rows are written.
+    """
+    num_rows, num_columns = df.shape
+    if num_rows > EXCEL_MAX_ROWS or num_columns > EXCEL_MAX_COLUMNS:
+        raise ValueError(
+            f"This sheet is too large! Your sheet size is: {num_rows}, {num_columns} "
+            f"Max sheet size is: {EXCEL_MAX_ROWS}, {EXCEL_MAX_COLUMNS}"
+        )
+
+    sheet = workbook.create_sheet(title=sheet_name)
+
+    header_row = []
+    for column_header in df.columns:
+        value, number_format = get_excel_value_and_number_format(column_header)
+        if header_style_name is not None:
+            header_row.append(get_cell(sheet, value, header_style_name, number_format))
+        else:
+            cell = get_default_header_cell(sheet, value)
+            if number_format is not None:
+                cell.number_format = number_format
+            header_row.append(cell)
+    sheet.append(header_row)
+
+    # As the write-only sheet writes each row as it is appended, we reuse a styled cell for
+    # each column and style, rather than creating a new cell for every value we write
+    styled_cells: List[Dict[Tuple[Optional[str], Optional[str]], Any]] = [{} for _ in range(num_columns)]
+
+    def get_styled_cell(column_index: int, value: Any, style_name: Optional[str], number_format: Optional[str]) -> Any:
+        if style_name is None and number_format is None:
+            return value
+
+        cell = styled_cells[column_index].get((style_name, number_format))
+        if cell is None:
+            cell = get_cell(sheet, None, style_name, number_format)
+            styled_cells[column_index][(style_name, number_format)] = cell
+
+        cell.value = value
+        return cell
+
+    for start_row in range(0, num_rows, EXCEL_EXPORT_CHUNK_SIZE):
+        chunk = df.iloc[start_row:start_row + EXCEL_EXPORT_CHUNK_SIZE]
+        columns = [get_excel_column_values_and_number_formats(chunk.iloc[:, column_index]) for column_index in range(num_columns)]
+        column_values = [values for values, _ in columns]
+
+        if row_style_names is None and all(number_formats is None for _, number_formats in columns):
+            for row in zip(*column_values):
+                sheet.append(row)
+            continue
+
+        for row_index, row in enumerate(zip(*column_values)):
+            # The first row of the dataframe is the second row of the sheet, so it is even
+            style_name = None if row_style_names is None else row_style_names[(start_row + row_index) % 2]
+            sheet.append([
+                get_styled_cell(column_index, value, style_name, None if number_formats is None else number_formats[row_index])
+                for column_index, (value, (_, number_formats)) in enumerate(zip(row, columns))
+            ])
+
+    return sheet
@@ -1,13 +1,36 @@
 
 
 
+import csv
+import os
+import posixpath
 import string
-from typing import Optional, Tuple, Union
+import threading
+import zipfile
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from xml.etree.ElementTree import iterparse
 
+import numpy as np
+import pandas as pd
 from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES, TYPE_ERROR, TYPE_FORMULA
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
 
 from mitosheet.errors import make_invalid_range_error
 
+# The maximum number of excel sheets that have their cells kept in memory. NOTE: 
+# the cells of a sheet take much more memory than the file, so we keep this small
+MAX_CACHED_EXCEL_SHEETS = 2
+
+# Excel truncates the contents of cells to this many characters
+MAX_EXCEL_CELL_LENGTH = 32767
+
+# The relationship types of the parts of an XLSX file we read to get its sheets
+XLSX_OFFICE_DOCUMENT_RELATIONSHIP_TYPE = '/officeDocument'
+XLSX_WORKSHEET_RELATIONSHIP_TYPE = '/worksheet'
+
 
 def get_excel_range_from_column_index(col_index: int) -> str:
     """
@@ -57,4 +80,503 @@ def get_index_from_column(col: str) -> int:
     return num - 1
 
 def get_df_name_as_valid_sheet_name(df_name: str) -> str:
-    return df_name[:31] # not more than 32 chars
\ No newline at end of file
+    return df_name[:31] # not more than 32 chars
+
+
+class ExcelSheetCells:
+    """
+    The cells of an excel sheet, read from the file once, so that we can find 
+    and read many ranges from the sheet without parsing the file again.
+
+    values[row, col] is the value of the cell at the 0-indexed row and column,
+    or None if the cell is empty. Like get_table_range always has, ranges are found 
+    with the formulas of formula cells, e.g. '=A1+1', as openpyxl loads them by default. 
+
+    read_values are the values that ranges are read with, which are the cached values 
+    of formulas, as pd.read_excel reads them. If the sheet has no formulas, these are
+    the same as the values.
+    """
+
+    def __init__(self, values: np.ndarray, row_widths: np.ndarray, error_cells: Set[Tuple[int, int]], read_values: Optional[np.ndarray]=None):
+        self.values = values
+        self.read_values = read_values if read_values is not None else values
+        # The number of cells in each row that are read, up to the last cell that is not empty
+        self.row_widths = row_widths
+        # The cells that are errors, e.g. #DIV/0!, which are read as NaN
+        self.error_cells = error_cells
+
+        self.empty: np.ndarray = values == None # noqa: E711
+        self._strings: Optional[np.ndarray] = None
+
+    @property
+    def strings(self) -> np.ndarray:
+        """
+        The values of the cells as strings, which we only create when a range
+        is found by what its values start with or contain.
+        """
+        if self._strings is None:
+            self._strings = np.frompyfunc(str, 1, 1)(self.values)
+        return self._strings
+
+    def read_range(self, _range: str) -> pd.DataFrame:
+        """
+        Reads the range into a dataframe, with the first row of the range as the header,
+        the same as pd.read_excel does with the skiprows, nrows and usecols of the range.
+        """
+        ((start_col_index, start_row_index), (end_col_index, end_row_index)) = get_col_and_row_indexes_from_range(_range)
+        nrows = end_row_index - start_row_index
+
+        # Like pd.read_excel, only the rows up to the end of the range are read, so we 
+        # only pad the rows to the widest of those rows, not the widest in the sheet
+        row_widths = self.row_widths[:end_row_index + 1]
+        rows_with_data = np.flatnonzero(row_widths)
+        num_rows = rows_with_data[-1] + 1 if len(rows_with_data) > 0 else 0
+        width = int(row_widths.max()) if num_rows > 0 else 0
+
+        data = [self._get_row_data(row_index, width) for row_index in range(max(start_row_index, 0), num_rows)]
+
+        try:
+            parser = TextParser(
+                data,
+                header=0,
+                nrows=nrows,
+                usecols=list(range(start_col_index, end_col_index + 1)),
+                skip_blank_lines=False
+            )
+            return parser.read(nrows=nrows)
+        except EmptyDataError:
+            return pd.DataFrame()
+
+    def _get_row_data(self, row_index: int, width: int) -> List[Any]:
+        """
+        Returns the values of the row the same way that pd.read_excel reads them with openpyxl.
+        """
+        row_data: List[Any] = []
+        for col_index, value in enumerate(self.read_values[row_index, :width]):
+            if value is None:
+                row_data.append('')
+            elif (row_index, col_index) in self.error_cells:
+                row_data.append(np.nan)
+            elif isinstance(value, float) and value.is_integer():
+                row_data.append(int(value))
+            else:
+                row_data.append(value)
+        return row_data
+
+
+def read_excel_sheet_cells(file_path: str, sheet_name: Optional[str]=None, sheet_index: Optional[int]=None) -> ExcelSheetCells:
+    """
+    Reads all of the cells of the sheet, with a single pass over the sheet in read only mode.
+    If the sheet has formulas, we make a second pass to read their cached values.
+    """
+    rows, error_cells, has_formulas = _read_excel_sheet_rows(file_path, sheet_name, sheet_index, data_only=False)
+    if not has_formulas:
+        return _get_sheet_cells_from_rows(rows, error_cells)
+
+    read_rows, error_cells, _ = _read_excel_sheet_rows(file_path, sheet_name, sheet_index, data_only=True)
+    return _get_sheet_cells_from_rows(rows, error_cells, read_rows)
+
+
+def _read_excel_sheet_rows(file_path: str, sheet_name: Optional[str], sheet_index: Optional[int], data_only: bool) -> Tuple[List[List[Any]], Set[Tuple[int, int]], bool]:
+    """
+    Returns the values of the cells in each row of the sheet, the cells that are errors, 
+    and if any cell is a formula. If data_only is True, formulas are read as their cached
+    values, and otherwise as the formula itself.
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=data_only, keep_links=False)
+    try:
+        if sheet_name is not None:
+            sheet = workbook[sheet_name]
+        else:
+            sheet = workbook.worksheets[sheet_index] # type: ignore
+
+        # The dimensions saved in the file can be wrong, so we read all the rows
+        sheet.reset_dimensions()
+
+        rows: List[List[Any]] = []
+        error_cells: Set[Tuple[int, int]] = set()
+        has_formulas = False
+        for row_index, row in enumerate(sheet.iter_rows()):
+            row_values = []
+            for col_index, cell in enumerate(row):
+                if cell.data_type == TYPE_ERROR:
+                    error_cells.add((row_index, col_index))
+                elif cell.data_type == TYPE_FORMULA:
+                    has_formulas = True
+                row_values.append(cell.value)
+            rows.append(row_values)
+    finally:
+        workbook.close()
+
+    return rows, error_cells, has_formulas
+
+
+def _get_csv_cell_value(value: str) -> Optional[str]:
+    """
+    Returns the value of a CSV cell as it is once the CSV is converted to an XLSX file
+    with convert_csv_file_to_xlsx_file.
+    """
+    if value == '':
+        return None
+    return value[:MAX_EXCEL_CELL_LENGTH]
+
+
+def _is_csv_cell_formula(value: Optional[str]) -> bool:
+    # Strings that start with = are written as formulas, which have no cached value
+    # until the converted file is opened in excel
+    return value is not None and len(value) > 1 and value.startswith('=')
+
+
+def read_csv_sheet_cells(csv_path: str) -> ExcelSheetCells:
+    """
+    Reads all of the cells of the CSV file, streaming its rows, so that ranges can be 
+    found and read from the CSV the same way they would be from the XLSX file that
+    convert_csv_file_to_xlsx_file creates from it, without creating that file.
+    """
+    rows: List[List[Any]] = []
+    error_cells: Set[Tuple[int, int]] = set()
+    has_formulas = False
+    with open(csv_path, 'r') as csv_file:
+        for row_index, row in enumerate(csv.reader(csv_file)):
+            row_values = [_get_csv_cell_value(value) for value in row]
+            for col_index, value in enumerate(row_values):
+                if value in ERROR_CODES:
+                    error_cells.add((row_index, col_index))
+                elif _is_csv_cell_formula(value):
+                    has_formulas = True
+            rows.append(row_values)
+
+    if not has_formulas:
+        return _get_sheet_cells_from_rows(rows, error_cells)
+
+    read_rows = [[None if _is_csv_cell_formula(value) else value for value in row] for row in rows]
+    return _get_sheet_cells_from_rows(rows, error_cells, read_rows)
+
+
+def _get_values_from_rows(rows: List[List[Any]], num_rows: int, num_cols: int) -> np.ndarray:
+    values = np.full((num_rows, num_cols), None, dtype=object)
+    for row_index, row in enumerate(rows[:num_rows]):
+        values[row_index, :len(row)] = row
+    return values
+
+
+def _get_sheet_cells_from_rows(rows: List[List[Any]], error_cells: Set[Tuple[int, int]], read_rows: Optional[List[List[Any]]]=None) -> ExcelSheetCells:
+    """
+    Returns the cells of a sheet from the values of each of its rows, and the values that
+    are read from each row, if they are different.
+    """
+    # Like openpyxl's max_row and max_column, the sheet includes all the cells in the file, even if they are empty
+    while rows and not rows[-1]:
+        rows.pop()
+    num_cols = max(len(row) for row in rows) if len(rows) > 0 else 0
+
+    values = _get_values_from_rows(rows, len(rows), num_cols)
+    read_values = _get_values_from_rows(read_rows, len(rows), num_cols) if read_rows is not None else None
+
+    # Like pd.read_excel, we don't read the empty cells at the end of each row
+    row_widths = np.zeros(len(rows), dtype=int)
+    for row_index, row in enumerate(read_rows if read_rows is not None else rows):
+        if row_index >= len(rows):
+            break
+        row_width = len(row)
+        while row_width > 0 and row[row_width - 1] is None:
+            row_width -= 1
+        row_widths[row_index] = row_width
+
+    return ExcelSheetCells(values, row_widths, error_cells, read_values)
+
+
+class ExcelSheetCellsCache:
+    """
+    A least recently used cache from the path, modified time, size and sheet of
+    an excel file to the cells of that sheet, so that a sheet is only read once 
+    for all of the ranges imported from it, and when the import is rerun.
+    """
+
+    def __init__(self, max_cached_excel_sheets: int=MAX_CACHED_EXCEL_SHEETS):
+        self.max_cached_excel_sheets = max_cached_excel_sheets
+        self.cached_excel_sheets: 'OrderedDict[Tuple[str, int, int, Optional[str], Optional[int]], ExcelSheetCells]' = OrderedDict()
+        # Imports can be run from the api thread as well
+        self.lock = threading.Lock()
+
+    def get(self, key: Tuple[str, int, int, Optional[str], Optional[int]]) -> Optional[ExcelSheetCells]:
+        with self.lock:
+            sheet_cells = self.cached_excel_sheets.get(key)
+            if sheet_cells is not None:
+                self.cached_excel_sheets.move_to_end(key)
+            return sheet_cells
+
+    def set(self, key: Tuple[str, int, int, Optional[str], Optional[int]], sheet_cells: ExcelSheetCells) -> None:
+        with self.lock:
+            self.cached_excel_sheets[key] = sheet_cells
+            self.cached_excel_sheets.move_to_end(key)
+            while len(self.cached_excel_sheets) > self.max_cached_excel_sheets:
+                self.cached_excel_sheets.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.cached_excel_sheets.clear()
+
+
+EXCEL_SHEET_CELLS_CACHE = ExcelSheetCellsCache()
+
+
+def get_excel_sheet_cells(file_path: str, sheet_name: Optional[str]=None, sheet_index: Optional[int]=None) -> ExcelSheetCells:
+    """
+    Returns the cells of the sheet, reading them from the file only if the file has changed
+    since they were last read.
+    """
+    file_stat = os.stat(file_path)
+    cache_key = (os.path.abspath(file_path), file_stat.st_mtime_ns, file_stat.st_size, sheet_name, sheet_index)
+    sheet_cells = EXCEL_SHEET_CELLS_CACHE.get(cache_key)
+    if sheet_cells is not None:
+        return sheet_cells
+
+    sheet_cells = read_excel_sheet_cells(file_path, sheet_name=sheet_name, sheet_index=sheet_index)
+    EXCEL_SHEET_CELLS_CACHE.set(cache_key, sheet_cells)
+    return sheet_cells
+
+
+def get_csv_sheet_cells(csv_path: str) -> ExcelSheetCells:
+    """
+    Returns the cells of the CSV file, reading them from the file only if the file has changed
+    since they were last read.
+    """
+    file_stat = os.stat(csv_path)
+    # A CSV file has no sheets, so it has no sheet name or index
+    cache_key = (os.path.abspath(csv_path), file_stat.st_mtime_ns, file_stat.st_size, None, None)
+    sheet_cells = EXCEL_SHEET_CELLS_CACHE.get(cache_key)
+    if sheet_cells is not None:
+        return sheet_cells
+
+    sheet_cells = read_csv_sheet_cells(csv_path)
+    EXCEL_SHEET_CELLS_CACHE.set(cache_key, sheet_cells)
+    return sheet_cells
+
+
+def _get_empty_cells(sheet_cells: ExcelSheetCells, min_row: int, max_row: int, min_col: int, max_col: int) -> np.ndarray:
+    """
+    Returns if each cell between the 1-indexed rows and columns is empty, where the cells
+    past the end of the sheet are empty.
+    """
+    empty_cells = np.ones((max(max_row - min_row + 1, 0), max(max_col - min_col + 1, 0)), dtype=bool)
+    sheet_empty_cells = sheet_cells.empty[min_row - 1:max_row, min_col - 1:max_col]
+    empty_cells[:sheet_empty_cells.shape[0], :sheet_empty_cells.shape[1]] = sheet_empty_cells
+    return empty_cells
+
+
+def _get_first_index(matches: np.ndarray) -> Optional[int]:
+    if not matches.any():
+        return None
+    return int(np.argmax(matches))
+
+
+def _starts_with(strings: np.ndarray, value: Union[str, int, float, bool]) -> np.ndarray:
+    return pd.Series(strings.ravel(), dtype=object).str.startswith(str(value)).to_numpy(dtype=bool).reshape(strings.shape)
+
+
+def _contains(strings: np.ndarray, value: Union[str, int, float, bool]) -> np.ndarray:
+    return pd.Series(strings.ravel(), dtype=object).str.contains(str(value), regex=False).to_numpy(dtype=bool).reshape(strings.shape)
+
+
+def _equals(values: np.ndarray, value: Union[str, int, float, bool]) -> np.ndarray:
+    return np.frompyfunc(lambda cell_value: cell_value == value, 1, 1)(values).astype(bool)
+
+
+def get_table_range_from_excel_sheet_cells(
+        sheet_cells: ExcelSheetCells, 
+        upper_left_value: Optional[Union[str, int, float, bool]]=None, 
+        upper_left_value_starts_with: Optional[Union[str, int, float, bool]]=None,
+        upper_left_value_contains: Optional[Union[str, int, float, bool]]=None,
+        bottom_left_corner_consecutive_empty_cells: Optional[int]=None,
+        bottom_left_consecutive_empty_cells_in_first_column: Optional[int]=None,
+        bottom_left_value: Optional[Union[str, int, float, bool]]=None, 
+        bottom_left_value_starts_with: Optional[Union[str, int, float, bool]]=None,
+        bottom_left_value_contains: Optional[Union[str, int, float, bool]]=None,
+        row_entirely_empty: Optional[bool]=None,
+        cumulative_number_of_empty_rows: Optional[int]=None,
+        num_columns: Optional[int]=None
+) -> Optional[str]:
+    """
+    Finds the range in the sheet that meets the conditions, as described in get_table_range.
+    
+    NOTE: the rows and columns below are 1-indexed, like they are in Excel.
+    """
+    values = sheet_cells.values
+    max_row, max_col = values.shape
+
+    # We only search from the first row and column with data, so we don't waste time searching data we don't need
+    not_empty = ~sheet_cells.empty
+    if not not_empty.any():
+        return None
+    min_search_row_index = int(np.argmax(not_empty.any(axis=1)))
+    min_search_col_index = int(np.argmax(not_empty.any(axis=0)))
+
+    search_values = values[min_search_row_index:, min_search_col_index:]
+    is_upper_left = np.zeros(search_values.shape, dtype=bool)
+    if upper_left_value is not None:
+        is_upper_left |= _equals(search_values, upper_left_value)
+    if upper_left_value_starts_with is not None:
+        is_upper_left |= _starts_with(sheet_cells.strings[min_search_row_index:, min_search_col_index:], upper_left_value_starts_with)
+    if upper_left_value_contains is not None:
+        is_upper_left |= _contains(sheet_cells.strings[min_search_row_index:, min_search_col_index:], upper_left_value_contains)
+
+    # We search the columns one by one, and take the first match in the first column with one
+    found_col_index = _get_first_index(is_upper_left.any(axis=0))
+    if found_col_index is None:
+        return None
+    found_row_index = _get_first_index(is_upper_left[:, found_col_index])
+    assert found_row_index is not None
+    min_found_row = min_search_row_index + found_row_index + 1
+    min_found_col = min_search_col_index + found_col_index + 1
+
+    # Then we find where the columns are defined to, or the limit of the sheet if there is no empty cell
+    if num_columns is None:
+        first_empty_col_index = _get_first_index(sheet_cells.empty[min_found_row - 1, min_found_col - 1:])
+        max_found_col = min_found_col + first_empty_col_index - 1 if first_empty_col_index is not None else max_col
+    else:
+        max_found_col = min_found_col + num_columns - 1
+
+    # Then we find the max row index
+    max_found_row: Optional[int] = None
+
+    # Check for number of empty cells conditions for rows, including the row after the end of the sheet
+    if bottom_left_corner_consecutive_empty_cells is not None or row_entirely_empty is not None:
+        empty_cells = _get_empty_cells(sheet_cells, min_found_row, max_row + 1, min_found_col, max_found_col)
+        num_empty_cells = empty_cells.sum(axis=1)
+        is_end_row = np.zeros(len(num_empty_cells), dtype=bool)
+        if bottom_left_corner_consecutive_empty_cells is not None:
+            is_end_row |= num_empty_cells >= bottom_left_corner_consecutive_empty_cells
+        if row_entirely_empty is not None:
+            is_end_row |= num_empty_cells >= empty_cells.shape[1]
+        end_row_index = _get_first_index(is_end_row)
+        if end_row_index is not None:
+            max_found_row = min_found_row + end_row_index - 1 # minus b/c this is one past the end
+
+    # Check for number of empty cells conditions for columns
+    if max_found_row is None and bottom_left_consecutive_empty_cells_in_first_column is not None and min_found_row < max_row:
+        is_empty = sheet_cells.empty[min_found_row:, min_found_col - 1]
+        # The number of consecutive empty cells ending at each cell
+        indexes = np.arange(len(is_empty))
+        consecutive_empty_cells = indexes - np.maximum.accumulate(np.where(is_empty, -1, indexes))
+        end_row_index = _get_first_index(consecutive_empty_cells == bottom_left_consecutive_empty_cells_in_first_column)
+        if end_row_index is not None:
+            max_found_row = min_found_row + 1 + end_row_index - bottom_left_consecutive_empty_cells_in_first_column # minus b/c we don't want to take the empty cells
+        else:
+            # If we get to the end of the column, the last cell that is not empty is the max
+            max_found_row = max_row - int(consecutive_empty_cells[-1])
+
+    if max_found_row is None and cumulative_number_of_empty_rows is not None:
+        empty_rows = _get_empty_cells(sheet_cells, min_found_row, max_row, min_found_col, max_found_col).all(axis=1)
+        end_row_index = _get_first_index(np.cumsum(empty_rows) >= cumulative_number_of_empty_rows)
+        if end_row_index is not None:
+            max_found_row = min_found_row + end_row_index - 1 # minus b/c this is one past the end
+        else:
+            max_found_row = max_row # Stop at the end as well
+
+    # Then check for other ending conditions
+    if max_found_row is None:
+        column_values = values[min_found_row:, min_found_col - 1]
+        column_strings = sheet_cells.strings[min_found_row:, min_found_col - 1] if bottom_left_value_starts_with is not None or bottom_left_value_contains is not None else None
+
+        is_end_row = np.zeros(len(column_values), dtype=bool)
+        if bottom_left_value is not None:
+            is_end_row |= _equals(column_values, bottom_left_value)
+        if bottom_left_value_starts_with is not None:
+            is_end_row |= _starts_with(column_strings, bottom_left_value_starts_with) # type: ignore
+        if bottom_left_value_contains is not None:
+            is_end_row |= _contains(column_strings, bottom_left_value_contains) # type: ignore
+
+        end_row_index = _get_first_index(is_end_row)
+        if end_row_index is not None:
+            max_found_row = min_found_row + 1 + end_row_index
+        elif bottom_left_value is None and bottom_left_value_starts_with is None and bottom_left_value_contains is None:
+            # For backwards compatibility, with no other end condition we look for the first empty cell
+            end_row_index = _get_first_index(sheet_cells.empty[min_found_row:, min_found_col - 1])
+            if end_row_index is not None:
+                max_found_row = min_found_row + end_row_index # one past the end, minus one
+
+    # If we looked over the entire column without ending, then we take the entire column
+    if max_found_row is None:
+        max_found_row = max_row
+
+    return f'{get_column_from_column_index(min_found_col - 1)}{min_found_row}:{get_column_from_column_index(max_found_col - 1)}{max_found_row}'
+
+
+def _get_xml_local_name(name: str) -> str:
+    # Tags and attributes are namespaced like {namespace}name, and the namespaces differ between
+    # transitional and strict XLSX files, so we only look at the names
+    return name.rsplit('}', 1)[-1]
+
+
+def _get_xlsx_relationship_targets(xlsx_file: zipfile.ZipFile, part_path: str) -> Dict[str, Tuple[str, str]]:
+    """
+    Returns a mapping from the id of each relationship of the part to its type and the path of its target.
+    """
+    part_directory, part_name = posixpath.split(part_path)
+    relationships_path = posixpath.join(part_directory, '_rels', part_name + '.rels')
+
+    relationship_targets = {}
+    with xlsx_file.open(relationships_path) as relationships_file:
+        for _, element in iterparse(relationships_file):
+            if _get_xml_local_name(element.tag) != 'Relationship':
+                continue
+            target = element.get('Target', '')
+            if target.startswith('/'):
+                target_path = target[1:]
+            else:
+                target_path = posixpath.normpath(posixpath.join(part_directory, target))
+            relationship_targets[element.get('Id', '')] = (element.get('Type', ''), target_path)
+    return relationship_targets
+
+
+def _get_xlsx_sheet_dimension(xlsx_file: zipfile.ZipFile, sheet_path: str) -> Optional[str]:
+    """
+    Returns the dimension saved at the start of the sheet, e.g. A1:C10, without reading its cells.
+    """
+    with xlsx_file.open(sheet_path) as sheet_file:
+        for _, element in iterparse(sheet_file, events=('start',)):
+            tag = _get_xml_local_name(element.tag)
+            if tag == 'dimension':
+                return element.get('ref')
+            # The dimension is always before the cells, so if we get to the cells there is none
+            if tag == 'sheetData':
+                return None
+    return None
+
+
+def read_xlsx_sheet_names_and_dimensions(file_path: str) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Returns the names of the worksheets in the XLSX file, in order, and the dimension saved for
+    each of them, if there is one. 
+    
+    Only the workbook part of the file and the start of each sheet are read, so this does not 
+    depend on how much data is in the file, unlike opening the workbook with openpyxl.
+    """
+    with zipfile.ZipFile(file_path) as xlsx_file:
+        workbook_path = next((
+            target_path for relationship_type, target_path in _get_xlsx_relationship_targets(xlsx_file, '').values() 
+            if relationship_type.endswith(XLSX_OFFICE_DOCUMENT_RELATIONSHIP_TYPE)
+        ), 'xl/workbook.xml')
+        workbook_relationship_targets = _get_xlsx_relationship_targets(xlsx_file, workbook_path)
+
+        sheet_names: List[str] = []
+        sheet_paths: List[str] = []
+        with xlsx_file.open(workbook_path) as workbook_file:
+            for _, element in iterparse(workbook_file):
+                if _get_xml_local_name(element.tag) != 'sheet':
+                    continue
+                relationship_id = next((value for name, value in element.attrib.items() if _get_xml_local_name(name) == 'id'), None)
+                relationship_type, sheet_path = workbook_relationship_targets.get(relationship_id or '', ('', ''))
+                # Like pd.ExcelFile, we only return worksheets, and not chartsheets
+                if relationship_type.endswith(XLSX_WORKSHEET_RELATIONSHIP_TYPE):
+                    sheet_names.append(element.get('name', ''))
+                    sheet_paths.append(sheet_path)
+
+        sheet_dimensions: Dict[str, str] = {}
+        for sheet_name, sheet_path in zip(sheet_names, sheet_paths):
+            dimension = _get_xlsx_sheet_dimension(xlsx_file, sheet_path)
+            if dimension is not None:
+                sheet_dimensions[sheet_name] = dimension
+
+    return sheet_names, sheet_dimensions
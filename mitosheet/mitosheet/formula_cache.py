@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+
+"""
+A cache for parsed formulas, so that we only parse (and compile) each
+formula once, rather than every time it is saturated, executed, transpiled
+or replayed.
+
+The result of parsing a formula depends on the formula itself, where it
+is written, and the sheet it is written in: the column headers and their
+dtypes, and the index (for references to specific rows). All of these
+are part of the cache key. As hashing the index is slow for large sheets,
+the digest of the index is cached by the version of the sheet.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from types import CodeType
+from typing import Any, Collection, Hashable, Optional, Set
+
+import pandas as pd
+
+from mitosheet.types import ColumnHeader, FormulaAppliedToType, IndexLabel
+
+# The maximum number of parsed formulas that are kept in the cache
+MAX_CACHED_FORMULAS = 1000
+# The maximum number of index digests that are kept in the cache
+MAX_CACHED_INDEX_DIGESTS = 1000
+
+
+class CachedFormula:
+    """
+    The result of parsing a formula, as well as the compiled code, which is
+    only created when the formula is executed.
+    """
+
+    def __init__(
+        self,
+        python_code: str,
+        functions: Set[str],
+        column_header_dependencies: Set[ColumnHeader],
+        index_label_dependencies: Set[IndexLabel],
+        checked_common_errors: bool
+    ):
+        self.python_code = python_code
+        self.functions = functions
+        self.column_header_dependencies = column_header_dependencies
+        self.index_label_dependencies = index_label_dependencies
+        # If the formula was parsed with throw_errors=True, and so has no common errors
+        self.checked_common_errors = checked_common_errors
+        self.code: Optional[CodeType] = None
+
+    def get_code(self) -> CodeType:
+        if self.code is None:
+            # NOTE: we use the same filename as exec does when passed a string
+            self.code = compile(self.python_code, '<string>', 'exec')
+        return self.code
+
+
+class IndexDigestCache:
+    """
+    A least recently used cache from a sheet version to the digest of the index
+    of that sheet. As sheets with the same version are identical, we only need to
+    hash the index of each sheet once, even though every copy of a state creates
+    new index objects.
+    """
+
+    def __init__(self, max_cached_index_digests: int=MAX_CACHED_INDEX_DIGESTS):
+        self.max_cached_index_digests = max_cached_index_digests
+        self.cached_index_digests: 'OrderedDict[int, str]' = OrderedDict()
+        # Formulas may be parsed from the api thread as well
+        self.lock = threading.Lock()
+
+    def get(self, sheet_version: int) -> Optional[str]:
+        with self.lock:
+            digest = self.cached_index_digests.get(sheet_version)
+            if digest is not None:
+                self.cached_index_digests.move_to_end(sheet_version)
+            return digest
+
+    def set(self, sheet_version: int, digest: str) -> None:
+        with self.lock:
+            self.cached_index_digests[sheet_version] = digest
+            self.cached_index_digests.move_to_end(sheet_version)
+            while len(self.cached_index_digests) > self.max_cached_index_digests:
+                self.cached_index_digests.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.cached_index_digests.clear()
+
+
+INDEX_DIGEST_CACHE = IndexDigestCache()
+
+
+def _get_index_digest(index: pd.Index, sheet_version: Optional[int]) -> Optional[str]:
+    """
+    Returns a digest of the labels in the index, or None if the index cannot be hashed.
+
+    Hashing an index takes time linear in its length, so unless the index is a RangeIndex,
+    we only do so if we know the sheet_version, and so only have to hash it once.
+    """
+    if isinstance(index, pd.RangeIndex):
+        return f'range({index.start}, {index.stop}, {index.step})'
+
+    if sheet_version is None:
+        return None
+
+    digest = INDEX_DIGEST_CACHE.get(sheet_version)
+    if digest is not None:
+        return digest
+
+    try:
+        hashed_index = pd.util.hash_pandas_object(index, index=False).values
+        digest = f'{type(index).__name__}-{index.dtype}-{hashlib.sha1(hashed_index.tobytes()).hexdigest()}'
+    except Exception:
+        return None
+
+    INDEX_DIGEST_CACHE.set(sheet_version, digest)
+    return digest
+
+
+def get_formula_cache_key(
+    formula: str,
+    column_header: ColumnHeader,
+    formula_label: Any,
+    index_labels_formula_is_applied_to: FormulaAppliedToType,
+    df: pd.DataFrame,
+    df_name: str,
+    include_df_set: bool,
+    sheet_version: Optional[int],
+) -> Optional[Hashable]:
+    """
+    Returns the key to cache the parsed formula under, or None if the
+    formula should not be cached.
+
+    The sheet_version must be a version of the sheet with the same index
+    as the df, or None if this is not known.
+    """
+    index_digest = _get_index_digest(df.index, sheet_version)
+    if index_digest is None:
+        return None
+
+    # NOTE: we include the types of all labels, as otherwise 1, 1.0 and True are the same key
+    index_labels: Collection[IndexLabel] = index_labels_formula_is_applied_to.get('index_labels', []) # type: ignore
+    key = (
+        formula,
+        (column_header, type(column_header)),
+        (formula_label, type(formula_label)),
+        index_labels_formula_is_applied_to['type'],
+        tuple((index_label, type(index_label)) for index_label in index_labels),
+        df_name,
+        include_df_set,
+        tuple(df.columns),
+        tuple(map(type, df.columns)),
+        tuple(df.dtypes),
+        index_digest
+    )
+
+    try:
+        hash(key)
+    except TypeError:
+        return None
+
+    return key
+
+
+class FormulaCache:
+    """
+    A least recently used cache from the formula cache key to the CachedFormula.
+    """
+
+    def __init__(self, max_cached_formulas: int=MAX_CACHED_FORMULAS):
+        self.max_cached_formulas = max_cached_formulas
+        self.cached_formulas: 'OrderedDict[Hashable, CachedFormula]' = OrderedDict()
+        # Formulas may be parsed from the api thread as well
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CachedFormula]:
+        with self.lock:
+            cached_formula = self.cached_formulas.get(key)
+            if cached_formula is not None:
+                self.cached_formulas.move_to_end(key)
+            return cached_formula
+
+    def set(self, key: Hashable, cached_formula: CachedFormula) -> None:
+        with self.lock:
+            self.cached_formulas[key] = cached_formula
+            self.cached_formulas.move_to_end(key)
+            while len(self.cached_formulas) > self.max_cached_formulas:
+                self.cached_formulas.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.cached_formulas.clear()
+
+
+FORMULA_CACHE = FormulaCache()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+
+"""
+Utilities for reporting how much memory each step in an analysis retains.
+
+As states are copy-on-write (see State.copy), consecutive states share
+most of their dataframe buffers and metadata. As such, naively summing the
+size of each state wildly overestimates the memory used by an analysis.
+
+Instead, we walk the steps in order, and attribute each buffer or object
+to the first step that retains it, so that the bytes reported for all of the 
+steps sum to the memory used by the analysis. NOTE: this is not the memory that
+would be freed by releasing a step's state, as the buffers and objects that it
+shares with later states are still retained by them.
+"""
+import sys
+from typing import Any, Dict, List, Set
+
+import numpy as np
+import pandas as pd
+
+from mitosheet.state import State
+from mitosheet.step import Step
+
+
+def _get_array_bytes(values: Any, seen_ids: Set[int]) -> int:
+    """
+    Returns the bytes of the buffer that backs the values, if this buffer
+    has not been seen before. Views share their root buffer, which is what
+    allows us to detect that two dataframes share data.
+    """
+    if isinstance(values, np.ndarray):
+        root = values
+        while isinstance(root.base, np.ndarray):
+            root = root.base
+
+        if id(root) in seen_ids:
+            return 0
+        seen_ids.add(id(root))
+
+        if root.dtype == object:
+            # For object arrays, we also count the python objects stored in the array
+            return int(root.nbytes + sum(sys.getsizeof(value) for value in root.ravel()))
+        return int(root.nbytes)
+
+    # Extension arrays are shared between shallow copies of a dataframe, so we
+    # can just use their identity
+    if id(values) in seen_ids:
+        return 0
+    seen_ids.add(id(values))
+    return int(getattr(values, 'nbytes', 0))
+
+
+def get_dataframe_bytes(df: pd.DataFrame, seen_ids: Set[int]) -> int:
+    """
+    Returns the number of bytes in the dataframe's column and index
+    buffers that are not in seen_ids, and adds them to seen_ids.
+    """
+    total_bytes = _get_array_bytes(df.index.values, seen_ids)
+    for column_index in range(df.shape[1]):
+        total_bytes += _get_array_bytes(df.iloc[:, column_index].values, seen_ids)
+    return total_bytes
+
+
+def get_object_bytes(obj: Any, seen_ids: Set[int]) -> int:
+    """
+    Returns the number of bytes in the python object graph rooted at obj that
+    are not in seen_ids, and adds them to seen_ids. Only follows the containers
+    that are used for state metadata.
+    """
+    total_bytes = 0
+    objects_to_visit = [obj]
+    while len(objects_to_visit) > 0:
+        curr_obj = objects_to_visit.pop()
+        if id(curr_obj) in seen_ids:
+            continue
+        seen_ids.add(id(curr_obj))
+
+        total_bytes += sys.getsizeof(curr_obj)
+        if isinstance(curr_obj, dict):
+            objects_to_visit.extend(curr_obj.keys())
+            objects_to_visit.extend(curr_obj.values())
+        elif isinstance(curr_obj, (list, tuple, set, frozenset)):
+            objects_to_visit.extend(curr_obj)
+
+    return total_bytes
+
+
+def get_state_metadata(state: State) -> List[Any]:
+    """
+    Returns all of the metadata containers that a state retains, other than
+    the dataframes themselves.
+    """
+    return [
+        state.df_names,
+        state.df_sources,
+        state.column_ids.column_id_to_column_header,
+        state.column_ids.column_header_to_column_id,
+        state.column_formulas,
+        state.column_filters,
+        state.df_formats,
+        state.graph_data_dict,
+    ]
+
+
+def get_steps_memory_report(steps: List[Step]) -> List[Dict[str, Any]]:
+    """
+    Returns a list with an entry for each step, that reports the number of bytes
+    that step retains on top of all of the steps before it.
+
+    Note that skipped steps may not have a state, in which case they retain
+    nothing.
+    """
+    seen_ids: Set[int] = set()
+    memory_report = []
+
+    for step_idx, step in enumerate(steps):
+        dataframe_bytes = 0
+        metadata_bytes = 0
+
+        # The prev_state of a step is the post_state of the step before it, so we
+        # count both in case this is the first step we've seen with a state
+        for state in [step.prev_state, step.post_state]:
+            if state is None:
+                continue
+            # Evicted dataframes are not retained, and accessing them would rebuild them
+            for df in (state.dfs if not state.are_dfs_evicted else []):
+                dataframe_bytes += get_dataframe_bytes(df, seen_ids)
+            for metadata in get_state_metadata(state):
+                metadata_bytes += get_object_bytes(metadata, seen_ids)
+
+        memory_report.append({
+            'step_idx': step_idx,
+            'step_id': step.step_id,
+            'step_type': step.step_type,
+            'dataframe_bytes': dataframe_bytes,
+            'metadata_bytes': metadata_bytes,
+            'total_bytes': dataframe_bytes + metadata_bytes,
+        })
+
+    return memory_report
@@ -139,16 +139,12 @@ class MitoBackend():
         self.steps_manager.handle_edit_event(event)
 
         # Also, write the analysis to a file!
-        write_analysis(self.steps_manager)
+        write_analysis(self.steps_manager, background=True)
 
         # Tell the front-end to render the new sheet and new code with an empty
         # response. NOTE: in the future, we can actually send back some data
         # with the response (like an error), to get this response in-place!        
-        self.mito_send({
-            'event': 'response',
-            'id': event['id'],
-            'shared_variables': self.get_shared_state_variables()
-        })
+        self.send_response_with_shared_state_variables(event)
 
 
     def handle_update_event(self, event: Dict[str, Any]) -> None:
@@ -178,15 +174,38 @@ class MitoBackend():
                 raise make_execution_error(error_modal=False)
             raise
         # Also, write the analysis to a file!
-        write_analysis(self.steps_manager)
+        write_analysis(self.steps_manager, background=True)
 
         # Tell the front-end to render the new sheet and new code with an empty
         # response. 
+        self.send_response_with_shared_state_variables(event)
+
+    def send_response_with_shared_state_variables(self, event: Dict[str, Any]) -> None:
+        """
+        Sends the response to the event, with the new shared state variables.
+
+        If the frontend that sent the event can read binary data, then the column buffers
+        in the sheet data are sent as the buffers of the message, and sheet_data_json 
+        refers to them by index rather than containing their data.
+        """
+        if not event.get('accepts_sheet_data_buffers', False):
+            self.mito_send({
+                'event': 'response',
+                'id': event['id'],
+                'shared_variables': self.get_shared_state_variables()
+            })
+            return
+
+        sheet_data_json, buffers = self.steps_manager.sheet_data_with_buffers
         self.mito_send({
             'event': 'response',
             'id': event['id'],
-            'shared_variables': self.get_shared_state_variables()
-        })
+            'shared_variables': {
+                'sheet_data_json': sheet_data_json,
+                'analysis_data_json': self.steps_manager.analysis_data_json,
+                'user_profile_json': self.get_user_profile_json()
+            }
+        }, buffers=buffers)
 
     def receive_message(self, content: Dict[str, Any]) -> bool:
         """
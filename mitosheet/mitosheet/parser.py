@@ -12,12 +12,14 @@ import datetime
 from distutils.version import LooseVersion
 import re
 import warnings
+from types import CodeType
 from typing import Any, Callable, List, Optional, Set, Tuple, Union
 
 import pandas as pd
 
-from mitosheet.column_headers import get_column_header_display
+from mitosheet.column_headers import get_column_header_display, get_column_header_matcher
 from mitosheet.errors import make_invalid_formula_error
+from mitosheet.formula_cache import FORMULA_CACHE, CachedFormula, get_formula_cache_key
 from mitosheet.is_type_utils import (is_datetime_dtype,
                                                    is_number_dtype,
                                                    is_string_dtype)
@@ -451,22 +453,20 @@ def get_raw_parser_matches(
     """
 
     index = df.index
-    column_headers: List[ColumnHeader] = df.columns.to_list()
 
     raw_parser_matches: List[RawParserMatch] = []
 
     # We look for column headers from longest to shortest, to enable us
     # to issues if one column header is a substring of another
-    # column header
-    column_headers_sorted = sorted(column_headers, key=lambda ch: len(str(ch)), reverse=True)
+    # column header. NOTE: the matcher finds all of the column headers in one pass
+    # over the formula, and is cached for these column headers
+    column_header_matcher = get_column_header_matcher(df.columns)
 
     # First, we go through and replace all the column headers
-    for column_header in column_headers_sorted:
-        def find_column_headers(match: Any) -> Any:
-            found_column_header: str = match.group() # type:ignore
-            start = match.start()
-            end = match.end()
-            match_range = (start, end)
+    for column_header, match_ranges in column_header_matcher.get_match_ranges(formula):
+        for match_range in match_ranges:
+            start, end = match_range
+            found_column_header = formula[start:end]
 
             # Do not replace the column header if it is in a string
             if match_covered_by_matches(string_matches, match_range):
@@ -475,13 +475,13 @@ def get_raw_parser_matches(
                 ends_with_quote = is_quote(str(column_header)[-1])
 
                 if is_string and not (starts_with_quote and ends_with_quote):
-                    return found_column_header
+                    continue
 
             # If this column header was already covered by another column header
             # that has been found, then this column header is just a substring
             # of another column header, so we avoid matching it
             if match_covered_by_matches([match['substring_range'] for match in raw_parser_matches], match_range):
-                return found_column_header
+                continue
 
             # First, we check if it's an unqualified column header with no index
             if is_no_index_after_column_header_match(formula, index, start, end):
@@ -492,7 +492,7 @@ def get_raw_parser_matches(
                     'unparsed': found_column_header,
                     'row_offset': 0
                 })
-                return
+                continue
 
             # Second, check if column header is follwed by an index of any variety
             number_index_label_match = get_index_match_from_number_index(formula, formula_label, index, end)
@@ -509,17 +509,6 @@ def get_raw_parser_matches(
                     'row_offset': index_label_match['row_offset']
                 })
                 raw_parser_matches.append(index_label_match)
-                return 
-            
-            # NOTE: we add the column_header, not the found column header
-            # as the found column header is a string, and the column_header 
-            # may not be
-            return found_column_header
-
-        # First, just find all of the matches, without changing the string, as this shifts indexes
-        # NOTE: for booleans, and for multi-index headers, we need to make the same transformation 
-        # that we make on the frontend
-        re.sub(re.escape(get_column_header_display(column_header)), find_column_headers, formula)
 
     # Sort the matches from start to end
     raw_parser_matches = sorted(raw_parser_matches, key=lambda x: x['substring_range'][0])
@@ -870,6 +859,7 @@ def parse_formula(
         df_name: str='df',
         throw_errors: bool=True,
         include_df_set: bool=True,
+        sheet_version: Optional[int]=None,
     ) -> Tuple[str, Set[str], Set[ColumnHeader], Set[IndexLabel]]:
     """
     Returns a representation of the formula that is easy to handle, specifically
@@ -878,11 +868,76 @@ def parse_formula(
 
     If include_df_set, then will return {df_name}[{column_header}] = {parsed formula}, and if
     not then will just return {parsed formula}
+
+    NOTE: the result of parsing is cached, see formula_cache.py. Pass the sheet_version of
+    the sheet the df is from, if known, so that the result can be cached for any index.
     """
     # If the column doesn't have a formula, then there are no dependencies, duh!
     if formula is None or formula == '':
         return '', set(), set(), set()
 
+    cached_formula = _get_cached_formula(formula, column_header, formula_label, index_labels_formula_is_applied_to, df, df_name, throw_errors, include_df_set, sheet_version)
+
+    # We return copies of the sets, so that callers cannot change what is cached
+    return cached_formula.python_code, set(cached_formula.functions), set(cached_formula.column_header_dependencies), set(cached_formula.index_label_dependencies)
+
+
+def compile_formula(
+        formula: str, 
+        column_header: ColumnHeader, 
+        formula_label: Union[str, bool, int, float],
+        index_labels_formula_is_applied_to: FormulaAppliedToType,
+        df: pd.DataFrame,
+        df_name: str='df',
+        throw_errors: bool=True,
+        sheet_version: Optional[int]=None,
+    ) -> CodeType:
+    """
+    Returns the compiled python code that sets the column to the result of the formula, 
+    so that it can be passed directly to exec. This is cached along with the parsed formula.
+    """
+    return _get_cached_formula(formula, column_header, formula_label, index_labels_formula_is_applied_to, df, df_name, throw_errors, True, sheet_version).get_code()
+
+
+def _get_cached_formula(
+        formula: str, 
+        column_header: ColumnHeader, 
+        formula_label: Union[str, bool, int, float],
+        index_labels_formula_is_applied_to: FormulaAppliedToType,
+        df: pd.DataFrame,
+        df_name: str,
+        throw_errors: bool,
+        include_df_set: bool,
+        sheet_version: Optional[int],
+    ) -> CachedFormula:
+    key = get_formula_cache_key(formula, column_header, formula_label, index_labels_formula_is_applied_to, df, df_name, include_df_set, sheet_version)
+    cached_formula = FORMULA_CACHE.get(key) if key is not None else None
+
+    if cached_formula is None:
+        cached_formula = CachedFormula(
+            *_parse_formula(formula, column_header, formula_label, index_labels_formula_is_applied_to, df, df_name, throw_errors, include_df_set),
+            checked_common_errors=throw_errors
+        )
+        if key is not None:
+            FORMULA_CACHE.set(key, cached_formula)
+    elif throw_errors and not cached_formula.checked_common_errors:
+        # If this formula was parsed without checking for errors, we still need to check it now
+        check_common_errors(formula, df)
+        cached_formula.checked_common_errors = True
+
+    return cached_formula
+
+
+def _parse_formula(
+        formula: str, 
+        column_header: ColumnHeader, 
+        formula_label: Union[str, bool, int, float],
+        index_labels_formula_is_applied_to: FormulaAppliedToType,
+        df: pd.DataFrame,
+        df_name: str,
+        throw_errors: bool,
+        include_df_set: bool,
+    ) -> Tuple[str, Set[str], Set[ColumnHeader], Set[IndexLabel]]:
     if throw_errors:
         check_common_errors(formula, df)
 
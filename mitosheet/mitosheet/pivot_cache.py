@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+
+"""
+A cache for the source data of pivot tables, so that as a pivot table is
+edited, we don't filter its source dataframe, create the transformed
+pivot columns (e.g. the month of a date) and group the data by the pivot
+rows again for each edit.
+
+Pivots are cached by the version of their source sheet, which changes
+whenever the sheet does, and the filters applied to it.
+
+Each analysis has its own cache, which is created by its StepsManager and
+shared by all of its states (see State.pivot_source_cache), so that the cached
+dataframes are released along with the analysis. When the dataframes of a state
+are evicted, the pivot sources created from them are removed from the cache.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Collection, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+from mitosheet.types import ColumnHeader
+
+# The maximum number of pivot sources that are kept in the cache. NOTE: each
+# pivot source can hold a filtered copy of the dataframe, so we keep this small
+MAX_CACHED_PIVOT_SOURCES = 3
+
+
+class PivotSource:
+    """
+    The source dataframe of a pivot, after it is filtered, along with the
+    transformed columns created from it, and the groupbys on these columns.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        # A mapping from (column header, transformation) -> the transformed column
+        self.transformed_columns: Dict[Tuple[ColumnHeader, str], pd.Series] = {}
+        # A mapping from the (column header, transformation) of each pivot row -> the groupby
+        self.groupbys: Dict[Tuple[Tuple[ColumnHeader, str], ...], Any] = {}
+
+
+class PivotSourceCache:
+    """
+    A least recently used cache from the sheet version and filters of a
+    pivot to its PivotSource.
+    """
+
+    def __init__(self, max_cached_pivot_sources: int=MAX_CACHED_PIVOT_SOURCES):
+        self.max_cached_pivot_sources = max_cached_pivot_sources
+        self.cached_pivot_sources: 'OrderedDict[Hashable, Tuple[pd.DataFrame, PivotSource]]' = OrderedDict()
+        # Pivots may be executed from the api thread as well
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable, df: pd.DataFrame) -> Optional[PivotSource]:
+        """
+        Returns the pivot source cached for the key, if it was created from this same df.
+        """
+        with self.lock:
+            cached = self.cached_pivot_sources.get(key)
+            if cached is None or cached[0] is not df:
+                return None
+            self.cached_pivot_sources.move_to_end(key)
+            return cached[1]
+
+    def set(self, key: Hashable, df: pd.DataFrame, pivot_source: PivotSource) -> None:
+        with self.lock:
+            self.cached_pivot_sources[key] = (df, pivot_source)
+            self.cached_pivot_sources.move_to_end(key)
+            while len(self.cached_pivot_sources) > self.max_cached_pivot_sources:
+                self.cached_pivot_sources.popitem(last=False)
+
+    def remove_pivot_sources_of_dfs(self, dfs: Collection[pd.DataFrame]) -> None:
+        """
+        Removes the pivot sources created from any of the dfs, which will not be
+        used again once these dfs are released.
+        """
+        df_ids = set(id(df) for df in dfs)
+        with self.lock:
+            for key in [key for key, (df, _) in self.cached_pivot_sources.items() if id(df) in df_ids]:
+                del self.cached_pivot_sources[key]
+
+    def clear(self) -> None:
+        with self.lock:
+            self.cached_pivot_sources.clear()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> 'PivotSourceCache':
+        # The cache is shared by all the states in an analysis, so copying a state 
+        # shares it too, the same as the functions the state holds
+        return self
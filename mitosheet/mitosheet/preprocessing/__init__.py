@@ -13,16 +13,14 @@ from typing import List, Type
 from mitosheet.preprocessing.preprocess_step_performer import PreprocessStepPerformer
 from mitosheet.preprocessing.preprocess_read_file_paths import ReadFilePathsPreprocessStepPerformer
 from mitosheet.preprocessing.preprocess_check_args_type import CheckArgsTypePreprocessStepPerformer
-from mitosheet.preprocessing.preprocess_copy import CopyPreprocessStepPerformer
 
 
 # NOTE: These should be in the order you want to apply them to the arguments,
 # as they are run in a linear order
 PREPROCESS_STEP_PERFORMERS: List[Type[PreprocessStepPerformer]] = [
-   # First, we make sure all the args are the right type
+   # First, we make sure all the args are the right type. NOTE: the args are already
+   # copies, made by the StepsManager, so we don't change the passed dataframes accidently
    CheckArgsTypePreprocessStepPerformer,
-   # Then, we copy the args to make sure we don't change them accidently
-   CopyPreprocessStepPerformer,
    # Then, we read in the files
    ReadFilePathsPreprocessStepPerformer,
 ]
@@ -1,63 +1,130 @@
+import base64
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
-from mitosheet.types import ConditionalFormattingCellResults, ConditionalFormattingInvalidResults, ConditionalFormattingResult, StateType
+from mitosheet.types import ColumnHeader, ColumnID, ConditionalFormattingCellResults, ConditionalFormattingInvalidResults, ConditionalFormattingResult, Filter, FilterGroup, OperatorType, StateType
 from mitosheet.utils import MAX_ROWS, NpEncoder
 
 
+def get_conditional_formatting_bitmap(applied_mask: np.ndarray) -> str:
+    """
+    Returns a bitmap of the rows a conditional format applies to, where the i-th
+    bit (in little endian bit order) is set if it applies to the i-th displayed row.
+    The bitmap is base64 encoded so it can be sent to the frontend as json.
+    """
+    return base64.b64encode(np.packbits(applied_mask, bitorder='little').tobytes()).decode('ascii')
+
+
+class ConditionalFormattingMasks:
+    """
+    Evaluates the filters of the conditional formats on a column, for the displayed rows,
+    [start_row, end_row), of the dataframe.
+
+    As many conditional formats on the same column share filters, the result of
+    each filter is only evaluated once, and reused by all the conditional formats
+    on the column.
+    """
+
+    def __init__(self, df: pd.DataFrame, column_header: ColumnHeader, start_row: int, end_row: Optional[int]):
+        self.df = df
+        self.column_header = column_header
+        self.start_row = start_row
+        self.end_row = end_row
+        self.displayed_df = df.iloc[start_row:end_row]
+        self.applied_filters: Dict[Tuple[str, str], pd.Series] = {}
+
+    def get_applied_mask(self, filters: List[Union[Filter, FilterGroup]]) -> np.ndarray:
+        """
+        Returns a boolean array with an element for each displayed row, that
+        is True if the row passes the filters.
+        """
+        return self.get_full_applied_filter('And', filters).to_numpy(dtype=bool)
+
+    def get_full_applied_filter(self, operator: OperatorType, filters: List[Union[Filter, FilterGroup]]) -> pd.Series:
+        from mitosheet.step_performers.filter import combine_filters
+
+        applied_filters = []
+        for filter_or_group in filters:
+            if "filters" not in filter_or_group:
+                filter_: Filter = filter_or_group #type: ignore
+                applied_filters.append(self.get_applied_filter(filter_))
+            else:
+                filter_group: FilterGroup = filter_or_group #type: ignore
+                applied_filters.append(self.get_full_applied_filter(filter_group['operator'], filter_group["filters"]))
+
+        if len(applied_filters) > 0:
+            return combine_filters(operator, applied_filters)
+        return pd.Series(data=True, index=self.displayed_df.index, dtype='bool')
+
+    def get_applied_filter(self, filter_: Filter) -> pd.Series:
+        from mitosheet.step_performers.filter import FILTER_CONDITIONS_THAT_REQUIRE_FULL_DATAFRAME, get_applied_filter
+
+        key = (filter_['condition'], json.dumps(filter_['value'], cls=NpEncoder))
+        if key not in self.applied_filters:
+            # Certain filter conditions require the entire dataframe to be present, as they calculate based
+            # on the full dataframe. In other cases, we only operate on the displayed rows, for speed
+            if filter_['condition'] in FILTER_CONDITIONS_THAT_REQUIRE_FULL_DATAFRAME:
+                applied_filter = get_applied_filter(self.df, self.column_header, filter_).iloc[self.start_row:self.end_row]
+            else:
+                applied_filter = get_applied_filter(self.displayed_df, self.column_header, filter_)
+            self.applied_filters[key] = applied_filter
+
+        return self.applied_filters[key]
+
+
 def get_conditonal_formatting_result(
         state: StateType,
         sheet_index: int,
         df: pd.DataFrame,
         conditional_formatting_rules: List[Dict[str, Any]],
         max_rows: Optional[int]=MAX_ROWS,
-    ) -> ConditionalFormattingResult: 
-    from mitosheet.step_performers.filter import check_filters_contain_condition_that_needs_full_df
+        start_row: int=0,
+    ) -> ConditionalFormattingResult:
+    """
+    Returns the cells in the displayed rows, [start_row, start_row + max_rows), that each
+    conditional format applies to.
 
+    For each column, the results are a list of the formats that apply to some of the displayed
+    rows, in the order of the conditional formats, with a bitmap of the rows they apply to. If
+    multiple formats apply to the same cell, the last one is used.
+    """
     invalid_conditional_formats: ConditionalFormattingInvalidResults = dict()
     formatted_result: ConditionalFormattingCellResults = dict()
+    conditional_formatting_masks: Dict[ColumnID, ConditionalFormattingMasks] = dict()
+
+    end_row = None if max_rows is None else start_row + max_rows
 
     for conditional_format in conditional_formatting_rules:
-        try:
-
-            format_uuid = conditional_format["format_uuid"]
-            column_ids = conditional_format["columnIDs"]
-
-            for column_id in column_ids:
-                if column_id not in formatted_result:
-                    formatted_result[column_id] = dict()
-
-                filters  = conditional_format["filters"]
-                backgroundColor = conditional_format.get("backgroundColor", None)
-                color = conditional_format.get("color", None)
-                
-                # Certain filter conditions require the entire dataframe to be present, as they calculate based
-                # on the full dataframe. In other cases, we only operate on the first 1500 rows, for speed
-                _df = df
-                if not check_filters_contain_condition_that_needs_full_df(filters):
-                    df = df.head(max_rows)
-
-                column_header = state.column_ids.get_column_header_by_id(sheet_index, column_id)
-
-                # Use the get_applied_filter function from our filtering infrastructure
-                from mitosheet.step_performers.filter import \
-                    get_full_applied_filter
-                full_applied_filter, _ = get_full_applied_filter(_df, column_header, 'And', filters)
-
-                # We can only take the first max_rows here, as this is all we need
-                applied_indexes = _df[full_applied_filter].head(max_rows).index.tolist()
-
-                for index in applied_indexes:
-                    # We need to make this index valid json, and do so in a way that is consistent with how indexes
-                    # are sent to the frontend
-                    json_index = json.dumps(index, cls=NpEncoder)
-                    formatted_result[column_id][json_index] = {'backgroundColor': backgroundColor, 'color': color}
-        except Exception as e:
-            if format_uuid not in invalid_conditional_formats:
-                invalid_conditional_formats[format_uuid] = []
-            invalid_conditional_formats[format_uuid].append(column_id)
+        format_uuid = conditional_format["format_uuid"]
+        filters = conditional_format["filters"]
+        backgroundColor = conditional_format.get("backgroundColor", None)
+        color = conditional_format.get("color", None)
+
+        for column_id in conditional_format["columnIDs"]:
+            if column_id not in formatted_result:
+                formatted_result[column_id] = []
+
+            try:
+                if column_id not in conditional_formatting_masks:
+                    column_header = state.column_ids.get_column_header_by_id(sheet_index, column_id)
+                    conditional_formatting_masks[column_id] = ConditionalFormattingMasks(df, column_header, start_row, end_row)
+
+                applied_mask = conditional_formatting_masks[column_id].get_applied_mask(filters)
+            except Exception as e:
+                if format_uuid not in invalid_conditional_formats:
+                    invalid_conditional_formats[format_uuid] = []
+                invalid_conditional_formats[format_uuid].append(column_id)
+                continue
+
+            if applied_mask.any():
+                formatted_result[column_id].append({
+                    'backgroundColor': backgroundColor,
+                    'color': color,
+                    'bitmap': get_conditional_formatting_bitmap(applied_mask)
+                })
 
     return {
         'invalid_conditional_formats': invalid_conditional_formats,
         'results': formatted_result
-    }
\ No newline at end of file
+    }
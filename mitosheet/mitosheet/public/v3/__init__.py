@@ -8,5 +8,5 @@ from mitosheet.public.v3.sheet_functions import FUNCTIONS
 from mitosheet.public.v3.sheet_functions import *
 
 from mitosheet.public.v1 import register_analysis
-from mitosheet.public.v2.excel_utils import get_table_range_from_upper_left_corner_value, get_read_excel_params_from_range, get_table_range, convert_csv_file_to_xlsx_file
+from mitosheet.public.v2.excel_utils import get_table_range_from_upper_left_corner_value, get_read_excel_params_from_range, get_table_range, convert_csv_file_to_xlsx_file, get_table_range_from_csv, read_csv_range
 import pandas as pd
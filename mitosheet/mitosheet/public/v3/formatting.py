@@ -81,8 +81,13 @@ def get_conditional_format_rule(
 def add_conditional_formats(
     conditional_formats: list,
     sheet: Worksheet,
-    df: DataFrame
+    df: DataFrame,
+    max_row: Optional[int]=None
 ) -> None:
+    # Write-only sheets do not know their max row, so it can be passed instead
+    if max_row is None:
+        max_row = sheet.max_row
+
     for conditional_format in conditional_formats:
         for filter in conditional_format.get('filters', []):
             # Create the conditional formatting color objects
@@ -99,7 +104,7 @@ def add_conditional_formats(
             for column_header in conditional_format['columns']:
                 column_index = df.columns.tolist().index(column_header)
                 column = get_column_from_column_index(column_index)
-                cell_range = f'{column}2:{column}{sheet.max_row}'
+                cell_range = f'{column}2:{column}{max_row}'
                 column_conditional_rule = get_conditional_format_rule(
                     filter_condition=filter['condition'],
                     fill=cond_fill,
@@ -112,6 +117,60 @@ def add_conditional_formats(
                     sheet.conditional_formatting.add(cell_range, column_conditional_rule)
 
 
+def get_header_named_style(
+        sheet_name: str,
+        header_background_color: Optional[str]=None,
+        header_font_color: Optional[str]=None,
+    ) -> Optional[NamedStyle]:
+    """
+    Returns the named style for the header row of the sheet, or None if the 
+    header is not formatted.
+    """
+    # Only add format if there is a header color or background color
+    if not header_background_color and not header_font_color:
+        return None
+
+    header_format = NamedStyle(name=f"{sheet_name}_Header")
+    if header_font_color:
+        # Remove the # from the color
+        header_format.font = Font(color=header_font_color[1:])
+    if header_background_color:
+        # Remove the # from the color
+        header_format.fill = PatternFill(start_color=header_background_color[1:], end_color=header_background_color[1:], fill_type="solid")
+    return header_format
+
+
+def get_row_named_styles(
+        sheet_name: str,
+        even_background_color: Optional[str]=None,
+        even_font_color: Optional[str]=None,
+        odd_background_color: Optional[str]=None,
+        odd_font_color: Optional[str]=None,
+    ) -> Optional[Tuple[NamedStyle, NamedStyle]]:
+    """
+    Returns the named styles for the even and odd rows of the sheet, or None 
+    if the rows are not formatted.
+    """
+    # Only add format if there is a background color or font color
+    if not even_background_color and not even_font_color and not odd_background_color and not odd_font_color:
+        return None
+
+    even_format = NamedStyle(name=f"{sheet_name}_Even")
+    odd_format = NamedStyle(name=f"{sheet_name}_Odd")
+
+    # Remove the # from the colors and define the formatting objects
+    if even_background_color:
+        even_format.fill = PatternFill(start_color=even_background_color[1:], end_color=even_background_color[1:], fill_type="solid")
+    if even_font_color:
+        even_format.font = Font(color=even_font_color[1:])
+    if odd_background_color:
+        odd_format.fill = PatternFill(start_color=odd_background_color[1:], end_color=odd_background_color[1:], fill_type="solid")
+    if odd_font_color:
+        odd_format.font = Font(color=odd_font_color[1:])
+
+    return even_format, odd_format
+
+
 def add_formatting_to_excel_sheet(
         writer: ExcelWriter,
         sheet_name: str,
@@ -134,54 +193,27 @@ def add_formatting_to_excel_sheet(
         sheet = workbook.get_sheet_by_name(sheet_name)
         
         # Add formatting to the header row   
-        header_name = f"{sheet_name}_Header"
-        header_format = NamedStyle(name=header_name)
-        if header_font_color:
-            # Remove the # from the color
-            header_format.font = Font(color=header_font_color[1:])
-        if header_background_color:
-            # Remove the # from the color
-            header_format.fill = PatternFill(start_color=header_background_color[1:], end_color=header_background_color[1:], fill_type="solid")
-        
-        # Only add format if there is a header color or background color
-        has_header_formatting = header_background_color or header_font_color 
-        if has_header_formatting:
+        header_format = get_header_named_style(sheet_name, header_background_color, header_font_color)
+        if header_format is not None:
             # Add named styles for the header rows to improve performance
             workbook.add_named_style(header_format)
 
             # Write the formatting to the sheet
             for col in range(1, sheet.max_column + 1):
-                sheet.cell(row=1, column=col).style = header_name
+                sheet.cell(row=1, column=col).style = header_format.name
 
         # Add formatting to the rows
-        even_name = f"{sheet_name}_Even"
-        odd_name = f"{sheet_name}_Odd"
-        even_format = NamedStyle(name=even_name)
-        odd_format = NamedStyle(name=odd_name)
-
-        # Remove the # from the colors and define the formatting objects
-        if even_background_color:
-            even_format.fill = PatternFill(start_color=even_background_color[1:], end_color=even_background_color[1:], fill_type="solid")
-        if even_font_color:
-            even_format.font = Font(color=even_font_color[1:])
-        if odd_background_color:
-            odd_format.fill = PatternFill(start_color=odd_background_color[1:], end_color=odd_background_color[1:], fill_type="solid")
-        if odd_font_color:
-            odd_format.font = Font(color=odd_font_color[1:])
-        
-        # Only add format if there is a background color or font color
-        has_row_formatting = even_background_color or even_font_color or odd_background_color or odd_font_color
-        if has_row_formatting:
+        row_formats = get_row_named_styles(sheet_name, even_background_color, even_font_color, odd_background_color, odd_font_color)
+        if row_formats is not None:
+            even_format, odd_format = row_formats
             workbook.add_named_style(even_format)
             workbook.add_named_style(odd_format)
 
-            for row in range(2, sheet.max_row + 1):
-                for col in range(1, sheet.max_column + 1):
-                    if row % 2 == 0:
-                        sheet.cell(row=row, column=col).style = even_name
-                    else:
-                        sheet.cell(row=row, column=col).style = odd_name
+            for row_index, row in enumerate(sheet.iter_rows(min_row=2), start=2):
+                row_style_name = even_format.name if row_index % 2 == 0 else odd_format.name
+                for cell in row:
+                    cell.style = row_style_name
 
         # Add conditional formatting
         if conditional_formats is not None:
-            add_conditional_formats(conditional_formats, sheet, df)
\ No newline at end of file
+            add_conditional_formats(conditional_formats, sheet, df)
@@ -1,8 +1,38 @@
 
+import warnings
 from datetime import datetime, timedelta
-from typing import Callable, Tuple, Union
+from typing import Callable, Dict, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# The maximum number of values we reduce at once when reducing windows of a rolling 
+# range, so that we don't use too much memory on large dataframes
+MAX_WINDOW_VALUES_PER_CHUNK = 10_000_000
+
+
+# The following reductions of a dataframe (or a window of a rolling range) are recognized
+# by RollingRange.apply, which then computes them for all of the windows at once. Sheet 
+# functions should use these, rather than equivalent lambdas, so that they are fast.
+
+def dataframe_sum(df: pd.DataFrame) -> Union[int, float]:
+    return df.sum().sum()
+
+def dataframe_count(df: pd.DataFrame) -> int:
+    return df.count().sum()
+
+def dataframe_max(df: pd.DataFrame) -> Union[int, float, datetime, timedelta]:
+    return df.max().max()
+
+def dataframe_min(df: pd.DataFrame) -> Union[int, float, datetime, timedelta]:
+    return df.min().min()
+
+def dataframe_std(df: pd.DataFrame) -> float:
+    return df.stack().std()
+
+def dataframe_var(df: pd.DataFrame) -> float:
+    return df.stack().var()
 
 
 class RollingRange():
@@ -38,8 +68,14 @@ class RollingRange():
     def apply(self, func: Callable[[pd.DataFrame], Union[str, float, int, bool, datetime, timedelta]], default_value: Union[str, float, int, bool, datetime, timedelta]=0) -> pd.Series:
         """
         Calls the func with each of the windows, and returns a series with
-        the same index as the original dataframe.
+        the same index as the original dataframe. Windows that are entirely
+        outside of the dataframe are the default_value.
         """
+        if func in VECTORISED_REDUCTIONS:
+            vectorised_result = self._apply_vectorised(VECTORISED_REDUCTIONS[func], default_value)
+            if vectorised_result is not None:
+                return vectorised_result
+
         result = []
 
         # Then, we get each window, and call the function with it
@@ -47,7 +83,7 @@ class RollingRange():
         end = start + self.window
 
         while (start - self.offset) < len(self.obj): 
-            df_subset = self.obj[max(0, start):end] # avoid negative start, as this wraps around to the end
+            df_subset = self.obj[max(0, start):max(0, end)] # avoid negative start and end, as these wrap around to the end
 
             # We manually detect the default value case, as it messes up types otherwise (e.g. .sum().sum() returns a float with an empty df)
             if len(df_subset) == 0:
@@ -67,4 +103,118 @@ class RollingRange():
             else:
                 result = result + default_values
 
-        return pd.Series(result, index=self.obj.index)
\ No newline at end of file
+        return pd.Series(result, index=self.obj.index)
+
+    def _apply_vectorised(self, reduce: Callable[['RollingRange', np.ndarray], np.ndarray], default_value: Union[str, float, int, bool, datetime, timedelta]) -> Optional[pd.Series]:
+        """
+        Reduces all of the windows at once with the given reduction, which takes the values of
+        the dataframe and returns the result for each window. Returns None if the dataframe is
+        not entirely numeric, and so the windows cannot be reduced this way.
+        """
+        if self.obj.shape[1] == 0 or not isinstance(default_value, (int, float)) or isinstance(default_value, bool):
+            return None
+        for dtype in self.obj.dtypes:
+            if not isinstance(dtype, np.dtype) or dtype.kind not in 'if':
+                return None
+
+        starts = np.arange(len(self.obj)) + self.offset
+        starts, ends = np.clip(starts, 0, len(self.obj)), np.clip(starts + self.window, 0, len(self.obj))
+        empty_windows = ends <= starts
+        if empty_windows.all():
+            return pd.Series(default_value, index=self.obj.index)
+
+        # We pad the values before and after the dataframe to get the windows, and so we make
+        # sure the offset and window do not go further past the dataframe than they need to
+        offset = max(self.offset, -len(self.obj))
+        window = min(self.window - (offset - self.offset), len(self.obj) + max(0, -offset))
+
+        with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+            # Windows with all NaN values, or too few values for a std, result in NaN like in pandas
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            result = reduce(RollingRange(self.obj, window, offset), self.obj.to_numpy())
+
+        if empty_windows.any():
+            result = result.astype(np.result_type(result.dtype, type(default_value)))
+            result[empty_windows] = default_value
+        return pd.Series(result, index=self.obj.index)
+
+    def _get_windows(self, values: np.ndarray, fill_value: Union[int, float], values_per_row: int=1) -> np.ndarray:
+        """
+        Given a 1D array of the values in each row, returns a view with the values in 
+        the window of each row. The parts of the windows outside of the dataframe are 
+        the fill_value.
+        """
+        pad_before = max(0, -self.offset)
+        pad_after = max(0, self.offset + self.window - 1)
+        padded_values = np.concatenate([
+            np.full(pad_before * values_per_row, fill_value, dtype=values.dtype),
+            values,
+            np.full(pad_after * values_per_row, fill_value, dtype=values.dtype)
+        ])
+        first_window = self.offset + pad_before
+        windows = sliding_window_view(padded_values, self.window * values_per_row)[::values_per_row]
+        return windows[first_window:first_window + len(self.obj)]
+
+    def _reduce_windows(self, windows: np.ndarray, reduce: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+        """
+        Reduces the windows a chunk at a time, so we don't use too much memory.
+        """
+        chunk_size = max(1, MAX_WINDOW_VALUES_PER_CHUNK // windows.shape[1])
+        return np.concatenate([reduce(windows[i:i + chunk_size]) for i in range(0, len(windows), chunk_size)])
+
+    def _get_cumulative_window_sums(self, row_values: np.ndarray) -> np.ndarray:
+        starts = np.arange(len(self.obj)) + self.offset
+        starts, ends = np.clip(starts, 0, len(self.obj)), np.clip(starts + self.window, 0, len(self.obj))
+        cumulative_sums = np.concatenate([[0], np.cumsum(row_values)])
+        return cumulative_sums[ends] - cumulative_sums[starts]
+
+    def _sum(self, values: np.ndarray) -> np.ndarray:
+        if values.dtype.kind == 'i':
+            # Integer sums are exact, and so we can use the difference of cumulative sums
+            return self._get_cumulative_window_sums(values.sum(axis=1))
+
+        # We sum each column, and then add them together, like pandas does
+        result = None
+        for column_index in range(values.shape[1]):
+            windows = self._get_windows(values[:, column_index], 0)
+            column_result = self._reduce_windows(windows, lambda windows: np.nansum(windows, axis=1))
+            result = column_result if result is None else result + column_result
+        return result # type: ignore
+
+    def _count(self, values: np.ndarray) -> np.ndarray:
+        if values.dtype.kind == 'i':
+            return self._get_cumulative_window_sums(np.full(len(values), values.shape[1]))
+        return self._get_cumulative_window_sums((~np.isnan(values)).sum(axis=1))
+
+    def _max_or_min(self, values: np.ndarray, is_max: bool) -> np.ndarray:
+        reduce = np.fmax if is_max else np.fmin
+        result = None
+        for column_index in range(values.shape[1]):
+            column_values = values[:, column_index]
+            fill_value: Union[int, float]
+            if column_values.dtype.kind == 'i':
+                # Pad with a value that is never the max (or min), as ints cannot be NaN
+                fill_value = np.iinfo(column_values.dtype).min if is_max else np.iinfo(column_values.dtype).max
+            else:
+                fill_value = np.nan
+            windows = self._get_windows(column_values, fill_value)
+            column_result = self._reduce_windows(windows, lambda windows: reduce.reduce(windows, axis=1))
+            result = column_result if result is None else reduce(result, column_result)
+        return result # type: ignore
+
+    def _std_or_var(self, values: np.ndarray, is_std: bool) -> np.ndarray:
+        # Like .stack(), we take the values of each row in turn, and so the 
+        # window of a row is the (window * columns) values starting at that row
+        windows = self._get_windows(values.astype(float).reshape(-1), np.nan, values_per_row=values.shape[1])
+        reduce = np.nanstd if is_std else np.nanvar
+        return self._reduce_windows(windows, lambda windows: reduce(windows, axis=1, ddof=1))
+
+
+VECTORISED_REDUCTIONS: Dict[Callable[[pd.DataFrame], Union[str, float, int, bool, datetime, timedelta]], Callable[[RollingRange, np.ndarray], np.ndarray]] = {
+    dataframe_sum: RollingRange._sum,
+    dataframe_count: RollingRange._count,
+    dataframe_max: lambda rolling_range, values: rolling_range._max_or_min(values, is_max=True),
+    dataframe_min: lambda rolling_range, values: rolling_range._max_or_min(values, is_max=False),
+    dataframe_std: lambda rolling_range, values: rolling_range._std_or_var(values, is_std=True),
+    dataframe_var: lambda rolling_range, values: rolling_range._std_or_var(values, is_std=False),
+}
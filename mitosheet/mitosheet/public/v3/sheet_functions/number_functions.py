@@ -25,7 +25,7 @@ import numpy as np
 import pandas as pd
 
 from mitosheet.public.v3.errors import handle_sheet_function_errors
-from mitosheet.public.v3.rolling_range import RollingRange
+from mitosheet.public.v3.rolling_range import RollingRange, dataframe_count, dataframe_max, dataframe_min, dataframe_std, dataframe_sum, dataframe_var
 from mitosheet.public.v3.sheet_functions.utils import get_final_result_series_or_primitive, get_index_from_series, get_series_from_primitive_or_series
 from mitosheet.public.v3.types.decorators import cast_values_in_all_args_to_type, cast_values_in_arg_to_type
 from mitosheet.public.v3.types.sheet_function_types import DatetimeFunctionReturnType, DatetimeRestrictedInputType, FloatFunctonReturnType, IntFunctionReturnType, IntRestrictedInputType, NumberFunctionReturnType, NumberInputType, NumberRestrictedInputType
@@ -95,7 +95,7 @@ def AVG(*argv: Optional[NumberInputType]) -> NumberFunctionReturnType:
             num_entries += int(num_non_null_values)
 
         elif isinstance(arg, RollingRange):
-            num_non_null_values_series = arg.apply(lambda df: df.count().sum())
+            num_non_null_values_series = arg.apply(dataframe_count)
             num_entries += num_non_null_values_series
             
         elif isinstance(arg, pd.Series):
@@ -331,7 +331,7 @@ def MAX(*argv: Union[NumberInputType, None, DatetimeRestrictedInputType]) -> Uni
     result = get_final_result_series_or_primitive(
         default_value,
         argv,
-        lambda df: df.max().max(),
+        dataframe_max,
         lambda previous_value, new_value: max(previous_value, new_value),
         lambda previous_series, new_series: pd.concat([previous_series, new_series], axis=1).max(axis=1)
     )
@@ -389,7 +389,7 @@ def MIN(*argv: Union[NumberInputType, None, DatetimeRestrictedInputType]) -> Uni
     result = get_final_result_series_or_primitive(
         default_value,
         argv,
-        lambda df: df.min().min(),
+        dataframe_min,
         lambda previous_value, new_value: min(previous_value, new_value),
         lambda previous_series, new_series: pd.concat([previous_series, new_series], axis=1).min(axis=1)
     )
@@ -568,7 +568,7 @@ def STDEV(arg: NumberInputType) -> NumberFunctionReturnType:
     elif isinstance(arg, pd.DataFrame):
         return arg.stack().std() # We have to compute them all together
     else:
-        return arg.apply(lambda x: x.stack().std()) # type: ignore
+        return arg.apply(dataframe_std) # type: ignore
 
 
 @cast_values_in_all_args_to_type('number')
@@ -600,7 +600,7 @@ def SUM(*argv: Optional[NumberInputType]) -> NumberFunctionReturnType:
     return get_final_result_series_or_primitive(
         0,
         argv,
-        lambda df: df.sum().sum(),
+        dataframe_sum,
         lambda previous_value, new_value: previous_value + new_value,
         lambda previous_series, new_series: previous_series + new_series
     )
@@ -714,7 +714,7 @@ def VAR(arg: NumberInputType) -> NumberFunctionReturnType:
     elif isinstance(arg, pd.DataFrame):
         return arg.stack().var() # type: ignore
     else:
-        return arg.apply(lambda x: x.stack().var()) # type: ignore
+        return arg.apply(dataframe_var) # type: ignore
 
 
 NUMBER_FUNCTIONS = {
@@ -86,7 +86,7 @@ def __get_new_result_series_or_primitive(
         return get_new_result(previous_result, reduced_df)
 
     elif isinstance(arg, RollingRange):
-        new_series = arg.apply(lambda df: get_primitive_value_from_dataframe(df))
+        new_series = arg.apply(get_primitive_value_from_dataframe)
         return get_new_result(previous_result, new_series)
         
     elif isinstance(arg, pd.Series):
@@ -1,6 +1,22 @@
 
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Numbers that float can parse as is
+PLAIN_NUMBER_REGEX = r'\s*[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?\s*\Z'
+# Numbers with a leading negative sign, dollar sign, accounting parentheses, American commas
+# or a million or billion identifier, in the orders that cast_string_to_float handles them
+FORMATTED_NUMBER_REGEX = r'^\s*(?P<negative>-)?\$?(?P<parentheses>\()?' + \
+    r'(?P<number>[0-9]{1,3}(?:,[0-9]{3})+(?:\.[0-9]*)?|[0-9]+(?:\.[0-9]*)?|\.[0-9]+)' + \
+    r'(?P<identifier>Million|million|Mil|mil|M|m|Billion|billion|Bil|bil|B|b)?(?(parentheses)\))\s*\Z'
+
+IDENTIFIER_MULTIPLIERS = {
+    **{identifier: 1000000 for identifier in ["Million", 'Mil', 'M', 'million', 'mil', 'm']},
+    **{identifier: 1000000000 for identifier in ["Billion", 'Bil', 'B', 'billion', 'bil', 'b']},
+}
 
 
 def get_million_identifier_in_string(string: str) -> Union[str, None]:
@@ -116,4 +132,70 @@ def cast_to_float(unknown: Union[str, int, float, bool, datetime, timedelta]) ->
     elif isinstance(unknown, bool):
         return float(unknown)
 
-    return None
\ No newline at end of file
+    return None
+
+
+def cast_distinct_strings_to_float(strings: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Casts the strings that are plain or formatted numbers all at once, giving the same
+    results as cast_string_to_float would. Returns the float values and a mask of the 
+    strings that were cast. 
+    
+    The strings that were not cast are anything that cast_string_to_float would need to
+    handle more carefully (e.g. European commas), and should be cast element-wise.
+    """
+    try:
+        # Optimistically, all of the strings are numbers that float can parse, in which case
+        # numpy can call float on each of them much faster than we can
+        return strings.to_numpy(dtype=object).astype('float64'), np.ones(len(strings), dtype=bool)
+    except ValueError:
+        pass
+
+    values = np.full(len(strings), np.nan)
+
+    is_plain_number = strings.str.match(PLAIN_NUMBER_REGEX, na=False).to_numpy(dtype=bool)
+    values[is_plain_number] = strings[is_plain_number].to_numpy(dtype=object).astype('float64')
+
+    formatted_numbers = strings[~is_plain_number].str.extract(FORMATTED_NUMBER_REGEX)
+    # Commas and an identifier together are handled in a way that is hard to predict, so
+    # we leave them to be cast element-wise
+    is_formatted_number = formatted_numbers['number'].notna() & ~(
+        formatted_numbers['number'].str.contains(',', regex=False, na=False) & formatted_numbers['identifier'].notna()
+    )
+    formatted_numbers = formatted_numbers[is_formatted_number]
+
+    is_negative = formatted_numbers['negative'].notna() | formatted_numbers['parentheses'].notna()
+    multiplier = formatted_numbers['identifier'].map(IDENTIFIER_MULTIPLIERS).fillna(1).astype('int64')
+
+    is_cast = is_plain_number.copy()
+    formatted_indexes = np.flatnonzero(~is_plain_number)[is_formatted_number.to_numpy(dtype=bool)]
+    is_cast[formatted_indexes] = True
+    values[formatted_indexes] = formatted_numbers['number'].str.replace(',', '', regex=False).to_numpy(dtype=object).astype('float64') \
+        * np.where(is_negative, -1, 1) \
+        * multiplier.to_numpy()
+
+    return values, is_cast
+
+
+def cast_string_series_to_float(series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Casting strings to floats element-wise is very slow, so this function casts the
+    strings in the series that are plain or formatted numbers all at once. As string
+    columns often repeat values, each distinct string is only cast once.
+
+    The series should only contain strings and missing values. Returns the float
+    values and a mask of the elements that were cast. The elements that were not 
+    cast, including all missing values, should be cast element-wise.
+    """
+    codes, distinct_strings = pd.factorize(series)
+    if len(distinct_strings) == 0:
+        return np.full(len(series), np.nan), np.zeros(len(series), dtype=bool)
+
+    distinct_values, distinct_is_cast = cast_distinct_strings_to_float(pd.Series(distinct_strings, dtype=object))
+
+    is_missing = codes == -1
+    values = distinct_values[codes]
+    values[is_missing] = np.nan
+    is_cast = distinct_is_cast[codes] & ~is_missing
+
+    return values, is_cast
@@ -3,13 +3,14 @@
 from datetime import datetime, timedelta
 from typing import Any, Callable, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 from mitosheet.is_type_utils import is_bool_dtype, is_datetime_dtype, is_float_dtype, is_int_dtype, is_string_dtype, is_timedelta_dtype
 
 from mitosheet.public.v3.rolling_range import RollingRange
 from mitosheet.public.v3.types.bool import cast_to_bool
 from mitosheet.public.v3.types.datetime import cast_series_to_datetime, cast_to_datetime
-from mitosheet.public.v3.types.float import cast_to_float
+from mitosheet.public.v3.types.float import cast_string_series_to_float, cast_to_float
 from mitosheet.public.v3.types.int import cast_to_int
 from mitosheet.public.v3.types.number import cast_to_number
 from mitosheet.public.v3.types.str import cast_to_string
@@ -79,6 +80,112 @@ def get_primitive_type_name_from_series(series: pd.Series) -> PrimitiveTypeName:
         return 'str'
 
 
+def get_numeric_series_cast_to_type(target_primitive_type_name: PrimitiveTypeName, series: pd.Series) -> Optional[pd.Series]:
+    """
+    For a series with a numpy int, float or bool dtype, we know how every element casts 
+    to the target type, so we can cast the entire series at once. Returns None if the
+    series has to be cast element-wise.
+    """
+    kind = series.dtype.kind
+
+    if target_primitive_type_name == 'float':
+        return series.astype('float64')
+    elif target_primitive_type_name == 'number':
+        if kind == 'f':
+            return series.astype('float64')
+        elif kind in 'ib':
+            return series.astype('int64')
+    elif target_primitive_type_name == 'int':
+        if kind in 'ib':
+            return series.astype('int64')
+        elif kind == 'f':
+            values = series.to_numpy()
+            # NaN, infinite and very large values cannot be cast to int64, so we cast them element-wise
+            if (np.abs(values) < 2**63).all():
+                return series.astype('int64')
+    elif target_primitive_type_name == 'bool':
+        if kind == 'b':
+            return series.copy()
+        elif kind in 'iu':
+            return series != 0
+        elif kind == 'f':
+            # We cast NaN's to false
+            return series.notna() & (series != 0)
+    elif target_primitive_type_name == 'str':
+        if kind in 'iub':
+            return series.astype(str)
+
+    return None
+
+
+def get_string_series_cast_to_number(
+        target_primitive_type_name: PrimitiveTypeName, 
+        series: pd.Series,
+        element_conversion_function: Callable[[Any], Any]
+    ) -> pd.Series:
+    """
+    Casts a series of strings (and missing values) to a float, number or int series, by 
+    casting all the strings that are numbers at once, and only casting the remaining
+    elements element-wise.
+    """
+    values, is_cast = cast_string_series_to_float(series)
+
+    cast_values: np.ndarray = values
+    if target_primitive_type_name == 'int':
+        # Values that cannot be cast to int64 are cast element-wise, so they error correctly
+        is_cast = is_cast & (np.abs(values) < 2**63)
+        cast_values = values.astype('int64') if is_cast.all() else np.where(is_cast, values, 0).astype('int64')
+
+    if is_cast.all():
+        return pd.Series(cast_values, index=series.index, name=series.name)
+
+    if not is_cast.any():
+        return series.apply(element_conversion_function)
+
+    new_values = np.empty(len(series), dtype=object)
+    new_values[is_cast] = cast_values[is_cast]
+    new_values[~is_cast] = series[~is_cast].apply(element_conversion_function).to_numpy(dtype=object)
+    return pd.Series(new_values, index=series.index, name=series.name).infer_objects()
+
+
+def get_series_cast_to_type(
+        target_primitive_type_name: PrimitiveTypeName, 
+        series: pd.Series,
+        element_conversion_function: Callable[[Any], Any],
+        primitive_types_to_ignore: List[PrimitiveTypeName]
+    ) -> pd.Series:
+    """
+    Casts the series to the target type, giving the same result as casting each element
+    with the element_conversion_function, but avoiding casting element-wise where the 
+    dtype of the series lets us cast it all at once.
+    """
+    if len(series) == 0:
+        return series.apply(element_conversion_function)
+
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iufb':
+        # NOTE: element-wise, bools are ints, as bool is a subclass of int
+        if ('float' if dtype.kind == 'f' else 'int') in primitive_types_to_ignore:
+            if dtype in [np.dtype('float64'), np.dtype('int64'), np.dtype('bool')]:
+                return series.copy()
+            return series.apply(element_conversion_function)
+
+        new_series = get_numeric_series_cast_to_type(target_primitive_type_name, series)
+        if new_series is not None:
+            return new_series
+
+    elif dtype == object:
+        if target_primitive_type_name == 'str' and pd.api.types.infer_dtype(series, skipna=False) == 'string':
+            return series.copy()
+
+        if target_primitive_type_name in ['float', 'number', 'int'] \
+            and 'str' not in primitive_types_to_ignore \
+            and pd.api.types.infer_dtype(series, skipna=True) == 'string':
+            return get_string_series_cast_to_number(target_primitive_type_name, series, element_conversion_function)
+
+    return series.apply(element_conversion_function)
+
+
 def get_arg_cast_to_type(
         target_primitive_type_name: PrimitiveTypeName, 
         arg: Any,
@@ -116,14 +223,14 @@ def get_arg_cast_to_type(
         if series_conversion_function is not None:
             return series_conversion_function(arg)
 
-        return arg.apply(element_conversion_function)
+        return get_series_cast_to_type(target_primitive_type_name, arg, element_conversion_function, primitive_types_to_ignore) # type: ignore
 
     elif isinstance(arg, pd.DataFrame):
 
         if series_conversion_function is not None:
             return arg.apply(lambda c: series_conversion_function(c))
 
-        return arg.apply(lambda c: c.apply(element_conversion_function))
+        return arg.apply(lambda c: get_series_cast_to_type(target_primitive_type_name, c, element_conversion_function, primitive_types_to_ignore)) # type: ignore
 
     elif isinstance(arg, RollingRange):
         obj = arg.obj
@@ -131,6 +238,6 @@ def get_arg_cast_to_type(
         if series_conversion_function is not None:
             new_obj = obj.apply(lambda c: series_conversion_function(c))
         else:
-            new_obj = obj.apply(lambda c: c.apply(element_conversion_function))
+            new_obj = obj.apply(lambda c: get_series_cast_to_type(target_primitive_type_name, c, element_conversion_function, primitive_types_to_ignore)) # type: ignore
             
         return RollingRange(new_obj, arg.window, arg.offset)
\ No newline at end of file
@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains the AnalysisWriter, which saves analyses from a background thread.
+
+Rather than rewriting the entire saved analysis after each edit, the writer
+appends the steps that changed to a journal next to the saved analysis, and
+only rewrites the saved analysis (compacting the journal into it) every so
+often. See read_analysis for how the journal is read back.
+"""
+
+import atexit
+import json
+import os
+import tempfile
+from copy import deepcopy
+from threading import Condition, Thread
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+from mitosheet.utils import NpEncoder
+
+# The most records we append to a journal before compacting it into the saved analysis
+MAX_JOURNAL_RECORDS = 100
+
+# The longest we wait for the analyses to be written when the interpreter exits
+ANALYSIS_WRITER_EXIT_FLUSH_TIMEOUT_SECONDS = 5.0
+
+# The keys of a saved analysis, other than the steps_data, that each journal record saves
+SAVED_ANALYSIS_METADATA_KEYS = ['version', 'public_interface_version', 'args', 'code_options']
+
+
+def get_journal_path(analysis_path: str) -> str:
+    """
+    Returns the path of the journal for the saved analysis at analysis_path
+    """
+    return analysis_path[:-len('.json')] + '.journal' if analysis_path.endswith('.json') else analysis_path + '.journal'
+
+
+def get_file_key(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        return None
+    return (file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size)
+
+
+def is_same_step(old_step: Dict[str, Any], new_step: Dict[str, Any]) -> bool:
+    # NOTE: step params are not changed once the step is created, so a step with
+    # the same params object is the same step, and we don't need to compare them
+    return (
+        old_step['params'] is new_step['params'] and
+        old_step['step_type'] == new_step['step_type'] and
+        old_step['step_version'] == new_step['step_version']
+    )
+
+
+class AnalysisJournal:
+    """
+    What the writer last wrote for a saved analysis, which the next write appends to.
+    """
+
+    def __init__(self, journal_id: str, saved_analysis: Dict[str, Any], saved_analysis_size: int, saved_analysis_file_key: Optional[Tuple[int, int, int]]):
+        self.journal_id = journal_id
+        self.saved_analysis = saved_analysis
+        self.saved_analysis_size = saved_analysis_size
+        # So we can tell if the saved analysis was changed by something other than the writer
+        self.saved_analysis_file_key = saved_analysis_file_key
+        self.num_records = 0
+        self.journal_size = 0
+
+
+class AnalysisWriter:
+    """
+    Writes saved analyses, appending to their journals where possible.
+
+    If threaded, analyses are written from a background thread. If an analysis is
+    written again before the background thread gets to it, only the latest version
+    is written. Call flush to wait for an analysis to be written.
+    """
+
+    def __init__(self, threaded: bool=True):
+        self.threaded = threaded
+
+        # The latest analysis to write to each path, and the paths being written
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.writing: Set[str] = set()
+        self.condition = Condition()
+
+        # NOTE: only accessed by the thread writing to the path
+        self.journals: Dict[str, AnalysisJournal] = {}
+
+        self.thread: Optional[Thread] = None
+
+    def write(self, analysis_path: str, saved_analysis: Dict[str, Any], background: bool=True) -> None:
+        """
+        Writes the saved analysis to analysis_path. If background is False, or the writer
+        is not threaded, the analysis is written before this returns, and any errors are raised.
+
+        NOTE: the steps_data is not copied, and so it must not be changed after it is written.
+        """
+        # The metadata is small, and might be changed in place, so we copy it
+        saved_analysis = {**saved_analysis, **deepcopy({key: saved_analysis[key] for key in SAVED_ANALYSIS_METADATA_KEYS})}
+
+        if not background or not self.threaded:
+            with self.condition:
+                # This write replaces any pending write, which is older
+                self.pending.pop(analysis_path, None)
+                self.condition.wait_for(lambda: analysis_path not in self.writing)
+                self.writing.add(analysis_path)
+            try:
+                self._write(analysis_path, saved_analysis)
+            finally:
+                self._finish_writing(analysis_path)
+            return
+
+        with self.condition:
+            self.pending[analysis_path] = saved_analysis
+            self.condition.notify_all()
+        self._start_thread()
+
+    def flush(self, analysis_path: Optional[str]=None, timeout: Optional[float]=None) -> bool:
+        """
+        Waits until the analysis at analysis_path, or all analyses if it is None, are written.
+        Returns False if this takes longer than timeout.
+        """
+        def is_flushed() -> bool:
+            if analysis_path is None:
+                return len(self.pending) == 0 and len(self.writing) == 0
+            return analysis_path not in self.pending and analysis_path not in self.writing
+
+        with self.condition:
+            return self.condition.wait_for(is_flushed, timeout)
+
+    def forget(self, analysis_path: str) -> None:
+        """
+        Waits until the analysis at analysis_path is written, and then forgets its journal,
+        so it is compacted the next time it is written. Call this before the saved analysis
+        is changed other than by this writer, e.g. when it is deleted or renamed.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: analysis_path not in self.pending and analysis_path not in self.writing)
+            self.journals.pop(analysis_path, None)
+
+    def _start_thread(self) -> None:
+        with self.condition:
+            if self.thread is not None:
+                return
+
+            # A daemon thread, so it does not stop the interpreter from exiting. We
+            # instead flush the analyses at exit, with a timeout
+            self.thread = Thread(target=self._run, daemon=True)
+            self.thread.start()
+            atexit.register(self.flush, None, ANALYSIS_WRITER_EXIT_FLUSH_TIMEOUT_SECONDS)
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: any(path not in self.writing for path in self.pending))
+                analysis_path = next(path for path in self.pending if path not in self.writing)
+                saved_analysis = self.pending.pop(analysis_path)
+                self.writing.add(analysis_path)
+
+            # Failing to save the analysis should never stop this thread
+            try:
+                self._write(analysis_path, saved_analysis)
+            except:
+                pass
+            finally:
+                self._finish_writing(analysis_path)
+
+    def _finish_writing(self, analysis_path: str) -> None:
+        with self.condition:
+            self.writing.discard(analysis_path)
+            self.condition.notify_all()
+
+    def _write(self, analysis_path: str, saved_analysis: Dict[str, Any]) -> None:
+        journal = self.journals.get(analysis_path)
+        journal_path = get_journal_path(analysis_path)
+
+        if (
+            journal is None or
+            journal.num_records >= MAX_JOURNAL_RECORDS or
+            journal.journal_size > journal.saved_analysis_size or
+            get_file_key(analysis_path) != journal.saved_analysis_file_key or
+            (journal.num_records > 0 and not os.path.exists(journal_path))
+        ):
+            self._compact(analysis_path, saved_analysis)
+            return
+
+        old_steps: List[Dict[str, Any]] = journal.saved_analysis['steps_data']
+        new_steps: List[Dict[str, Any]] = saved_analysis['steps_data']
+
+        # The steps are replaced from the first step that is different
+        start_index = 0
+        while start_index < min(len(old_steps), len(new_steps)) and is_same_step(old_steps[start_index], new_steps[start_index]):
+            start_index += 1
+
+        metadata_changed = any(journal.saved_analysis[key] != saved_analysis[key] for key in SAVED_ANALYSIS_METADATA_KEYS)
+        if start_index == len(old_steps) == len(new_steps) and not metadata_changed:
+            return
+
+        record = {
+            'journal_id': journal.journal_id,
+            'start_index': start_index,
+            'steps_data': new_steps[start_index:],
+            **{key: saved_analysis[key] for key in SAVED_ANALYSIS_METADATA_KEYS}
+        }
+        record_string = json.dumps(record, cls=NpEncoder) + '\n'
+        with open(journal_path, 'a') as f:
+            f.write(record_string)
+
+        journal.saved_analysis = saved_analysis
+        journal.num_records += 1
+        journal.journal_size += len(record_string)
+
+    def _compact(self, analysis_path: str, saved_analysis: Dict[str, Any]) -> None:
+        """
+        Writes the entire saved analysis, with a new journal id, so that any old journal
+        is no longer read. We write to a temporary file and rename it, so the saved
+        analysis is never half written.
+        """
+        journal_id = str(uuid4())
+        saved_analysis_string = json.dumps({**saved_analysis, 'journal_id': journal_id}, cls=NpEncoder)
+
+        file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(analysis_path), prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'w') as f:
+                f.write(saved_analysis_string)
+            os.replace(temp_path, analysis_path)
+        except:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        journal_path = get_journal_path(analysis_path)
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+
+        self.journals[analysis_path] = AnalysisJournal(journal_id, saved_analysis, len(saved_analysis_string), get_file_key(analysis_path))
+
+
+def read_journal(analysis_path: str, saved_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Applies the records in the journal of the saved analysis at analysis_path to the
+    saved_analysis read from it, and returns the result.
+
+    Records from a different journal than the one the saved analysis was compacted
+    with are ignored, as is a record left half written.
+    """
+    journal_id = saved_analysis.pop('journal_id', None)
+    journal_path = get_journal_path(analysis_path)
+    if journal_id is None or 'steps_data' not in saved_analysis or not os.path.exists(journal_path):
+        return saved_analysis
+
+    with open(journal_path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except:
+                break
+
+            if record.get('journal_id') != journal_id:
+                continue
+
+            saved_analysis['steps_data'] = saved_analysis['steps_data'][:record['start_index']] + record['steps_data']
+            for key in SAVED_ANALYSIS_METADATA_KEYS:
+                saved_analysis[key] = record[key]
+
+    return saved_analysis
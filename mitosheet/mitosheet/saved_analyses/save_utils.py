@@ -13,15 +13,19 @@ import os
 import json
 from typing import Any, Dict, List, Optional
 from mitosheet._version import __version__
+from mitosheet.saved_analyses.analysis_writer import AnalysisWriter, get_journal_path, read_journal
 from mitosheet.telemetry.telemetry_utils import log
 from mitosheet.types import CodeOptions, StepsManagerType
-from mitosheet.utils import NpEncoder
+from mitosheet.user.location import is_jupyterlite
 from mitosheet.save_paths import MITO_FOLDER
 
 # The current version of the saved Mito analysis
 # where we save all the analyses for this version
 SAVED_ANALYSIS_FOLDER = os.path.join(MITO_FOLDER, 'saved_analyses')
 
+# JupyterLite does not support multiple threads, so there we write analyses as they change
+analysis_writer = AnalysisWriter(threaded=not is_jupyterlite())
+
 
 def get_analysis_exists(analysis_name: Optional[str]) -> bool:
     """
@@ -33,6 +37,7 @@ def get_analysis_exists(analysis_name: Optional[str]) -> bool:
         return False
 
     analysis_path = f'{SAVED_ANALYSIS_FOLDER}/{analysis_name}.json'
+    analysis_writer.flush(analysis_path)
     return os.path.exists(analysis_path)
 
 def read_analysis(analysis_name: str) -> Optional[Dict[str, Any]]:
@@ -40,20 +45,34 @@ def read_analysis(analysis_name: str) -> Optional[Dict[str, Any]]:
     Given an analysis_name, reads the saved analysis in
     ~/.mito/{analysis_name}.json and returns a JSON object
     representing it.
+
+    Any steps appended to the journal of the analysis since it
+    was last written in full are included.
     """
 
     analysis_path = f'{SAVED_ANALYSIS_FOLDER}/{analysis_name}.json'
 
+    # Make sure any changes to the analysis are written before we read it
+    analysis_writer.flush(analysis_path)
+
     if not os.path.exists(analysis_path):
         return None
 
     with open(analysis_path) as f:
         try:
             # We try and read the file as JSON
-            return json.load(f)
+            saved_analysis = json.load(f)
         except: 
             return None
 
+    if not isinstance(saved_analysis, dict):
+        return saved_analysis
+
+    try:
+        return read_journal(analysis_path, saved_analysis)
+    except:
+        return None
+
 def read_and_upgrade_analysis(analysis_name: str, args: List[str]) -> Optional[Dict[str, Any]]:
     """
     Given an analysis_name, reads the saved analysis in
@@ -68,6 +87,8 @@ def _get_all_analysis_filenames():
     """
     Returns the names of the files in the SAVED_ANALYSIS_FOLDER
     """
+    analysis_writer.flush()
+
     if not os.path.exists(SAVED_ANALYSIS_FOLDER):
         return []
 
@@ -83,6 +104,7 @@ def _delete_analyses(analysis_filenames):
     For bulk deleting analysis with file names. 
     """
     for filename in analysis_filenames:
+        analysis_writer.forget(os.path.join(SAVED_ANALYSIS_FOLDER, filename))
         os.remove(os.path.join(SAVED_ANALYSIS_FOLDER, filename))
 
 def delete_saved_analysis(analysis_name):
@@ -96,7 +118,11 @@ def delete_saved_analysis(analysis_name):
 
     # If the analysis name exists, delete it
     if analysis is not None:
-        os.remove(os.path.join(SAVED_ANALYSIS_FOLDER, analysis_name + '.json'))
+        analysis_path = os.path.join(SAVED_ANALYSIS_FOLDER, analysis_name + '.json')
+        analysis_writer.forget(analysis_path)
+        os.remove(analysis_path)
+        if os.path.exists(get_journal_path(analysis_path)):
+            os.remove(get_journal_path(analysis_path))
     else:
         raise Exception(f'Cannot delete {analysis_name} as it does not exist')
 
@@ -115,21 +141,24 @@ def rename_saved_analysis(old_analysis_name, new_analysis_name):
     if old_analysis is not None and new_analysis is None:
         full_old_analysis_name = os.path.join(SAVED_ANALYSIS_FOLDER, old_analysis_name + '.json')
         full_new_analysis_name = os.path.join(SAVED_ANALYSIS_FOLDER, new_analysis_name + '.json')
+        analysis_writer.forget(full_old_analysis_name)
+        analysis_writer.forget(full_new_analysis_name)
         os.rename(full_old_analysis_name, full_new_analysis_name)
+        if os.path.exists(get_journal_path(full_old_analysis_name)):
+            os.rename(get_journal_path(full_old_analysis_name), get_journal_path(full_new_analysis_name))
     else:
         raise Exception(f'Invalid rename, with old and new analysis are {old_analysis_name} and {new_analysis_name}')
 
 
-def write_saved_analysis(analysis_path: str, steps_data: List[Dict[str, Any]], public_interface_version: int, args: List[str], code_options: CodeOptions, version: str=__version__) -> None:
-    with open(analysis_path, 'w+') as f:
-        saved_analysis = {
-            'version': version,
-            'steps_data': steps_data,
-            'public_interface_version': public_interface_version,
-            'args': args,
-            'code_options': code_options
-        }
-        f.write(json.dumps(saved_analysis, cls=NpEncoder))
+def write_saved_analysis(analysis_path: str, steps_data: List[Dict[str, Any]], public_interface_version: int, args: List[str], code_options: CodeOptions, version: str=__version__, background: bool=False) -> None:
+    saved_analysis = {
+        'version': version,
+        'steps_data': steps_data,
+        'public_interface_version': public_interface_version,
+        'args': args,
+        'code_options': code_options
+    }
+    analysis_writer.write(analysis_path, saved_analysis, background=background)
 
 
 def make_steps_json_obj(
@@ -183,12 +212,15 @@ def make_steps_json_obj(
 
     return steps_json_obj
 
-def write_analysis(steps_manager: StepsManagerType, analysis_name: Optional[str]=None) -> None:
+def write_analysis(steps_manager: StepsManagerType, analysis_name: Optional[str]=None, background: bool=False) -> None:
     """
     Writes the analysis saved in steps_manager to
     ~/.mito/{analysis_name}. If analysis_name is none, gets the temporary
     name from the steps_manager.
 
+    If background is True, the analysis is written from a background 
+    thread, and this returns before it is written. 
+
     Note that a step container may contain invalid steps/out of
     date steps, but we save them all, as they will play back validly
     as they were valid when they were added.
@@ -207,4 +239,4 @@ def write_analysis(steps_manager: StepsManagerType, analysis_name: Optional[str]
     steps = make_steps_json_obj(steps_manager.steps_including_skipped)
 
     # Actually write the file
-    write_saved_analysis(analysis_path, steps, steps_manager.public_interface_version, steps_manager.original_args_raw_strings, steps_manager.code_options)
\ No newline at end of file
+    write_saved_analysis(analysis_path, steps, steps_manager.public_interface_version, steps_manager.original_args_raw_strings, steps_manager.code_options, background=background)
\ No newline at end of file
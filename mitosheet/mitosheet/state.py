@@ -4,11 +4,13 @@
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
 from collections import OrderedDict
-from copy import deepcopy
+from copy import copy, deepcopy
+from itertools import count
 from typing import Any, Callable, Collection, List, Dict, Optional
 import pandas as pd
 
 from mitosheet.column_headers import ColumnIDMap
+from mitosheet.pivot_cache import PivotSourceCache
 from mitosheet.types import FrontendFormulaAndLocation
 from mitosheet.types import ColumnHeader, ColumnID, DataframeFormat
 from mitosheet.user.utils import is_enterprise, is_running_test
@@ -46,6 +48,24 @@ def get_default_dataframe_format() -> DataframeFormat:
     }
 
 
+# Every sheet version is unique, across all states
+_sheet_versions = count()
+
+def get_new_sheet_version() -> int:
+    return next(_sheet_versions)
+
+
+def _copy_sheet_metadata(sheet_metadata: List[Any], deep_sheet_indexes: List[int]) -> List[Any]:
+    """
+    Returns a new list of per-sheet metadata, where only the metadata for the
+    sheets in deep_sheet_indexes is deep copied, and the rest is shared.
+    """
+    return [
+        deepcopy(metadata) if sheet_index in deep_sheet_indexes else metadata
+        for sheet_index, metadata in enumerate(sheet_metadata)
+    ]
+
+
 class State:
     """
     State is a container that stores the current state of a Mito analysis,
@@ -69,10 +89,18 @@ class State:
         graph_data_dict: "Optional[OrderedDict[str, Dict[str, Any]]]"=None,
         user_defined_functions: Optional[List[Callable]]=None,
         user_defined_importers: Optional[List[Callable]]=None,
+        pivot_source_cache: Optional[PivotSourceCache]=None,
     ):
 
-        # The dataframes that are in the state
+        # The dataframes that are in the state. NOTE: these can be evicted to save memory, 
+        # in which case they are rebuilt when they are next accessed. See step_state_cache.py
         self.dfs = list(dfs)
+        self._dataframe_rebuilder: Optional[Any] = None
+
+        # Each sheet has a version, which changes whenever anything about the sheet
+        # might have changed. Sheets with the same version are identical, in this 
+        # state or any other, so anything computed from a sheet can be cached by version
+        self.sheet_versions: List[int] = [get_new_sheet_version() for _ in self.dfs]
 
         # The df_names are composed of two parts:
         # 1. The names of the variables passed into the mitosheet.sheet call (which don't change over time).
@@ -146,27 +174,73 @@ class State:
 
         self.user_defined_importers = user_defined_importers if user_defined_importers is not None else []
 
+        # The pivot sources cached for this analysis, which are shared by all of its states
+        self.pivot_source_cache = pivot_source_cache if pivot_source_cache is not None else PivotSourceCache()
+
+    @property
+    def dfs(self) -> List[pd.DataFrame]:
+        if self._dfs is None:
+            # If the dataframes were evicted, we rebuild them by reexecuting the
+            # step that created this state
+            self._dataframe_rebuilder.rebuild(self)
+        return self._dfs # type: ignore
+
+    @dfs.setter
+    def dfs(self, dfs: List[pd.DataFrame]) -> None:
+        self._dfs: Optional[List[pd.DataFrame]] = dfs
+
+    @property
+    def are_dfs_evicted(self) -> bool:
+        return self._dfs is None
+
+    def evict_dfs(self, dataframe_rebuilder: Any) -> None:
+        """
+        Releases the dataframes in this state, so that they can be garbage 
+        collected. The dataframe_rebuilder is used to rebuild them if they
+        are accessed again.
+        """
+        self._dataframe_rebuilder = dataframe_rebuilder
+        self._dfs = None
+
     def copy(self, deep_sheet_indexes: Optional[List[int]]=None) -> "State":
         """
         Returns a copy of the state, while only making deep copies of
-        those dataframes in the deep_sheet_indexes. Ideally, we'd copy
-        even less than that deeply.
+        those dataframes in the deep_sheet_indexes. 
+
+        The state is copy-on-write: the per-sheet metadata (column ids, formulas,
+        filters and formats) is only deep copied for the sheets in deep_sheet_indexes,
+        which are the sheets that the step is allowed to mutate in place. All other
+        sheets share their metadata with this state, which is safe as every step
+        treats the state it is given as immutable.
+
+        The containers themselves are always new, so steps can still freely add, 
+        replace or remove entire sheets (and graphs) from the copied state. 
+
+        NOTE: if you mutate the metadata of a sheet in place, you must pass its
+        index in deep_sheet_indexes, or you will change the state of previous steps.
         """
         if deep_sheet_indexes is None:
             deep_sheet_indexes = []
-        
-        return State(
-            [df.copy(deep=index in deep_sheet_indexes) for index, df in enumerate(self.dfs)],
-            df_names=deepcopy(self.df_names),
-            df_sources=deepcopy(self.df_sources),
-            column_ids=deepcopy(self.column_ids),
-            column_formulas=deepcopy(self.column_formulas),
-            column_filters=deepcopy(self.column_filters),
-            df_formats=deepcopy(self.df_formats),
-            graph_data_dict=deepcopy(self.graph_data_dict),
-            user_defined_functions=deepcopy(self.user_defined_functions),
-            user_defined_importers=deepcopy(self.user_defined_importers),
-        )
+
+        # Copying the state object itself gives us any other attributes, which we then
+        # replace with copies below. This avoids rerunning the validation and wrapping 
+        # of the user defined functions in the constructor, which have already been done
+        new_state = copy(self)
+        new_state.dfs = [df.copy(deep=index in deep_sheet_indexes) for index, df in enumerate(self.dfs)]
+        new_state._dataframe_rebuilder = None
+        new_state.sheet_versions = list(self.sheet_versions)
+        new_state.df_names = list(self.df_names)
+        new_state.df_sources = list(self.df_sources)
+        new_state.column_ids = self.column_ids.copy(deep_sheet_indexes)
+        new_state.column_formulas = _copy_sheet_metadata(self.column_formulas, deep_sheet_indexes)
+        new_state.column_filters = _copy_sheet_metadata(self.column_filters, deep_sheet_indexes)
+        new_state.df_formats = _copy_sheet_metadata(self.df_formats, deep_sheet_indexes)
+        # Graph steps replace or delete entire graphs, so we only need a new container
+        new_state.graph_data_dict = OrderedDict(self.graph_data_dict)
+        new_state.user_defined_functions = list(self.user_defined_functions)
+        new_state.user_defined_importers = list(self.user_defined_importers)
+
+        return new_state
 
     def add_df_to_state(
         self,
@@ -188,6 +262,7 @@ class State:
         if sheet_index is None:
             # Update dfs by appending new df
             self.dfs.append(new_df)
+            self.sheet_versions.append(get_new_sheet_version())
             # Also update the dataframe name
             if df_name is None:
                 self.df_names.append(
@@ -226,6 +301,7 @@ class State:
         else:
             # Update dfs by switching which df is at this index specifically
             self.dfs[sheet_index] = new_df
+            self.sheet_versions[sheet_index] = get_new_sheet_version()
             # Also update the dataframe name, if it is passed. Otherwise, we don't change it
             if df_name is not None:
                 self.df_names[sheet_index] = df_name
@@ -258,6 +334,18 @@ class State:
             # Return the index of this sheet
             return sheet_index
 
+    def update_sheet_versions(self, sheet_indexes: Collection[int]) -> None:
+        """
+        Gives new versions to the sheets at sheet_indexes, as they have been modified. 
+        Any sheet without a version, e.g. because it was added directly to dfs, also 
+        gets a new version.
+        """
+        # NOTE: we create a new list, as the sheet versions might be shared with the prev_state
+        self.sheet_versions = [
+            get_new_sheet_version() if sheet_index in sheet_indexes or sheet_index >= len(self.sheet_versions) else self.sheet_versions[sheet_index]
+            for sheet_index in range(len(self.dfs))
+        ]
+
     def add_columns_to_state(self, sheet_index: int, column_headers: List[ColumnHeader]) -> None:
         """
         Helper function for adding a new columns to this state, making sure that we 
@@ -4,8 +4,9 @@
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
 
-from typing import Any, Dict, List, Optional, Set, Type
+from typing import Any, Dict, List, Optional, Set, Tuple, Type
 import json
+from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.step_performers.step_performer import StepPerformer
 from mitosheet.step_performers.column_steps.set_column_formula import SetColumnFormulaStepPerformer
 from mitosheet.step_performers.filter import FilterStepPerformer
@@ -14,6 +15,37 @@ from mitosheet.step_performers import STEP_TYPE_TO_STEP_PERFORMER
 from mitosheet.types import FORMULA_SPECIFIC_INDEX_LABELS_TYPE, ColumnHeader, ColumnID, FORMULA_ENTIRE_COLUMN_TYPE
 
 
+def get_modified_sheet_indexes(prev_state: State, post_state: State, modified_dataframe_indexes: Set[int]) -> Set[int]:
+    """
+    Returns the indexes of the sheets in the post_state that might have been modified 
+    by the step that created it from the prev_state, given the modified dataframe 
+    indexes that the step performer returns.
+
+    This is a best guess, and so may return sheets that have in fact not been modified. 
+    If a sheet has been modified, it should always be returned.
+    """
+    num_prev_sheets = len(prev_state.sheet_versions)
+    num_post_sheets = len(post_state.dfs)
+
+    # If the set is empty, then we modified everything. If sheets were removed, 
+    # then the other sheets might have moved, and so we also say everything
+    if len(modified_dataframe_indexes) == 0 or num_post_sheets < num_prev_sheets:
+        return set(range(num_post_sheets))
+
+    modified_indexes = set(modified_dataframe_indexes)
+    # If -1 is modified, then all new dataframes are modified, which
+    # if nothing new was created, means there was a live updated event,
+    # and so we should just take the last element
+    if -1 in modified_indexes:
+        modified_indexes.remove(-1)
+        if num_prev_sheets == num_post_sheets:
+            modified_indexes.add(num_post_sheets - 1)
+
+    # Any new sheets are always modified
+    modified_indexes.update(range(num_prev_sheets, num_post_sheets))
+    return modified_indexes
+
+
 class Step:
     """
     A step is a container around a specific data transformation.
@@ -63,6 +95,10 @@ class Step:
         # work if it has already been done. See simple_import for an example
         self.execution_data = execution_data if execution_data is not None else {}
 
+        # The code chunks this step transpiles to, and the prev_state, post_state, params
+        # and execution_data they were transpiled from. See get_code_chunks
+        self._code_chunks_cache: Optional[Tuple[Tuple[Any, ...], List[CodeChunk]]] = None
+
     @property
     def dfs(self):
         return self.post_state.dfs
@@ -159,6 +195,11 @@ class Step:
             # just don't change anything in the state
             new_post_state, execution_data = new_prev_state, {}
         
+        if new_post_state is not new_prev_state:
+            new_post_state.update_sheet_versions(get_modified_sheet_indexes(
+                new_prev_state, new_post_state, self.step_performer.get_modified_dataframe_indexes(params)
+            ))
+
         # Update the relevant state variables
         self.prev_state = new_prev_state
         self.post_state = new_post_state
@@ -166,6 +207,31 @@ class Step:
         self.params = params
 
         return post_state_and_execution_data is not None
+
+    def get_code_chunks(self) -> List[CodeChunk]:
+        """
+        Returns the (unoptimized) code chunks that this step transpiles to.
+
+        As we transpile every step on every update, these are cached, and the step
+        is only transpiled again if its prev_state, post_state, params or execution_data
+        have changed since it was last transpiled - which happens when it is reexecuted.
+
+        NOTE: do not modify the returned list, as it is shared with the cache.
+        """
+        transpiled_from = (self.prev_state, self.post_state, self.params, self.execution_data)
+        if self._code_chunks_cache is not None:
+            cached_transpiled_from, code_chunks = self._code_chunks_cache
+            if all(cached is current for cached, current in zip(cached_transpiled_from, transpiled_from)):
+                return code_chunks
+
+        code_chunks = self.step_performer.transpile(
+            self.prev_state, # type: ignore
+            self.post_state, # type: ignore
+            self.params,
+            self.execution_data,
+        )
+        self._code_chunks_cache = (transpiled_from, code_chunks)
+        return code_chunks
     
 
     def step_indexes_to_skip(self, all_steps_before_this_step: List['Step']) -> Set[int]:
@@ -194,23 +260,32 @@ class Step:
                 step_indexes_to_skip.add(step_index)
 
         if len(all_steps_before_this_step) > 0:
-            previous_step: Step = all_steps_before_this_step[-1]
-            
             # Check (3) and (4)
-            if self.step_type == SetColumnFormulaStepPerformer.step_type() and previous_step.step_type == SetColumnFormulaStepPerformer.step_type():
-                both_entire_column = self.params['index_labels_formula_is_applied_to']['type'] == FORMULA_ENTIRE_COLUMN_TYPE and previous_step.params['index_labels_formula_is_applied_to']['type'] == FORMULA_ENTIRE_COLUMN_TYPE
-                same_indexes = (
-                    self.params['index_labels_formula_is_applied_to']['type'] == FORMULA_SPECIFIC_INDEX_LABELS_TYPE and previous_step.params['index_labels_formula_is_applied_to']['type'] == FORMULA_SPECIFIC_INDEX_LABELS_TYPE \
-                    and self.params['index_labels_formula_is_applied_to']['index_labels'] == previous_step.params['index_labels_formula_is_applied_to']['index_labels']
-                )
-                
-                if (both_entire_column or same_indexes) \
-                    and self.params['sheet_index'] == previous_step.params['sheet_index'] \
-                    and self.params['column_id'] == previous_step.params['column_id']:
-                    step_indexes_to_skip.add(len(all_steps_before_this_step) - 1)
+            if self.overwrites_previous_step(all_steps_before_this_step[-1]):
+                step_indexes_to_skip.add(len(all_steps_before_this_step) - 1)
 
         return step_indexes_to_skip
 
+    def overwrites_previous_step(self, previous_step: 'Step') -> bool:
+        """
+        Returns True if this step is a formula step overwriting the previous_step (the step 
+        that came just before it), where they either both set the entire column or both set
+        the same indexes. See checks (3) and (4) in step_indexes_to_skip.
+        """
+        if self.step_type == SetColumnFormulaStepPerformer.step_type() and previous_step.step_type == SetColumnFormulaStepPerformer.step_type():
+            both_entire_column = self.params['index_labels_formula_is_applied_to']['type'] == FORMULA_ENTIRE_COLUMN_TYPE and previous_step.params['index_labels_formula_is_applied_to']['type'] == FORMULA_ENTIRE_COLUMN_TYPE
+            same_indexes = (
+                self.params['index_labels_formula_is_applied_to']['type'] == FORMULA_SPECIFIC_INDEX_LABELS_TYPE and previous_step.params['index_labels_formula_is_applied_to']['type'] == FORMULA_SPECIFIC_INDEX_LABELS_TYPE \
+                and self.params['index_labels_formula_is_applied_to']['index_labels'] == previous_step.params['index_labels_formula_is_applied_to']['index_labels']
+            )
+            
+            if (both_entire_column or same_indexes) \
+                and self.params['sheet_index'] == previous_step.params['sheet_index'] \
+                and self.params['column_id'] == previous_step.params['column_id']:
+                return True
+
+        return False
+
     def get_column_headers_by_ids(self, sheet_index: int, column_ids: List[ColumnID]) -> List[Any]:
         """
         Utility for getting the column headers from column ids in a step.
@@ -36,7 +36,7 @@ class ColumnHeadersTransformStepPerformer(StepPerformer):
 
 
         # We make a new state to modify it
-        post_state = prev_state.copy() # TODO: update the deep copies
+        post_state = prev_state.copy(deep_sheet_indexes=[sheet_index])
 
         pandas_start_time = perf_counter()
 
@@ -16,7 +16,7 @@ from mitosheet.errors import (MitoError, get_recent_traceback, make_execution_er
                               make_operator_type_error,
                               make_unsupported_function_error,
                               raise_error_if_column_ids_do_not_exist)
-from mitosheet.parser import get_frontend_formula, parse_formula
+from mitosheet.parser import compile_formula, get_frontend_formula, parse_formula
 from mitosheet.state import State
 from mitosheet.step_performers.step_performer import StepPerformer
 from mitosheet.step_performers.utils import get_param
@@ -54,7 +54,7 @@ class SetColumnFormulaStepPerformer(StepPerformer):
         else:
             try:
                 # Try and parse the formula, letting it throw errors if it is invalid
-                parse_formula(new_formula, column_header, formula_label, index_labels_formula_is_applied_to, prev_state.dfs[sheet_index], throw_errors=True)
+                parse_formula(new_formula, column_header, formula_label, index_labels_formula_is_applied_to, prev_state.dfs[sheet_index], throw_errors=True, sheet_version=prev_state.sheet_versions[sheet_index])
             except Exception as e:
                 params['new_formula'] = _get_fixed_invalid_formula(new_formula, column_header, formula_label, index_labels_formula_is_applied_to, prev_state.dfs[sheet_index])
 
@@ -85,6 +85,7 @@ class SetColumnFormulaStepPerformer(StepPerformer):
             formula_label,
             index_labels_formula_is_applied_to,
             prev_state.dfs[sheet_index],
+            sheet_version=prev_state.sheet_versions[sheet_index]
         )
 
         if public_interface_version == 1:
@@ -264,12 +265,15 @@ def exec_column_formula(
         return
 
     column_header = post_state.column_ids.get_column_header_by_id(sheet_index, column_id)
-    python_code, _, _, _ = parse_formula(
+    compiled_code = compile_formula(
         spreadsheet_code, 
         column_header,
         formula_label,
         index_labels_formula_is_applied_to,
         post_state.dfs[sheet_index],
+        # NOTE: the sheet versions of the post state are only updated after the step is executed, 
+        # but this is still the version of the sheet that the index of this df was copied from
+        sheet_version=post_state.sheet_versions[sheet_index]
     )
 
     try:
@@ -292,7 +296,7 @@ def exec_column_formula(
         # See explination here: https://www.tutorialspoint.com/exec-in-python
 
         exec(
-            python_code,
+            compiled_code,
             {'df': df, 'pd': pd}, 
             locals_for_exec
         )
@@ -334,3 +338,28 @@ def exec_column_formula(
         )
     except Exception as e:
         raise
+
+
+def copy_column_formula_result(
+    prev_state: State,
+    previous_post_state: State,
+    params: Dict[str, Any]
+) -> State:
+    """
+    Returns the post_state of executing the set column formula step with the
+    given params on the prev_state, by copying the column that was computed
+    in the previous_post_state rather than executing the formula again.
+
+    This is only correct if the columns the formula reads, and the index of the
+    sheet, are the same in both states. See ColumnDependencyGraph.
+    """
+    sheet_index: int = get_param(params, 'sheet_index')
+    column_id: ColumnID = get_param(params, 'column_id')
+
+    post_state = prev_state.copy(deep_sheet_indexes=[sheet_index])
+    column_header = post_state.column_ids.get_column_header_by_id(sheet_index, column_id)
+
+    post_state.dfs[sheet_index][column_header] = previous_post_state.dfs[sheet_index][column_header].copy()
+    post_state.column_formulas[sheet_index][column_id] = list(previous_post_state.column_formulas[sheet_index][column_id])
+
+    return post_state
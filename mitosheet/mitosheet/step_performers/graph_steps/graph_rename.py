@@ -47,7 +47,8 @@ class GraphRenameStepPerformer(StepPerformer):
         # Create a new step and save the parameters
         post_state = prev_state.copy()
 
-        post_state.graph_data_dict[graph_id]["graphTabName"] = new_graph_tab_name
+        # The graph data is shared with the previous state, so we replace it rather than mutating it
+        post_state.graph_data_dict[graph_id] = {**post_state.graph_data_dict[graph_id], "graphTabName": new_graph_tab_name}
         
         return post_state, {
             'pandas_processing_time': 0 # No time spent on pandas, only metadata changes
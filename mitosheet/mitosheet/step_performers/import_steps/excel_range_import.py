@@ -9,7 +9,6 @@ import os
 from time import perf_counter
 from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
-import pandas as pd
 
 from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.code_chunks.step_performers.import_steps.excel_range_import_code_chunk import (
@@ -17,10 +16,8 @@ from mitosheet.code_chunks.step_performers.import_steps.excel_range_import_code_
     get_table_range_params,
     ExcelRangeImportCodeChunk)
 from mitosheet.errors import make_range_not_found_error
-from mitosheet.excel_utils import (get_col_and_row_indexes_from_range,
-                                   get_column_from_column_index)
-from mitosheet.public.v2 import get_table_range
-from mitosheet.public.v2.excel_utils import convert_csv_file_to_xlsx_file
+from mitosheet.excel_utils import (get_csv_sheet_cells, get_excel_sheet_cells,
+                                   get_table_range_from_excel_sheet_cells)
 from mitosheet.state import DATAFRAME_SOURCE_IMPORTED, State
 from mitosheet.step_performers.step_performer import StepPerformer
 from mitosheet.step_performers.utils import get_param
@@ -48,13 +45,20 @@ class ExcelRangeImportStepPerformer(StepPerformer):
         range_imports: List[ExcelRangeImport] = get_param(params, 'range_imports')
         convert_csv_to_xlsx: bool = get_param(params, 'convert_csv_to_xlsx')
 
-        if convert_csv_to_xlsx:
-            file_path = convert_csv_file_to_xlsx_file(file_path, sheet_name=sheet['value'])
-
         post_state = prev_state.copy() 
 
         pandas_start_time = perf_counter()
 
+        # We read the sheet once, and then find and read all of the ranges from its cells
+        if convert_csv_to_xlsx:
+            # The cells of the CSV are read as they would be from the XLSX file that the 
+            # generated code converts it to, without having to create that file
+            sheet_cells = get_csv_sheet_cells(file_path)
+        else:
+            sheet_name = sheet['value'] if isinstance(sheet['value'], str) else None
+            sheet_index = sheet['value'] if not isinstance(sheet['value'], str) else None
+            sheet_cells = get_excel_sheet_cells(file_path, sheet_name=sheet_name, sheet_index=sheet_index)
+
         sheet_index_to_df_range: Dict[int, str] = {}
         for range_import in range_imports:
             _range: Optional[str]
@@ -66,16 +70,14 @@ class ExcelRangeImportStepPerformer(StepPerformer):
                 column_end_condition = range_import['column_end_condition'] #type: ignore
 
                 params = get_table_range_params(sheet, start_condition, end_condition, column_end_condition)
-                _range = get_table_range(file_path, **params)
+                params.pop('sheet_name', None)
+                params.pop('sheet_index', None)
+                _range = get_table_range_from_excel_sheet_cells(sheet_cells, **params)
                 
             if _range is None:
                 raise make_range_not_found_error(range_import['start_condition']['value'], False) #type: ignore
 
-            ((start_col_index, start_row_index), (end_col_index, end_row_index)) = get_col_and_row_indexes_from_range(_range)
-            nrows = end_row_index - start_row_index
-            usecols = get_column_from_column_index(start_col_index) + ':' + get_column_from_column_index(end_col_index)
-
-            df = pd.read_excel(file_path, sheet_name=sheet['value'], skiprows=start_row_index, nrows=nrows, usecols=usecols)
+            df = sheet_cells.read_range(_range)
             final_df_name = get_valid_dataframe_name(post_state.df_names, range_import['df_name'])
             post_state.add_df_to_state(
                 df,
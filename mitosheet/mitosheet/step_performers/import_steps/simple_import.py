@@ -3,8 +3,12 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
+import codecs
 import csv
 import json
+import re
+import threading
+from collections import OrderedDict
 from os.path import normpath, basename
 import os
 from copy import copy
@@ -21,6 +25,23 @@ from mitosheet.errors import make_file_not_found_error, make_invalid_simple_impo
 from mitosheet.state import DATAFRAME_SOURCE_IMPORTED, State
 from mitosheet.step_performers.step_performer import StepPerformer
 
+# The most bytes at the start of a CSV file that we read to guess how to read it, 
+# so that guessing is fast even for very large files
+CSV_METADATA_PROBE_BYTES = 64 * 1024
+
+# The most lines at the start of a CSV file that we use to guess its delimeter and decimal
+CSV_METADATA_SAMPLE_LINES = 20
+
+# If chardet is less confident than this in the encoding it guesses for a file, we use latin-1
+MIN_ENCODING_CONFIDENCE = 0.5
+
+# The most files that we keep the guessed CSV metadata for
+MAX_CACHED_CSV_METADATA = 32
+
+# Numbers that use a comma as the decimal separator, optionally with a . as a thousands separator
+COMMA_DECIMAL_NUMBER_REGEX = re.compile(r'[-+]?(\d{1,3}(\.\d{3})+|\d*),\d+')
+DOT_DECIMAL_NUMBER_REGEX = re.compile(r'[-+]?\d*\.\d+')
+
 
 class SimpleImportStepPerformer(StepPerformer):
     """
@@ -153,10 +174,174 @@ class SimpleImportStepPerformer(StepPerformer):
         return {-1}
 
 
+class CSVMetadata:
+    """
+    Our guesses for how to read a CSV file.
+    """
+
+    def __init__(self, delimeter: str, encoding: str, decimal: str):
+        self.delimeter = delimeter
+        self.encoding = encoding
+        self.decimal = decimal
+
+
+class CSVMetadataCache:
+    """
+    A least recently used cache from the path, modified time and size of a CSV
+    file to the CSVMetadata guessed for it, so that we only guess once for
+    each file, e.g. when the metadata is displayed and then the file is imported.
+    """
+
+    def __init__(self, max_cached_csv_metadata: int=MAX_CACHED_CSV_METADATA):
+        self.max_cached_csv_metadata = max_cached_csv_metadata
+        self.cached_csv_metadata: 'OrderedDict[Tuple[str, int, int], CSVMetadata]' = OrderedDict()
+        # The metadata is guessed from the api thread as well
+        self.lock = threading.Lock()
+
+    def get(self, key: Tuple[str, int, int]) -> Optional[CSVMetadata]:
+        with self.lock:
+            csv_metadata = self.cached_csv_metadata.get(key)
+            if csv_metadata is not None:
+                self.cached_csv_metadata.move_to_end(key)
+            return csv_metadata
+
+    def set(self, key: Tuple[str, int, int], csv_metadata: CSVMetadata) -> None:
+        with self.lock:
+            self.cached_csv_metadata[key] = csv_metadata
+            self.cached_csv_metadata.move_to_end(key)
+            while len(self.cached_csv_metadata) > self.max_cached_csv_metadata:
+                self.cached_csv_metadata.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.cached_csv_metadata.clear()
+
+
+CSV_METADATA_CACHE = CSVMetadataCache()
+
+
+def get_csv_metadata(file_name: str) -> CSVMetadata:
+    """
+    Guesses the delimeter, encoding and decimal of the CSV file at file_name, 
+    from the first CSV_METADATA_PROBE_BYTES of the file. 
+    """
+    file_stat = os.stat(file_name)
+    cache_key = (os.path.abspath(file_name), file_stat.st_mtime_ns, file_stat.st_size)
+    csv_metadata = CSV_METADATA_CACHE.get(cache_key)
+    if csv_metadata is not None:
+        return csv_metadata
+
+    prefix = _read_csv_prefix(file_name)
+    encoding = _guess_encoding_from_prefix(prefix)
+    sample = _get_sample_from_prefix(prefix, encoding)
+
+    try:
+        delimeter = _guess_delimeter_from_sample(sample)
+    except csv.Error:
+        # If we cannot guess the delimeter, e.g. because the file has a single column,
+        # we fall back to the default
+        delimeter = DEFAULT_DELIMETER
+
+    csv_metadata = CSVMetadata(delimeter, encoding, _guess_decimal_from_sample(sample, delimeter))
+    CSV_METADATA_CACHE.set(cache_key, csv_metadata)
+    return csv_metadata
+
+
+def _read_csv_prefix(file_name: str) -> bytes:
+    with open(file_name, 'rb') as f:
+        return f.read(CSV_METADATA_PROBE_BYTES)
+
+
+def _decode_prefix(prefix: bytes, encoding: str) -> str:
+    """
+    Decodes the prefix of a file, ignoring a character that is cut off at 
+    the end of the prefix. Raises a UnicodeDecodeError if the prefix is not
+    in this encoding.
+    """
+    return codecs.getincrementaldecoder(encoding)().decode(prefix, final=False)
+
+
+def _guess_encoding_from_prefix(prefix: bytes) -> str:
+    try:
+        _decode_prefix(prefix, DEFAULT_ENCODING)
+        return DEFAULT_ENCODING
+    except UnicodeDecodeError:
+        pass
+
+    result = chardet.detect(prefix)
+    encoding = result['encoding']
+    if encoding is None or result['confidence'] < MIN_ENCODING_CONFIDENCE:
+        return 'latin-1'
+
+    try:
+        _decode_prefix(prefix, encoding)
+        return encoding
+    except (UnicodeDecodeError, LookupError):
+        # Sometimes chardet guesses 'ascii' when we want 'latin-1'
+        return 'latin-1'
+
+
+def _get_sample_from_prefix(prefix: bytes, encoding: str) -> str:
+    """
+    Returns the first complete lines of the prefix, up to CSV_METADATA_SAMPLE_LINES.
+    """
+    lines = _decode_prefix(prefix, encoding).splitlines(keepends=True)
+    # If we did not read the whole file, the last line might be cut off
+    if len(prefix) == CSV_METADATA_PROBE_BYTES and len(lines) > 1:
+        lines = lines[:-1]
+    return ''.join(lines[:CSV_METADATA_SAMPLE_LINES])
+
+
+def _guess_delimeter_from_sample(sample: str) -> str:
+    """
+    Guesses the delimeter from the sample lines of a CSV file, or if this is 
+    not possible, from the first line. Raises a csv.Error if neither is possible.
+    """
+    s = csv.Sniffer()
+    first_line = sample.splitlines()[0] if len(sample) > 0 else ''
+    for text in [sample, first_line]:
+        try:
+            delimeter = s.sniff(text).delimiter
+        except csv.Error:
+            continue
+
+        # For a file with a single column, the sniffer can guess a letter in 
+        # the column header, which is never the delimeter
+        if not delimeter.isalnum():
+            return delimeter
+
+    raise csv.Error('Could not determine delimiter')
+
+
+def _guess_decimal_from_sample(sample: str, delimeter: str) -> str:
+    """
+    Guesses the decimal separator from the sample lines of a CSV file, which is
+    a comma if the numbers in the sample only use commas as decimal separators.
+    """
+    # If the delimeter is a comma, it is very unlikely the decimal is too
+    if delimeter == ',':
+        return DEFAULT_DECIMAL
+
+    num_comma_decimals = 0
+    num_dot_decimals = 0
+    try:
+        for row in csv.reader(sample.splitlines()[1:], delimiter=delimeter):
+            for value in row:
+                value = value.strip()
+                if COMMA_DECIMAL_NUMBER_REGEX.fullmatch(value):
+                    num_comma_decimals += 1
+                elif DOT_DECIMAL_NUMBER_REGEX.fullmatch(value):
+                    num_dot_decimals += 1
+    except csv.Error:
+        return DEFAULT_DECIMAL
+
+    return ',' if num_comma_decimals > 0 and num_dot_decimals == 0 else DEFAULT_DECIMAL
+
+
 def read_csv_get_delimiter_and_encoding(file_name: str) -> Tuple[pd.DataFrame, str, str]:
     """
     Given a file_name, will read in the file as a CSV, and
-    return the df, delimeter, decimal separator, and encoding of the file
+    return the df, delimeter, and encoding of the file
     """
     encoding = DEFAULT_ENCODING
     delimeter = DEFAULT_DELIMETER
@@ -165,23 +350,20 @@ def read_csv_get_delimiter_and_encoding(file_name: str) -> Tuple[pd.DataFrame, s
         df = pd.read_csv(file_name)
         return df, delimeter, encoding
 
-    try:
-        # First attempt to read csv without specifying an encoding, just with a delimeter
-        delimeter = guess_delimeter(file_name)
-        df = pd.read_csv(file_name, sep=delimeter)
-    except UnicodeDecodeError:
-        # If we have an encoding error, try and get the encoding
-        try: 
-            encoding = guess_encoding(file_name)
-            delimeter = guess_delimeter(file_name, encoding=encoding)
+    csv_metadata = get_csv_metadata(file_name)
+    delimeter = csv_metadata.delimeter
+    encoding = csv_metadata.encoding
 
-            # Read the file as dataframe 
-            df = pd.read_csv(file_name, sep=delimeter, encoding=encoding)
-        except: 
-            # Sometimes guess_encoding, guesses 'ascii' when we want 'latin-1', 
-            # so if guess_encoding fails, we try latin-1
-            encoding = 'latin-1'
+    try:
+        if encoding == DEFAULT_ENCODING:
+            df = pd.read_csv(file_name, sep=delimeter)
+        else:
             df = pd.read_csv(file_name, sep=delimeter, encoding=encoding)
+    except UnicodeDecodeError:
+        # The encoding is guessed from the start of the file, so it might be
+        # wrong for the rest of it. If so, we try latin-1
+        encoding = 'latin-1'
+        df = pd.read_csv(file_name, sep=delimeter, encoding=encoding)
         
     return df, delimeter, encoding
 
@@ -191,19 +373,14 @@ def guess_delimeter(file_name: str, encoding: Optional[str]=None) -> str:
     Given a path to a file that is assumed to exist and be a CSV, this
     function guesses the delimeter that is used by that file
     """
-    s = csv.Sniffer()
-    with open(file_name, 'r', encoding=encoding) as f:
-        return s.sniff(f.readline()).delimiter
+    prefix = _read_csv_prefix(file_name)
+    return _guess_delimeter_from_sample(_get_sample_from_prefix(prefix, encoding if encoding is not None else DEFAULT_ENCODING))
 
 def guess_encoding(file_name: str) -> str:
     """
-    Uses chardet to guess the encoding of the the file
-    at the given file_name
+    Guesses the encoding of the file at the given file_name
     """
-    # Attempt to determine the encoding and try again. 
-    with open(file_name, 'rb') as f:
-        result = chardet.detect(f.readline())
-        return result['encoding']
+    return _guess_encoding_from_prefix(_read_csv_prefix(file_name))
 
 
 def is_url_to_file(file_name: str) -> bool:
@@ -13,6 +13,7 @@ from mitosheet.code_chunks.code_chunk import CodeChunk
 from mitosheet.code_chunks.step_performers.pivot_code_chunk import (
     USE_INPLACE_PIVOT, PivotCodeChunk)
 from mitosheet.errors import make_invalid_pivot_error, make_invalid_pivot_filter_error, make_no_column_error
+from mitosheet.pivot_cache import PivotSource, PivotSourceCache
 from mitosheet.state import DATAFRAME_SOURCE_PIVOTED, State
 from mitosheet.step_performers.filter import (combine_filters,
                                               get_applied_filter)
@@ -147,7 +148,9 @@ class PivotStepPerformer(StepPerformer):
             values,
             pivot_filters,
             flatten_column_headers,
-            public_interface_version
+            public_interface_version,
+            pivot_source_cache=prev_state.pivot_source_cache,
+            source_sheet_version=prev_state.sheet_versions[sheet_index]
         )
         pandas_processing_time = perf_counter() - pandas_start_time
         # Create a new df name if we don't have one
@@ -231,55 +234,50 @@ def get_new_column_header_from_column_header_with_pivot_transform(chwpt: ColumnH
 
     return f'{str(column_header)} ({transformation})'
 
-def add_transform_columns_to_dataframe(df: pd.DataFrame, column_headers_with_transforms: List[ColumnHeaderWithPivotTransform]) -> pd.DataFrame:
-    for chwpt in column_headers_with_transforms:
-        column_header, transformation = chwpt['column_header'], chwpt['transformation']
-        # We need to turn the column header into a string before creating the new one, so that we can
-        # append to it for the new temporary transformation column
-        if transformation == PCT_NO_OP:
-            continue
-
-        new_column_header = get_new_column_header_from_column_header_with_pivot_transform(chwpt)
-        if transformation == PCT_DATE_YEAR:
-            df[new_column_header] = df[column_header].dt.year
-        if transformation == PCT_DATE_QUARTER:
-            df[new_column_header] = df[column_header].dt.quarter
-        if transformation == PCT_DATE_MONTH:
-            df[new_column_header] = df[column_header].dt.month
-        if transformation == PCT_DATE_WEEK:
-            if is_prev_version(pd.__version__, '1.0.0'):
-                df[new_column_header] = df[column_header].dt.week
-            else:
-                df[new_column_header] = df[column_header].dt.isocalendar().week.astype(int)
-        if transformation == PCT_DATE_DAY_OF_MONTH:
-            df[new_column_header] = df[column_header].dt.day
-        if transformation == PCT_DATE_DAY_OF_WEEK:
-            df[new_column_header] = df[column_header].dt.weekday
-        if transformation == PCT_DATE_HOUR:
-            df[new_column_header] = df[column_header].dt.hour
-        if transformation == PCT_DATE_MINUTE:
-            df[new_column_header] = df[column_header].dt.minute
-        if transformation == PCT_DATE_SECOND:
-            df[new_column_header] = df[column_header].dt.second
-        if transformation == PCT_DATE_YEAR_MONTH_DAY_HOUR_MINUTE:
-            df[new_column_header] = df[column_header].dt.strftime("%Y-%m-%d %H:%M")
-        if transformation == PCT_DATE_YEAR_MONTH_DAY_HOUR:
-            df[new_column_header] = df[column_header].dt.strftime("%Y-%m-%d %H")
-        if transformation == PCT_DATE_YEAR_MONTH_DAY:
-            df[new_column_header] = df[column_header].dt.strftime("%Y-%m-%d")
-        if transformation == PCT_DATE_YEAR_MONTH:
-            df[new_column_header] = df[column_header].dt.strftime("%Y-%m")
-        if transformation == PCT_DATE_YEAR_QUARTER:
-            df[new_column_header] = df[column_header].dt.year.astype(str) + "-Q" + df[column_header].dt.quarter.astype(str)
-        if transformation == PCT_DATE_MONTH_DAY:
-            df[new_column_header] = df[column_header].dt.strftime("%m-%d")
-        if transformation == PCT_DATE_DAY_HOUR:
-            df[new_column_header] = df[column_header].dt.strftime("%d %H")
-        if transformation == PCT_DATE_HOUR_MINUTE:
-            df[new_column_header] = df[column_header].dt.strftime("%H:%M")
-
-    
-    return df
+def get_transformed_column(column: pd.Series, transformation: str) -> pd.Series:
+    """
+    Returns the column with the pivot column transformation applied to it, e.g. the
+    year of each date in it.
+    """
+    if transformation == PCT_DATE_YEAR:
+        return column.dt.year
+    if transformation == PCT_DATE_QUARTER:
+        return column.dt.quarter
+    if transformation == PCT_DATE_MONTH:
+        return column.dt.month
+    if transformation == PCT_DATE_WEEK:
+        if is_prev_version(pd.__version__, '1.0.0'):
+            return column.dt.week
+        else:
+            return column.dt.isocalendar().week.astype(int)
+    if transformation == PCT_DATE_DAY_OF_MONTH:
+        return column.dt.day
+    if transformation == PCT_DATE_DAY_OF_WEEK:
+        return column.dt.weekday
+    if transformation == PCT_DATE_HOUR:
+        return column.dt.hour
+    if transformation == PCT_DATE_MINUTE:
+        return column.dt.minute
+    if transformation == PCT_DATE_SECOND:
+        return column.dt.second
+    if transformation == PCT_DATE_YEAR_MONTH_DAY_HOUR_MINUTE:
+        return column.dt.strftime("%Y-%m-%d %H:%M")
+    if transformation == PCT_DATE_YEAR_MONTH_DAY_HOUR:
+        return column.dt.strftime("%Y-%m-%d %H")
+    if transformation == PCT_DATE_YEAR_MONTH_DAY:
+        return column.dt.strftime("%Y-%m-%d")
+    if transformation == PCT_DATE_YEAR_MONTH:
+        return column.dt.strftime("%Y-%m")
+    if transformation == PCT_DATE_YEAR_QUARTER:
+        return column.dt.year.astype(str) + "-Q" + column.dt.quarter.astype(str)
+    if transformation == PCT_DATE_MONTH_DAY:
+        return column.dt.strftime("%m-%d")
+    if transformation == PCT_DATE_DAY_HOUR:
+        return column.dt.strftime("%d %H")
+    if transformation == PCT_DATE_HOUR_MINUTE:
+        return column.dt.strftime("%H:%M")
+
+    return column
 
 
 def _execute_pivot(
@@ -289,11 +287,17 @@ def _execute_pivot(
         values: Dict[ColumnHeader, Collection[str]],
         pivot_filters: List[ColumnHeaderWithFilter],
         flatten_column_headers: bool,
-        public_interface_version: int
+        public_interface_version: int,
+        pivot_source_cache: Optional[PivotSourceCache]=None,
+        source_sheet_version: Optional[int]=None
     ) -> Tuple[pd.DataFrame, bool]:
     """
     Helper function for executing the pivot on a specific dataframe
-    and then aggregating the values with the passed values mapping
+    and then aggregating the values with the passed values mapping.
+
+    If the pivot_source_cache and source_sheet_version are passed, the filtered 
+    dataframe, the transformed columns and the groupby on the pivot rows are cached 
+    for this version of the sheet, so they are reused if the pivot is edited.
     """
 
     pivot_rows = [cit['column_header'] for cit in pivot_rows_with_transforms]
@@ -306,15 +310,14 @@ def _execute_pivot(
     values_keys = list(values.keys())
 
     # First, we do the filtering on the initial dataframe, according to the pivot_filters
-    if len(pivot_filters) > 0:
-        filters = []
-        for pf in pivot_filters:
-            try:
-                filters.append(get_applied_filter(df, pf['column_header'], pf['filter']))
-            except:
-                raise make_invalid_pivot_filter_error(pf['column_header'], pf['filter']['condition'])
-        full_filter = combine_filters('And', filters)
-        df = df[full_filter] # TODO: do we have to make a copy
+    pivot_source = _get_pivot_source(df, pivot_filters, pivot_source_cache, source_sheet_version)
+    df = pivot_source.df
+
+    # If there are no pivot columns, we can just aggregate a groupby on the pivot rows, 
+    # which we can reuse when the values change
+    if _can_execute_pivot_with_groupby(df, pivot_rows_with_transforms, pivot_columns_with_transforms, values):
+        groupby_pivot_table = _execute_pivot_with_groupby(pivot_source, pivot_rows_with_transforms, values)
+        return _finish_pivot_table(groupby_pivot_table, False, flatten_column_headers, public_interface_version)
 
     # Then, we make a temp dataframe that does not have the columns 
     # we do not need, as this allows us to avoid a bug in pandas where these extra
@@ -326,8 +329,9 @@ def _execute_pivot(
 
     # Then, we create the new columns that are a function of the transforms that are passed
     # with the pivot params
-    df = add_transform_columns_to_dataframe(df, pivot_rows_with_transforms)
-    df = add_transform_columns_to_dataframe(df, pivot_columns_with_transforms)
+    for chwpt in pivot_rows_with_transforms + pivot_columns_with_transforms:
+        if chwpt['transformation'] != PCT_NO_OP:
+            df[get_new_column_header_from_column_header_with_pivot_transform(chwpt)] = _get_transformed_pivot_source_column(pivot_source, chwpt)
 
     # Create the final pivot_rows and pivot_columns, which might be the temporary columns
     # created above by the transformations. NOTE: we need to deduplicate these here, as
@@ -372,6 +376,14 @@ def _execute_pivot(
         pivot_table = pd.DataFrame(pivot_table)
         was_series = True
 
+    return _finish_pivot_table(pivot_table, was_series, flatten_column_headers, public_interface_version)
+
+
+def _finish_pivot_table(pivot_table: pd.DataFrame, was_series: bool, flatten_column_headers: bool, public_interface_version: int) -> Tuple[pd.DataFrame, bool]:
+    """
+    Flattens the column headers of the pivot table, if necessary, and moves the
+    pivot rows from the index to columns.
+    """
     if flatten_column_headers:
 
         # Get the correct version of flatten column header
@@ -396,6 +408,117 @@ def _execute_pivot(
 
     return pivot_table, was_series
 
+
+def _get_pivot_source(
+        df: pd.DataFrame, 
+        pivot_filters: List[ColumnHeaderWithFilter], 
+        pivot_source_cache: Optional[PivotSourceCache], 
+        source_sheet_version: Optional[int]
+    ) -> PivotSource:
+    """
+    Returns the dataframe filtered by the pivot_filters, in a PivotSource, which is 
+    cached in the pivot_source_cache for the source_sheet_version if they are passed.
+    """
+    # NOTE: the filters are made by the frontend, so the same filters have the same repr
+    cache_key = (source_sheet_version, repr(pivot_filters))
+    if pivot_source_cache is not None and source_sheet_version is not None:
+        pivot_source = pivot_source_cache.get(cache_key, df)
+        if pivot_source is not None:
+            return pivot_source
+
+    filtered_df = df
+    if len(pivot_filters) > 0:
+        filters = []
+        for pf in pivot_filters:
+            try:
+                filters.append(get_applied_filter(df, pf['column_header'], pf['filter']))
+            except:
+                raise make_invalid_pivot_filter_error(pf['column_header'], pf['filter']['condition'])
+        full_filter = combine_filters('And', filters)
+        filtered_df = df[full_filter] # TODO: do we have to make a copy
+
+    pivot_source = PivotSource(filtered_df)
+    if pivot_source_cache is not None and source_sheet_version is not None:
+        pivot_source_cache.set(cache_key, df, pivot_source)
+    return pivot_source
+
+
+def _get_transformed_pivot_source_column(pivot_source: PivotSource, chwpt: ColumnHeaderWithPivotTransform) -> pd.Series:
+    """
+    Returns the transformed column of the pivot source, reusing it if it has been created before.
+    """
+    key = (chwpt['column_header'], chwpt['transformation'])
+    if key not in pivot_source.transformed_columns:
+        pivot_source.transformed_columns[key] = get_transformed_column(pivot_source.df[chwpt['column_header']], chwpt['transformation'])
+    return pivot_source.transformed_columns[key]
+
+
+def _can_execute_pivot_with_groupby(
+        df: pd.DataFrame,
+        pivot_rows_with_transforms: List[ColumnHeaderWithPivotTransform], 
+        pivot_columns_with_transforms: List[ColumnHeaderWithPivotTransform], 
+        values: Dict[ColumnHeader, Collection[str]],
+    ) -> bool:
+    """
+    Returns True if the pivot gives the same result with _execute_pivot_with_groupby 
+    as it does with pivot_table.
+    """
+    if len(pivot_columns_with_transforms) > 0 or len(pivot_rows_with_transforms) == 0 or is_prev_version(pd.__version__, '1.0.0'):
+        return False
+
+    # pivot_table errors if a pivot row is also a value, or if a transformed column
+    # overwrites a column in the dataframe, so we leave these cases to it
+    pivot_rows = [chwpt['column_header'] for chwpt in pivot_rows_with_transforms]
+    final_pivot_rows = [get_new_column_header_from_column_header_with_pivot_transform(chwpt) for chwpt in pivot_rows_with_transforms]
+    if any(column_header in values for column_header in pivot_rows + final_pivot_rows):
+        return False
+    if any(chwpt['transformation'] != PCT_NO_OP and final_pivot_row in df.columns for chwpt, final_pivot_row in zip(pivot_rows_with_transforms, final_pivot_rows)):
+        return False
+
+    return True
+
+
+def _execute_pivot_with_groupby(
+        pivot_source: PivotSource, 
+        pivot_rows_with_transforms: List[ColumnHeaderWithPivotTransform], 
+        values: Dict[ColumnHeader, Collection[str]],
+    ) -> pd.DataFrame:
+    """
+    Executes a pivot with no pivot columns by aggregating a groupby on the pivot rows, 
+    which gives the same result as pivot_table does. The groupby is cached in the 
+    pivot source, so that the groups are only found once.
+    """
+    df = pivot_source.df
+
+    # NOTE: we need to deduplicate these here, as pivot_table does not allow duplicated rows
+    groupby_key = tuple(deduplicate_array([(chwpt['column_header'], chwpt['transformation']) for chwpt in pivot_rows_with_transforms]))
+    if groupby_key not in pivot_source.groupbys:
+        keys = []
+        for column_header, transformation in groupby_key:
+            if transformation == PCT_NO_OP:
+                keys.append(df[column_header])
+            else:
+                key = _get_transformed_pivot_source_column(pivot_source, {'column_header': column_header, 'transformation': transformation})
+                keys.append(key.rename(get_new_column_header_from_column_header_with_pivot_transform({'column_header': column_header, 'transformation': transformation})))
+        pivot_source.groupbys[groupby_key] = df.groupby(keys, sort=True)
+
+    groupby = pivot_source.groupbys[groupby_key]
+
+    # While aggregating, catch warnings that are created by pandas so that we can log them.
+    with warnings.catch_warnings(record=True):
+        # Forward the warning handling to our custom function to log it
+        warnings.showwarning = log_pivot_table_warnings
+        
+        pivot_table = groupby[list(values.keys())].agg(values_to_functions(values))
+
+    # Then, we drop the rows and columns that are all NaN, and sort the columns, as pivot_table does
+    if len(pivot_table.columns) > 0:
+        pivot_table = pivot_table.dropna(how='all')
+    pivot_table = pivot_table.sort_index(axis=1)
+    pivot_table = pivot_table.dropna(how='all', axis=1)
+
+    return pivot_table
+
 def get_new_pivot_df_name(post_state: State, sheet_index: int) -> str: 
     """
     Creates the name for the new pivot table sheet using the format
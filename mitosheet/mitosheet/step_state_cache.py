@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+
+"""
+Every step in the steps manager keeps the state it creates, which means that
+every intermediate dataframe in an analysis is kept in memory for the life of
+the kernel. For large dataframes and long analyses, this can run a notebook out
+of memory.
+
+The StepStateCache bounds this, by evicting the dataframes of states that are
+not likely to be needed again. Evicted states keep all of their metadata (which
+is cheap, as it is shared between states), and when their dataframes are next
+accessed - e.g. by an undo, by checking out a previous step, or by the step
+summary - they are rebuilt by reexecuting the step that created them from the
+previous state, which in turn may be rebuilt from the state before it.
+
+We keep:
+1. The initial state, and the states created by steps that cannot be rebuilt
+   safely, like imports and exports, which have side effects or read data
+   that may have changed since the step was first executed, and AI 
+   transformations and formulas that call user defined functions, which may 
+   not give the same result when reexecuted, and can be slow to reexecute.
+2. A checkpoint state every checkpoint_interval steps, which bounds how many
+   steps must be reexecuted to rebuild any state.
+3. The state of the checked out step and the most recent step.
+4. The most recently created or rebuilt states, until the dataframes in memory
+   use more than max_cached_bytes.
+
+The memory used by the dataframes is measured with a shallow memory_usage once
+per sheet version, which does not count the python objects (e.g. strings) in 
+object columns, so that it is cheap enough to run on every edit. As sheets with 
+the same version are shared between states, each sheet version is only counted 
+once, and we keep a running total of the bytes used as states are added and evicted.
+"""
+
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from mitosheet.state import State
+from mitosheet.step_performers.ai_transformation import AITransformationStepPerformer
+from mitosheet.step_performers.column_steps.set_column_formula import SetColumnFormulaStepPerformer
+from mitosheet.step import Step
+from mitosheet.step_performers.export_to_file import ExportToFileStepPerformer
+from mitosheet.step_performers.import_steps.dataframe_import import DataframeImportStepPerformer
+from mitosheet.step_performers.import_steps.excel_import import ExcelImportStepPerformer
+from mitosheet.step_performers.import_steps.excel_range_import import ExcelRangeImportStepPerformer
+from mitosheet.step_performers.import_steps.simple_import import SimpleImportStepPerformer
+from mitosheet.step_performers.import_steps.snowflake_import import SnowflakeImportStepPerformer
+from mitosheet.step_performers.user_defined_import import UserDefinedImportStepPerformer
+
+# The number of steps between states that are never evicted
+DEFAULT_STEP_STATE_CHECKPOINT_INTERVAL = 10
+
+# Steps that read external data or have side effects, and so should
+# never be reexecuted just to rebuild their state
+STEP_TYPES_WITH_PINNED_STATES = {
+    'initialize',
+    SimpleImportStepPerformer.step_type(),
+    ExcelImportStepPerformer.step_type(),
+    ExcelRangeImportStepPerformer.step_type(),
+    DataframeImportStepPerformer.step_type(),
+    SnowflakeImportStepPerformer.step_type(),
+    UserDefinedImportStepPerformer.step_type(),
+    ExportToFileStepPerformer.step_type(),
+    # AI transformations run generated code, which may not give the same result
+    # when it is reexecuted
+    AITransformationStepPerformer.step_type(),
+}
+
+
+def _get_dataframe_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=False).sum())
+
+
+def is_step_state_pinned(step: Step) -> bool:
+    """
+    Returns True if the state created by this step should never be evicted,
+    as the step cannot be safely reexecuted to rebuild it.
+    """
+    if step.step_type in STEP_TYPES_WITH_PINNED_STATES or step.prev_state is None:
+        return True
+
+    # User defined functions may not give the same result when they are reexecuted 
+    # (e.g. if they read external data), and may be slow, so we keep the state of any 
+    # formula that might call them
+    if step.step_type == SetColumnFormulaStepPerformer.step_type():
+        new_formula = step.params.get('new_formula', '')
+        return any(
+            user_defined_function.__name__ in new_formula 
+            for user_defined_function in step.prev_state.user_defined_functions
+        )
+
+    return False
+
+
+class DataframeRebuilder:
+    """
+    Rebuilds the dataframes of an evicted state by reexecuting the step
+    that created this state on its previous state.
+    """
+
+    def __init__(self, step: Step, step_state_cache: 'StepStateCache'):
+        # Steps without a previous state are pinned, so they never need to be rebuilt
+        assert step.prev_state is not None
+        self.prev_state: State = step.prev_state
+        self.step_performer = step.step_performer
+        # We copy the params, as the step may be reexecuted with the same params object
+        self.params = deepcopy(step.params)
+        self.step_state_cache = step_state_cache
+
+    def rebuild(self, state: State) -> None:
+        # Rebuilding a state may require rebuilding the states before it, and so
+        # we find all the evicted states we need, and rebuild them from the oldest
+        # one, to avoid recursing through the entire chain of states
+        states_to_rebuild = [state]
+        while True:
+            dataframe_rebuilder: Optional[DataframeRebuilder] = states_to_rebuild[-1]._dataframe_rebuilder
+            assert dataframe_rebuilder is not None
+            prev_state = dataframe_rebuilder.prev_state
+            if not prev_state.are_dfs_evicted:
+                break
+            states_to_rebuild.append(prev_state)
+
+        for state_to_rebuild in reversed(states_to_rebuild):
+            dataframe_rebuilder = state_to_rebuild._dataframe_rebuilder
+            assert dataframe_rebuilder is not None
+            # NOTE: the params are already saturated, so we do not saturate them again
+            post_state_and_execution_data = dataframe_rebuilder.step_performer.execute(
+                dataframe_rebuilder.prev_state,
+                dataframe_rebuilder.params
+            )
+            if post_state_and_execution_data is not None:
+                state_to_rebuild.dfs = post_state_and_execution_data[0].dfs
+            else:
+                state_to_rebuild.dfs = list(dataframe_rebuilder.prev_state.dfs)
+
+            self.step_state_cache.mark_recently_used(state_to_rebuild)
+
+
+class StepStateCache:
+    """
+    Tracks which states have their dataframes in memory, and evicts the least 
+    recently used ones when the dataframes use more than max_cached_bytes.
+
+    If max_cached_bytes is None, nothing is ever evicted.
+    """
+
+    def __init__(self, max_cached_bytes: Optional[int]=None, checkpoint_interval: int=DEFAULT_STEP_STATE_CHECKPOINT_INTERVAL):
+        if max_cached_bytes is not None and max_cached_bytes < 0:
+            raise ValueError(f'max_cached_bytes must be at least 0, but got {max_cached_bytes}')
+        if checkpoint_interval < 1:
+            raise ValueError(f'checkpoint_interval must be at least 1, but got {checkpoint_interval}')
+
+        self.max_cached_bytes = max_cached_bytes
+        self.checkpoint_interval = checkpoint_interval
+
+        # A mapping from id(state) -> state, for the states that can be evicted and are
+        # currently in memory, ordered from least to most recently used
+        self.cached_states: 'OrderedDict[int, State]' = OrderedDict()
+
+        # A mapping from id(state) -> state, for the states that must not be evicted
+        self.pinned_states: Dict[int, State] = dict()
+
+        # A mapping from sheet version -> the bytes used by that sheet, and the number
+        # of states in memory that share that sheet, for the sheets that are in memory
+        self.sheet_version_bytes: Dict[int, int] = dict()
+        self.sheet_version_state_counts: Dict[int, int] = dict()
+
+        # A mapping from id(state) -> the sheet versions of that state that are counted in 
+        # cached_bytes, and the bytes of any of its sheets that do not have a version
+        self.counted_states: Dict[int, Tuple[List[int], int]] = dict()
+
+        # The bytes used by the dataframes of the states in memory
+        self.cached_bytes = 0
+
+    def mark_recently_used(self, state: State) -> None:
+        if self.max_cached_bytes is None or id(state) in self.pinned_states:
+            return
+
+        self.cached_states[id(state)] = state
+        self.cached_states.move_to_end(id(state))
+        self._count_state(state)
+        self._evict_over_budget()
+
+    def update_cached_states(self, steps: List[Step], curr_step_idx: int) -> None:
+        """
+        Called whenever the steps or the checked out step change. Pins the states we
+        must keep, and evicts the least recently used other states until we are within
+        the budget. The states of later steps are treated as more recently used.
+        """
+        if self.max_cached_bytes is None:
+            return
+
+        pinned_states: Dict[int, State] = dict()
+        evictable_states: Dict[int, State] = OrderedDict()
+
+        for step_idx, step in enumerate(steps):
+            if step.post_state is None:
+                continue
+
+            if step_idx % self.checkpoint_interval == 0 \
+                or step_idx == curr_step_idx \
+                or step_idx == len(steps) - 1 \
+                or is_step_state_pinned(step):
+                pinned_states[id(step.post_state)] = step.post_state
+            elif step.post_state is not step.prev_state and step.post_state._dataframe_rebuilder is None:
+                # If the post state is the prev state, then the step did not change anything,
+                # and the state will be handled by the step that created it
+                step.post_state._dataframe_rebuilder = DataframeRebuilder(step, self)
+
+            if step.post_state._dataframe_rebuilder is not None:
+                evictable_states[id(step.post_state)] = step.post_state
+
+        self.pinned_states = pinned_states
+
+        # Any state that is no longer in the steps (e.g. because of an undo) can be
+        # dropped from the cache entirely, as it is no longer reachable
+        cached_states: 'OrderedDict[int, State]' = OrderedDict(
+            (state_id, state) for state_id, state in self.cached_states.items()
+            if state_id in evictable_states and state_id not in pinned_states
+        )
+        for state_id, state in evictable_states.items():
+            if state_id not in pinned_states and not state.are_dfs_evicted:
+                cached_states[state_id] = state
+                cached_states.move_to_end(state_id)
+
+        self.cached_states = cached_states
+
+        # The states in memory may have changed in any way, so we count them again, 
+        # reusing the bytes of sheets that were already measured
+        sheet_version_bytes = self.sheet_version_bytes
+        self.sheet_version_bytes = dict()
+        self.sheet_version_state_counts = dict()
+        self.counted_states = dict()
+        self.cached_bytes = 0
+        for state in list(self.pinned_states.values()) + list(self.cached_states.values()):
+            self._count_state(state, sheet_version_bytes)
+
+        self._evict_over_budget()
+
+    def _count_state(self, state: State, sheet_version_bytes: Optional[Dict[int, int]]=None) -> None:
+        """
+        Adds the bytes used by the dataframes of the state to cached_bytes, counting 
+        each sheet that is shared with another state in memory once. Sheets are only 
+        measured if they are not in sheet_version_bytes.
+        """
+        self._uncount_state(id(state))
+        if state.are_dfs_evicted:
+            return
+
+        sheet_versions: List[int] = []
+        unversioned_bytes = 0
+        for sheet_index, df in enumerate(state.dfs):
+            if sheet_index >= len(state.sheet_versions):
+                unversioned_bytes += _get_dataframe_bytes(df)
+                continue
+
+            sheet_version = state.sheet_versions[sheet_index]
+            sheet_versions.append(sheet_version)
+            if sheet_version not in self.sheet_version_state_counts:
+                if sheet_version_bytes is not None and sheet_version in sheet_version_bytes:
+                    self.sheet_version_bytes[sheet_version] = sheet_version_bytes[sheet_version]
+                else:
+                    self.sheet_version_bytes[sheet_version] = _get_dataframe_bytes(df)
+                self.sheet_version_state_counts[sheet_version] = 0
+                self.cached_bytes += self.sheet_version_bytes[sheet_version]
+            self.sheet_version_state_counts[sheet_version] += 1
+
+        self.counted_states[id(state)] = (sheet_versions, unversioned_bytes)
+        self.cached_bytes += unversioned_bytes
+
+    def _uncount_state(self, state_id: int) -> None:
+        """
+        Removes the bytes used by the dataframes of the state from cached_bytes, 
+        other than the sheets that are shared with another state in memory.
+        """
+        if state_id not in self.counted_states:
+            return
+
+        sheet_versions, unversioned_bytes = self.counted_states.pop(state_id)
+        self.cached_bytes -= unversioned_bytes
+        for sheet_version in sheet_versions:
+            self.sheet_version_state_counts[sheet_version] -= 1
+            if self.sheet_version_state_counts[sheet_version] == 0:
+                del self.sheet_version_state_counts[sheet_version]
+                self.cached_bytes -= self.sheet_version_bytes.pop(sheet_version)
+
+    def get_cached_bytes(self) -> int:
+        """
+        Returns the bytes used by the dataframes of the states in memory, counting each
+        sheet that is shared between states once.
+        """
+        return self.cached_bytes
+
+    def _evict_over_budget(self) -> None:
+        if self.max_cached_bytes is None:
+            return
+
+        # We always keep the most recently used state, as it may be the prev_state of 
+        # a state that is being rebuilt
+        while len(self.cached_states) > 1 and self.cached_bytes > self.max_cached_bytes:
+            state_id, state = self.cached_states.popitem(last=False)
+            self._uncount_state(state_id)
+            state.pivot_source_cache.remove_pivot_sources_of_dfs(state.dfs)
+            state.evict_dfs(state._dataframe_rebuilder)
+
+    def get_cached_state_count(self) -> Dict[str, Any]:
+        return {
+            'pinned': len(self.pinned_states),
+            'cached': len(self.cached_states),
+        }
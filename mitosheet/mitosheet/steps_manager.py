@@ -12,18 +12,24 @@ from typing import Any, Callable, Collection, Dict, List, Optional, Set, Tuple,
 
 import pandas as pd
 from mitosheet.api.get_path_contents import get_path_parts
+from mitosheet.code_chunks.code_chunk import CodeChunk
+from mitosheet.code_chunks.code_chunk_utils import OptimizedCodeChunksCache
 
 from mitosheet.data_in_mito import DataTypeInMito, get_data_type_in_mito
 from mitosheet.enterprise.mito_config import MitoConfig
 from mitosheet.experiments.experiment_utils import get_current_experiment
+from mitosheet.step_performers.filter import FilterStepPerformer
 from mitosheet.step_performers.import_steps.dataframe_import import DataframeImportStepPerformer
 from mitosheet.step_performers.import_steps.excel_range_import import ExcelRangeImportStepPerformer
 from mitosheet.step_performers.user_defined_import import UserDefinedImportStepPerformer, get_user_defined_importers_for_frontend
 from mitosheet.telemetry.telemetry_utils import log
+from mitosheet.pivot_cache import PivotSourceCache
 from mitosheet.preprocessing import PREPROCESS_STEP_PERFORMERS
 from mitosheet.saved_analyses.save_utils import get_analysis_exists
 from mitosheet.state import State
 from mitosheet.step import Step
+from mitosheet.step_state_cache import StepStateCache
+from mitosheet.column_dependency_graph import ColumnDependencyGraph
 from mitosheet.step_performers import EVENT_TYPE_TO_STEP_PERFORMER
 from mitosheet.step_performers.import_steps.excel_import import \
     ExcelImportStepPerformer
@@ -36,20 +42,44 @@ from mitosheet.transpiler.transpile_utils import get_default_code_options
 from mitosheet.types import CodeOptions
 from mitosheet.updates import UPDATES
 from mitosheet.user.utils import is_pro, is_running_test
-from mitosheet.utils import (NpEncoder, dfs_to_array_for_json, get_new_id,
-                             is_default_df_names)
+from mitosheet.utils import (NpEncoder, dfs_to_array_for_json,
+                             encode_sheet_data,
+                             encode_sheet_data_array_with_buffers, get_new_id,
+                             is_default_df_names, join_encoded_sheet_data)
 
 def get_step_indexes_to_skip(step_list: List[Step]) -> Set[int]:
     """
     Given a list of steps, will collect all of the steps
     from this list that should be skipped.
+
+    NOTE: this is the same as taking the union of Step.step_indexes_to_skip for 
+    each step and the steps before it, but as we call this on every update, we 
+    do it in a single pass over the steps, rather than one pass for each step.
     """
     step_indexes_to_skip: Set[int] = set()
 
+    # The indexes of the steps that a later step might skip, and that have not 
+    # been skipped yet. Filters skip the previous filters on the same column, 
+    # and other steps with the same step id. Other steps skip all the steps 
+    # with the same step id
+    filter_step_indexes_by_column: Dict[Tuple[int, str], List[int]] = {}
+    filter_step_indexes_by_step_id: Dict[str, List[int]] = {}
+    other_step_indexes_by_step_id: Dict[str, List[int]] = {}
+
     for step_index, step in enumerate(step_list):
-        step_indexes_to_skip = step_indexes_to_skip.union(
-            step.step_indexes_to_skip(step_list[:step_index])
-        )
+        if step.step_type == FilterStepPerformer.step_type():
+            filter_column = (step.params['sheet_index'], step.params['column_id'])
+            step_indexes_to_skip.update(filter_step_indexes_by_column.pop(filter_column, []))
+            step_indexes_to_skip.update(other_step_indexes_by_step_id.pop(step.step_id, []))
+            filter_step_indexes_by_column.setdefault(filter_column, []).append(step_index)
+            filter_step_indexes_by_step_id.setdefault(step.step_id, []).append(step_index)
+        else:
+            step_indexes_to_skip.update(filter_step_indexes_by_step_id.pop(step.step_id, []))
+            step_indexes_to_skip.update(other_step_indexes_by_step_id.pop(step.step_id, []))
+            other_step_indexes_by_step_id.setdefault(step.step_id, []).append(step_index)
+
+        if step_index > 0 and step.overwrites_previous_step(step_list[step_index - 1]):
+            step_indexes_to_skip.add(step_index - 1)
 
     return step_indexes_to_skip
 
@@ -80,20 +110,41 @@ def execute_step_list_from_index(
     new_step_list = step_list[: start_index + 1]
     last_valid_step = step_list[start_index]
 
+    # We track which columns are different from the last time these steps were executed,
+    # so that we can reuse the result of formulas that don't depend on any of them. To 
+    # do so, we also track the state the next step was previously executed on
+    column_dependency_graph = ColumnDependencyGraph()
+    previous_execution_state = last_valid_step.final_defined_state
+
     for partial_index, step in enumerate(step_list[start_index + 1 :]):
         step_index = partial_index + start_index + 1
         # If we're skipping a step, add it to the new step list (since we don't
         # want to lose it), but don't reexecute it
         if step_index in step_indexes_to_skip:
+            # If this step was executed last time, then whatever it changed is now different
+            if step.post_state is not None and step.prev_state is previous_execution_state:
+                column_dependency_graph.mark_step_changed(step)
+                previous_execution_state = step.post_state
+
             new_step_list.append(step)
             continue
+
+        # If this step was not previously executed on the state we expect, then we 
+        # have no idea what is different from last time
+        if step.prev_state is None or step.prev_state is not previous_execution_state:
+            column_dependency_graph.mark_all_changed()
+        previous_execution_state = step.final_defined_state
             
         # Create a new step with the same params
         new_step = Step(step.step_type, step.step_id, step.params)
 
         # Set the previous state of the new step, and then update
         # what the last valid step is
-        new_step.set_prev_state_and_execute(last_valid_step.final_defined_state)
+        if column_dependency_graph.can_reuse_step(step, last_valid_step.final_defined_state):
+            column_dependency_graph.reuse_step(step, new_step, last_valid_step.final_defined_state)
+        else:
+            new_step.set_prev_state_and_execute(last_valid_step.final_defined_state)
+            column_dependency_graph.mark_step_reexecuted(new_step)
         last_valid_step = new_step
 
         new_step_list.append(new_step)
@@ -101,45 +152,6 @@ def execute_step_list_from_index(
     return new_step_list
 
 
-def get_modified_sheet_indexes(
-    steps: List[Step], starting_step_index: int, ending_step_index: int
-) -> Set[int]:
-    """
-    Returns a best guess for which sheets have been modified starting at
-    starting_step_index and ending at (and including) ending_step_index.
-
-    This is a best guess for caching reasons, and so may return sheets that
-    have in fact not been modified. If a sheet index has been modified, it should
-    always be returned.
-    """
-    # If only one step has been performed, we can calculate the modified sheet indexes,
-    # otherwise we just say all of them (undo, replay might interact weird)
-    if starting_step_index == ending_step_index - 1:
-        step = steps[ending_step_index]
-        modified_indexes = step.step_performer.get_modified_dataframe_indexes(step.params)
-
-        # If the set is empty, then we modified everything
-        if len(modified_indexes) == 0:
-            modified_indexes = {j for j in range(len(step.dfs))}
-        # If -1 is modified, then all new dataframes are modified, which
-        # if nothing new was created, means there was a live updated event,
-        # and so we should just take the last element
-        elif -1 in modified_indexes:
-            prev_step = steps[ending_step_index - 1]
-            modified_indexes.remove(-1)
-
-            if len(prev_step.dfs) != len(step.dfs):
-                modified_indexes.update(
-                    {j for j in range(len(prev_step.dfs), len(step.dfs))}
-                )
-            else:
-                modified_indexes.add(len(step.dfs) - 1)
-    else:
-        modified_indexes = {i for i in range(len(steps[ending_step_index].dfs))}
-
-    return modified_indexes
-
-
 class StepsManager:
     """
     The StepsManager holds the list of the steps, and makes sure
@@ -202,7 +214,9 @@ class StepsManager:
         self.import_folder = import_folder
 
         # The args are a tuple of dataframes or strings, and we start by making them
-        # into a list, and making copies of them for safe keeping
+        # into a list, and making copies of them for safe keeping. NOTE: these copies
+        # are also the dataframes in the initial state, so that we only copy each passed
+        # dataframe once. This is safe as neither is ever changed in place
         self.original_args = [
             arg.copy(deep=True) if isinstance(arg, pd.DataFrame) else deepcopy(arg)
             for arg in args
@@ -221,12 +235,17 @@ class StepsManager:
         # saving any data that we need to transpilate it later this
         self.preprocess_execution_data = {}
         df_names = None
+        args = self.original_args
         for preprocess_step_performers in PREPROCESS_STEP_PERFORMERS:
             args, df_names, execution_data = preprocess_step_performers.execute(args)
             self.preprocess_execution_data[
                 preprocess_step_performers.preprocess_step_type()
             ] = execution_data            
 
+        # Pivots cache their filtered source data and groupbys as they are edited, 
+        # for as long as this analysis and the source dataframes are in memory
+        self.pivot_source_cache = PivotSourceCache()
+
         # Then we initialize the analysis with just a simple initialize step
         self.steps_including_skipped: List[Step] = [
             Step(
@@ -235,7 +254,8 @@ class StepsManager:
                     args, 
                     df_names=df_names,
                     user_defined_functions=user_defined_functions, 
-                    user_defined_importers=user_defined_importers
+                    user_defined_importers=user_defined_importers,
+                    pivot_source_cache=self.pivot_source_cache
                 ), 
                 {}
             )
@@ -259,27 +279,29 @@ class StepsManager:
         """
         self.undone_step_list_store: List[Tuple[str, List[Step]]] = []
 
+        # We bound the memory used by the dataframes of the step states, rebuilding 
+        # the evicted ones when they are needed again
+        self.step_state_cache = StepStateCache(mito_config.get_max_step_states_memory_mb() * 1024 * 1024)
+
+        # We transpile the steps on every update, and so we cache the optimized code chunks,
+        # as well as the display name and description of each step's summary, keyed by the
+        # step id and the code chunks they were created from. See Step.get_code_chunks
+        self.optimized_code_chunks_cache = OptimizedCodeChunksCache()
+        self.step_summaries_cache: Dict[str, Tuple[List[CodeChunk], str, str]] = {}
+
         # We display the state that exists after the curr_step_idx is applied,
         # which means you can never see before the initalize step
         self.curr_step_idx = 0
 
         # We also cache some of the sheet data in a form suitable to turn
-        # into json, so that we can package it and send it to the front-end
-        # faster and with less work. Make sure to cache the starting values
-        # for the saved sheet data
-        self.saved_sheet_data: List[Dict] = dfs_to_array_for_json(
-            self.curr_step.final_defined_state,
-            set(range(len(args))),
-            [],
-            self.curr_step.dfs,
-            self.curr_step.df_names,
-            self.curr_step.df_sources,
-            self.curr_step.column_formulas,
-            self.curr_step.column_filters,
-            self.curr_step.column_ids,
-            self.curr_step.df_formats,
-        )
-        self.last_step_index_we_wrote_sheet_json_on = 0
+        # into json (or json and binary column buffers), so that we can package it 
+        # and send it to the front-end faster and with less work. We save the version of each sheet it was
+        # created from, so we only recreate the data for sheets that have changed
+        self.saved_sheet_data: List[Dict] = self._get_sheet_data_array([], [])
+        self.saved_sheet_data_versions: List[int] = list(self.curr_step.final_defined_state.sheet_versions)
+        # When the frontend cannot take column buffers, we send the sheet data as JSON only, 
+        # so we also save the JSON of each sheet by its version, to only encode changed sheets
+        self.saved_sheet_data_json: Dict[int, str] = {}
 
         # We store the number of update events that have been processed successfully,
         # which allows us to have some awareness about undos and redos in the front-end
@@ -332,14 +354,51 @@ class StepsManager:
         for speed reasons. This results in way less data getting
         passed around
         """
-        modified_sheet_indexes = get_modified_sheet_indexes(
-            self.steps_including_skipped, self.last_step_index_we_wrote_sheet_json_on, self.curr_step_idx
-        )
+        sheet_data_array = self._update_saved_sheet_data()
+        self.saved_sheet_data_json = {
+            sheet_version: self.saved_sheet_data_json[sheet_version] if sheet_version in self.saved_sheet_data_json else encode_sheet_data(sheet_data)
+            for sheet_version, sheet_data in zip(self.saved_sheet_data_versions, sheet_data_array)
+        }
+        return join_encoded_sheet_data([self.saved_sheet_data_json[sheet_version] for sheet_version in self.saved_sheet_data_versions])
+
+    @property
+    def sheet_data_with_buffers(self) -> Tuple[str, List[memoryview]]:
+        """
+        The same sheet data as sheet_data_json, except that the data in numeric
+        and boolean columns is sent in binary buffers alongside the JSON, rather 
+        than in the JSON itself. This saves converting these columns to and from
+        JSON, both here and on the frontend.
+        """
+        return encode_sheet_data_array_with_buffers(self._update_saved_sheet_data())
+
+    def _update_saved_sheet_data(self) -> List[Dict]:
+        """
+        Updates the saved sheet data to the current step, and returns it.
+        """
+        sheet_versions = self.curr_step.final_defined_state.sheet_versions
+        self.saved_sheet_data = self._get_sheet_data_array(self.saved_sheet_data, self.saved_sheet_data_versions)
+        self.saved_sheet_data_versions = list(sheet_versions)
+        return self.saved_sheet_data
 
-        array = dfs_to_array_for_json(
+    def _get_sheet_data_array(self, previous_array: List[Dict], previous_sheet_versions: List[int]) -> List[Dict]:
+        """
+        Returns the sheet data for the current step, reusing the sheet data in the previous_array
+        for any sheet whose version has not changed, even if it is now at a different index. 
+        """
+        sheet_versions = self.curr_step.final_defined_state.sheet_versions
+        previous_sheet_data_by_version = dict(zip(previous_sheet_versions, previous_array))
+
+        modified_sheet_indexes = {
+            sheet_index for sheet_index, sheet_version in enumerate(sheet_versions) 
+            if sheet_version not in previous_sheet_data_by_version
+        }
+        # NOTE: the previous sheet data is None for the modified sheets, which are created again
+        previous_sheet_data_array: List[Optional[Dict]] = [previous_sheet_data_by_version.get(sheet_version) for sheet_version in sheet_versions]
+
+        return dfs_to_array_for_json(
             self.curr_step.final_defined_state,
             modified_sheet_indexes,
-            self.saved_sheet_data,
+            previous_sheet_data_array,
             self.curr_step.dfs,
             self.curr_step.df_names,
             self.curr_step.df_sources,
@@ -347,13 +406,9 @@ class StepsManager:
             self.curr_step.column_filters,
             self.curr_step.column_ids,
             self.curr_step.df_formats,
+            use_column_buffers=True
         )
 
-        self.saved_sheet_data = array
-        self.last_step_index_we_wrote_sheet_json_on = self.curr_step_idx
-
-        return json.dumps(array, cls=NpEncoder)
-
     @property
     def analysis_data_json(self):
         return json.dumps(
@@ -412,28 +467,45 @@ class StepsManager:
             if index in step_indexes_to_skip:
                 continue
             
-            # NOTE: we cannot and should not optimize the code chunks here, as
-            # rely on getting data out of them is to label the steps correctly
-            code_chunks = step.step_performer.transpile(
-                step.prev_state, # type: ignore
-                step.post_state, # type: ignore
-                step.params,
-                step.execution_data,
-            )
-
+            step_display_name, step_description = self._get_step_display_name_and_description(step)
             step_summary_list.append(
                 {
                     "step_id": step.step_id,
                     "step_idx": index,
                     "step_type": step.step_type,
-                    "step_display_name": code_chunks[0].get_display_name(),
-                    "step_description": code_chunks[0].get_description_comment().strip().replace('\n', '\n# '),
+                    "step_display_name": step_display_name,
+                    "step_description": step_description,
                     "params": step.params,
                     "result": step.execution_data.get('result', None) if step.execution_data else None
                 }
             )
 
+        # Don't hold on to the summaries of steps that no longer exist
+        step_ids = set(step.step_id for step in self.steps_including_skipped)
+        for step_id in list(self.step_summaries_cache.keys()):
+            if step_id not in step_ids:
+                del self.step_summaries_cache[step_id]
+
         return step_summary_list
+
+    def _get_step_display_name_and_description(self, step: Step) -> Tuple[str, str]:
+        """
+        Returns the display name and description of the step, reusing the cached
+        ones if the step has not been transpiled again since they were created.
+        """
+        # NOTE: we cannot and should not optimize the code chunks here, as
+        # rely on getting data out of them is to label the steps correctly
+        code_chunks = step.get_code_chunks()
+
+        if step.step_id in self.step_summaries_cache:
+            cached_code_chunks, step_display_name, step_description = self.step_summaries_cache[step.step_id]
+            if cached_code_chunks is code_chunks:
+                return step_display_name, step_description
+
+        step_display_name = code_chunks[0].get_display_name()
+        step_description = code_chunks[0].get_description_comment().strip().replace('\n', '\n# ')
+        self.step_summaries_cache[step.step_id] = (code_chunks, step_display_name, step_description)
+        return step_display_name, step_description
     
     def code(self) -> List[str]:
         return transpile(self, optimize=(is_pro() or is_running_test()))
@@ -691,6 +763,7 @@ class StepsManager:
         )
         self.steps_including_skipped = final_steps
         self.curr_step_idx = len(self.steps_including_skipped) - 1
+        self.step_state_cache.update_cached_states(self.steps_including_skipped, self.curr_step_idx)
 
     def execute_steps_data(self, new_steps_data: Optional[List[Dict[str, Any]]] = None) -> None:
         """
@@ -2,14 +2,117 @@ import hashlib
 import json
 import os
 import pickle
+import weakref
 from typing import Any, Dict, List, Callable, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
 from mitosheet.mito_backend import MitoBackend
 from mitosheet.utils import get_new_id
 
-def _get_dataframe_hash(df: pd.DataFrame) -> bytes:
+# The hashes of indexes, by the id of the index, along with a weakref to the 
+# index. See get_dataframe_hash
+_hash_cache: Dict[int, Tuple[weakref.ref, Any]] = {}
+
+
+def _get_cached_hash(obj: Any, get_hash: Callable[[Any], Any]) -> Any:
+    """
+    Returns get_hash(obj), reusing the hash from the last time it was called
+    with this same object, if this object is still alive. This must only be used 
+    for objects that cannot be changed in place.
+    """
+    key = id(obj)
+    cached = _hash_cache.get(key)
+    if cached is not None and cached[0]() is obj:
+        return cached[1]
+
+    obj_hash = get_hash(obj)
+
+    def remove_cached_hash(obj_ref: weakref.ref) -> None:
+        if key in _hash_cache and _hash_cache[key][0] is obj_ref:
+            del _hash_cache[key]
+
+    try:
+        obj_ref = weakref.ref(obj, remove_cached_hash)
+    except TypeError:
+        # Some objects cannot be weakly referenced, so we do not cache them
+        return obj_hash
+
+    _hash_cache[key] = (obj_ref, obj_hash)
+    return obj_hash
+
+
+def _reduce_hashes(hashes: np.ndarray) -> bytes:
+    """
+    Reduces the uint64 hashes of the values in a column or index to a single
+    hash, which changes if the values are reordered.
+    """
+    # We weight each hash by an odd number that depends on its position, so swapping
+    # two values changes the result. NOTE: the uint64 arithmetic wraps around
+    weights = np.arange(1, 2 * len(hashes), 2, dtype=np.uint64)
+    return np.array([len(hashes), np.dot(hashes, weights)], dtype=np.uint64).tobytes()
+
+
+def _get_values_hash(values: Any) -> bytes:
+    """
+    Returns a hash of the 1-dimensional array of values, which is a column or index.
+    """
+    if isinstance(values, pd.RangeIndex):
+        # A range index is defined by its range, so we don't need to hash its values
+        return hashlib.md5(str((values.start, values.stop, values.step)).encode('utf-8')).digest()
+
+    try:
+        if isinstance(values, pd.Index):
+            hashes = pd.util.hash_pandas_object(values)
+        else:
+            hashes = pd.util.hash_pandas_object(pd.Series(values, copy=False), index=False)
+        return _reduce_hashes(hashes.to_numpy(dtype=np.uint64))
+    except TypeError:        
+        # Use pickle if pandas cannot hash the object for example if
+        # it contains unhashable objects.
+        return hashlib.md5(pickle.dumps(values, pickle.HIGHEST_PROTOCOL)).digest()
+
+
+def _get_block_column_hashes(values: Any) -> List[bytes]:
+    """
+    Returns the hash of each of the columns in the values of a block of a 
+    dataframe, which holds the data of one or more of its columns.
+    """
+    if values.ndim == 1:
+        return [_get_values_hash(values)]
+    return [_get_values_hash(values[i]) for i in range(values.shape[0])]
+
+
+def _get_column_hashes(df: pd.DataFrame) -> List[bytes]:
+    """
+    Returns the hash of each of the columns in the dataframe, in order. 
+    
+    Pandas stores the data in a dataframe in blocks, which hold the data of one 
+    or more columns, so we hash the columns of each block without copying them
+    out of the dataframe.
+    """
+    block_manager = getattr(df, '_mgr', None)
+    if block_manager is None:
+        # Older versions of pandas call the block manager _data
+        block_manager = getattr(df, '_data', None)
+
+    try:
+        column_hashes: List[Optional[bytes]] = [None] * len(df.columns)
+        for block in block_manager.blocks: # type: ignore
+            for column_index, column_hash in zip(block.mgr_locs.as_array, _get_block_column_hashes(block.values)):
+                column_hashes[column_index] = column_hash
+
+        if all(column_hash is not None for column_hash in column_hashes):
+            return column_hashes # type: ignore
+    except AttributeError:
+        pass
+
+    # If we cannot read the blocks, we just hash each column
+    return [_get_values_hash(df.iloc[:, column_index]) for column_index in range(len(df.columns))]
+
+
+def get_dataframe_hash(df: pd.DataFrame) -> bytes:
     """
     Returns a hash for a pandas dataframe that is consistent across runs, notably including:
     1. The column names
@@ -20,25 +123,120 @@ def _get_dataframe_hash(df: pd.DataFrame) -> bytes:
     This is necessary due to the issues described here: https://github.com/streamlit/streamlit/issues/7086
     where streamlit default hashing is not ideal for pandas dataframes, as it misses some column header and
     reordering changes. 
+
+    Every value of every column is hashed with pandas, and the hashes of the values
+    are combined with numpy, so any change to the dataframe, including changing 
+    a single value in place, changes its hash.
     """
-    try:
-        return hashlib.md5(
-            bytes(str(pd.util.hash_pandas_object(df.columns)), 'utf-8') +
-            bytes(str(pd.util.hash_pandas_object(df)), 'utf-8')
-        ).digest()
-    except TypeError as e:        
-        # Use pickle if pandas cannot hash the object for example if
-        # it contains unhashable objects.
-        return b"%s" % pickle.dumps(df, pickle.HIGHEST_PROTOCOL)
+    md5 = hashlib.md5()
+    md5.update(str(df.shape).encode('utf-8'))
+    md5.update(str(list(df.dtypes)).encode('utf-8'))
+    # Indexes cannot be changed in place, so their cached hashes are always correct
+    md5.update(_get_cached_hash(df.columns, _get_values_hash))
+    md5.update(_get_cached_hash(df.index, _get_values_hash))
+    for column_hash in _get_column_hashes(df):
+        md5.update(column_hash)
+    return md5.digest()
+
+
+class StreamlitBackendSession:
+    """
+    Holds a Mito backend that is displayed in a streamlit app, along with the
+    responses it has sent to the frontend, across reruns of the app.
+
+    Responses are kept only until the frontend acknowledges that it has received
+    them, which it does with each message it sends, so that the responses sent
+    to the frontend on each rerun do not grow with the number of messages. The 
+    sheet data, analysis data and code are only recomputed when the backend
+    changes.
+    """
+
+    def __init__(self, mito_backend: MitoBackend):
+        self.mito_backend = mito_backend
+
+        # The responses the frontend has not acknowledged, and the index of the 
+        # first of them out of all the responses sent
+        self.responses: List[Dict[str, Any]] = []
+        self.responses_start_index = 0
+
+        # NOTE: the message passer returns the last message it passed on every
+        # rerun, so we keep the id of this message to make sure we only receive it once
+        self.last_message_id: Optional[str] = None
+
+        self._payloads_key: Optional[Tuple[Any, ...]] = None
+        self._payloads: Optional[Tuple[str, str, str]] = None
+
+        # Make a send function that stores the responses
+        def send(response: Dict[str, Any]) -> None:
+            self.responses.append(response)
+        
+        self.mito_backend.mito_send = send
+
+    def receive_message(self, msg: Optional[Dict[str, Any]]) -> bool:
+        """
+        Passes the message to the backend, if it is a new message for this backend. 
+        Returns True if the message was received.
+        """
+        # We receive a message if:
+        # 1. It is not None
+        # 2. We have not already received it on this backend
+        # 3. It is for this analysis. 
+        # Note that the final two conditions are to prevent messages that have been sent
+        # by the message passer component from being received again. This happens because
+        # when a component value is set, it is always returned by the message_passer_component
+        # until a new component value is set
+        if (
+            msg is None or 
+            msg['id'] == self.last_message_id or 
+            msg['analysis_name'] != self.mito_backend.analysis_name
+        ):
+            return False
+
+        self.last_message_id = msg['id']
+        if 'num_responses_received' in msg:
+            self.acknowledge_responses(msg['num_responses_received'])
+
+        self.mito_backend.receive_message(msg)
+        return True
+
+    def acknowledge_responses(self, num_responses_received: int) -> None:
+        """
+        Removes the responses that the frontend has received, out of all the responses sent
+        """
+        num_to_remove = min(num_responses_received - self.responses_start_index, len(self.responses))
+        if num_to_remove <= 0:
+            return
+
+        del self.responses[:num_to_remove]
+        self.responses_start_index += num_to_remove
+
+    def get_payloads(self) -> Tuple[str, str, str]:
+        """
+        Returns the sheet data json, the analysis data json and the code of the
+        backend, which are reused until the backend changes.
+        """
+        steps_manager = self.mito_backend.steps_manager
+        # NOTE: the current step is included so that an edit to the final step
+        # is noticed even if the number of steps does not change
+        payloads_key = (
+            steps_manager.curr_step,
+            steps_manager.curr_step_idx,
+            len(steps_manager.steps_including_skipped),
+            steps_manager.update_event_count,
+            steps_manager.undo_count,
+            steps_manager.redo_count,
+        )
+
+        if self._payloads is None or self._payloads_key != payloads_key:
+            self._payloads = (
+                steps_manager.sheet_data_json,
+                steps_manager.analysis_data_json,
+                "\n".join(steps_manager.code())
+            )
+            self._payloads_key = payloads_key
+
+        return self._payloads
 
-def get_dataframe_hash(df: pd.DataFrame) -> bytes:
-    _PANDAS_ROWS_LARGE = 100000
-    _PANDAS_SAMPLE_SIZE = 10000
-    
-    if len(df) >= _PANDAS_ROWS_LARGE:
-        df = df.sample(n=_PANDAS_SAMPLE_SIZE, random_state=0)
-    
-    return _get_dataframe_hash(df)
 
 try:
     import streamlit.components.v1 as components
@@ -87,7 +285,7 @@ try:
             df_names: Optional[List[str]]=None,
             session_id: Optional[str]=None,
             key: Optional[str]=None # So it caches on key
-        ) -> Tuple[MitoBackend, List[Any]]: 
+        ) -> StreamlitBackendSession: 
 
         mito_backend = MitoBackend(
             *args, 
@@ -95,12 +293,7 @@ try:
             user_defined_importers=_importers, user_defined_functions=_sheet_functions
         )
 
-        # Make a send function that stores the responses in a list
-        responses = []
-        def send(response):
-            responses.append(response)
-        
-        mito_backend.mito_send = send
+        session = StreamlitBackendSession(mito_backend)
 
         if df_names is not None and len(df_names) > 0:
             mito_backend.receive_message(
@@ -114,7 +307,7 @@ try:
                 }
             )
 
-        return mito_backend, responses
+        return session
 
     def message_passer_component(key: Optional[str]=None) -> Any:
         """
@@ -174,7 +367,7 @@ try:
 
         session_id = get_session_id()
 
-        mito_backend, responses = _get_mito_backend(
+        session = _get_mito_backend(
             *args, 
             _sheet_functions=sheet_functions,
             _importers=importers, 
@@ -183,6 +376,7 @@ try:
             df_names=df_names, 
             key=key
         )
+        mito_backend = session.mito_backend
 
         # Mito widgets need new ids every time a new one is displayed. As such, if
         # the key is None, we generate a new one. Notably, we do this after getting the
@@ -190,41 +384,27 @@ try:
         if key is None:
             key = mito_backend.analysis_name
 
-        sheet_data_json = mito_backend.steps_manager.sheet_data_json,
-        analysis_data_json = mito_backend.steps_manager.analysis_data_json,
+        sheet_data_json, analysis_data_json, _ = session.get_payloads()
         user_profile_json = mito_backend.get_user_profile_json()
 
         msg = message_passer_component(key=str(key) + 'message_passer')
-        if (
-            msg is not None \
-            and msg['id'] not in [response['id'] for response in responses] \
-            and msg['analysis_name'] == mito_backend.analysis_name
-        ):
-            # We receive a message if:
-            # 1. It is not None
-            # 2. We have not already received it on this backend
-            # 3. It is for this analysis. 
-            # Note that the final two conditions are to prevent messages that have been sent
-            # by the message passer component from being received again. This happens because
-            # when a component value is set, it is always returned by the message_passer_component
-            # until a new component value is set            
-            mito_backend.receive_message(msg)
+        session.receive_message(msg)
             
-        responses_json = json.dumps(responses)
+        responses_json = json.dumps(session.responses)
 
         _mito_component_func(
             key=key, 
             sheet_data_json=sheet_data_json, analysis_data_json=analysis_data_json, user_profile_json=user_profile_json, 
-            responses_json=responses_json, id=id(mito_backend)
+            responses_json=responses_json, responses_start_index=session.responses_start_index, id=id(mito_backend)
         )
 
         # We return a mapping from dataframe names to dataframes
         final_state = mito_backend.steps_manager.curr_step.final_defined_state
-        code = mito_backend.steps_manager.code()
+        _, _, code = session.get_payloads()
         return {
             df_name: df for df_name, df in 
             zip(final_state.df_names, final_state.dfs)
-        }, "\n".join(code)
+        }, code
     
 except ImportError:
     def spreadsheet(*args, key=None): # type: ignore
@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+
+"""
+Contains the TelemetrySender, which sends logs from a background thread
+so that logging an event never waits on the network.
+"""
+
+import atexit
+import time
+from queue import Empty, Full, Queue
+from threading import Event, Lock, Thread
+from typing import Any, Callable, List, Optional
+
+# The most logs we hold in memory waiting to be sent. Once the queue is full,
+# new logs are dropped rather than blocking the event that logged them
+TELEMETRY_MAX_QUEUE_SIZE = 1000
+
+# The most logs we send at once
+TELEMETRY_BATCH_SIZE = 100
+
+# The longest a log waits for more logs to be batched with it before it is sent
+TELEMETRY_FLUSH_INTERVAL_SECONDS = 1.0
+
+# The longest we wait for the queued logs to be sent when the interpreter exits
+TELEMETRY_EXIT_FLUSH_TIMEOUT_SECONDS = 2.0
+
+
+class TelemetrySender:
+    """
+    Sends logs in batches from a background thread.
+
+    Logs are put in a bounded queue, and the background thread sends them with
+    send_batch once TELEMETRY_BATCH_SIZE logs are waiting, or once the first waiting
+    log has waited TELEMETRY_FLUSH_INTERVAL_SECONDS. Any logs still queued are flushed
+    when the interpreter exits.
+
+    If threaded is False, as in JupyterLite where we cannot start threads, each log
+    is sent as soon as it is enqueued.
+    """
+
+    def __init__(
+            self,
+            send_batch: Callable[[List[Any]], None],
+            threaded: bool=True,
+            max_queue_size: int=TELEMETRY_MAX_QUEUE_SIZE,
+            batch_size: int=TELEMETRY_BATCH_SIZE,
+            flush_interval: float=TELEMETRY_FLUSH_INTERVAL_SECONDS,
+        ):
+        self.send_batch = send_batch
+        self.threaded = threaded
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        # NOTE: flush requests are put in the queue as well, so they are handled
+        # after all the logs that were queued before them
+        self.queue: Queue = Queue(max_queue_size)
+        self.num_dropped = 0
+
+        self.thread: Optional[Thread] = None
+        self.thread_lock = Lock()
+
+    def enqueue(self, log: Any) -> bool:
+        """
+        Queues the log to be sent, and returns False if the queue is full and
+        so the log was dropped.
+        """
+        if not self.threaded:
+            self._send_batch([log])
+            return True
+
+        self._start_thread()
+
+        try:
+            self.queue.put_nowait(log)
+            return True
+        except Full:
+            self.num_dropped += 1
+            return False
+
+    def flush(self, timeout: Optional[float]=None) -> bool:
+        """
+        Waits until all the logs queued before this call are sent, for at
+        most timeout seconds. Returns False if they were not all sent in time.
+        """
+        if self.thread is None:
+            return True
+
+        flushed = Event()
+        start_time = time.monotonic()
+        try:
+            self.queue.put(flushed, timeout=timeout)
+        except Full:
+            return False
+
+        remaining_timeout = None if timeout is None else max(timeout - (time.monotonic() - start_time), 0)
+        return flushed.wait(remaining_timeout)
+
+    def _start_thread(self) -> None:
+        if self.thread is not None:
+            return
+
+        with self.thread_lock:
+            if self.thread is not None:
+                return
+
+            # A daemon thread, so it does not stop the interpreter from exiting. We
+            # instead flush the queued logs at exit, with a timeout
+            self.thread = Thread(target=self._run, daemon=True)
+            self.thread.start()
+            atexit.register(self.flush, TELEMETRY_EXIT_FLUSH_TIMEOUT_SECONDS)
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Any] = []
+            flush_requests: List[Event] = []
+
+            # Wait for a log, and then collect logs until the batch is full, the
+            # flush interval has passed, or a flush is requested
+            item = self.queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, Event):
+                    flush_requests.append(item)
+                    break
+
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+
+                try:
+                    item = self.queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except Empty:
+                    break
+
+            if len(batch) > 0:
+                self._send_batch(batch)
+
+            for flushed in flush_requests:
+                flushed.set()
+
+    def _send_batch(self, batch: List[Any]) -> None:
+        # Telemetry failing should never break anything, including this thread
+        try:
+            self.send_batch(batch)
+        except:
+            pass
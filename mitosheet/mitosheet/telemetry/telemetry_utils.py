@@ -16,7 +16,7 @@ import platform
 import sys
 import time
 from copy import copy
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import requests
 
@@ -24,6 +24,7 @@ from unittest.mock import patch
 from mitosheet.errors import MitoError, get_recent_traceback_as_list
 from mitosheet.telemetry.anonymization_utils import anonymize_object, get_final_private_params_for_single_kv
 from mitosheet.telemetry.private_params_map import LOG_EXECUTION_DATA_PUBLIC
+from mitosheet.telemetry.telemetry_sender import TelemetrySender
 from mitosheet.types import StepsManagerType
 from mitosheet.user.location import get_location, is_docker, is_jupyterlite
 from mitosheet.user.schemas import UJ_FEEDBACKS, UJ_FEEDBACKS_V2, UJ_INTENDED_BEHAVIOR, UJ_MITOSHEET_TELEMETRY, UJ_USER_EMAIL
@@ -61,6 +62,9 @@ from mitosheet.user import (UJ_STATIC_USER_ID, get_user_field,
 # If you want, you can optionally choose to print logs
 PRINT_LOGS = False
 
+# The longest we wait for the analytics url to respond to a log
+ANALYTICS_URL_TIMEOUT_SECONDS = 5
+
 
 try:
     import mitosheet_helper_private
@@ -374,14 +378,47 @@ def identify() -> None:
             analytics.identify(static_user_id, params)
 
 
-def log(log_event: str, params: Optional[Dict[str, Any]]=None, steps_manager: Optional[StepsManagerType]=None, failed: bool=False, mito_error: Optional[MitoError]=None, start_time: Optional[float]=None) -> None:
+def _send_logs(logs: List[Dict[str, Any]]) -> None:
     """
-    This function is the entry point for all logging. It collects
-    all relevant parameters, exeuction data, and more info while
-    making sure to anonymize all data. 
+    Sends a batch of logs created by log. This is called from the telemetry
+    sender's background thread, and so can wait on the network.
+    """
+    for log_to_send in logs:
+        if log_to_send['params'] is not None:
+            if is_jupyterlite():
+                # We patch post function to use pyodide fetch
+                # instead of requests
+                with patch('requests.sessions.Session.post', post):
+                    analytics.track(
+                        log_to_send['static_user_id'], 
+                        log_to_send['log_event'], 
+                        log_to_send['params']
+                    )
+            else:
+                analytics.track(
+                    log_to_send['static_user_id'], 
+                    log_to_send['log_event'], 
+                    log_to_send['params']
+                )
 
-    Then, if telemetry is not turned off and we are not running tests,
-    we log this information.
+        if log_to_send['analytics_url'] is not None:
+            requests.post(
+                log_to_send['analytics_url'],
+                json={
+                    'user_id': log_to_send['static_user_id'],
+                    'log_event': log_to_send['log_event']
+                },
+                timeout=ANALYTICS_URL_TIMEOUT_SECONDS
+            )
+
+
+# JupyterLite does not support multiple threads, so there we send logs as they are created
+telemetry_sender = TelemetrySender(_send_logs, threaded=not is_jupyterlite())
+
+
+def _get_final_log_params(params: Optional[Dict[str, Any]]=None, steps_manager: Optional[StepsManagerType]=None, failed: bool=False, mito_error: Optional[MitoError]=None, start_time: Optional[float]=None) -> Dict[str, Any]:
+    """
+    Collects all the params for a log, making sure to anonymize all data.
     """
     if params is None:
         params = {}
@@ -413,26 +450,28 @@ def log(log_event: str, params: Optional[Dict[str, Any]]=None, steps_manager: Op
     # Then, make sure to add the user email
     final_params['email'] = get_user_field(UJ_USER_EMAIL)
 
-    # Finially, do the acutal logging. We do not log anything when tests are
-    # running, or if telemetry is turned off
-    if not is_running_test() and telemetry_turned_on():
+    return final_params
 
-        if is_jupyterlite():
-            # We patch post function to use pyodide fetch
-            # instead of requests
-            with patch('requests.sessions.Session.post', post):
-                analytics.track(
-                    get_user_field(UJ_STATIC_USER_ID), 
-                    log_event, 
-                    final_params
-                )
-        else:
-            analytics.track(
-                get_user_field(UJ_STATIC_USER_ID), 
-                log_event, 
-                final_params
-            )
-        
+
+def log(log_event: str, params: Optional[Dict[str, Any]]=None, steps_manager: Optional[StepsManagerType]=None, failed: bool=False, mito_error: Optional[MitoError]=None, start_time: Optional[float]=None) -> None:
+    """
+    This function is the entry point for all logging. It collects
+    all relevant parameters, exeuction data, and more info while
+    making sure to anonymize all data. 
+
+    Then, if telemetry is not turned off and we are not running tests,
+    we queue this information to be sent by the telemetry sender, so 
+    that logging never waits on the network.
+    """
+    # We do not log anything when tests are running, or if telemetry is turned off
+    track = not is_running_test() and telemetry_turned_on()
+    analytics_url = steps_manager.mito_config.get_analytics_url() if steps_manager is not None else None
+
+    # The analytics url only receives the log event, so we only collect the
+    # params if we are tracking or printing the log
+    final_params = None
+    if track or PRINT_LOGS:
+        final_params = _get_final_log_params(params, steps_manager=steps_manager, failed=failed, mito_error=mito_error, start_time=start_time)
 
     # If we want to print the logs for debugging reasons, then we print them as well
     if PRINT_LOGS:
@@ -441,12 +480,10 @@ def log(log_event: str, params: Optional[Dict[str, Any]]=None, steps_manager: Op
             final_params
         )
 
-    analytics_url = steps_manager.mito_config.get_analytics_url() if steps_manager is not None else None
-    if analytics_url is not None:
-        requests.post(
-            analytics_url,
-            json={
-                'user_id': get_user_field(UJ_STATIC_USER_ID),
-                'log_event': log_event
-            }
-        )
\ No newline at end of file
+    if track or analytics_url is not None:
+        telemetry_sender.enqueue({
+            'static_user_id': get_user_field(UJ_STATIC_USER_ID),
+            'log_event': log_event,
+            'params': final_params if track else None,
+            'analytics_url': analytics_url
+        })
@@ -0,0 +1,88 @@
+import os
+
+import pandas as pd
+import pytest
+
+import mitosheet.step_performers.import_steps.simple_import as simple_import
+from mitosheet.api.get_csv_files_metadata import get_csv_files_metadata
+from mitosheet.step_performers.import_steps.simple_import import CSV_METADATA_CACHE, CSV_METADATA_PROBE_BYTES
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+TEST_FILE_PATH = 'test_file.csv'
+
+
+@pytest.fixture
+def num_prefix_reads(monkeypatch):
+    CSV_METADATA_CACHE.clear()
+
+    reads = []
+    read_csv_prefix = simple_import._read_csv_prefix
+    def counting_read_csv_prefix(file_name):
+        reads.append(file_name)
+        return read_csv_prefix(file_name)
+    monkeypatch.setattr(simple_import, '_read_csv_prefix', counting_read_csv_prefix)
+
+    yield lambda: len(reads)
+
+    if os.path.exists(TEST_FILE_PATH):
+        os.remove(TEST_FILE_PATH)
+
+
+def get_metadata(mito, file_name=TEST_FILE_PATH):
+    return get_csv_files_metadata({'file_names': [file_name]}, mito.mito_backend.steps_manager)
+
+
+CSV_METADATA_TESTS = [
+    ('A,B\n1,2\n3,4\n', 'utf-8', ',', 'utf-8', '.'),
+    ('A;B\n1,5;2\n3,25;4\n', 'utf-8', ';', 'utf-8', ','),
+    ('A;B\n1.5;2\n3,25;4\n', 'utf-8', ';', 'utf-8', '.'),
+    ('A|B\n1.234,5|2\n3|4\n', 'utf-8', '|', 'utf-8', ','),
+    ('A\tB\nÑ\t2\n', 'latin-1', '\t', 'latin-1', '.'),
+    ('A,B\n1,2\n', 'utf-16', ',', 'UTF-16', '.'),
+    ('date\n1\n2\n', 'utf-8', ',', 'utf-8', '.'),
+]
+@pytest.mark.parametrize("file_contents, file_encoding, delimeter, encoding, decimal", CSV_METADATA_TESTS)
+def test_get_csv_files_metadata(num_prefix_reads, file_contents, file_encoding, delimeter, encoding, decimal):
+    with open(TEST_FILE_PATH, 'w', encoding=file_encoding, newline='') as f:
+        f.write(file_contents)
+
+    metadata = get_metadata(create_mito_wrapper())
+
+    assert metadata['delimeters'] == [delimeter]
+    assert metadata['encodings'] == [encoding]
+    assert metadata['decimals'] == [decimal]
+
+
+def test_get_csv_files_metadata_missing_file_uses_defaults(num_prefix_reads):
+    metadata = get_metadata(create_mito_wrapper(), 'never_exists.csv')
+    assert metadata == {'delimeters': [','], 'encodings': ['utf-8'], 'decimals': ['.'], 'skiprows': [0]}
+
+
+def test_get_csv_files_metadata_only_reads_start_of_file(num_prefix_reads):
+    with open(TEST_FILE_PATH, 'wb') as f:
+        f.write(b'A;B\n' + b'1;2\n' * (CSV_METADATA_PROBE_BYTES // 4))
+        # Bytes that are not utf-8 after the start of the file
+        f.write(b'\xff\xfe;\xff\n' * 100)
+
+    metadata = get_metadata(create_mito_wrapper())
+
+    assert metadata['delimeters'] == [';']
+    assert metadata['encodings'] == ['utf-8']
+
+
+def test_get_csv_files_metadata_is_cached_until_file_changes(num_prefix_reads):
+    pd.DataFrame({'A': [1, 2], 'B': [3, 4]}).to_csv(TEST_FILE_PATH, index=False, sep=';')
+    mito = create_mito_wrapper()
+
+    assert get_metadata(mito)['delimeters'] == [';']
+    assert get_metadata(mito)['delimeters'] == [';']
+    assert num_prefix_reads() == 1
+
+    # Importing the file after getting its metadata does not guess again
+    mito.simple_import([TEST_FILE_PATH])
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2], 'B': [3, 4]}))
+    assert num_prefix_reads() == 1
+
+    pd.DataFrame({'A': [1, 2], 'B': [3, 4]}).to_csv(TEST_FILE_PATH, index=False, sep='|')
+    assert get_metadata(mito)['delimeters'] == ['|']
+    assert num_prefix_reads() == 2
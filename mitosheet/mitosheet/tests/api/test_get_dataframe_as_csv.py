@@ -0,0 +1,123 @@
+import base64
+import gzip
+import json
+
+import pandas as pd
+import pytest
+
+import mitosheet.api.get_dataframe_as_csv as get_dataframe_as_csv_module
+from mitosheet.api.get_dataframe_as_csv import (
+    MAX_OPEN_CSV_DOWNLOADS, cancel_dataframe_as_csv_download, csv_downloads,
+    get_dataframe_as_csv, get_dataframe_as_csv_chunk,
+    get_dataframe_as_csv_download)
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+DOWNLOAD_DFS = [
+    pd.DataFrame({'A': range(10), 'B': [str(i) + ',"' for i in range(10)], 'C': [i * 1.5 for i in range(10)]}),
+    pd.DataFrame({'A': [1, 2, 3]}),
+    pd.DataFrame({'A': []}),
+]
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # So that the tests download dataframes in multiple chunks
+    monkeypatch.setattr(get_dataframe_as_csv_module, 'CSV_DOWNLOAD_CHUNK_SIZE', 3)
+
+
+def download(mito, sheet_index, compress):
+    steps_manager = mito.mito_backend.steps_manager
+    download = get_dataframe_as_csv_download({'sheet_index': sheet_index, 'compress': compress}, steps_manager)
+
+    chunks = []
+    for chunk_index in range(download['num_chunks']):
+        # Make sure the chunks can be sent to the frontend
+        chunk = json.loads(json.dumps(get_dataframe_as_csv_chunk({'download_id': download['download_id'], 'chunk_index': chunk_index}, steps_manager)))
+        assert chunk['progress'] == (chunk_index + 1) / download['num_chunks']
+        assert chunk['done'] == (chunk_index == download['num_chunks'] - 1)
+        chunks.append(chunk['chunk'])
+
+    # Finished downloads are kept until the frontend cancels them
+    assert cancel_dataframe_as_csv_download({'download_id': download['download_id']}, steps_manager)
+    assert download['download_id'] not in csv_downloads
+    if compress:
+        return gzip.decompress(b''.join(base64.b64decode(chunk) for chunk in chunks)).decode('utf-8')
+    return ''.join(chunks)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+@pytest.mark.parametrize("df", DOWNLOAD_DFS)
+def test_download_in_chunks_same_as_csv(df, compress):
+    mito = create_mito_wrapper(df)
+
+    assert download(mito, 0, compress) == get_dataframe_as_csv({'sheet_index': 0}, mito.mito_backend.steps_manager)
+
+
+def test_download_splits_rows_into_chunks():
+    mito = create_mito_wrapper(pd.DataFrame({'A': range(7)}))
+
+    download = get_dataframe_as_csv_download({'sheet_index': 0}, mito.mito_backend.steps_manager)
+
+    assert download['num_chunks'] == 3
+    assert download['compress'] == False
+    chunks = [
+        get_dataframe_as_csv_chunk({'download_id': download['download_id'], 'chunk_index': chunk_index}, mito.mito_backend.steps_manager)['chunk']
+        for chunk_index in range(3)
+    ]
+    assert chunks == ['A\n0\n1\n2\n', '3\n4\n5\n', '6\n']
+
+
+def test_download_can_request_last_chunk_again():
+    mito = create_mito_wrapper(pd.DataFrame({'A': range(7)}))
+    steps_manager = mito.mito_backend.steps_manager
+    download = get_dataframe_as_csv_download({'sheet_index': 0}, steps_manager)
+
+    first = get_dataframe_as_csv_chunk({'download_id': download['download_id'], 'chunk_index': 0}, steps_manager)
+    assert get_dataframe_as_csv_chunk({'download_id': download['download_id'], 'chunk_index': 0}, steps_manager) == first
+
+    # But chunks cannot be skipped
+    with pytest.raises(ValueError):
+        get_dataframe_as_csv_chunk({'download_id': download['download_id'], 'chunk_index': 2}, steps_manager)
+
+
+def test_download_can_request_final_chunk_again():
+    mito = create_mito_wrapper(pd.DataFrame({'A': range(7)}))
+    steps_manager = mito.mito_backend.steps_manager
+    download = get_dataframe_as_csv_download({'sheet_index': 0}, steps_manager)
+
+    for chunk_index in range(download['num_chunks']):
+        last = get_dataframe_as_csv_chunk({'download_id': download['download_id'], 'chunk_index': chunk_index}, steps_manager)
+    assert last['done']
+
+    # As if the response with the final chunk was lost, and the frontend retries it
+    assert get_dataframe_as_csv_chunk({'download_id': download['download_id'], 'chunk_index': download['num_chunks'] - 1}, steps_manager) == last
+    assert download['download_id'] in csv_downloads
+
+    assert cancel_dataframe_as_csv_download({'download_id': download['download_id']}, steps_manager)
+
+
+def test_cancel_download():
+    mito = create_mito_wrapper(pd.DataFrame({'A': range(7)}))
+    steps_manager = mito.mito_backend.steps_manager
+    download = get_dataframe_as_csv_download({'sheet_index': 0}, steps_manager)
+    get_dataframe_as_csv_chunk({'download_id': download['download_id'], 'chunk_index': 0}, steps_manager)
+
+    assert cancel_dataframe_as_csv_download({'download_id': download['download_id']}, steps_manager)
+    assert not cancel_dataframe_as_csv_download({'download_id': download['download_id']}, steps_manager)
+    with pytest.raises(KeyError):
+        get_dataframe_as_csv_chunk({'download_id': download['download_id'], 'chunk_index': 1}, steps_manager)
+
+
+def test_oldest_downloads_dropped_when_too_many_open():
+    mito = create_mito_wrapper(pd.DataFrame({'A': range(7)}))
+    steps_manager = mito.mito_backend.steps_manager
+
+    download_ids = [
+        get_dataframe_as_csv_download({'sheet_index': 0}, steps_manager)['download_id']
+        for _ in range(MAX_OPEN_CSV_DOWNLOADS + 1)
+    ]
+
+    assert download_ids[0] not in csv_downloads
+    assert all(download_id in csv_downloads for download_id in download_ids[1:])
+    for download_id in download_ids[1:]:
+        cancel_dataframe_as_csv_download({'download_id': download_id}, steps_manager)
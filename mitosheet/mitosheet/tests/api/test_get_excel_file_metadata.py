@@ -0,0 +1,68 @@
+import os
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from mitosheet.api.get_excel_file_metadata import get_excel_file_metadata
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+TEST_FILE_PATH = 'test_file.xlsx'
+
+
+@pytest.fixture
+def cleanup_test_file():
+    yield
+    if os.path.exists(TEST_FILE_PATH):
+        os.remove(TEST_FILE_PATH)
+
+
+def get_metadata():
+    mito = create_mito_wrapper()
+    return get_excel_file_metadata({'file_path': TEST_FILE_PATH}, mito.mito_backend.steps_manager)
+
+
+def test_get_excel_file_metadata(cleanup_test_file):
+    with pd.ExcelWriter(TEST_FILE_PATH) as writer:
+        pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]}).to_excel(writer, sheet_name='first', index=False)
+        pd.DataFrame({'A': [1]}).to_excel(writer, sheet_name='second sheet', startrow=2, startcol=1, index=False)
+        pd.DataFrame().to_excel(writer, sheet_name='empty', index=False)
+
+    metadata = get_metadata()
+
+    assert metadata['sheet_names'] == pd.ExcelFile(TEST_FILE_PATH, engine='openpyxl').sheet_names == ['first', 'second sheet', 'empty']
+    assert metadata['sheet_sizes']['first'] == {'num_rows': 4, 'num_columns': 2}
+    assert metadata['sheet_sizes']['second sheet'] == {'num_rows': 2, 'num_columns': 1}
+    assert metadata['size'] == os.path.getsize(TEST_FILE_PATH)
+
+
+def test_get_excel_file_metadata_skips_chartsheets(cleanup_test_file):
+    from openpyxl.chart import BarChart, Reference
+
+    workbook = openpyxl.Workbook()
+    workbook.active.title = 'data'
+    workbook.active.append([1, 2])
+    chart = BarChart()
+    chart.add_data(Reference(workbook.active, min_col=1, max_col=2, min_row=1, max_row=1))
+    workbook.create_chartsheet('chart').add_chart(chart)
+    workbook.create_sheet('more data')
+    workbook.save(TEST_FILE_PATH)
+
+    metadata = get_metadata()
+
+    assert metadata['sheet_names'] == pd.ExcelFile(TEST_FILE_PATH, engine='openpyxl').sheet_names == ['data', 'more data']
+    assert metadata['sheet_sizes']['data'] == {'num_rows': 1, 'num_columns': 2}
+
+
+def test_get_excel_file_metadata_does_not_read_cells(cleanup_test_file, monkeypatch):
+    pd.DataFrame({'A': range(1000), 'B': ['abc'] * 1000}).to_excel(TEST_FILE_PATH, sheet_name='data', index=False)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('The workbook should not be loaded')
+    monkeypatch.setattr(openpyxl, 'load_workbook', fail)
+    monkeypatch.setattr(openpyxl.reader.excel, 'load_workbook', fail)
+
+    metadata = get_metadata()
+
+    assert metadata['sheet_names'] == ['data']
+    assert metadata['sheet_sizes'] == {'data': {'num_rows': 1001, 'num_columns': 2}}
@@ -0,0 +1,108 @@
+import base64
+import json
+
+import pandas as pd
+import pytest
+
+from mitosheet.api.get_sheet_data_viewport import get_sheet_data_viewport
+from mitosheet.pro.conditional_formatting_utils import get_conditonal_formatting_result
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.types import FC_NUMBER_GREATER
+from mitosheet.utils import MAX_COLUMNS, MAX_ROWS
+
+
+def get_viewport(mito, sheet_index, start_row, end_row, start_column, end_column):
+    viewport = get_sheet_data_viewport(
+        {
+            'sheet_index': sheet_index,
+            'start_row': start_row,
+            'end_row': end_row,
+            'start_column': start_column,
+            'end_column': end_column,
+        },
+        mito.mito_backend.steps_manager
+    )
+    # Make sure the viewport can be sent to the frontend
+    return json.loads(json.dumps(viewport))
+
+
+def test_get_sheet_data_viewport():
+    df = pd.DataFrame({'A': range(10), 'B': [str(i) for i in range(10)], 'C': [i * 1.5 for i in range(10)]})
+    mito = create_mito_wrapper(df)
+
+    viewport = get_viewport(mito, 0, 4, 7, 1, 3)
+
+    assert viewport['numRows'] == 10
+    assert viewport['numColumns'] == 3
+    assert (viewport['startRow'], viewport['endRow'], viewport['startColumn'], viewport['endColumn']) == (4, 7, 1, 3)
+    assert viewport['index'] == [4, 5, 6]
+    assert viewport['data'] == [
+        {'columnID': 'B', 'columnHeader': 'B', 'columnDtype': 'object', 'columnData': ['4', '5', '6']},
+        {'columnID': 'C', 'columnHeader': 'C', 'columnDtype': 'float64', 'columnData': [6.0, 7.5, 9.0]},
+    ]
+    # The column metadata is for all columns
+    assert viewport['columnIDsMap'] == {'A': 'A', 'B': 'B', 'C': 'C'}
+    assert viewport['columnDtypeMap'] == {'A': 'int64', 'B': 'object', 'C': 'float64'}
+
+
+def test_get_sheet_data_viewport_beyond_max_rows_and_columns():
+    df = pd.DataFrame({i: range(MAX_ROWS * 2) for i in range(MAX_COLUMNS + 10)})
+    mito = create_mito_wrapper(df)
+
+    viewport = get_viewport(mito, 0, MAX_ROWS + 100, MAX_ROWS + 102, MAX_COLUMNS + 5, MAX_COLUMNS + 7)
+
+    assert viewport['index'] == [MAX_ROWS + 100, MAX_ROWS + 101]
+    assert [column_data['columnHeader'] for column_data in viewport['data']] == [str(MAX_COLUMNS + 5), str(MAX_COLUMNS + 6)]
+    assert viewport['data'][0]['columnData'] == [MAX_ROWS + 100, MAX_ROWS + 101]
+
+
+@pytest.mark.parametrize("start_row, end_row, start_column, end_column, expected", [
+    (-5, 2, -1, 1, (0, 2, 0, 1)),
+    (8, 100, 2, 100, (8, 10, 2, 3)),
+    (5, 2, 2, 1, (5, 5, 2, 2)),
+    (20, 30, 5, 6, (10, 10, 3, 3)),
+    (0, MAX_ROWS * 10, 0, 3, (0, 10, 0, 3)),
+])
+def test_get_sheet_data_viewport_clips_to_dataframe(start_row, end_row, start_column, end_column, expected):
+    df = pd.DataFrame({'A': range(10), 'B': range(10), 'C': range(10)})
+    mito = create_mito_wrapper(df)
+
+    viewport = get_viewport(mito, 0, start_row, end_row, start_column, end_column)
+
+    assert (viewport['startRow'], viewport['endRow'], viewport['startColumn'], viewport['endColumn']) == expected
+    assert len(viewport['index']) == expected[1] - expected[0]
+    assert len(viewport['data']) == expected[3] - expected[2]
+
+
+def test_get_sheet_data_viewport_clips_to_max_rows():
+    df = pd.DataFrame({'A': range(MAX_ROWS * 2)})
+    mito = create_mito_wrapper(df)
+
+    viewport = get_viewport(mito, 0, 10, MAX_ROWS * 2, 0, 1)
+
+    assert viewport['endRow'] == MAX_ROWS + 10
+    assert len(viewport['data'][0]['columnData']) == MAX_ROWS
+
+
+def test_conditional_formatting_result_only_for_viewport():
+    df = pd.DataFrame({'A': range(MAX_ROWS * 2), 'B': range(MAX_ROWS * 2)})
+    mito = create_mito_wrapper(df)
+    conditional_formats = [{
+        'format_uuid': '1234',
+        'columnIDs': ['A', 'B'],
+        'filters': [{'condition': FC_NUMBER_GREATER, 'value': 2}],
+        'color': 'red',
+        'backgroundColor': 'blue',
+    }]
+
+    conditional_formatting_result = get_conditonal_formatting_result(
+        mito.mito_backend.steps_manager.curr_step.final_defined_state, 0, mito.dfs[0], conditional_formats, max_rows=3, start_row=MAX_ROWS + 10
+    )
+
+    for column_id in ['A', 'B']:
+        column_formats = conditional_formatting_result['results'][column_id]
+        assert len(column_formats) == 1
+        assert column_formats[0]['backgroundColor'] == 'blue'
+        assert column_formats[0]['color'] == 'red'
+        # Rows MAX_ROWS + 10, MAX_ROWS + 11 and MAX_ROWS + 12, relative to the start row
+        assert column_formats[0]['bitmap'] == base64.b64encode(bytes([0b111])).decode('ascii')
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for casting series, dataframes and rolling ranges to types all at once
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from mitosheet.public.v3.rolling_range import RollingRange
+from mitosheet.public.v3.types.float import cast_string_series_to_float
+from mitosheet.public.v3.types.utils import ELEMENT_CONVERSION_FUNCTIONS, get_arg_cast_to_type, get_primitive_type_name_from_primitive_value
+
+NUMBER_STRINGS = [
+    '1', '-1', '1.5', ' 2 ', '+3', '1e5', '.5', '5.', '$5', '-$5', '(5)', '-(5)', '$(1,000)', '1,000', '1,000.25',
+    '12,345,678', '1,5', '1234,567', '5M', '5m', '5Mil', '5 M', '(5Billion)', '$2b', '1,000M', '1,5M', 'nan', 'inf',
+    '1_000', '1e999', '-0', '\t$5 ', '10000000000000000000000', '9.3e18',
+]
+NOT_NUMBER_STRINGS = ['abc', '', '-', '$', '()', '(5', '5)', '$-5', '(-5)', 'True']
+
+SERIES = [
+    pd.Series(NUMBER_STRINGS),
+    pd.Series(NUMBER_STRINGS + NOT_NUMBER_STRINGS),
+    pd.Series(NUMBER_STRINGS + [None, np.nan] + NOT_NUMBER_STRINGS),
+    pd.Series(['1', '2', '3', '2', '1'], index=[1, 1, 2, 3, 5], name='A'),
+    pd.Series(['5', 'abc', None]),
+    pd.Series(['abc', None]),
+    pd.Series([1, 2, 3]),
+    pd.Series([1.5, np.nan, -2.7, 0.0]),
+    pd.Series([1.0, 2.0, 1e18]),
+    pd.Series([1e20, np.inf]),
+    pd.Series([True, False]),
+    pd.Series([1, 2], dtype='uint8'),
+    pd.Series([1, 2], dtype='float32'),
+    pd.Series([1, 'a', 2.5, None]),
+    pd.Series([1, 2], dtype=object),
+    pd.Series([], dtype='float64'),
+    pd.Series([], dtype=object),
+]
+
+
+def get_element_wise_result(target_primitive_type_name, series, primitive_types_to_ignore):
+    element_conversion_function = ELEMENT_CONVERSION_FUNCTIONS[target_primitive_type_name]
+    return series.apply(
+        lambda v: v if get_primitive_type_name_from_primitive_value(v) in primitive_types_to_ignore else element_conversion_function(v)
+    )
+
+
+@pytest.mark.parametrize("target_primitive_type_name", ['str', 'int', 'float', 'number', 'bool'])
+@pytest.mark.parametrize("primitive_types_to_ignore", [[], ['str'], ['int'], ['float']])
+@pytest.mark.parametrize("series", SERIES)
+def test_series_cast_to_type_same_as_element_wise(target_primitive_type_name, primitive_types_to_ignore, series):
+    try:
+        expected = get_element_wise_result(target_primitive_type_name, series, primitive_types_to_ignore)
+    except Exception as e:
+        with pytest.raises(type(e)):
+            get_arg_cast_to_type(target_primitive_type_name, series, primitive_types_to_ignore)
+        return
+
+    result = get_arg_cast_to_type(target_primitive_type_name, series, primitive_types_to_ignore)
+    pd.testing.assert_series_equal(result, expected)
+    assert [type(v) for v in result] == [type(v) for v in expected]
+
+
+@pytest.mark.parametrize("target_primitive_type_name", ['int', 'float', 'number', 'bool'])
+def test_dataframe_and_rolling_range_cast_to_type_same_as_element_wise(target_primitive_type_name):
+    df = pd.DataFrame({'A': ['1', '$2', '(3)', '4M'], 'B': [1.5, 2.5, 3.5, 4.5], 'C': [1, 2, 3, 4]})
+    expected = df.apply(lambda c: get_element_wise_result(target_primitive_type_name, c, []))
+
+    pd.testing.assert_frame_equal(get_arg_cast_to_type(target_primitive_type_name, df), expected)
+    rolling_range = get_arg_cast_to_type(target_primitive_type_name, RollingRange(df, 2, -1))
+    pd.testing.assert_frame_equal(rolling_range.obj, expected)
+    assert (rolling_range.window, rolling_range.offset) == (2, -1)
+
+
+def test_cast_string_series_to_float_only_leaves_unparsed_strings():
+    series = pd.Series(['1', '$1,000', '(2.5M)', '1,5', 'abc', None, '1,000M'])
+
+    values, is_cast = cast_string_series_to_float(series)
+
+    assert is_cast.tolist() == [True, True, True, False, False, False, False]
+    assert values[is_cast].tolist() == [1.0, 1000.0, -2500000.0]
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for applying reductions to rolling ranges
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from mitosheet.public.v3.rolling_range import (RollingRange, dataframe_count, dataframe_max, dataframe_min,
+                                               dataframe_std, dataframe_sum, dataframe_var)
+
+REDUCTIONS = [dataframe_sum, dataframe_count, dataframe_max, dataframe_min, dataframe_std, dataframe_var]
+
+DATAFRAMES = [
+    pd.DataFrame({'B': [1, 2, 3, 4, 5, 6, 7]}),
+    pd.DataFrame({'B': [1.5, None, 3.25, -4.0, None, None, 7.125]}),
+    pd.DataFrame({'B': [1, 2, 3, 4, 5, 6, 7], 'C': [0.5, None, 2.5, 3.5, 4.5, None, 6.5]}),
+    pd.DataFrame({'B': [-1, 2, -3, 4, -5, 6, -7], 'C': [7, 6, 5, 4, 3, 2, 1]}, index=['a', 'b', 'c', 'd', 'e', 'f', 'g']),
+    pd.DataFrame({'B': np.array([1, 2, 3, 4, 5, 6, 7], dtype='int32')}),
+    pd.DataFrame({'B': [None] * 7}, dtype='float64'),
+]
+
+WINDOWS_AND_OFFSETS = [
+    (1, 0), (2, 0), (2, -1), (3, -1), (5, -2), (3, 2), (10, 0), (10, -5), (10, 10), (3, -10), (3, 6), (3, -9), (0, 0), (100, -50)
+]
+
+
+def get_looped_result(rolling_range, func, default_value):
+    """
+    The result of applying func to each window in turn, which is what any func we 
+    cannot vectorise does
+    """
+    return RollingRange(rolling_range.obj, rolling_range.window, rolling_range.offset).apply(lambda df: func(df), default_value)
+
+
+@pytest.mark.parametrize("func", REDUCTIONS)
+@pytest.mark.parametrize("df", DATAFRAMES)
+@pytest.mark.parametrize("window, offset", WINDOWS_AND_OFFSETS)
+def test_vectorised_reductions_are_same_as_looping(func, df, window, offset):
+    rolling_range = RollingRange(df, window, offset)
+
+    result = rolling_range.apply(func)
+    expected = get_looped_result(rolling_range, func, 0)
+
+    assert result.index.equals(expected.index)
+    assert result.dtype == expected.dtype
+    if result.dtype.kind == 'f':
+        assert np.allclose(result.to_numpy(), expected.to_numpy(), equal_nan=True)
+    else:
+        assert result.equals(expected)
+
+
+@pytest.mark.parametrize("func", REDUCTIONS)
+def test_vectorised_reductions_with_float_default_value(func):
+    rolling_range = RollingRange(pd.DataFrame({'B': [1, 2, 3]}), 2, 2)
+    result = rolling_range.apply(func, default_value=1.5)
+    expected = get_looped_result(rolling_range, func, 1.5)
+    assert np.allclose(result.to_numpy(dtype=float), expected.to_numpy(dtype=float), equal_nan=True)
+
+
+@pytest.mark.parametrize("df", [
+    pd.DataFrame({'B': pd.to_datetime(['2020-01-01', '2020-01-03', '2020-01-02'])}),
+    pd.DataFrame({'B': pd.array([1, None, 3], dtype='Int64')}),
+])
+@pytest.mark.parametrize("func", [dataframe_max, dataframe_min])
+def test_reductions_of_non_numeric_columns_loop(df, func):
+    rolling_range = RollingRange(df, 2, -1)
+    assert rolling_range.apply(func).equals(get_looped_result(rolling_range, func, 0))
+
+
+def test_large_rolling_range_sum():
+    df = pd.DataFrame({'B': np.arange(1_000_000, dtype=float)})
+    result = RollingRange(df, 3, -1).apply(dataframe_sum)
+    assert result.iloc[0] == 1
+    assert result.iloc[500_000] == 1_500_000
+    assert result.iloc[-1] == 999_999 + 999_998
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the analysis writer, which appends changes to saved analyses
+to their journals.
+"""
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from mitosheet.saved_analyses import SAVED_ANALYSIS_FOLDER, make_steps_json_obj, read_analysis, write_analysis
+from mitosheet.saved_analyses.analysis_writer import MAX_JOURNAL_RECORDS, AnalysisWriter, get_journal_path, read_journal
+from mitosheet.saved_analyses.save_utils import analysis_writer, delete_saved_analysis, rename_saved_analysis
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+
+def get_analysis_path(analysis_name):
+    return f'{SAVED_ANALYSIS_FOLDER}/{analysis_name}.json'
+
+
+def get_num_journal_records(analysis_name):
+    journal_path = get_journal_path(get_analysis_path(analysis_name))
+    if not os.path.exists(journal_path):
+        return 0
+    with open(journal_path) as f:
+        return len(f.readlines())
+
+
+def assert_saved_analysis_equals_steps(mito):
+    saved_analysis = read_analysis(mito.mito_backend.analysis_name)
+    steps_data = json.loads(json.dumps(make_steps_json_obj(mito.mito_backend.steps_manager.steps_including_skipped)))
+    assert saved_analysis['steps_data'] == steps_data
+    assert 'journal_id' not in saved_analysis
+
+
+@pytest.fixture
+def mito():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    yield mito
+    if read_analysis(mito.mito_backend.analysis_name) is not None:
+        delete_saved_analysis(mito.mito_backend.analysis_name)
+
+
+def test_edits_are_appended_to_journal(mito):
+    # Enough steps that the journal is smaller than the saved analysis
+    for i in range(10):
+        mito.add_column(0, f'B{i}')
+    analysis_writer.flush()
+    first_snapshot_size = os.path.getsize(get_analysis_path(mito.mito_backend.analysis_name))
+    # Writes that are pending at the same time are combined, so depending on how fast they
+    # are written, some of the steps above may already be in the journal
+    num_journal_records = get_num_journal_records(mito.mito_backend.analysis_name)
+
+    mito.add_column(0, 'C')
+    analysis_writer.flush()
+    mito.set_formula('=A + 1', 0, 'C')
+
+    # The saved analysis is not rewritten, the new steps are only appended
+    analysis_writer.flush()
+    assert os.path.getsize(get_analysis_path(mito.mito_backend.analysis_name)) == first_snapshot_size
+    assert get_num_journal_records(mito.mito_backend.analysis_name) == num_journal_records + 2
+    assert_saved_analysis_equals_steps(mito)
+
+
+def test_undo_redo_and_delete_are_read_from_journal(mito):
+    mito.add_column(0, 'B')
+    mito.add_column(0, 'C')
+    mito.undo()
+    assert_saved_analysis_equals_steps(mito)
+
+    mito.redo()
+    assert_saved_analysis_equals_steps(mito)
+
+    mito.delete_columns(0, ['B'])
+    mito.set_formula('=A * 2', 0, 'C')
+    assert_saved_analysis_equals_steps(mito)
+
+    mito.clear()
+    assert_saved_analysis_equals_steps(mito)
+
+
+def test_saved_analysis_from_journal_replays(mito):
+    mito.add_column(0, 'B')
+    mito.set_formula('=A + 1', 0, 'B')
+    mito.add_column(0, 'C')
+    mito.undo()
+
+    new_mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    new_mito.replay_analysis(mito.mito_backend.analysis_name)
+
+    assert new_mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [2, 3, 4]}))
+
+
+def test_journal_is_compacted(mito):
+    for i in range(MAX_JOURNAL_RECORDS + 5):
+        mito.add_column(0, f'B{i}')
+
+    analysis_writer.flush()
+    assert get_num_journal_records(mito.mito_backend.analysis_name) < MAX_JOURNAL_RECORDS
+    assert_saved_analysis_equals_steps(mito)
+
+
+def test_unchanged_analysis_is_not_written(mito):
+    mito.add_column(0, 'B')
+    write_analysis(mito.mito_backend.steps_manager)
+    num_journal_records = get_num_journal_records(mito.mito_backend.analysis_name)
+
+    write_analysis(mito.mito_backend.steps_manager)
+    write_analysis(mito.mito_backend.steps_manager)
+
+    assert get_num_journal_records(mito.mito_backend.analysis_name) == num_journal_records
+
+
+def test_half_written_journal_record_is_ignored(mito):
+    mito.add_column(0, 'B')
+    mito.add_column(0, 'C')
+    analysis_writer.flush()
+    steps_data = read_analysis(mito.mito_backend.analysis_name)['steps_data']
+
+    with open(get_journal_path(get_analysis_path(mito.mito_backend.analysis_name)), 'a') as f:
+        f.write('{"journal_id": "')
+
+    assert read_analysis(mito.mito_backend.analysis_name)['steps_data'] == steps_data
+
+
+def test_journal_from_old_snapshot_is_ignored(tmp_path):
+    writer = AnalysisWriter(threaded=False)
+    analysis_path = str(tmp_path / 'analysis.json')
+    journal_path = get_journal_path(analysis_path)
+
+    saved_analysis = {'version': '1', 'steps_data': [], 'public_interface_version': 3, 'args': [], 'code_options': {}}
+    writer.write(analysis_path, saved_analysis)
+    writer.write(analysis_path, {**saved_analysis, 'steps_data': [{'step_version': 1, 'step_type': 'a', 'params': {}}]})
+    with open(journal_path) as f:
+        journal = f.read()
+
+    # Another process rewrites the analysis, but leaves an old journal behind
+    writer.forget(analysis_path)
+    writer.write(analysis_path, saved_analysis)
+    with open(journal_path, 'w') as f:
+        f.write(journal)
+
+    with open(analysis_path) as f:
+        assert read_journal(analysis_path, json.load(f)) == saved_analysis
+
+
+def test_analysis_changed_by_another_writer_is_compacted(tmp_path):
+    writer = AnalysisWriter(threaded=False)
+    analysis_path = str(tmp_path / 'analysis.json')
+
+    saved_analysis = {'version': '1', 'steps_data': [], 'public_interface_version': 3, 'args': [], 'code_options': {}}
+    writer.write(analysis_path, saved_analysis)
+    with open(analysis_path, 'w') as f:
+        f.write(json.dumps({**saved_analysis, 'version': '0'}))
+
+    new_saved_analysis = {**saved_analysis, 'steps_data': [{'step_version': 1, 'step_type': 'a', 'params': {}}]}
+    writer.write(analysis_path, new_saved_analysis)
+
+    assert not os.path.exists(get_journal_path(analysis_path))
+    with open(analysis_path) as f:
+        saved = json.load(f)
+    saved.pop('journal_id')
+    assert saved == new_saved_analysis
+
+
+def test_background_writes_are_coalesced(tmp_path):
+    writer = AnalysisWriter()
+    analysis_path = str(tmp_path / 'analysis.json')
+
+    saved_analysis = {'version': '1', 'steps_data': [], 'public_interface_version': 3, 'args': [], 'code_options': {}}
+    steps_data = []
+    for i in range(50):
+        steps_data = steps_data + [{'step_version': 1, 'step_type': 'a', 'params': {'i': i}}]
+        writer.write(analysis_path, {**saved_analysis, 'steps_data': steps_data})
+
+    assert writer.flush(timeout=10)
+
+    with open(analysis_path) as f:
+        assert read_journal(analysis_path, json.load(f))['steps_data'] == steps_data
+
+
+def test_rename_moves_journal(mito):
+    mito.add_column(0, 'B')
+    mito.add_column(0, 'C')
+    analysis_writer.flush()
+    steps_data = read_analysis(mito.mito_backend.analysis_name)['steps_data']
+
+    new_analysis_name = mito.mito_backend.analysis_name + '_renamed'
+    rename_saved_analysis(mito.mito_backend.analysis_name, new_analysis_name)
+    try:
+        assert read_analysis(new_analysis_name)['steps_data'] == steps_data
+        assert not os.path.exists(get_journal_path(get_analysis_path(mito.mito_backend.analysis_name)))
+    finally:
+        delete_saved_analysis(new_analysis_name)
+    assert not os.path.exists(get_journal_path(get_analysis_path(new_analysis_name)))
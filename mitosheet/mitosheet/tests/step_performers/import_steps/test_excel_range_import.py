@@ -675,3 +675,165 @@ def test_excel_range_import_can_add_multiple_end_conditions_no_error():
     assert range2 == 'A1:A3'
     assert range3 == 'A1:A3'
 
+
+@pandas_post_1_2_only
+@python_post_3_6_only
+def test_excel_range_import_reads_sheet_once(monkeypatch):
+    import mitosheet.excel_utils as excel_utils
+    from mitosheet.excel_utils import EXCEL_SHEET_CELLS_CACHE
+    EXCEL_SHEET_CELLS_CACHE.clear()
+
+    sheet_reads = []
+    read_excel_sheet_cells = excel_utils.read_excel_sheet_cells
+    def counting_read_excel_sheet_cells(*args, **kwargs):
+        sheet_reads.append(args)
+        return read_excel_sheet_cells(*args, **kwargs)
+    monkeypatch.setattr(excel_utils, 'read_excel_sheet_cells', counting_read_excel_sheet_cells)
+
+    with pd.ExcelWriter(TEST_FILE_PATH) as writer:
+        TEST_DF_1.to_excel(writer, sheet_name=TEST_SHEET_NAME, index=False)
+        TEST_DF_3.to_excel(writer, sheet_name=TEST_SHEET_NAME, startcol=3, index=False)
+        TEST_DF_4.to_excel(writer, sheet_name=TEST_SHEET_NAME, startrow=5, index=False)
+
+    mito = create_mito_wrapper()
+    mito.excel_range_import(TEST_FILE_PATH, {'type': 'sheet name', 'value': TEST_SHEET_NAME}, [
+        {'type': 'dynamic', 'start_condition': {'type': 'upper left corner value', 'value': 'header 1'}, 'end_condition': {'type': 'first empty cell'}, 'column_end_condition': {'type': 'first empty cell'}, 'df_name': 'dataframe_1'},
+        {'type': 'dynamic', 'start_condition': {'type': 'upper left corner value', 'value': 'header 101'}, 'end_condition': {'type': 'first empty cell'}, 'column_end_condition': {'type': 'first empty cell'}, 'df_name': 'dataframe_2'},
+        {'type': 'range', 'value': 'A6:B8', 'df_name': 'dataframe_3'},
+    ], False)
+
+    assert len(mito.dfs) == 3
+    assert mito.dfs[0].equals(TEST_DF_1)
+    assert mito.dfs[1].equals(TEST_DF_3)
+    assert mito.dfs[2].equals(TEST_DF_4)
+    assert len(sheet_reads) == 1
+
+    # Finding the range again does not read the file again, until it changes
+    assert get_table_range(TEST_FILE_PATH, TEST_SHEET_NAME, 'header 101') == 'D1:E4'
+    assert len(sheet_reads) == 1
+
+    TEST_DF_2.to_excel(TEST_FILE_PATH, sheet_name=TEST_SHEET_NAME, startcol=3, index=False)
+    assert get_table_range(TEST_FILE_PATH, TEST_SHEET_NAME, 'header 100') == 'D1:E2'
+    assert len(sheet_reads) == 2
+
+    os.remove(TEST_FILE_PATH)
+
+@pandas_post_1_2_only
+@python_post_3_6_only
+def test_excel_range_import_reads_errors_as_nan():
+    import openpyxl
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = TEST_SHEET_NAME
+    sheet.append(['A', 'B'])
+    sheet.append([1.0, '#DIV/0!'])
+    sheet.cell(2, 2).data_type = 'e'
+    sheet.append([2.5, 'abc'])
+    workbook.save(TEST_FILE_PATH)
+
+    mito = create_mito_wrapper()
+    mito.excel_range_import(TEST_FILE_PATH, {'type': 'sheet name', 'value': TEST_SHEET_NAME}, [{'type': 'range', 'value': 'A1:B3', 'df_name': 'df1'}], False)
+
+    expected_df = pd.read_excel(TEST_FILE_PATH, sheet_name=TEST_SHEET_NAME)
+    assert mito.dfs[0].equals(expected_df)
+    assert mito.dfs[0]['B'].isna().tolist() == [True, False]
+
+    os.remove(TEST_FILE_PATH)
+
+@pandas_post_1_2_only
+@python_post_3_6_only
+def test_convert_csv_to_excel_finds_same_ranges_as_xlsx_file():
+    from mitosheet.excel_utils import get_csv_sheet_cells, get_table_range_from_excel_sheet_cells
+    from mitosheet.public.v2.excel_utils import convert_csv_file_to_xlsx_file
+
+    with open(TEST_FILE_CSV_PATH, 'w') as f:
+        f.write('title,,\n,,\nheader 1,header 2,=formula\n1,#DIV/0!,\n2,3,\n,,\nheader 100,header 200\n3,4\n')
+
+    mito = create_mito_wrapper()
+    mito.excel_range_import(
+        TEST_FILE_CSV_PATH, 
+        {'type': 'sheet name', 'value': TEST_SHEET_NAME}, 
+        [
+            {'type': 'dynamic', 'df_name': 'df1', 'start_condition': {'type': 'upper left corner value', 'value': 'header 1'}, 'end_condition': {'type': 'first empty cell'}, 'column_end_condition': {'type': 'num columns', 'value': 3}},
+            {'type': 'dynamic', 'df_name': 'df2', 'start_condition': {'type': 'upper left corner value starts with', 'value': 'header 10'}, 'end_condition': {'type': 'row entirely empty'}, 'column_end_condition': {'type': 'first empty cell'}},
+        ], True)
+
+    # The ranges found in the CSV are the same as the ranges found in the XLSX file it converts to
+    xlsx_file_path = convert_csv_file_to_xlsx_file(TEST_FILE_CSV_PATH, TEST_SHEET_NAME)
+    sheet_cells = get_csv_sheet_cells(TEST_FILE_CSV_PATH)
+    for params in [
+        {'upper_left_value': 'header 1'},
+        {'upper_left_value_contains': 'formula', 'bottom_left_corner_consecutive_empty_cells': 1},
+        {'upper_left_value': 'title', 'cumulative_number_of_empty_rows': 2, 'num_columns': 2},
+        {'upper_left_value': 'header 2', 'bottom_left_consecutive_empty_cells_in_first_column': 2},
+        {'upper_left_value_starts_with': 'header 2', 'bottom_left_value_starts_with': '4'},
+    ]:
+        _range = get_table_range(xlsx_file_path, TEST_SHEET_NAME, **params)
+        assert get_table_range_from_excel_sheet_cells(sheet_cells, **params) == _range
+
+    ((start_col_index, start_row_index), (end_col_index, end_row_index)) = get_col_and_row_indexes_from_range(mito.mito_backend.steps_manager.curr_step.execution_data['new_sheet_index_to_df_range'][0])
+    expected_df_1 = pd.read_excel(xlsx_file_path, sheet_name=TEST_SHEET_NAME, skiprows=start_row_index, nrows=end_row_index - start_row_index, usecols='A:C')
+    assert mito.dfs[0].equals(expected_df_1)
+    assert mito.dfs[1].equals(pd.DataFrame({'header 100': [3], 'header 200': [4]}))
+
+    os.remove(xlsx_file_path)
+    os.remove(TEST_FILE_CSV_PATH)
+
+@pandas_post_1_2_only
+@python_post_3_6_only
+def test_convert_csv_to_excel_generated_code_reads_csv_directly():
+    TEST_DF_1.to_csv(TEST_FILE_CSV_PATH, index=False)
+    TEST_DF_2.to_csv(TEST_FILE_CSV_PATH, mode='a', index=False, header=True)
+
+    mito = create_mito_wrapper()
+    mito.excel_range_import(
+        TEST_FILE_CSV_PATH, 
+        {'type': 'sheet name', 'value': TEST_SHEET_NAME}, 
+        [
+            {'type': 'range', 'df_name': 'df1', 'value': 'A1:B2'},
+            {'type': 'dynamic', 'df_name': 'df2', 'start_condition': {'type': 'upper left corner value', 'value': TEST_DF_2.columns[0]}, 'end_condition': {'type': 'first empty cell'}, 'column_end_condition': {'type': 'first empty cell'}}
+        ], True)
+
+    assert mito.transpiled_code == [
+        'from mitosheet.public.v3 import *',
+        'import pandas as pd',
+        '',
+        f"df1 = read_csv_range(r'{TEST_FILE_CSV_PATH}', 'A1:B2')",
+        '',
+        f"_range = get_table_range_from_csv(r'{TEST_FILE_CSV_PATH}', upper_left_value='header 100')",
+        f"df2 = read_csv_range(r'{TEST_FILE_CSV_PATH}', _range)",
+        '',
+    ]
+    assert not os.path.exists(os.path.splitext(TEST_FILE_CSV_PATH)[0] + '_tmp.xlsx')
+
+    os.remove(TEST_FILE_CSV_PATH)
+
+@pandas_post_1_2_only
+@python_post_3_6_only
+def test_excel_range_import_finds_ranges_with_formulas_without_cached_values():
+    # Workbooks written by openpyxl have no cached values for their formulas
+    import openpyxl
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = TEST_SHEET_NAME
+    sheet.append(['A', 'B'])
+    sheet.append([1, 2])
+    sheet.append(['=A2+1', '=B2+1'])
+    sheet.append([3, 4])
+    workbook.save(TEST_FILE_PATH)
+
+    # Formula cells are found with their formulas, so they are not empty cells
+    assert get_table_range(TEST_FILE_PATH, TEST_SHEET_NAME, 'A') == 'A1:B4'
+    assert get_table_range(TEST_FILE_PATH, TEST_SHEET_NAME, upper_left_value_starts_with='=A') == 'A3:B4'
+
+    mito = create_mito_wrapper()
+    mito.excel_range_import(TEST_FILE_PATH, {'type': 'sheet name', 'value': TEST_SHEET_NAME}, [
+        {'type': 'dynamic', 'start_condition': {'type': 'upper left corner value', 'value': 'A'}, 'end_condition': {'type': 'first empty cell'}, 'column_end_condition': {'type': 'first empty cell'}, 'df_name': 'df1'},
+    ], False)
+
+    # But they are read with their cached values, as pd.read_excel reads them
+    expected_df = pd.read_excel(TEST_FILE_PATH, sheet_name=TEST_SHEET_NAME, skiprows=0, nrows=3, usecols='A:B')
+    assert mito.dfs[0].equals(expected_df)
+    assert mito.dfs[0]['A'].isna().tolist() == [False, True, False]
+
+    os.remove(TEST_FILE_PATH)
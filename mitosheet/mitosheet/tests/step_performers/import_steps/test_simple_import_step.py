@@ -85,7 +85,6 @@ def test_can_import_a_single_csv():
     # Remove the test file
     os.remove(TEST_FILE_PATHS[0])
 
-@pytest.mark.skip('Error in delimeter detection, just noting')
 def test_can_import_a_single_csv_with_a_single_column():
     df = pd.DataFrame(data={'date': [1, 2, 3]})
     df.to_csv(TEST_FILE_PATHS[0], index=False)
@@ -934,3 +934,100 @@ def test_pivot_with_rename_works_then_edit_optimized_properly():
     mito.pivot_sheet(0, ['date'], [], {'value': ['sum']}, destination_sheet_index=1)
     assert len(mito.optimized_code_chunks) == 1
 
+
+
+GROUPBY_PIVOT_DF = pd.DataFrame({
+    'A': ['a', 'b', 'c', None, 'a', 'b', 'c', 'a'],
+    'B': [1.0, 2.0, 1.0, 2.0, np.nan, 1.0, 2.0, 1.0],
+    'C': pd.Categorical(['x', 'y', 'x', 'y', 'x', 'y', 'x', 'y'], categories=['x', 'y', 'z']),
+    'D': pd.to_datetime(['2000-01-01', '2000-02-01', '2001-01-01', '2001-02-01', '2000-01-01', '2000-02-01', '2001-01-01', '2001-02-01']),
+    'E': [1, 2, 3, 4, 5, 6, 7, 8],
+    'F': [1.5, np.nan, np.nan, 2.5, 3.5, np.nan, 4.5, 5.5],
+    'G': ['p', 'q', 'p', 'q', 'p', 'q', 'p', 'q'],
+})
+GROUPBY_PIVOT_TESTS = [
+    (['A'], {'E': ['sum']}),
+    (['A'], {'E': ['sum', 'mean'], 'F': ['count', 'std']}),
+    (['B'], {'F': ['max', 'min', 'median']}),
+    (['C'], {'G': ['count unique'], 'E': ['sum']}),
+    (['A', 'C'], {'F': ['mean']}),
+    ([{'column_header': 'D', 'transformation': PCT_DATE_YEAR}], {'E': ['sum']}),
+    ([{'column_header': 'D', 'transformation': PCT_DATE_YEAR_MONTH}, 'A'], {'F': ['sum', 'count']}),
+]
+@pandas_post_1_only
+@pytest.mark.parametrize("pivot_rows, values", GROUPBY_PIVOT_TESTS)
+def test_pivot_without_columns_same_as_pivot_table(pivot_rows, values):
+    mito = create_mito_wrapper(GROUPBY_PIVOT_DF)
+    pivot_rows_with_transforms: List[Any] = [
+        pivot_row if isinstance(pivot_row, dict) else {'column_header': pivot_row, 'transformation': PCT_NO_OP}
+        for pivot_row in pivot_rows
+    ]
+    mito.pivot_sheet(0, pivot_rows_with_transforms, [], values)
+
+    # Pivot the same way the generated code does
+    df = GROUPBY_PIVOT_DF.copy()
+    for chwpt in pivot_rows_with_transforms:
+        if chwpt['transformation'] == PCT_DATE_YEAR:
+            df['D (year)'] = df['D'].dt.year
+        if chwpt['transformation'] == PCT_DATE_YEAR_MONTH:
+            df['D (year-month)'] = df['D'].dt.strftime('%Y-%m')
+    index = [chwpt['column_header'] if chwpt['transformation'] == PCT_NO_OP else f"{chwpt['column_header']} ({chwpt['transformation']})" for chwpt in pivot_rows_with_transforms]
+    pivot_table = df.pivot_table(
+        index=index,
+        values=list(values.keys()),
+        aggfunc={column_header: [pd.Series.nunique if f == 'count unique' else f for f in functions] for column_header, functions in values.items()}
+    )
+    pivot_table.columns = [' '.join([str(c) for c in col]).strip() for col in pivot_table.columns.values]
+    pivot_table = pivot_table.reset_index()
+
+    assert_frame_equal(mito.dfs[1], pivot_table)
+
+
+def test_pivot_edit_reuses_groupby():
+    mito = create_mito_wrapper(GROUPBY_PIVOT_DF)
+    mito.pivot_sheet(0, [{'column_header': 'D', 'transformation': PCT_DATE_YEAR}], [], {'E': ['sum']}, step_id='pivot')
+    mito.pivot_sheet(0, [{'column_header': 'D', 'transformation': PCT_DATE_YEAR}], [], {'E': ['sum', 'mean'], 'F': ['max']}, step_id='pivot')
+
+    pivot_source_cache = mito.mito_backend.steps_manager.pivot_source_cache
+    assert len(pivot_source_cache.cached_pivot_sources) == 1
+    _, pivot_source = list(pivot_source_cache.cached_pivot_sources.values())[0]
+    assert len(pivot_source.groupbys) == 1
+    assert len(pivot_source.transformed_columns) == 1
+    assert mito.dfs[1].equals(pd.DataFrame({'D (year)': [2000, 2001], 'E mean': [3.5, 5.5], 'E sum': [14, 22], 'F max': [3.5, 5.5]}))
+
+
+def test_pivot_after_source_edit_does_not_reuse_groupby():
+    mito = create_mito_wrapper(pd.DataFrame({'A': ['a', 'a', 'b'], 'B': [1, 2, 3]}))
+    mito.pivot_sheet(0, ['A'], [], {'B': ['sum']})
+    mito.set_cell_value(0, 'B', 0, 10)
+    mito.pivot_sheet(0, ['A'], [], {'B': ['sum']}, destination_sheet_index=1)
+
+    assert mito.dfs[1].equals(pd.DataFrame({'A': ['a', 'b'], 'B sum': [12, 3]}))
+
+
+def test_pivot_sources_are_not_shared_between_analyses():
+    mito = create_mito_wrapper(GROUPBY_PIVOT_DF)
+    mito.pivot_sheet(0, ['A'], [], {'E': ['sum']})
+    other_mito = create_mito_wrapper(GROUPBY_PIVOT_DF)
+
+    assert len(mito.mito_backend.steps_manager.pivot_source_cache.cached_pivot_sources) == 1
+    assert len(other_mito.mito_backend.steps_manager.pivot_source_cache.cached_pivot_sources) == 0
+
+
+def test_pivot_sources_are_removed_when_source_state_is_evicted():
+    from mitosheet.step_state_cache import StepStateCache
+    mito = create_mito_wrapper(GROUPBY_PIVOT_DF)
+    steps_manager = mito.mito_backend.steps_manager
+    steps_manager.step_state_cache = StepStateCache(0, 100)
+
+    mito.add_column(0, 'X')
+    mito.pivot_sheet(0, ['A'], [], {'E': ['sum']})
+    assert len(steps_manager.pivot_source_cache.cached_pivot_sources) == 1
+
+    # The source of the pivot is the state of the add column, which is evicted 
+    # once it is no longer the most recently used state
+    for i in range(2):
+        mito.add_column(0, f'Y{i}')
+
+    assert steps_manager.steps_including_skipped[1].post_state.are_dfs_evicted
+    assert len(steps_manager.pivot_source_cache.cached_pivot_sources) == 0
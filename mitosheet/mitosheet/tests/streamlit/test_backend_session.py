@@ -0,0 +1,91 @@
+import pandas as pd
+
+from mitosheet.mito_backend import MitoBackend
+from mitosheet.streamlit.v1.spreadsheet import StreamlitBackendSession
+
+
+def get_add_column_message(session, column_header, num_responses_received=None):
+    msg = {
+        'event': 'edit_event',
+        'id': column_header,
+        'type': 'add_column_edit',
+        'step_id': column_header,
+        'params': {
+            'sheet_index': 0,
+            'column_header': column_header,
+            'column_header_index': -1
+        },
+        'analysis_name': session.mito_backend.analysis_name
+    }
+    if num_responses_received is not None:
+        msg['num_responses_received'] = num_responses_received
+    return msg
+
+
+def test_receives_message_once():
+    session = StreamlitBackendSession(MitoBackend(pd.DataFrame({'A': [1]})))
+    msg = get_add_column_message(session, 'B')
+
+    assert session.receive_message(msg)
+    # The message passer returns the same message on every rerun
+    assert not session.receive_message(msg)
+    assert not session.receive_message(None)
+    assert not session.receive_message({**get_add_column_message(session, 'C'), 'analysis_name': 'other'})
+
+    assert [response['id'] for response in session.responses] == ['B']
+    assert session.mito_backend.steps_manager.dfs[0].columns.tolist() == ['A', 'B']
+
+
+def test_keeps_responses_until_acknowledged():
+    session = StreamlitBackendSession(MitoBackend(pd.DataFrame({'A': [1]})))
+
+    session.receive_message(get_add_column_message(session, 'B'))
+    session.receive_message(get_add_column_message(session, 'C'))
+    assert [response['id'] for response in session.responses] == ['B', 'C']
+    assert session.responses_start_index == 0
+
+    session.receive_message(get_add_column_message(session, 'D', num_responses_received=1))
+    assert [response['id'] for response in session.responses] == ['C', 'D']
+    assert session.responses_start_index == 1
+
+    # Acknowledging old responses again does nothing
+    session.acknowledge_responses(1)
+    assert session.responses_start_index == 1
+
+    session.acknowledge_responses(3)
+    assert session.responses == []
+    assert session.responses_start_index == 3
+
+
+def test_responses_do_not_grow_with_session():
+    session = StreamlitBackendSession(MitoBackend(pd.DataFrame({'A': [1]})))
+
+    num_responses_received = 0
+    for i in range(200):
+        session.receive_message(get_add_column_message(session, f'B{i}', num_responses_received=num_responses_received))
+        num_responses_received = session.responses_start_index + len(session.responses)
+        assert len(session.responses) <= 1
+
+    assert len(session.mito_backend.steps_manager.dfs[0].columns) == 201
+
+
+def test_payloads_are_reused_until_backend_changes():
+    session = StreamlitBackendSession(MitoBackend(pd.DataFrame({'A': [1]})))
+
+    payloads = session.get_payloads()
+    assert session.get_payloads() is payloads
+
+    session.receive_message(get_add_column_message(session, 'B'))
+    new_payloads = session.get_payloads()
+    assert new_payloads is not payloads
+    assert 'B' in new_payloads[0]
+    assert new_payloads[2] == '\n'.join(session.mito_backend.steps_manager.code())
+    assert session.get_payloads() is new_payloads
+
+    session.mito_backend.receive_message({
+        'event': 'update_event',
+        'id': 'undo',
+        'type': 'undo',
+        'params': {}
+    })
+    assert 'B' not in session.get_payloads()[0]
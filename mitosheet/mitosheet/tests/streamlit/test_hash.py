@@ -64,4 +64,49 @@ TEST_HASHES = [
 def test_hash_pandas_dataframe(df1, df2, expected):
     assert len(get_dataframe_hash(df1)) < 100
     assert (get_dataframe_hash(df1) == get_dataframe_hash(df2)) == expected
-    
\ No newline at end of file
+    
+
+def test_hash_large_dataframe_change_outside_sample():
+    df1 = pd.DataFrame({'A': range(200_000), 'B': 1.0})
+    df2 = df1.copy()
+    df2.iloc[123_456, 0] = -1
+    assert get_dataframe_hash(df1) != get_dataframe_hash(df2)
+
+
+def test_hash_unhashable_values():
+    df1 = pd.DataFrame({'A': [[1], [2]], 'B': [{'a': 1}, None]})
+    df2 = pd.DataFrame({'A': [[1], [3]], 'B': [{'a': 1}, None]})
+    assert get_dataframe_hash(df1) == get_dataframe_hash(df1.copy())
+    assert get_dataframe_hash(df1) != get_dataframe_hash(df2)
+
+
+def test_hash_changes_when_column_replaced():
+    df = pd.DataFrame({'A': [1, 2, 3], 'B': [2, 3, 4]})
+    original_hash = get_dataframe_hash(df)
+
+    df['A'] = [1, 2, 4]
+    assert get_dataframe_hash(df) != original_hash
+
+    df['A'] = [1, 2, 3]
+    assert get_dataframe_hash(df) == original_hash
+
+
+def test_hash_changes_when_small_dataframe_changed_in_place():
+    df = pd.DataFrame({'A': [1, 2, 3], 'B': [2, 3, 4]})
+    original_hash = get_dataframe_hash(df)
+
+    df.iloc[1, 0] = 100
+    assert get_dataframe_hash(df) != original_hash
+
+    df.iloc[1, 0] = 2
+    assert get_dataframe_hash(df) == original_hash
+
+
+@pytest.mark.parametrize("row_index", [0, 1, 100_000, -1])
+def test_hash_changes_when_large_dataframe_changed_in_place(row_index):
+    df = pd.DataFrame({'A': range(200_000), 'B': 1.0})
+    original_hash = get_dataframe_hash(df)
+
+    df.iloc[row_index, 0] = -1
+    assert get_dataframe_hash(df) != original_hash
+    assert get_dataframe_hash(df) == get_dataframe_hash(df.copy())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for only reexecuting the formulas that depend on changed columns
+"""
+import pandas as pd
+import pytest
+
+import mitosheet.step_performers.column_steps.set_column_formula as set_column_formula
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.types import FC_NUMBER_GREATER
+from mitosheet.utils import get_new_id
+
+
+@pytest.fixture
+def exec_column_formula_calls(monkeypatch):
+    calls = []
+    exec_column_formula = set_column_formula.exec_column_formula
+
+    def counted_exec_column_formula(*args, **kwargs):
+        calls.append(args)
+        return exec_column_formula(*args, **kwargs)
+
+    monkeypatch.setattr(set_column_formula, 'exec_column_formula', counted_exec_column_formula)
+    return calls
+
+
+def set_formula_with_step_id(mito, formula, sheet_index, column_header, step_id):
+    column_id = mito.mito_backend.steps_manager.curr_step.column_ids.get_column_id_by_header(sheet_index, column_header)
+    return mito.mito_backend.receive_message(
+        {
+            'event': 'edit_event',
+            'id': get_new_id(),
+            'type': 'set_column_formula_edit',
+            'step_id': step_id,
+            'params': {
+                'sheet_index': sheet_index,
+                'column_id': column_id,
+                'formula_label': 0,
+                'index_labels_formula_is_applied_to': {'type': 'entire_column'},
+                'new_formula': formula,
+            }
+        }
+    )
+
+
+def test_replay_reuses_formulas_on_unchanged_sheet(exec_column_formula_calls):
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'B': [1, 2, 3]}))
+    mito.filter(1, 'B', 'And', FC_NUMBER_GREATER, 1)
+    mito.set_formula('=A + 1', 0, 'C', add_column=True)
+    mito.set_formula('=C * 2', 0, 'D', add_column=True)
+    exec_column_formula_calls.clear()
+
+    # Overwriting the filter replays all of the steps after the original filter
+    mito.filter(1, 'B', 'And', FC_NUMBER_GREATER, 2)
+
+    assert len(exec_column_formula_calls) == 0
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'C': [2, 3, 4], 'D': [4, 6, 8]}))
+    assert mito.dfs[1]['B'].tolist() == [3]
+
+
+def test_replay_reexecutes_only_downstream_formulas(exec_column_formula_calls):
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]}))
+    mito.add_column(0, 'C')
+    mito.add_column(0, 'D')
+    mito.add_column(0, 'E')
+    set_formula_with_step_id(mito, '=A + 1', 0, 'C', 'edited_step_id')
+    mito.set_formula('=B + 1', 0, 'D')
+    mito.set_formula('=C * 2', 0, 'E')
+    exec_column_formula_calls.clear()
+
+    # Editing the formula in C skips the original step, and so changes C
+    set_formula_with_step_id(mito, '=A + 10', 0, 'C', 'edited_step_id')
+
+    # E is recomputed, as is the edited formula, but D is not
+    assert len(exec_column_formula_calls) == 2
+    assert mito.dfs[0]['C'].tolist() == [11, 12, 13]
+    assert mito.dfs[0]['D'].tolist() == [5, 6, 7]
+    assert mito.dfs[0]['E'].tolist() == [0, 0, 0]
+
+
+def test_replay_reuses_formulas_after_unchanged_set_cell_value(exec_column_formula_calls):
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]}), pd.DataFrame({'B': [1, 2, 3]}))
+    mito.filter(1, 'B', 'And', FC_NUMBER_GREATER, 1)
+    mito.set_cell_value(0, 'A', 0, '10')
+    mito.set_formula('=A + 1', 0, 'C', add_column=True)
+    mito.set_formula('=B + 1', 0, 'D', add_column=True)
+    exec_column_formula_calls.clear()
+
+    mito.filter(1, 'B', 'And', FC_NUMBER_GREATER, 2)
+
+    # The set cell value is reexecuted on the same data, so C does not change
+    assert len(exec_column_formula_calls) == 0
+    assert mito.dfs[0]['C'].tolist() == [11, 3, 4]
+    assert mito.dfs[0]['D'].tolist() == [5, 6, 7]
+
+
+def test_replay_reexecutes_formulas_after_sheet_changes(exec_column_formula_calls):
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 1)
+    mito.set_formula('=A + 1', 0, 'B', add_column=True)
+    exec_column_formula_calls.clear()
+
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 2)
+
+    assert len(exec_column_formula_calls) == 1
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [2, 3, 4]}, index=[0, 1, 2]).loc[[2]])
+
+
+def test_redo_after_clear_reuses_formulas(exec_column_formula_calls):
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    mito.set_formula('=A + 1', 0, 'B', add_column=True)
+    mito.set_formula('=B + 1', 0, 'C', add_column=True)
+    code = mito.transpiled_code
+    mito.clear()
+    exec_column_formula_calls.clear()
+
+    mito.undo()
+
+    assert len(exec_column_formula_calls) == 0
+    assert mito.dfs[0].equals(pd.DataFrame({'A': [1, 2, 3], 'B': [2, 3, 4], 'C': [3, 4, 5]}))
+    assert mito.transpiled_code == code
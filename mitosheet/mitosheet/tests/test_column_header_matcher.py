@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for finding column headers in formulas
+"""
+import random
+import re
+
+import pandas as pd
+import pytest
+
+from mitosheet.column_headers import ColumnHeaderMatcher, get_column_header_display, get_column_header_matcher
+from mitosheet.parser import parse_formula
+
+
+def get_expected_match_ranges(column_headers, formula):
+    column_headers_sorted = sorted(column_headers, key=lambda ch: len(str(ch)), reverse=True)
+    expected_match_ranges = []
+    for column_header in column_headers_sorted:
+        match_ranges = [match.span() for match in re.finditer(re.escape(get_column_header_display(column_header)), formula)]
+        if len(match_ranges) > 0:
+            expected_match_ranges.append((column_header, match_ranges))
+    return expected_match_ranges
+
+
+@pytest.mark.parametrize("column_headers, formula", [
+    (['A', 'B'], '=A + B'),
+    (['A', 'AA', 'AAA'], '=AAAA + AA'),
+    (['he', 'she', 'his', 'hers'], '=ushers + hishe'),
+    (['ab', 'bab', 'b'], '=ababab'),
+    ([True, False, 1, 1.5], '=IF(true, 1, 1.5) + false'),
+    ([('A', 'B'), ('A', '')], '=A, B + A'),
+    (['A', 'B'], '=C'),
+    (['A B', 'B C'], '=A B C'),
+])
+def test_column_header_matcher_matches_re(column_headers, formula):
+    assert ColumnHeaderMatcher(column_headers).get_match_ranges(formula) == get_expected_match_ranges(column_headers, formula)
+
+
+def test_column_header_matcher_matches_re_random():
+    random.seed(0)
+    for _ in range(100):
+        column_headers = list({''.join(random.choice('abc') for _ in range(random.randint(1, 4))) for _ in range(10)})
+        formula = ''.join(random.choice('abc +') for _ in range(30))
+        assert ColumnHeaderMatcher(column_headers).get_match_ranges(formula) == get_expected_match_ranges(column_headers, formula)
+
+
+def test_column_header_matcher_is_cached_by_column_headers():
+    assert get_column_header_matcher(pd.Index(['A', 'B'])) is get_column_header_matcher(['A', 'B'])
+    assert get_column_header_matcher(['A', 'B']) is not get_column_header_matcher(['A', 'C'])
+    assert get_column_header_matcher([1]) is not get_column_header_matcher([True])
+
+
+def test_parse_formula_on_wide_sheet_matches_longest_column_header():
+    df = pd.DataFrame({f'C{i}': [i] for i in range(2000)})
+    assert parse_formula('=C1 + C1999 + C19', 'C0', 0, {'type': 'entire_column'}, df)[2] == {'C1', 'C1999', 'C19'}
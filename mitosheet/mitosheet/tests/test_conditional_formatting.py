@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for finding the cells that conditional formats apply to
+"""
+import base64
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import mitosheet.step_performers.filter as filter_step_performer
+from mitosheet.pro.conditional_formatting_utils import get_conditonal_formatting_result
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.types import FC_NUMBER_GREATER, FC_NUMBER_HIGHEST, FC_NUMBER_LESS, FC_STRING_CONTAINS
+
+
+def read_bitmap(bitmap, num_rows):
+    """
+    Reads the bitmap like the frontend does
+    """
+    bits = np.unpackbits(np.frombuffer(base64.b64decode(bitmap), dtype=np.uint8), bitorder='little')
+    return bits[:num_rows].astype(bool).tolist()
+
+
+def get_formatted_rows(conditional_formatting_result, column_id, num_rows):
+    """
+    Returns the format of each displayed row in the column, where the last format that applies wins
+    """
+    formatted_rows = [None] * num_rows
+    for column_format in conditional_formatting_result['results'][column_id]:
+        for row, applies in enumerate(read_bitmap(column_format['bitmap'], num_rows)):
+            if applies:
+                formatted_rows[row] = column_format['backgroundColor']
+    return formatted_rows
+
+
+def get_conditional_format(format_uuid, column_ids, filters, background_color):
+    return {
+        'format_uuid': format_uuid,
+        'columnIDs': column_ids,
+        'filters': filters,
+        'color': None,
+        'backgroundColor': background_color,
+    }
+
+
+@pytest.fixture
+def applied_filter_calls(monkeypatch):
+    calls = []
+    get_applied_filter = filter_step_performer.get_applied_filter
+
+    def counted_get_applied_filter(df, column_header, filter_):
+        calls.append((len(df), column_header, filter_['condition']))
+        return get_applied_filter(df, column_header, filter_)
+
+    monkeypatch.setattr(filter_step_performer, 'get_applied_filter', counted_get_applied_filter)
+    return calls
+
+
+def test_conditional_formatting_last_format_applies():
+    df = pd.DataFrame({'A': [1, 5, 10, 15], 'B': ['a', 'ab', 'b', 'c']})
+    mito = create_mito_wrapper(df)
+    conditional_formats = [
+        get_conditional_format('1', ['A'], [{'condition': FC_NUMBER_GREATER, 'value': 2}], 'red'),
+        get_conditional_format('2', ['A'], [{'condition': FC_NUMBER_GREATER, 'value': 8}], 'blue'),
+        get_conditional_format('3', ['B'], [{'condition': FC_STRING_CONTAINS, 'value': 'a'}], 'green'),
+        get_conditional_format('4', ['A'], [{'condition': FC_NUMBER_GREATER, 'value': 100}], 'orange'),
+    ]
+
+    result = get_conditonal_formatting_result(mito.mito_backend.steps_manager.curr_step.final_defined_state, 0, mito.dfs[0], conditional_formats)
+
+    assert result['invalid_conditional_formats'] == {}
+    assert get_formatted_rows(result, 'A', 4) == [None, 'red', 'blue', 'blue']
+    assert get_formatted_rows(result, 'B', 4) == ['green', 'green', None, None]
+    # Formats that apply to no displayed rows are not sent
+    assert [column_format['backgroundColor'] for column_format in result['results']['A']] == ['red', 'blue']
+
+
+def test_conditional_formatting_with_filter_groups():
+    df = pd.DataFrame({'A': range(10)})
+    mito = create_mito_wrapper(df)
+    conditional_formats = [
+        get_conditional_format('1', ['A'], [
+            {'condition': FC_NUMBER_GREATER, 'value': 1},
+            {'operator': 'Or', 'filters': [{'condition': FC_NUMBER_LESS, 'value': 3}, {'condition': FC_NUMBER_GREATER, 'value': 7}]}
+        ], 'red'),
+    ]
+
+    result = get_conditonal_formatting_result(mito.mito_backend.steps_manager.curr_step.final_defined_state, 0, mito.dfs[0], conditional_formats)
+
+    assert get_formatted_rows(result, 'A', 10) == [None, None, 'red', None, None, None, None, None, 'red', 'red']
+
+
+def test_conditional_formatting_only_evaluates_displayed_rows(applied_filter_calls):
+    df = pd.DataFrame({'A': range(100)})
+    mito = create_mito_wrapper(df)
+    conditional_formats = [
+        get_conditional_format('1', ['A'], [{'condition': FC_NUMBER_GREATER, 'value': 50}], 'red'),
+        get_conditional_format('2', ['A'], [{'condition': FC_NUMBER_HIGHEST, 'value': 45}], 'blue'),
+    ]
+    applied_filter_calls.clear()
+
+    result = get_conditonal_formatting_result(mito.mito_backend.steps_manager.curr_step.final_defined_state, 0, mito.dfs[0], conditional_formats, max_rows=10, start_row=50)
+
+    # Only the conditions that need the full dataframe are evaluated on all of it
+    assert applied_filter_calls == [(10, 'A', FC_NUMBER_GREATER), (100, 'A', FC_NUMBER_HIGHEST)]
+    assert get_formatted_rows(result, 'A', 10) == [None] + ['red'] * 4 + ['blue'] * 5
+
+
+def test_conditional_formatting_shares_filters_between_formats(applied_filter_calls):
+    df = pd.DataFrame({'A': range(10), 'B': range(10)})
+    mito = create_mito_wrapper(df)
+    conditional_formats = [
+        get_conditional_format('1', ['A', 'B'], [{'condition': FC_NUMBER_GREATER, 'value': 5}], 'red'),
+        get_conditional_format('2', ['A'], [{'condition': FC_NUMBER_GREATER, 'value': 5}, {'condition': FC_NUMBER_LESS, 'value': 8}], 'blue'),
+        get_conditional_format('3', ['A'], [{'condition': FC_NUMBER_GREATER, 'value': 6}], 'green'),
+    ]
+    applied_filter_calls.clear()
+
+    result = get_conditonal_formatting_result(mito.mito_backend.steps_manager.curr_step.final_defined_state, 0, mito.dfs[0], conditional_formats)
+
+    assert applied_filter_calls == [
+        (10, 'A', FC_NUMBER_GREATER), (10, 'B', FC_NUMBER_GREATER), (10, 'A', FC_NUMBER_LESS), (10, 'A', FC_NUMBER_GREATER)
+    ]
+    assert get_formatted_rows(result, 'A', 10) == [None] * 6 + ['blue'] + ['green'] * 3
+    assert get_formatted_rows(result, 'B', 10) == [None] * 6 + ['red'] * 4
+
+
+def test_conditional_formatting_invalid_columns():
+    df = pd.DataFrame({'A': range(10), 'B': ['a'] * 10})
+    mito = create_mito_wrapper(df)
+    conditional_formats = [
+        get_conditional_format('1', ['B', 'C', 'A'], [{'condition': FC_NUMBER_GREATER, 'value': 5}], 'red'),
+    ]
+
+    result = get_conditonal_formatting_result(mito.mito_backend.steps_manager.curr_step.final_defined_state, 0, mito.dfs[0], conditional_formats)
+
+    assert result['invalid_conditional_formats'] == {'1': ['B', 'C']}
+    assert get_formatted_rows(result, 'A', 10) == [None] * 6 + ['red'] * 4
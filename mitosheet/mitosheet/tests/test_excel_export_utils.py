@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for streaming dataframes into write-only Excel workbooks
+"""
+import datetime
+from copy import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+
+import mitosheet.excel_export_utils as excel_export_utils
+from mitosheet.excel_export_utils import write_df_to_write_only_sheet
+from mitosheet.public.v3.formatting import get_header_named_style, get_row_named_styles
+
+EXPORT_DFS = [
+    pd.DataFrame({'A': [1, 2, 3], 'B': [1.5, np.nan, 3.5]}),
+    pd.DataFrame({'A': [1.5, np.inf, -np.inf], 'B': ['a', None, '=1+1'], 'C': [True, False, True]}),
+    pd.DataFrame({
+        'A': pd.to_datetime(['2020-01-01', None, '2021-05-05 10:00']),
+        'B': pd.to_timedelta(['1 day', '2 hours', None]),
+        'C': [datetime.date(2020, 1, 1), 1, 'x'],
+        5: [1, 2, 3]
+    }),
+    pd.DataFrame({'A': range(25), 'B': [str(i) for i in range(25)]}),
+    pd.DataFrame({'A': []}),
+]
+
+
+def write_df(tmp_path, df, header_style=None, row_styles=None):
+    workbook = Workbook(write_only=True)
+    if header_style is not None:
+        workbook.add_named_style(header_style)
+    if row_styles is not None:
+        workbook.add_named_style(row_styles[0])
+        workbook.add_named_style(row_styles[1])
+    write_df_to_write_only_sheet(
+        workbook, 'df', df,
+        header_style_name=header_style.name if header_style is not None else None,
+        row_style_names=(row_styles[0].name, row_styles[1].name) if row_styles is not None else None
+    )
+    workbook.save(tmp_path / 'streamed.xlsx')
+    return load_workbook(tmp_path / 'streamed.xlsx')['df']
+
+
+def write_df_with_pandas(tmp_path, df):
+    with pd.ExcelWriter(tmp_path / 'pandas.xlsx', engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='df', index=False)
+    return load_workbook(tmp_path / 'pandas.xlsx')['df']
+
+
+def get_cells(sheet):
+    return [
+        [(None if cell.value == '' else cell.value, cell.number_format, copy(cell.font), copy(cell.border), copy(cell.alignment)) for cell in row]
+        for row in sheet.iter_rows()
+    ]
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # So that the tests write dataframes in multiple chunks
+    monkeypatch.setattr(excel_export_utils, 'EXCEL_EXPORT_CHUNK_SIZE', 4)
+
+
+@pytest.mark.parametrize("df", EXPORT_DFS)
+def test_write_df_to_write_only_sheet_same_as_to_excel(tmp_path, df):
+    sheet = write_df(tmp_path, df)
+
+    pandas_sheet = write_df_with_pandas(tmp_path, df)
+
+    assert get_cells(sheet) == get_cells(pandas_sheet)
+
+
+@pytest.mark.parametrize("df", EXPORT_DFS)
+def test_write_df_to_write_only_sheet_styles_rows(tmp_path, df):
+    header_style = get_header_named_style('df', header_background_color='#000000', header_font_color='#ffffff')
+    row_styles = get_row_named_styles('df', even_background_color='#ff0000', odd_font_color='#00ff00')
+
+    sheet = write_df(tmp_path, df, header_style=header_style, row_styles=row_styles)
+
+    assert [cell.style for cell in sheet[1]] == ['df_Header'] * len(df.columns)
+    for row_index, row in enumerate(sheet.iter_rows(min_row=2), start=2):
+        assert len(row) == len(df.columns)
+        assert all(cell.style == ('df_Even' if row_index % 2 == 0 else 'df_Odd') for cell in row)
+    assert sheet.max_row == len(df) + 1
+
+    # Styling the rows keeps the values and their number formats
+    pandas_sheet = write_df_with_pandas(tmp_path, df)
+    assert [[cell[:2] for cell in row] for row in get_cells(sheet)[1:]] == [[cell[:2] for cell in row] for row in get_cells(pandas_sheet)[1:]]
+
+
+def test_write_df_to_write_only_sheet_errors_on_timezones(tmp_path):
+    df = pd.DataFrame({'A': pd.to_datetime(['2020-01-01']).tz_localize('UTC')})
+
+    with pytest.raises(ValueError):
+        write_df(tmp_path, df)
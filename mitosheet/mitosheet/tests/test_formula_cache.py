@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the cache of parsed formulas
+"""
+import pandas as pd
+import pytest
+
+from mitosheet.errors import MitoError
+from mitosheet.formula_cache import FORMULA_CACHE, INDEX_DIGEST_CACHE, CachedFormula, FormulaCache
+from mitosheet.parser import _parse_formula, compile_formula, parse_formula
+
+ENTIRE_COLUMN = {'type': 'entire_column'}
+
+
+def test_parse_formula_is_cached():
+    FORMULA_CACHE.clear()
+    df = pd.DataFrame({'A': [1, 2, 3]})
+
+    parse_formula('=A + 1', 'B', 0, ENTIRE_COLUMN, df)
+    assert len(FORMULA_CACHE.cached_formulas) == 1
+
+    # Also a hit for a copy of the dataframe
+    assert parse_formula('=A + 1', 'B', 0, ENTIRE_COLUMN, df.copy()) == ("df['B'] = df['A'] + 1", set(), {'A'}, set())
+    assert len(FORMULA_CACHE.cached_formulas) == 1
+
+
+def test_parse_formula_returns_copies_of_cached_sets():
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    _, _, column_header_dependencies, _ = parse_formula('=A + 1', 'B', 0, ENTIRE_COLUMN, df)
+    column_header_dependencies.add('C')
+
+    assert parse_formula('=A + 1', 'B', 0, ENTIRE_COLUMN, df)[2] == {'A'}
+
+
+@pytest.mark.parametrize("formula, df_one, df_two", [
+    # Different indexes change the row offsets
+    ('=A1', pd.DataFrame({'A': [1, 2, 3]}, index=[0, 1, 2]), pd.DataFrame({'A': [1, 2, 3]}, index=[1, 0, 2])),
+    ('=A1', pd.DataFrame({'A': [1, 2, 3]}, index=['0', '1', '2']), pd.DataFrame({'A': [1, 2, 3]}, index=[0, 1, 2])),
+    # Different dtypes change how the column is shifted
+    ('=A1', pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'A': ['1', '2', '3']})),
+    # Different columns change the range
+    ('=A:C', pd.DataFrame({'A': [1], 'B': [2], 'C': [3]}), pd.DataFrame({'A': [1], 'C': [3]})),
+    # Headers that are equal, but of different types
+    ('=SUM(1)', pd.DataFrame({1: [1]}), pd.DataFrame({True: [1]})),
+])
+def test_parse_formula_cache_depends_on_sheet(formula, df_one, df_two):
+    for df in [df_one, df_two, df_one, df_two]:
+        assert parse_formula(formula, 'B', 0, ENTIRE_COLUMN, df) == _parse_formula(formula, 'B', 0, ENTIRE_COLUMN, df, 'df', True, True)
+
+
+@pytest.mark.parametrize("formula, df_one, df_two", [
+    ('=A1', pd.DataFrame({'A': [1, 2, 3]}, index=[0, 1, 2]), pd.DataFrame({'A': [1, 2, 3]}, index=[1, 0, 2])),
+    ('=A1', pd.DataFrame({'A': [1, 2, 3]}, index=['0', '1', '2']), pd.DataFrame({'A': [1, 2, 3]}, index=[0, 1, 2])),
+])
+def test_parse_formula_cache_depends_on_sheet_version(formula, df_one, df_two):
+    FORMULA_CACHE.clear()
+    INDEX_DIGEST_CACHE.clear()
+    for sheet_version, df in [(-1, df_one), (-2, df_two), (-1, df_one), (-2, df_two)]:
+        assert parse_formula(formula, 'B', 0, ENTIRE_COLUMN, df, sheet_version=sheet_version) == _parse_formula(formula, 'B', 0, ENTIRE_COLUMN, df, 'df', True, True)
+
+
+def test_index_is_hashed_once_per_sheet_version(monkeypatch):
+    FORMULA_CACHE.clear()
+    INDEX_DIGEST_CACHE.clear()
+
+    hashed_indexes = []
+    hash_pandas_object = pd.util.hash_pandas_object
+    def counting_hash_pandas_object(obj, *args, **kwargs):
+        hashed_indexes.append(obj)
+        return hash_pandas_object(obj, *args, **kwargs)
+    monkeypatch.setattr(pd.util, 'hash_pandas_object', counting_hash_pandas_object)
+
+    df = pd.DataFrame({'A': [1, 2, 3]}, index=['a', 'b', 'c'])
+    # Copies of a state create new index objects, but keep the same sheet version
+    for _ in range(3):
+        parse_formula('=A + 1', 'B', 0, ENTIRE_COLUMN, df.copy(deep=True), sheet_version=-1)
+    assert len(hashed_indexes) == 1
+    assert len(FORMULA_CACHE.cached_formulas) == 1
+
+    # Without a sheet version, we do not hash the index, and do not cache the formula
+    parse_formula('=A + 2', 'B', 0, ENTIRE_COLUMN, df)
+    assert len(hashed_indexes) == 1
+    assert len(FORMULA_CACHE.cached_formulas) == 1
+
+
+def test_parse_formula_cache_depends_on_where_formula_is_applied():
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    specific_index_labels = {'type': 'specific_index_labels', 'index_labels': [1]}
+
+    for index_labels_formula_is_applied_to in [ENTIRE_COLUMN, specific_index_labels, ENTIRE_COLUMN]:
+        assert parse_formula('=A0', 'B', 1, index_labels_formula_is_applied_to, df) == \
+            _parse_formula('=A0', 'B', 1, index_labels_formula_is_applied_to, df, 'df', True, True)
+
+    assert parse_formula('=A0', 'B', 0, ENTIRE_COLUMN, df) != parse_formula('=A0', 'B', 1, ENTIRE_COLUMN, df)
+
+
+def test_parse_formula_checks_errors_if_cached_without_checking():
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    parse_formula('=A <> 1', 'B', 0, ENTIRE_COLUMN, df, throw_errors=False)
+
+    with pytest.raises(MitoError):
+        parse_formula('=A <> 1', 'B', 0, ENTIRE_COLUMN, df, throw_errors=True)
+
+
+def test_compile_formula_is_cached():
+    df = pd.DataFrame({'A': [1, 2, 3]})
+    code = compile_formula('=A + 1', 'B', 0, ENTIRE_COLUMN, df)
+    assert compile_formula('=A + 1', 'B', 0, ENTIRE_COLUMN, df) is code
+
+    exec(code, {'df': df})
+    assert df['B'].tolist() == [2, 3, 4]
+
+
+def test_formula_cache_evicts_least_recently_used():
+    formula_cache = FormulaCache(2)
+    formula_cache.set('A', CachedFormula('', set(), set(), set(), True))
+    formula_cache.set('B', CachedFormula('', set(), set(), set(), True))
+    formula_cache.get('A')
+    formula_cache.set('C', CachedFormula('', set(), set(), set(), True))
+
+    assert list(formula_cache.cached_formulas.keys()) == ['A', 'C']
+
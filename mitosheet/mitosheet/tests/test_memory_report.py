@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for the memory report
+"""
+import pandas as pd
+
+from mitosheet.memory_report import get_steps_memory_report
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+
+def test_memory_report_has_entry_per_step():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    mito.add_column(0, 'B')
+    mito.set_formula('=A + 1', 0, 'B')
+
+    memory_report = get_steps_memory_report(mito.mito_backend.steps_manager.steps_including_skipped)
+    assert [entry['step_type'] for entry in memory_report] == ['initialize', 'add_column', 'set_column_formula']
+    for entry in memory_report:
+        assert entry['total_bytes'] == entry['dataframe_bytes'] + entry['metadata_bytes']
+
+
+def test_memory_report_does_not_count_untouched_sheets_twice():
+    df = pd.DataFrame({'A': list(range(100_000))})
+    mito = create_mito_wrapper(df, pd.DataFrame({'B': [1, 2, 3]}))
+    mito.add_column(1, 'C')
+
+    memory_report = get_steps_memory_report(mito.mito_backend.steps_manager.steps_including_skipped)
+
+    # The first sheet is not touched by the add column, so is not retained again
+    assert memory_report[0]['dataframe_bytes'] >= 800_000
+    assert memory_report[1]['dataframe_bytes'] < 800_000
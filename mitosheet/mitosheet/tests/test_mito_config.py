@@ -25,6 +25,8 @@ from mitosheet.enterprise.mito_config import (
     MITO_CONFIG_FEATURE_DISPLAY_AI_TRANSFORMATION,
     MITO_CONFIG_FEATURE_TELEMETRY,
     MITO_CONFIG_PRO,
+    MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB,
+    DEFAULT_MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB,
     MitoConfig
 )
 
@@ -71,7 +73,8 @@ def test_none_works():
         MITO_CONFIG_LLM_URL: None,
         MITO_CONFIG_ANALYTICS_URL: None,
         MITO_CONFIG_FEATURE_TELEMETRY: True,
-        MITO_CONFIG_PRO: False
+        MITO_CONFIG_PRO: False,
+        MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB: DEFAULT_MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB
     }
 
 def test_none_config_version_is_string():
@@ -108,7 +111,8 @@ def test_version_2_works():
         MITO_CONFIG_LLM_URL: None,
         MITO_CONFIG_ANALYTICS_URL: None,
         MITO_CONFIG_FEATURE_TELEMETRY: True,
-        MITO_CONFIG_PRO: False
+        MITO_CONFIG_PRO: False,
+        MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB: DEFAULT_MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB
     }
 
     # Delete the environmnet variables for the next test
@@ -132,7 +136,8 @@ def test_mito_config_update_version_1_to_2():
         MITO_CONFIG_LLM_URL: None,
         MITO_CONFIG_ANALYTICS_URL: None,
         MITO_CONFIG_FEATURE_TELEMETRY: True,
-        MITO_CONFIG_PRO: False
+        MITO_CONFIG_PRO: False,
+        MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB: DEFAULT_MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB
     }    
 
     # Delete the environmnet variables for the next test
@@ -156,7 +161,8 @@ def test_mito_config_enable_snowflake_import():
         MITO_CONFIG_LLM_URL: None,
         MITO_CONFIG_ANALYTICS_URL: None,
         MITO_CONFIG_FEATURE_TELEMETRY: True,
-        MITO_CONFIG_PRO: False
+        MITO_CONFIG_PRO: False,
+        MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB: DEFAULT_MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB
     }    
 
     delete_all_mito_config_environment_variables()
@@ -180,7 +186,8 @@ def test_mito_config_dont_display_snowflake_import():
         MITO_CONFIG_LLM_URL: None,
         MITO_CONFIG_ANALYTICS_URL: None,
         MITO_CONFIG_FEATURE_TELEMETRY: True,
-        MITO_CONFIG_PRO: False
+        MITO_CONFIG_PRO: False,
+        MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB: DEFAULT_MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB
     }    
 
     delete_all_mito_config_environment_variables()
@@ -202,7 +209,8 @@ def test_mito_config_dont_display_ai_transform():
         MITO_CONFIG_LLM_URL: None,
         MITO_CONFIG_ANALYTICS_URL: None,
         MITO_CONFIG_FEATURE_TELEMETRY: True,
-        MITO_CONFIG_PRO: False
+        MITO_CONFIG_PRO: False,
+        MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB: DEFAULT_MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB
     }    
 
     delete_all_mito_config_environment_variables()
@@ -224,3 +232,13 @@ def test_mit_config_enable_pro_telemetry():
     from mitosheet.user import is_pro
     assert is_pro()
 
+
+def test_mito_config_max_step_states_memory_mb():
+    
+    os.environ[MITO_CONFIG_VERSION] = "2"
+    os.environ[MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB] = "512"
+
+    mito_config = MitoConfig()
+    assert mito_config.get_max_step_states_memory_mb() == 512
+
+    delete_all_mito_config_environment_variables()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for sending the sheet data with column buffers
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.utils import (MAX_COLUMNS, MAX_ROWS, NpEncoder, dfs_to_array_for_json,
+                             get_column_data_buffer, get_new_id)
+
+
+MAX_SAFE_INTEGER = 2 ** 53 - 1
+
+def read_column_buffer(column_buffer, buffers, is_index):
+    """
+    Reads the column buffer like the frontend does
+    """
+    dtype = 'uint8' if column_buffer['dtype'] == 'bool' else column_buffer['dtype']
+    array = np.frombuffer(buffers[column_buffer['bufferIndex']], dtype=dtype)
+    if column_buffer['dtype'] == 'bool':
+        return [bool(value) for value in array]
+    if column_buffer['dtype'] in ['int64', 'uint64']:
+        return [value if abs(value) <= MAX_SAFE_INTEGER else str(value) for value in array.tolist()]
+    missing_value = None if is_index else 'NaN'
+    return [value if np.isfinite(value) else missing_value for value in array.tolist()]
+
+
+def get_sheet_data_array_from_buffers(sheet_data_with_buffers):
+    sheet_data_json, buffers = sheet_data_with_buffers
+    sheet_data_array = json.loads(sheet_data_json)
+    for sheet_data in sheet_data_array:
+        for column_data in sheet_data['data']:
+            if isinstance(column_data['columnData'], dict):
+                column_data['columnData'] = read_column_buffer(column_data['columnData'], buffers, False)
+        if isinstance(sheet_data['index'], dict):
+            sheet_data['index'] = read_column_buffer(sheet_data['index'], buffers, True)
+    return sheet_data_array
+
+
+def assert_sheet_data_array_equal(sheet_data_array, expected_sheet_data_array):
+    """
+    Floats are sent in the column buffers exactly, but are rounded to 10 
+    decimal places in the JSON, so we compare them approximately
+    """
+    if isinstance(expected_sheet_data_array, float):
+        assert sheet_data_array == pytest.approx(expected_sheet_data_array, rel=1e-9, abs=1e-10)
+    elif isinstance(expected_sheet_data_array, list):
+        assert isinstance(sheet_data_array, list) and len(sheet_data_array) == len(expected_sheet_data_array)
+        for value, expected_value in zip(sheet_data_array, expected_sheet_data_array):
+            assert_sheet_data_array_equal(value, expected_value)
+    elif isinstance(expected_sheet_data_array, dict):
+        assert isinstance(sheet_data_array, dict) and sheet_data_array.keys() == expected_sheet_data_array.keys()
+        for key, expected_value in expected_sheet_data_array.items():
+            assert_sheet_data_array_equal(sheet_data_array[key], expected_value)
+    else:
+        assert sheet_data_array == expected_sheet_data_array and type(sheet_data_array) == type(expected_sheet_data_array)
+
+
+SHEET_DATA_DFS = [
+    pd.DataFrame({'A': [1, 2, 3]}),
+    pd.DataFrame({'A': [0.1 + 0.2, np.nan, np.inf], 'B': [-np.inf, 1e300, 1.5]}),
+    pd.DataFrame({'A': [True, False, True], 'B': ['a', None, 'c']}),
+    pd.DataFrame({'A': np.array([1, 2, 3], dtype='int8'), 'B': np.array([1, 2, 3], dtype='uint32'), 'C': np.array([1.1, 2.2, 3.3], dtype='float32')}),
+    pd.DataFrame({'A': pd.to_datetime(['2020-01-01', '2020-01-02', '2020-01-03']), 'B': pd.to_timedelta([1, 2, 3], unit='d')}),
+    pd.DataFrame({'A': pd.array([1, None, 3], dtype='Int64'), 'B': [1, 2, 3]}),
+    pd.DataFrame({'A': [1, 2, 3]}, index=[10, 20, 30]),
+    pd.DataFrame({'A': [1, 2, 3]}, index=[1.5, np.nan, np.inf]),
+    pd.DataFrame({'A': [1, 2, 3]}, index=['a', 'b', 'c']),
+    pd.DataFrame({'A': [1, 2, 3]}, index=pd.to_datetime(['2020-01-01', '2020-01-02', '2020-01-03'])),
+    pd.DataFrame({'A': range(MAX_ROWS + 10), 'B': [str(i) for i in range(MAX_ROWS + 10)]}),
+    pd.DataFrame({i: [1, 2] if i % 2 == 0 else ['a', 'b'] for i in range(MAX_COLUMNS + 10)}),
+]
+
+@pytest.mark.parametrize("df", SHEET_DATA_DFS)
+def test_sheet_data_with_buffers_is_same_as_json(df):
+    mito = create_mito_wrapper(df)
+    sheet_data_array = json.loads(mito.sheet_data_json)
+    assert_sheet_data_array_equal(get_sheet_data_array_from_buffers(mito.mito_backend.steps_manager.sheet_data_with_buffers), sheet_data_array)
+
+
+def test_sheet_data_json_is_same_as_without_buffers():
+    mito = create_mito_wrapper(*SHEET_DATA_DFS)
+    steps_manager = mito.mito_backend.steps_manager
+    assert mito.sheet_data_json == json.dumps(dfs_to_array_for_json(
+        steps_manager.curr_step.final_defined_state,
+        set(range(len(SHEET_DATA_DFS))),
+        [],
+        steps_manager.curr_step.dfs,
+        steps_manager.curr_step.df_names,
+        steps_manager.curr_step.df_sources,
+        steps_manager.curr_step.column_formulas,
+        steps_manager.curr_step.column_filters,
+        steps_manager.curr_step.column_ids,
+        steps_manager.curr_step.df_formats,
+    ), cls=NpEncoder)
+
+
+def test_large_integers_are_not_rounded():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [2 ** 60 + 1, 1], 'B': np.array([2 ** 64 - 1, 1], dtype='uint64')}, index=[2 ** 53 + 1, 2]))
+    sheet_data = get_sheet_data_array_from_buffers(mito.mito_backend.steps_manager.sheet_data_with_buffers)[0]
+    assert sheet_data['data'][0]['columnData'] == [str(2 ** 60 + 1), 1]
+    assert sheet_data['data'][1]['columnData'] == [str(2 ** 64 - 1), 1]
+    assert sheet_data['index'] == [str(2 ** 53 + 1), 2]
+
+    sheet_data = json.loads(mito.sheet_data_json)[0]
+    assert sheet_data['data'][0]['columnData'] == [2 ** 60 + 1, 1]
+    assert sheet_data['index'] == [2 ** 53 + 1, 2]
+
+
+@pytest.mark.parametrize("values, dtype", [
+    (pd.Series([1, 2, 3]), 'int64'),
+    (pd.Series([1.5, 2.5]), 'float64'),
+    (pd.Series([1, 2], dtype='int16'), 'int16'),
+    (pd.Series([1, 2], dtype='uint64'), 'uint64'),
+    (pd.Series([1.5, 2.5], dtype='float32'), 'float64'),
+    (pd.Series([True, False]), 'bool'),
+    (pd.RangeIndex(3), 'int64'),
+])
+def test_get_column_data_buffer(values, dtype):
+    column_buffer = get_column_data_buffer(values)
+    assert column_buffer is not None
+    assert column_buffer['dtype'] == dtype
+    assert column_buffer['buffer'].flags['C_CONTIGUOUS']
+    assert len(column_buffer['buffer']) == len(values)
+
+
+@pytest.mark.parametrize("values", [
+    pd.Series(['a', 'b']),
+    pd.Series([1, 'a']),
+    pd.Series(pd.to_datetime(['2020-01-01'])),
+    pd.Series([1, None], dtype='Int64'),
+    pd.Index(['a', 'b']),
+])
+def test_get_column_data_buffer_returns_none_for_non_numeric(values):
+    assert get_column_data_buffer(values) is None
+
+
+def test_sheet_data_with_buffers_updates_after_edits():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'B': [1.5, 2.5]}))
+    mito.mito_backend.steps_manager.sheet_data_with_buffers
+
+    mito.set_formula('=A * 2', 0, 'C', add_column=True)
+    mito.delete_row(1, [0])
+    assert_sheet_data_array_equal(get_sheet_data_array_from_buffers(mito.mito_backend.steps_manager.sheet_data_with_buffers), json.loads(mito.sheet_data_json))
+
+    mito.undo()
+    assert_sheet_data_array_equal(get_sheet_data_array_from_buffers(mito.mito_backend.steps_manager.sheet_data_with_buffers), json.loads(mito.sheet_data_json))
+
+
+def test_sheet_data_json_only_encodes_changed_sheets():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1.5, 2.5, 3.5]}), pd.DataFrame({'B': [1.5, 2.5]}))
+    steps_manager = mito.mito_backend.steps_manager
+    steps_manager.sheet_data_json
+    unchanged_sheet_json = steps_manager.saved_sheet_data_json[steps_manager.saved_sheet_data_versions[1]]
+
+    mito.set_formula('=A * 2', 0, 'C', add_column=True)
+    sheet_data_array = json.loads(mito.sheet_data_json)
+
+    assert len(steps_manager.saved_sheet_data_json) == 2
+    assert steps_manager.saved_sheet_data_json[steps_manager.saved_sheet_data_versions[1]] is unchanged_sheet_json
+    assert sheet_data_array[0]['data'][1]['columnData'] == [3.0, 5.0, 7.0]
+    assert_sheet_data_array_equal(get_sheet_data_array_from_buffers(steps_manager.sheet_data_with_buffers), sheet_data_array)
+
+    mito.delete_dataframe(1)
+    assert len(json.loads(mito.sheet_data_json)) == 1
+    assert len(steps_manager.saved_sheet_data_json) == 1
+
+
+def test_sends_buffers_only_if_frontend_accepts_them():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    responses = []
+    mito.mito_backend.mito_send = lambda response, buffers=None: responses.append((response, buffers))
+
+    event = {
+        'event': 'edit_event',
+        'id': get_new_id(),
+        'type': 'add_column_edit',
+        'step_id': get_new_id(),
+        'params': {
+            'sheet_index': 0,
+            'column_header': 'B',
+            'column_header_index': 1
+        }
+    }
+    mito.mito_backend.receive_message(event)
+    mito.mito_backend.receive_message({**event, 'id': get_new_id(), 'step_id': get_new_id(), 'params': {**event['params'], 'column_header': 'C'}, 'accepts_sheet_data_buffers': True})
+
+    (json_response, json_buffers), (buffers_response, buffers) = responses
+    assert json_buffers is None
+    assert json.loads(json_response['shared_variables']['sheet_data_json'])[0]['data'][0]['columnData'] == [1, 2, 3]
+    assert len(buffers) > 0
+
+    sheet_data_array = get_sheet_data_array_from_buffers((buffers_response['shared_variables']['sheet_data_json'], buffers))
+    assert sheet_data_array == json.loads(mito.sheet_data_json)
+    assert sheet_data_array[0]['data'][0]['columnData'] == [1, 2, 3]
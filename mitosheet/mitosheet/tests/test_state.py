@@ -29,3 +29,71 @@ def test_state_can_add_df_to_middle():
     
     assert state.df_sources == [DATAFRAME_SOURCE_IMPORTED]
 
+
+def test_state_copy_only_deep_copies_metadata_of_deep_sheets():
+    df = pd.DataFrame({'A': [123]})
+    state = State([df, df.copy()])
+    new_state = state.copy(deep_sheet_indexes=[0])
+
+    assert new_state.column_formulas is not state.column_formulas
+    assert new_state.column_formulas[0] is not state.column_formulas[0]
+    assert new_state.column_formulas[1] is state.column_formulas[1]
+    assert new_state.column_filters[0] is not state.column_filters[0]
+    assert new_state.column_filters[1] is state.column_filters[1]
+    assert new_state.df_formats[0] is not state.df_formats[0]
+    assert new_state.df_formats[1] is state.df_formats[1]
+    assert new_state.column_ids.column_id_to_column_header[0] is not state.column_ids.column_id_to_column_header[0]
+    assert new_state.column_ids.column_id_to_column_header[1] is state.column_ids.column_id_to_column_header[1]
+
+def test_state_copy_does_not_change_original_state():
+    df = pd.DataFrame({'A': [123]})
+    state = State([df])
+    new_state = state.copy(deep_sheet_indexes=[0])
+
+    new_state.column_ids.set_column_header(0, 'A', 'B')
+    new_state.column_filters[0]['A']['operator'] = 'Or'
+    new_state.add_df_to_state(df, DATAFRAME_SOURCE_IMPORTED)
+    new_state.graph_data_dict['graph'] = {}
+
+    assert state.column_ids.get_column_header_by_id(0, 'A') == 'A'
+    assert state.column_filters[0]['A']['operator'] == 'And'
+    assert len(state.dfs) == 1
+    assert len(state.column_ids.column_id_to_column_header) == 1
+    assert len(state.graph_data_dict) == 0
+
+def test_state_copy_does_not_rewrap_user_defined_functions():
+    def ADD1(x):
+        return x + 1
+
+    state = State([pd.DataFrame({'A': [123]})], user_defined_functions=[ADD1])
+    new_state = state.copy()
+    assert new_state.user_defined_functions[0] is state.user_defined_functions[0]
+
+
+def test_state_copy_keeps_sheet_versions():
+    df = pd.DataFrame({'A': [123]})
+    state = State([df, df.copy()])
+    new_state = state.copy(deep_sheet_indexes=[0])
+
+    assert new_state.sheet_versions == state.sheet_versions
+    assert len(set(state.sheet_versions)) == 2
+
+
+def test_state_update_sheet_versions_does_not_change_original_state():
+    df = pd.DataFrame({'A': [123]})
+    state = State([df, df.copy()])
+    new_state = state.copy()
+    new_state.update_sheet_versions({1})
+
+    assert new_state.sheet_versions[0] == state.sheet_versions[0]
+    assert new_state.sheet_versions[1] != state.sheet_versions[1]
+
+
+def test_state_add_df_to_state_gives_new_sheet_version():
+    df = pd.DataFrame({'A': [123]})
+    state = State([df])
+    new_state = state.copy()
+    new_state.add_df_to_state(df, DATAFRAME_SOURCE_IMPORTED)
+    new_state.add_df_to_state(df, DATAFRAME_SOURCE_IMPORTED, sheet_index=0)
+
+    assert len(set(new_state.sheet_versions + state.sheet_versions)) == 3
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for evicting and rebuilding step states
+"""
+import pandas as pd
+import pytest
+
+from mitosheet.step_state_cache import StepStateCache
+from mitosheet.tests.test_utils import create_mito_wrapper
+
+
+def create_mito_wrapper_with_cache(max_cached_bytes, checkpoint_interval, df=None, sheet_functions=None):
+    mito = create_mito_wrapper(df if df is not None else pd.DataFrame({'A': [1, 2, 3]}), sheet_functions=sheet_functions)
+    steps_manager = mito.mito_backend.steps_manager
+    steps_manager.step_state_cache = StepStateCache(max_cached_bytes, checkpoint_interval)
+    return mito, steps_manager
+
+
+def get_evicted_step_indexes(steps_manager):
+    return [
+        step_idx for step_idx, step in enumerate(steps_manager.steps_including_skipped) 
+        if step.post_state is not None and step.post_state.are_dfs_evicted
+    ]
+
+
+def test_no_budget_never_evicts():
+    mito, steps_manager = create_mito_wrapper_with_cache(None, 2)
+    for i in range(10):
+        mito.add_column(0, f'B{i}')
+
+    assert get_evicted_step_indexes(steps_manager) == []
+
+
+def test_evicts_all_but_checkpoints_and_recent_states():
+    mito, steps_manager = create_mito_wrapper_with_cache(0, 5)
+    for i in range(12):
+        mito.add_column(0, f'B{i}')
+
+    # Checkpoints at 0, 5, 10, the most recent step at 12, and the most recent other state
+    assert get_evicted_step_indexes(steps_manager) == [1, 2, 3, 4, 6, 7, 8, 9]
+
+
+def test_evicts_until_within_memory_budget():
+    # Each column uses 80,000 bytes, and each step adds a column
+    df = pd.DataFrame({'A': range(10_000)})
+    mito, steps_manager = create_mito_wrapper_with_cache(int(19.5 * 80_000), 100, df=df)
+    for i in range(6):
+        mito.add_column(0, f'B{i}')
+
+    # The pinned initial state and most recent state use 8 columns, and so there is
+    # room for the 11 columns in the states of step 4 and 5
+    assert get_evicted_step_indexes(steps_manager) == [1, 2, 3]
+    assert steps_manager.step_state_cache.get_cached_bytes() <= 19.5 * 80_000
+
+
+def test_shared_sheets_are_only_counted_once():
+    df = pd.DataFrame({'A': range(10_000)})
+    mito, steps_manager = create_mito_wrapper_with_cache(int(23.5 * 80_000), 100, df=df)
+    mito.add_column(0, 'B')
+    mito.duplicate_dataframe(0)
+    for i in range(4):
+        mito.add_column(1, f'C{i}')
+
+    # The first sheet is shared by all states after the first step, and so is only 
+    # counted once. Otherwise, these states would use more than the budget
+    assert get_evicted_step_indexes(steps_manager) == []
+    assert steps_manager.step_state_cache.get_cached_bytes() <= 23.5 * 80_000
+
+
+def test_ai_transformations_and_user_defined_functions_are_pinned():
+    def ADD1(col):
+        return col + 1 
+
+    mito, steps_manager = create_mito_wrapper_with_cache(0, 100, sheet_functions=[ADD1])
+    mito.ai_transformation('user input', 'version', 'prompt', 'completion', "df1['B'] = df1['A'] * 2")
+    mito.add_column(0, 'X')
+    mito.set_formula('=ADD1(A0)', 0, 'Y', add_column=True)
+    mito.set_formula('=A0 + 1', 0, 'Z', add_column=True)
+    for i in range(3):
+        mito.add_column(0, f'W{i}')
+
+    # The ai transformation and ADD1 formula at 1 and 4 are not evicted, while
+    # the other steps are, other than the most recently used one
+    evicted_step_indexes = get_evicted_step_indexes(steps_manager)
+    assert 1 not in evicted_step_indexes and 4 not in evicted_step_indexes
+    assert len(evicted_step_indexes) == 5
+
+
+def test_evicted_states_are_rebuilt_on_access():
+    mito, steps_manager = create_mito_wrapper_with_cache(0, 5)
+    for i in range(8):
+        mito.set_formula(f'=A + {i}', 0, f'B{i}', add_column=True)
+
+    assert 3 in get_evicted_step_indexes(steps_manager)
+
+    df = steps_manager.steps_including_skipped[3].dfs[0]
+    assert df.columns.tolist() == ['A', 'B0', 'B1', 'B2', 'B3'][:df.shape[1]]
+    assert df['B0'].tolist() == [1, 2, 3]
+    assert not steps_manager.steps_including_skipped[3].post_state.are_dfs_evicted
+
+
+def test_checkout_and_undo_rebuild_evicted_states():
+    mito, steps_manager = create_mito_wrapper_with_cache(0, 10)
+    for i in range(6):
+        mito.set_formula(f'=A + {i}', 0, f'B{i}', add_column=True)
+
+    mito.checkout_step_by_idx(4)
+    assert mito.dfs[0]['B1'].tolist() == [2, 3, 4]
+    assert 'B3' not in mito.dfs[0].columns
+
+    mito.checkout_step_by_idx(-1)
+    for _ in range(3):
+        mito.undo()
+
+    assert mito.dfs[0].columns.tolist() == ['A', 'B0', 'B1', 'B2', 'B3', 'B4', 'B5'][:mito.dfs[0].shape[1]]
+    assert mito.dfs[0]['B2'].tolist() == [3, 4, 5]
+
+
+def test_step_summary_and_code_work_with_evicted_states():
+    mito, steps_manager = create_mito_wrapper_with_cache(0, 3)
+    for i in range(5):
+        mito.set_formula(f'=A + {i}', 0, f'B{i}', add_column=True)
+    code = mito.transpiled_code
+    
+    mito_no_cache, _ = create_mito_wrapper_with_cache(None, 3)
+    for i in range(5):
+        mito_no_cache.set_formula(f'=A + {i}', 0, f'B{i}', add_column=True)
+
+    assert code == mito_no_cache.transpiled_code
+    assert len(steps_manager.step_summary_list) == len(mito_no_cache.mito_backend.steps_manager.step_summary_list)
+
+
+def test_invalid_budget_errors():
+    with pytest.raises(ValueError):
+        StepStateCache(-1)
+
+
+def test_cached_bytes_match_sheets_in_memory():
+    df = pd.DataFrame({'A': range(1_000)})
+    mito, steps_manager = create_mito_wrapper_with_cache(int(7.5 * 8_000), 3, df=df)
+    for i in range(8):
+        mito.set_formula(f'=A + {i}', 0, f'B{i}', add_column=True)
+    mito.checkout_step_by_idx(2)
+    mito.checkout_step_by_idx(-1)
+    mito.undo()
+
+    # The running total is the same as counting each sheet in memory once
+    step_state_cache = steps_manager.step_state_cache
+    sheet_version_bytes = {}
+    for state in list(step_state_cache.pinned_states.values()) + list(step_state_cache.cached_states.values()):
+        if not state.are_dfs_evicted:
+            for sheet_version, df in zip(state.sheet_versions, state.dfs):
+                sheet_version_bytes[sheet_version] = int(df.memory_usage(index=True).sum())
+
+    assert step_state_cache.get_cached_bytes() == sum(sheet_version_bytes.values())
+    assert len(get_evicted_step_indexes(steps_manager)) > 0
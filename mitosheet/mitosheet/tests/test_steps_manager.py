@@ -3,15 +3,18 @@
 
 # Copyright (c) Saga Inc.
 # Distributed under the terms of the GPL License.
+from typing import Any, List, Optional
+
 import pandas as pd
 import pytest
 from mitosheet.enterprise.mito_config import MitoConfig
-from mitosheet.types import FORMULA_ENTIRE_COLUMN_TYPE
+from mitosheet.types import FC_NUMBER_GREATER, FORMULA_ENTIRE_COLUMN_TYPE
 
 from mitosheet.utils import get_new_id
 from mitosheet.errors import MitoError
-from mitosheet.steps_manager import StepsManager
-from mitosheet.tests.test_utils import create_mito_wrapper_with_data
+from mitosheet.step import Step
+from mitosheet.steps_manager import StepsManager, get_step_indexes_to_skip
+from mitosheet.tests.test_utils import create_mito_wrapper, create_mito_wrapper_with_data
 from mitosheet.column_headers import get_column_header_id
 
 
@@ -104,3 +107,125 @@ def test_failed_overwrite_rolls_back_to_previous_state():
     assert mito.dfs[0].equals(pd.DataFrame(data={'A': [1, 2, 3], 'B': [0, 0, 0]}))
 
 
+
+
+def get_recreated_sheet_indexes(mito, *operations):
+    """
+    Returns the indexes of the sheets whose sheet data was recreated, rather than
+    reused from the cache, while running the operations
+    """
+    recreated_sheet_indexes = []
+    for operation in operations:
+        previous_sheet_data = mito.mito_backend.steps_manager.saved_sheet_data
+        operation()
+        recreated_sheet_indexes.append([
+            sheet_index for sheet_index, sheet_data in enumerate(mito.mito_backend.steps_manager.saved_sheet_data)
+            if not any(sheet_data is previous for previous in previous_sheet_data)
+        ])
+    return recreated_sheet_indexes
+
+
+def test_sheet_data_only_recreated_for_changed_sheets_on_undo_and_redo():
+    mito = create_mito_wrapper(*[pd.DataFrame({'A': [1, 2, 3]}) for _ in range(5)])
+
+    assert get_recreated_sheet_indexes(
+        mito,
+        lambda: mito.add_column(2, 'B'),
+        lambda: mito.add_column(3, 'B'),
+        mito.undo,
+        mito.undo,
+        mito.redo,
+    ) == [[2], [3], [3], [2], [2]]
+
+
+def test_sheet_data_only_recreated_for_changed_sheets_on_clear_and_replay():
+    mito = create_mito_wrapper(*[pd.DataFrame({'A': [1, 2, 3]}) for _ in range(5)])
+    mito.filter(1, 'A', 'And', FC_NUMBER_GREATER, 1)
+    mito.add_column(1, 'B')
+    mito.add_column(2, 'B')
+
+    assert get_recreated_sheet_indexes(
+        mito,
+        # Overwriting the filter replays the steps after it, which only modify sheets 1 and 2
+        lambda: mito.filter(1, 'A', 'And', FC_NUMBER_GREATER, 2),
+        mito.clear,
+        mito.undo,
+    ) == [[1, 2], [1, 2], [1, 2]]
+
+
+def test_sheet_data_recreated_for_all_sheets_after_deleting_sheet():
+    mito = create_mito_wrapper(*[pd.DataFrame({'A': [1, 2, 3]}) for _ in range(3)])
+
+    assert get_recreated_sheet_indexes(
+        mito,
+        lambda: mito.delete_dataframe(1),
+        lambda: mito.add_column(1, 'B'),
+    ) == [[0, 1], [1]]
+
+
+def get_filter_step(step_id: str, sheet_index: int, column_id: str) -> Step:
+    return Step('filter_column', step_id, {'sheet_index': sheet_index, 'column_id': column_id})
+
+def get_set_column_formula_step(step_id: str, sheet_index: int, column_id: str, index_labels: Optional[List[Any]]=None) -> Step:
+    index_labels_formula_is_applied_to = {'type': FORMULA_ENTIRE_COLUMN_TYPE} if index_labels is None else {'type': 'specific_index_labels', 'index_labels': index_labels}
+    return Step('set_column_formula', step_id, {'sheet_index': sheet_index, 'column_id': column_id, 'index_labels_formula_is_applied_to': index_labels_formula_is_applied_to})
+
+def get_pivot_step(step_id: str) -> Step:
+    return Step('pivot', step_id, {})
+
+
+def test_sheet_data_created_for_sheets_without_previous_sheet_data():
+    from mitosheet.utils import dfs_to_array_for_json
+    mito = create_mito_wrapper(*[pd.DataFrame({'A': [1, 2, 3]}) for _ in range(2)])
+    steps_manager = mito.mito_backend.steps_manager
+    previous_sheet_data = steps_manager.saved_sheet_data[0]
+    curr_step = steps_manager.curr_step
+
+    sheet_data_array = dfs_to_array_for_json(
+        curr_step.final_defined_state,
+        set(),
+        [previous_sheet_data, None],
+        curr_step.dfs,
+        curr_step.df_names,
+        curr_step.df_sources,
+        curr_step.column_formulas,
+        curr_step.column_filters,
+        curr_step.column_ids,
+        curr_step.df_formats,
+        use_column_buffers=True
+    )
+
+    assert sheet_data_array[0] is previous_sheet_data
+    assert sheet_data_array[1]['dfName'] == 'df2'
+
+
+@pytest.mark.parametrize("steps, expected", [
+    ([], set()),
+    ([get_filter_step('1', 0, 'A'), get_filter_step('2', 0, 'B'), get_filter_step('3', 0, 'A'), get_filter_step('4', 1, 'A'), get_filter_step('5', 0, 'A')], {0, 2}),
+    ([get_pivot_step('1'), get_pivot_step('2'), get_pivot_step('1'), get_pivot_step('1')], {0, 2}),
+    # Filters with the same step id on different columns do not skip eachother, but other steps do
+    ([get_filter_step('1', 0, 'A'), get_filter_step('1', 0, 'B'), get_pivot_step('1'), get_filter_step('1', 0, 'C')], {0, 1, 2}),
+    ([get_set_column_formula_step('1', 0, 'A'), get_set_column_formula_step('2', 0, 'A'), get_set_column_formula_step('3', 0, 'B'), get_set_column_formula_step('4', 0, 'A')], {0}),
+    ([get_set_column_formula_step('1', 0, 'A', [1]), get_set_column_formula_step('2', 0, 'A', [1]), get_set_column_formula_step('3', 0, 'A', [2]), get_set_column_formula_step('4', 0, 'A')], {0}),
+])
+def test_get_step_indexes_to_skip_is_same_as_each_step_skipping(steps, expected):
+    assert get_step_indexes_to_skip(steps) == expected
+
+    each_step_skipping = set()
+    for step_index, step in enumerate(steps):
+        each_step_skipping.update(step.step_indexes_to_skip(steps[:step_index]))
+    assert each_step_skipping == expected
+
+
+def test_passed_dataframes_are_copied_once():
+    df = pd.DataFrame(data={'A': [1, 2, 3]})
+
+    steps_manager = StepsManager([df], MitoConfig())
+
+    # The initial state shares the one copy that is kept as the original args
+    assert steps_manager.curr_step.dfs[0] is steps_manager.original_args[0]
+    assert steps_manager.curr_step.dfs[0] is not df
+
+    # Changing the passed dataframe does not change the sheet
+    df['A'] = [4, 5, 6]
+    assert steps_manager.curr_step.dfs[0].equals(pd.DataFrame(data={'A': [1, 2, 3]}))
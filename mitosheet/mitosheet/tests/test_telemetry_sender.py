@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for sending telemetry from a background thread
+"""
+import os
+import time
+from threading import Event
+
+from pytest_httpserver import HTTPServer
+from werkzeug import Request, Response
+
+from mitosheet.enterprise.mito_config import MITO_CONFIG_ANALYTICS_URL, MITO_CONFIG_VERSION
+from mitosheet.telemetry.telemetry_sender import TelemetrySender
+from mitosheet.telemetry.telemetry_utils import log, telemetry_sender
+from mitosheet.tests.test_mito_config import delete_all_mito_config_environment_variables
+from mitosheet.tests.test_utils import create_mito_wrapper
+from mitosheet.user import UJ_STATIC_USER_ID, get_user_field
+
+
+def test_sends_queued_logs_in_batches():
+    batches = []
+    sender = TelemetrySender(batches.append, batch_size=2)
+
+    for i in range(5):
+        assert sender.enqueue(i)
+    assert sender.flush(timeout=5)
+
+    assert [log for batch in batches for log in batch] == list(range(5))
+    assert all(1 <= len(batch) <= 2 for batch in batches)
+
+
+def test_sends_logs_after_flush_interval():
+    batches = []
+    sender = TelemetrySender(batches.append, flush_interval=0.05)
+
+    sender.enqueue(1)
+
+    start_time = time.monotonic()
+    while len(batches) == 0 and time.monotonic() - start_time < 5:
+        time.sleep(0.01)
+    assert batches == [[1]]
+
+
+def test_drops_logs_when_queue_full():
+    sending = Event()
+    can_send = Event()
+    batches = []
+    def send_batch(batch):
+        sending.set()
+        can_send.wait(5)
+        batches.append(batch)
+
+    sender = TelemetrySender(send_batch, max_queue_size=2, batch_size=1)
+
+    # Wait till the first log is being sent, so the rest wait in the queue
+    sender.enqueue(0)
+    assert sending.wait(5)
+    assert sender.enqueue(1)
+    assert sender.enqueue(2)
+    assert not sender.enqueue(3)
+    assert sender.num_dropped == 1
+
+    can_send.set()
+    assert sender.flush(timeout=5)
+    assert batches == [[0], [1], [2]]
+
+
+def test_send_batch_errors_do_not_stop_sender():
+    batches = []
+    def send_batch(batch):
+        if batch == [0]:
+            raise Exception()
+        batches.append(batch)
+
+    sender = TelemetrySender(send_batch, batch_size=1)
+
+    sender.enqueue(0)
+    sender.enqueue(1)
+    assert sender.flush(timeout=5)
+    assert batches == [[1]]
+
+
+def test_not_threaded_sends_logs_immediately():
+    batches = []
+    sender = TelemetrySender(batches.append, threaded=False)
+
+    sender.enqueue(1)
+
+    assert batches == [[1]]
+    assert sender.thread is None
+
+
+def test_log_does_not_wait_on_analytics_url(httpserver: HTTPServer) -> None:
+    def slow_handler(request: Request) -> Response:
+        time.sleep(0.5)
+        return Response('')
+    httpserver.expect_request("/analytics").respond_with_handler(slow_handler)
+
+    os.environ[MITO_CONFIG_VERSION] = "2"
+    os.environ[MITO_CONFIG_ANALYTICS_URL] = httpserver.url_for("/analytics")
+    mito = create_mito_wrapper()
+    telemetry_sender.flush(timeout=30)
+
+    start_time = time.perf_counter()
+    log('test_analytics_url_log', steps_manager=mito.mito_backend.steps_manager)
+    assert time.perf_counter() - start_time < 0.5
+
+    assert telemetry_sender.flush(timeout=30)
+    logs = [request.get_json() for request, _ in httpserver.log]
+    assert {'user_id': get_user_field(UJ_STATIC_USER_ID), 'log_event': 'test_analytics_url_log'} in logs
+
+    delete_all_mito_config_environment_variables()
@@ -9,9 +9,11 @@ import pytest
 import pandas as pd
 
 from mitosheet.api.get_parameterizable_params import get_parameterizable_params
+from mitosheet.code_chunks.code_chunk_utils import OptimizedCodeChunksCache
 from mitosheet.transpiler.transpile import transpile
 from mitosheet.tests.test_utils import create_mito_wrapper_with_data, create_mito_wrapper
 from mitosheet.tests.decorators import pandas_post_1_2_only, python_post_3_6_only
+from mitosheet.types import FC_NUMBER_GREATER
 
 def test_transpile_single_column():
     mito = create_mito_wrapper_with_data(['abc'])
@@ -739,3 +741,86 @@ path_0 = r'test.xlsx'
 
 df1, df2 = function(df1, df2, path_0)"""
 
+
+
+def test_transpile_reuses_code_chunks_of_unchanged_steps():
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'A': [1, 2, 3]}))
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 1)
+    mito.add_column(1, 'B')
+    mito.set_formula('=A + 1', 1, 'B')
+    steps = mito.mito_backend.steps_manager.steps_including_skipped[1:]
+    code_chunks = [step.get_code_chunks() for step in steps]
+
+    mito.add_column(0, 'C')
+    mito.undo()
+    mito.redo()
+
+    assert all(step.get_code_chunks() is step_code_chunks for step, step_code_chunks in zip(steps, code_chunks))
+
+    # Reexecuting a step transpiles it again
+    mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 2)
+    steps = mito.mito_backend.steps_manager.steps_including_skipped[1:]
+    assert steps[0].get_code_chunks() is code_chunks[0]
+    assert all(step.get_code_chunks() is not step_code_chunks for step, step_code_chunks in zip(steps[1:3], code_chunks[1:]))
+
+
+@pytest.mark.parametrize("operations", [
+    [
+        lambda mito: mito.add_column(0, 'B'),
+        lambda mito: mito.set_formula('=A + 1', 0, 'B'),
+        lambda mito: mito.rename_column(0, 'B', 'C'),
+        lambda mito: mito.delete_columns(0, ['C']),
+    ],
+    [
+        lambda mito: mito.add_column(0, 'B'),
+        lambda mito: mito.add_column(0, 'C'),
+        lambda mito: mito.undo(),
+        lambda mito: mito.delete_columns(0, ['B']),
+        lambda mito: mito.delete_row(0, [0]),
+        lambda mito: mito.delete_row(0, [1]),
+        lambda mito: mito.undo(),
+        lambda mito: mito.redo(),
+    ],
+    [
+        lambda mito: mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 1),
+        lambda mito: mito.set_formula('=A + 1', 0, 'B', add_column=True),
+        lambda mito: mito.filter(0, 'A', 'And', FC_NUMBER_GREATER, 2),
+        lambda mito: mito.rename_column(0, 'B', 'C'),
+        lambda mito: mito.rename_column(0, 'C', 'D'),
+        lambda mito: mito.delete_dataframe(0),
+    ],
+])
+def test_transpile_with_cached_optimizations_is_same_as_optimizing_all_code_chunks(operations):
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}))
+    steps_manager = mito.mito_backend.steps_manager
+    for operation in operations:
+        operation(mito)
+
+        code = transpile(steps_manager)
+        steps_manager.optimized_code_chunks_cache = OptimizedCodeChunksCache()
+        assert transpile(steps_manager) == code
+
+
+def test_transpile_with_cached_optimizations_only_optimizes_end_of_code_chunks(monkeypatch):
+    import mitosheet.code_chunks.code_chunk_utils as code_chunk_utils
+    mito = create_mito_wrapper(pd.DataFrame({'A': [1, 2, 3]}), pd.DataFrame({'A': [1, 2, 3]}))
+    for i in range(10):
+        mito.add_column(0, f'B{i}')
+    
+    optimized_code_chunk_lengths = []
+    def optimize_code_chunks(code_chunks):
+        optimized_code_chunk_lengths.append(len(code_chunks))
+        return original_optimize_code_chunks(code_chunks)
+    original_optimize_code_chunks = code_chunk_utils.optimize_code_chunks
+    monkeypatch.setattr(code_chunk_utils, 'optimize_code_chunks', optimize_code_chunks)
+
+    # Deleting the column of the last step is optimized into it
+    mito.add_column(1, 'C')
+    mito.delete_columns(1, ['C'])
+    assert max(optimized_code_chunk_lengths) <= 4
+
+    steps_manager = mito.mito_backend.steps_manager
+    code = transpile(steps_manager)
+    steps_manager.optimized_code_chunks_cache = OptimizedCodeChunksCache()
+    assert transpile(steps_manager) == code
+    assert "'C'" not in "".join(code)
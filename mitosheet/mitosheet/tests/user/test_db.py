@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# Copyright (c) Saga Inc.
+# Distributed under the terms of the GPL License.
+"""
+Contains tests for caching and writing the user.json
+"""
+import json
+import os
+import stat
+import time
+
+import pytest
+
+import mitosheet.user.db as db
+from mitosheet.user.db import (USER_JSON_PATH, USER_JSON_RACY_WINDOW_NS,
+                               get_user_field, get_user_json_object,
+                               set_user_field, set_user_json_object)
+
+
+def write_user_json_in_place(user_json_object, seconds_ago=10):
+    # Write as other processes might, and make the file old enough to be cached
+    with open(USER_JSON_PATH, 'w+') as f:
+        f.write(json.dumps(user_json_object))
+    modified_time = time.time() - seconds_ago
+    os.utime(USER_JSON_PATH, (modified_time, modified_time))
+
+
+@pytest.fixture
+def num_reads(monkeypatch):
+    reads = []
+    def counting_open(file, *args, **kwargs):
+        reads.append(file)
+        return open(file, *args, **kwargs)
+    monkeypatch.setattr(db, 'open', counting_open, raising=False)
+
+    yield lambda: len(reads)
+
+    os.remove(USER_JSON_PATH)
+
+
+def test_reads_user_json_once(num_reads):
+    write_user_json_in_place({'a': 1, 'b': [1, 2]})
+
+    for _ in range(10):
+        assert get_user_field('a') == 1
+        assert get_user_field('b') == [1, 2]
+        assert get_user_json_object() == {'a': 1, 'b': [1, 2]}
+
+    assert num_reads() == 1
+
+
+def test_reads_user_json_again_when_changed(num_reads):
+    write_user_json_in_place({'a': 1})
+    assert get_user_field('a') == 1
+
+    write_user_json_in_place({'a': 22}, seconds_ago=5)
+    assert get_user_field('a') == 22
+    assert num_reads() == 2
+
+
+def test_reads_recently_changed_user_json_every_time(num_reads):
+    write_user_json_in_place({'a': 1}, seconds_ago=0)
+
+    assert get_user_field('a') == 1
+    assert get_user_field('a') == 1
+    assert num_reads() == 2
+
+    # Once the file is old enough, it is cached
+    modified_time_ns = time.time_ns() - 2 * USER_JSON_RACY_WINDOW_NS
+    os.utime(USER_JSON_PATH, ns=(modified_time_ns, modified_time_ns))
+    assert get_user_field('a') == 1
+    assert get_user_field('a') == 1
+    assert num_reads() == 3
+
+
+def test_set_user_field_does_not_read_user_json_again(num_reads):
+    write_user_json_in_place({'a': 1, 'b': 2})
+
+    set_user_field('a', 3)
+    set_user_field('b', 4)
+
+    assert get_user_field('a') == 3
+    assert get_user_field('b') == 4
+    assert num_reads() == 1
+    with open(USER_JSON_PATH) as f:
+        assert json.load(f) == {'a': 3, 'b': 4}
+
+
+def test_set_user_json_object_is_atomic_and_keeps_permissions(num_reads):
+    write_user_json_in_place({'a': 1})
+    os.chmod(USER_JSON_PATH, 0o600)
+    files_before = set(os.listdir(os.path.dirname(USER_JSON_PATH)))
+
+    set_user_json_object({'a': 2})
+
+    assert set(os.listdir(os.path.dirname(USER_JSON_PATH))) == files_before
+    assert stat.S_IMODE(os.stat(USER_JSON_PATH).st_mode) == 0o600
+    assert get_user_json_object() == {'a': 2}
+
+
+def test_new_user_json_has_default_permissions_without_changing_umask(num_reads, monkeypatch):
+    write_user_json_in_place({'a': 1})
+    os.remove(USER_JSON_PATH)
+    def set_umask(mask):
+        raise Exception('The umask should not be changed')
+    monkeypatch.setattr(os, 'umask', set_umask)
+
+    set_user_json_object({'a': 2})
+
+    assert stat.S_IMODE(os.stat(USER_JSON_PATH).st_mode) == 0o666 & ~db._UMASK
+    assert get_user_json_object() == {'a': 2}
+
+
+def test_returned_values_do_not_change_cache(num_reads):
+    user_json_object = {'a': [1]}
+    write_user_json_in_place(user_json_object)
+
+    get_user_field('a').append(2)
+    get_user_json_object()['a'].append(3)
+    set_user_json_object(user_json_object)
+    user_json_object['a'].append(4)
+
+    assert get_user_field('a') == [1]
+
+
+def test_missing_user_json_is_none(num_reads):
+    write_user_json_in_place({'a': 1})
+    assert get_user_field('a') == 1
+    os.remove(USER_JSON_PATH)
+
+    assert get_user_field('a') is None
+    assert get_user_json_object() is None
+    with pytest.raises(FileNotFoundError):
+        set_user_field('a', 2)
+
+    write_user_json_in_place({'a': 1})
+
+
+def test_set_experiment_without_experiment_field(num_reads):
+    from mitosheet.experiments.experiment_utils import set_experiment
+    from mitosheet.user.schemas import UJ_EXPERIMENT
+    write_user_json_in_place({'a': 1})
+
+    set_experiment('experiment', 'A')
+
+    assert get_user_field(UJ_EXPERIMENT) == {'experiment_id': 'experiment', 'variant': 'A'}
+    assert get_user_field('a') == 1
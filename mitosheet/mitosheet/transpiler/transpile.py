@@ -57,7 +57,11 @@ def transpile(
         imports_code.extend(preprocess_imports)
 
     # We only transpile up to the currently checked out step
-    all_code_chunks: List[CodeChunk] = get_code_chunks(steps_manager.steps_including_skipped[:steps_manager.curr_step_idx + 1], optimize=optimize)
+    all_code_chunks: List[CodeChunk] = get_code_chunks(
+        steps_manager.steps_including_skipped[:steps_manager.curr_step_idx + 1], 
+        optimize=optimize,
+        optimized_code_chunks_cache=steps_manager.optimized_code_chunks_cache
+    )
 
     # We also make sure to include all the post_processing code chunks, which are those
     # code chunks that are always at the end of the dataframe
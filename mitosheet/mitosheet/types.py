@@ -61,7 +61,8 @@ ConditionalFormat: {
 """
 
 ConditionalFormattingInvalidResults = Dict[ConditionalFormatUUID, List[ColumnID]]
-ConditionalFormattingCellResults = Dict[ColumnID, Dict[IndexType, Dict[str, Optional[str]]]]
+# For each column, the formats that apply to some of the displayed rows, with a bitmap of those rows
+ConditionalFormattingCellResults = Dict[ColumnID, List[Dict[str, Optional[str]]]]
 
 ConditionalFormattingResult = Dict[str, Union[
         ConditionalFormattingInvalidResults, # A list of the invalid columns for a specific filter
@@ -67,6 +67,7 @@ def do_arg_update(steps_manager: StepsManagerType, args: List[str]) -> None:
     # nonsense), and thus this allows us to filter out Nones that are passed at the 
     # end of the arguments (not creating phantom tabs that cannot be clicked)
     steps_manager.curr_step.post_state.df_names = final_names[:len(steps_manager.curr_step.dfs)] # type: ignore
+    steps_manager.curr_step.post_state.update_sheet_versions(range(len(steps_manager.curr_step.dfs))) # type: ignore
 
     # Save the original args exactly as is, because we might need them for generating a function
     steps_manager.original_args_raw_strings = args
@@ -16,7 +16,7 @@ from typing import List, Optional
 
 from mitosheet._version import __version__
 from mitosheet.user.db import (MITO_FOLDER, USER_JSON_PATH, get_user_field,
-                               set_user_field)
+                               set_user_field, set_user_json_object)
 from mitosheet.user.schemas import (GITHUB_ACTION_EMAIL, GITHUB_ACTION_ID,
                                     UJ_MITOSHEET_CURRENT_VERSION,
                                     UJ_MITOSHEET_LAST_FIFTY_USAGES,
@@ -52,8 +52,7 @@ def try_create_user_json_file() -> None:
     # is invalid (e.g. it is not parseable JSON).
     if not is_user_json_exists_and_valid_json():
         # First, we write an empty default object
-        with open(USER_JSON_PATH, 'w+') as f:
-            f.write(json.dumps(USER_JSON_DEFAULT))
+        set_user_json_object(USER_JSON_DEFAULT)
 
         # Then, we take special care to put all the testing/CI environments 
         # (e.g. Github actions) under one ID and email
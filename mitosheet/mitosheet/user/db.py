@@ -5,24 +5,137 @@
 # Distributed under the terms of the GPL License.
 
 """
-Helpers for accessing the user.json file
+Helpers for accessing the user.json file.
+
+As the user.json is read many times for each event, we cache it in memory,
+and only read it again when the file changes. Writes go through the cache,
+and replace the file atomically, so it is never read half written.
 """
-import os
 import json
-from typing import Any, Dict, Optional
+import os
+import stat
+import tempfile
+import time
+from copy import deepcopy
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
 from mitosheet.save_paths import MITO_FOLDER
 
 # The path of the user.json file
 USER_JSON_PATH = os.path.join(MITO_FOLDER, 'user.json')
 
+# The user.json object, along with the inode, modification time and size of the
+# file it was read from. If any of these change, the file is read again
+_cached_user_json_object: Optional[Dict[str, Any]] = None
+_cached_user_json_key: Optional[Tuple[int, int, int]] = None
+_cached_user_json_time_ns = 0
+_user_json_cache_lock = Lock()
+
+# Filesystems only store modification times to some granularity, so a file changed
+# just after we cache it could keep the same modification time. We don't trust the
+# cache for files modified within this window of when they were cached
+USER_JSON_RACY_WINDOW_NS = 2 * 1_000_000_000
+
+# The only way to read the umask is to set it, which changes it for the whole process.
+# So we read it once on import, before any threads that create files are started, rather
+# than every time we write the user.json
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _get_user_json_key() -> Optional[Tuple[int, int, int]]:
+    try:
+        user_json_stat = os.stat(USER_JSON_PATH)
+    except OSError:
+        return None
+    return (user_json_stat.st_ino, user_json_stat.st_mtime_ns, user_json_stat.st_size)
+
+
+def _set_cached_user_json_object(user_json_object: Optional[Dict[str, Any]], key: Optional[Tuple[int, int, int]], cached_time_ns: Optional[int]=None) -> None:
+    global _cached_user_json_object
+    global _cached_user_json_key
+    global _cached_user_json_time_ns
+    with _user_json_cache_lock:
+        _cached_user_json_object = user_json_object
+        _cached_user_json_key = key
+        _cached_user_json_time_ns = cached_time_ns if cached_time_ns is not None else time.time_ns()
+
+
+def _is_cached_user_json_object_valid(key: Optional[Tuple[int, int, int]]) -> bool:
+    return (
+        key is not None and
+        key == _cached_user_json_key and
+        _cached_user_json_object is not None and
+        key[1] < _cached_user_json_time_ns - USER_JSON_RACY_WINDOW_NS
+    )
+
+
+def _read_user_json_object() -> Dict[str, Any]:
+    """
+    Returns the cached user json object, reading the user.json file if it has
+    changed since it was cached. Raises an error if the file cannot be read.
+
+    NOTE: the returned object is the cached object, and so must not be modified
+    """
+    key = _get_user_json_key()
+    with _user_json_cache_lock:
+        if _is_cached_user_json_object_valid(key):
+            assert _cached_user_json_object is not None
+            return _cached_user_json_object
+
+    with open(USER_JSON_PATH) as f:
+        user_json_object = json.load(f)
+
+    # If the file changed while we were reading it, the key will not match
+    # the file next time, and so we will just read it again
+    _set_cached_user_json_object(user_json_object, key)
+    return user_json_object
+
+
+def _get_new_user_json_mode() -> int:
+    # We keep the permissions of the user.json file, or use the default
+    # permissions for a new file if it does not exist yet
+    try:
+        return stat.S_IMODE(os.stat(USER_JSON_PATH).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def _write_user_json_object(user_json_object: Dict[str, Any]) -> None:
+    """
+    Writes the user json object to a temporary file, and then renames it to the
+    user.json, so that the user.json is never left half written.
+    """
+    user_json_string = json.dumps(user_json_object)
+    mode = _get_new_user_json_mode()
+
+    file_descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(USER_JSON_PATH), prefix='.user.json.', suffix='.tmp')
+    try:
+        with os.fdopen(file_descriptor, 'w') as f:
+            f.write(user_json_string)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, USER_JSON_PATH)
+    except:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    # We cache a copy, so later changes to the passed object do not change the cache. As we
+    # know what we just wrote, we trust the cache right away, rather than waiting for the 
+    # racy window to pass
+    key = _get_user_json_key()
+    cached_time_ns = key[1] + USER_JSON_RACY_WINDOW_NS + 1 if key is not None else None
+    _set_cached_user_json_object(json.loads(user_json_string), key, cached_time_ns=cached_time_ns)
+
+
 def get_user_json_object() -> Optional[Dict[str, Any]]:
     """
     Gets the entire user json object
     """
     try:
-        with open(USER_JSON_PATH) as f:
-            return json.load(f)
-    except: 
+        return deepcopy(_read_user_json_object())
+    except:
         return None
 
 def get_user_field(field: str) -> Optional[Any]:
@@ -31,24 +144,20 @@ def get_user_field(field: str) -> Optional[Any]:
     but may read a different file if it passed
     """
     try:
-        with open(USER_JSON_PATH) as f:
-            return json.load(f)[field]
-    except: 
+        return deepcopy(_read_user_json_object()[field])
+    except:
         return None
 
 def set_user_json_object(user_json_object: Dict[str, Any]) -> None:
     """
     Updates the value of a specific feild in user.json
     """
-    with open(USER_JSON_PATH, 'w+') as f:
-        f.write(json.dumps(user_json_object))
+    _write_user_json_object(user_json_object)
 
 def set_user_field(field: str, value: Any) -> None:
     """
     Updates the value of a specific feild in user.json
     """
-    with open(USER_JSON_PATH, 'r') as user_file_old:
-        old_user_json = json.load(user_file_old)
-        old_user_json[field] = value
-        with open(USER_JSON_PATH, 'w+') as f:
-            f.write(json.dumps(old_user_json))
+    old_user_json = deepcopy(_read_user_json_object())
+    old_user_json[field] = value
+    _write_user_json_object(old_user_json)
@@ -10,18 +10,20 @@ import json
 from random import randint
 import re
 import uuid
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 import os
 
 import numpy as np
 import pandas as pd
+from openpyxl import Workbook
 
 from mitosheet.column_headers import ColumnIDMap, get_column_header_display
 from mitosheet.is_type_utils import get_float_dt_td_columns
 from mitosheet.types import (ColumnHeader, ColumnID, DataframeFormat, FrontendFormulaAndLocation, StateType, FrontendFormula)
 from mitosheet.excel_utils import get_df_name_as_valid_sheet_name
+from mitosheet.excel_export_utils import write_df_to_write_only_sheet
 
-from mitosheet.public.v3.formatting import add_formatting_to_excel_sheet
+from mitosheet.public.v3.formatting import add_conditional_formats, get_header_named_style, get_row_named_styles
 
 
 # We only send the first 1500 rows of a dataframe; note that this
@@ -110,19 +112,22 @@ def is_default_df_names(df_names: List[str]) -> bool:
 def dfs_to_array_for_json(
         state: StateType,
         modified_sheet_indexes: Set[int],
-        previous_array: List,
+        previous_array: Sequence[Optional[Dict[str, Any]]],
         dfs: List[pd.DataFrame],
         df_names: List[str],
         df_sources: List[str],
         column_formulas_array: List[Dict[ColumnID, List[FrontendFormulaAndLocation]]],
         column_filters_array: List[Dict[ColumnID, Any]],
         column_ids: ColumnIDMap,
-        df_formats: List[DataframeFormat]
+        df_formats: List[DataframeFormat],
+        use_column_buffers: bool=False
     ) -> List:
 
     new_array = []
     for sheet_index, df in enumerate(dfs):
-        if sheet_index in modified_sheet_indexes:
+        # If there is no previous sheet data for this sheet, we have to create it
+        previous_sheet_data = previous_array[sheet_index] if sheet_index < len(previous_array) else None
+        if sheet_index in modified_sheet_indexes or previous_sheet_data is None:
             new_array.append(
                 df_to_json_dumpsable(
                     state,
@@ -136,11 +141,12 @@ def dfs_to_array_for_json(
                     df_formats[sheet_index],
                     # We only send the first 1500 rows and 1500 columns
                     max_rows=MAX_ROWS,
-                    max_columns=MAX_COLUMNS
+                    max_columns=MAX_COLUMNS,
+                    use_column_buffers=use_column_buffers
                 ) 
             )
         else:
-            new_array.append(previous_array[sheet_index])
+            new_array.append(previous_sheet_data)
 
     return new_array
 
@@ -181,37 +187,56 @@ def write_to_excel(
     state: Any,
     allow_formatting:bool=True
 ) -> None:
-    with pd.ExcelWriter(path, engine="openpyxl") as writer:
-        for sheet_index in sheet_indexes:
-            # Get the dataframe and sheet name
-            df = state.dfs[sheet_index]
-            df_name = state.df_names[sheet_index]
-            sheet_name = get_df_name_as_valid_sheet_name(df_name)
-
-            # Write the dataframe to the sheet
-            df.to_excel(writer, sheet_name, index=False)
-
-            # Add formatting to the sheet for pro users
-            format = state.df_formats[sheet_index]
-            conditional_formats = get_conditional_formats_objects_to_export_to_excel(
-                format.get('conditional_formats'),
-                column_id_map=state.column_ids,
-                sheet_index=sheet_index
+    # We use a write-only workbook, which streams the rows of each sheet to a temporary
+    # file as they are written, so that large dataframes do not have to be held in memory
+    workbook = Workbook(write_only=True)
+    for sheet_index in sheet_indexes:
+        # Get the dataframe and sheet name
+        df = state.dfs[sheet_index]
+        df_name = state.df_names[sheet_index]
+        sheet_name = get_df_name_as_valid_sheet_name(df_name)
+
+        # Get the formatting for the sheet, which is only added for pro users
+        format = state.df_formats[sheet_index]
+        header_format = None
+        row_formats = None
+        if allow_formatting:
+            header_format = get_header_named_style(
+                sheet_name,
+                header_background_color=format.get('headers', {}).get('backgroundColor'),
+                header_font_color=format.get('headers', {}).get('color'),
             )
-            if allow_formatting: 
-                add_formatting_to_excel_sheet(
-                    writer,
-                    sheet_name,
-                    df,
-                    header_background_color=format.get('headers', {}).get('backgroundColor'),
-                    header_font_color=format.get('headers', {}).get('color'),
-                    even_background_color=format.get('rows', {}).get('even', {}).get('backgroundColor'),
-                    even_font_color=format.get('rows', {}).get('even', {}).get('color'),
-                    odd_background_color=format.get('rows', {}).get('odd', {}).get('backgroundColor'),
-                    odd_font_color=format.get('rows', {}).get('odd', {}).get('color'),
-                    conditional_formats=conditional_formats
-                )
-    
+            row_formats = get_row_named_styles(
+                sheet_name,
+                even_background_color=format.get('rows', {}).get('even', {}).get('backgroundColor'),
+                even_font_color=format.get('rows', {}).get('even', {}).get('color'),
+                odd_background_color=format.get('rows', {}).get('odd', {}).get('backgroundColor'),
+                odd_font_color=format.get('rows', {}).get('odd', {}).get('color'),
+            )
+            if header_format is not None:
+                workbook.add_named_style(header_format)
+            if row_formats is not None:
+                workbook.add_named_style(row_formats[0])
+                workbook.add_named_style(row_formats[1])
+
+        # Write the dataframe to the sheet, styling the rows as they are written
+        sheet = write_df_to_write_only_sheet(
+            workbook,
+            sheet_name,
+            df,
+            header_style_name=header_format.name if header_format is not None else None,
+            row_style_names=(row_formats[0].name, row_formats[1].name) if row_formats is not None else None,
+        )
+
+        conditional_formats = get_conditional_formats_objects_to_export_to_excel(
+            format.get('conditional_formats'),
+            column_id_map=state.column_ids,
+            sheet_index=sheet_index
+        )
+        if allow_formatting and conditional_formats is not None:
+            add_conditional_formats(conditional_formats, sheet, df, max_row=len(df) + 1)
+
+    workbook.save(path)
 
 
 def _get_column_id_from_header_safe(
@@ -249,7 +274,8 @@ def df_to_json_dumpsable(
         column_headers_to_column_ids: Dict[ColumnHeader, ColumnID],
         df_format: DataframeFormat,
         max_rows: Optional[int]=MAX_ROWS, # How many items you want to display. None when using this function to get unique value counts
-        max_columns: int=MAX_COLUMNS # How many columns you want to display. Unlike max_rows, this is always defined
+        max_columns: int=MAX_COLUMNS, # How many columns you want to display. Unlike max_rows, this is always defined
+        use_column_buffers: bool=False # If numeric and boolean columns should be returned as column buffers
     ) -> Dict[str, Any]:
     """
     Returns a dataframe and other metadata represented in a way that can be turned into a 
@@ -275,11 +301,33 @@ def df_to_json_dumpsable(
         df_format: DataframeFormat;
         conditionalFormattingResult: ConditionalFormattingResult
     }
+
+    If use_column_buffers is True, then the columnData of the numeric and boolean columns,
+    and the index, are column buffers (see get_column_data_buffer) rather than lists. 
+    These must be sent with encode_sheet_data_array or encode_sheet_data_array_with_buffers, 
+    and not json.dumps.
     """
 
     (num_rows, num_columns) = original_df.shape 
 
-    json_obj = convert_df_to_parsed_json(original_df, max_rows=max_rows, max_columns=max_columns)
+    column_buffers: Dict[int, Dict[str, Any]] = {}
+    index_buffer = None
+    if use_column_buffers:
+        displayed_df = original_df if max_rows is None else original_df.head(n=max_rows)
+        for column_index in range(min(num_columns, max_columns)):
+            column_buffer = get_column_data_buffer(displayed_df.iloc[:, column_index])
+            if column_buffer is not None:
+                column_buffers[column_index] = column_buffer
+        index_buffer = get_column_data_buffer(displayed_df.index)
+
+    # We only convert the columns that are not sent as buffers to JSON
+    json_column_indexes = [column_index for column_index in range(min(num_columns, max_columns)) if column_index not in column_buffers]
+    json_column_positions = {column_index: position for position, column_index in enumerate(json_column_indexes)}
+    json_obj = convert_df_to_parsed_json(
+        original_df if len(column_buffers) == 0 else original_df.iloc[:, json_column_indexes], 
+        max_rows=max_rows, 
+        max_columns=max_columns
+    )
 
     final_data = []
     column_dtype_map = {}
@@ -293,10 +341,15 @@ def df_to_json_dumpsable(
             'columnData': [],
         }
         column_dtype_map[column_id] = str(original_df[column_header].dtype)
+        if column_index in column_buffers:
+            column_final_data['columnData'] = column_buffers[column_index]
+            final_data.append(column_final_data)
+            continue
+
         for row in json_obj['data']:
             # If we're beyond the max columns, we might not have data, and we leave column data empty
             # in this case and don't append anything
-            column_final_data['columnData'].append(row[column_index] if column_index < MAX_COLUMNS else None)
+            column_final_data['columnData'].append(row[json_column_positions[column_index]] if column_index in json_column_positions else None)
         
         final_data.append(column_final_data) 
 
@@ -318,7 +371,7 @@ def df_to_json_dumpsable(
         'columnFormulasMap': column_formulas,
         'columnFiltersMap': column_filters,
         'columnDtypeMap': column_dtype_map,
-        'index': json_obj['index'],
+        'index': json_obj['index'] if index_buffer is None else index_buffer,
         'dfFormat': df_format,
         'conditionalFormattingResult': get_conditonal_formatting_result(
             state,
@@ -331,6 +384,95 @@ def df_to_json_dumpsable(
     }
 
 
+def df_viewport_to_json_dumpsable(
+        state: StateType,
+        sheet_index: int,
+        start_row: int,
+        end_row: int,
+        start_column: int,
+        end_column: int,
+    ) -> Dict[str, Any]:
+    """
+    Returns the rows [start_row, end_row) of the columns [start_column, end_column) of 
+    the dataframe at sheet_index, represented in a way that can be turned into a JSON 
+    object with json.dumps. The viewport is clipped to the size of the dataframe, and to
+    at most MAX_ROWS rows and MAX_COLUMNS columns.
+
+    Unlike df_to_json_dumpsable, the data only contains the columns in the viewport,
+    and so this can be used to page through dataframes of any size. Should follow the format:
+    {
+        numRows: number,
+        numColumns: number,
+        startRow: number,
+        endRow: number,
+        startColumn: number,
+        endColumn: number,
+        data: {
+            columnID: string;
+            columnHeader: (string | number);
+            columnDtype: string;
+            columnData: (string | number)[];
+        }[];
+        columnIDsMap: ColumnIDsMap;
+        columnDtypeMap: Record<ColumnID, string>;
+        index: (string | number)[];
+        conditionalFormattingResult: ConditionalFormattingResult
+    }
+    """
+    original_df = state.dfs[sheet_index]
+    column_headers_to_column_ids = state.column_ids.column_header_to_column_id[sheet_index]
+    (num_rows, num_columns) = original_df.shape 
+
+    start_row = min(max(start_row, 0), num_rows)
+    end_row = min(max(end_row, start_row), num_rows, start_row + MAX_ROWS)
+    start_column = min(max(start_column, 0), num_columns)
+    end_column = min(max(end_column, start_column), num_columns, start_column + MAX_COLUMNS)
+
+    viewport_df = original_df.iloc[start_row:end_row, start_column:end_column]
+    json_obj = convert_df_to_parsed_json(viewport_df, max_rows=None, max_columns=end_column - start_column)
+
+    final_data = []
+    for column_index, column_header in enumerate(viewport_df.columns):
+        final_data.append({
+            'columnID': _get_column_id_from_header_safe(column_header, column_headers_to_column_ids),
+            'columnHeader': get_column_header_display(column_header),
+            'columnDtype': str(viewport_df.dtypes.iloc[column_index]),
+            'columnData': [row[column_index] for row in json_obj['data']],
+        })
+
+    column_ids = [_get_column_id_from_header_safe(column_header, column_headers_to_column_ids) for column_header in original_df.columns]
+
+    # Import just before we use it to avoid circular imports
+    from mitosheet.pro.conditional_formatting_utils import get_conditonal_formatting_result
+    
+    return {
+        'numRows': num_rows,
+        'numColumns': num_columns,
+        'startRow': start_row,
+        'endRow': end_row,
+        'startColumn': start_column,
+        'endColumn': end_column,
+        'data': final_data,
+        'columnIDsMap': {
+            column_id: get_column_header_display(column_header)
+            for column_id, column_header in zip(column_ids, original_df.columns)
+        },
+        'columnDtypeMap': {
+            column_id: str(dtype)
+            for column_id, dtype in zip(column_ids, original_df.dtypes)
+        },
+        'index': json_obj['index'],
+        'conditionalFormattingResult': get_conditonal_formatting_result(
+            state,
+            sheet_index,
+            original_df,
+            state.df_formats[sheet_index]['conditional_formats'],
+            max_rows=end_row - start_row,
+            start_row=start_row
+        )
+    }
+
+
 def get_row_data_array(df: pd.DataFrame) -> List[Any]:
     """
     Returns just the data of a dataframe in the 2d array format of [row idx][col idx]
@@ -383,6 +525,118 @@ def convert_df_to_parsed_json(original_df: pd.DataFrame, max_rows: Optional[int]
     return json_obj
 
 
+def get_column_data_buffer(values: Any) -> Optional[Dict[str, Any]]:
+    """
+    Returns the values of a numeric or boolean column (or index) as a column buffer, 
+    a contiguous array that the frontend can read as a typed array, or None if the 
+    values cannot be sent this way.
+
+    The column buffer is a dict of the form:
+    {
+        dtype: string;
+        buffer: np.ndarray;
+    }
+
+    Floats are sent as float64s, booleans as uint8s, and integers keep their dtype, 
+    so that 64 bit integers are not rounded (see readColumnBuffer on the frontend).
+    """
+    dtype = values.dtype
+    if not isinstance(dtype, np.dtype) or dtype.kind not in 'biuf':
+        return None
+
+    array = values.to_numpy()
+    if dtype.kind == 'b':
+        return {'dtype': 'bool', 'buffer': np.ascontiguousarray(array, dtype=np.uint8)}
+    if dtype.kind == 'f':
+        return {'dtype': 'float64', 'buffer': np.ascontiguousarray(array, dtype='<f8')}
+
+    return {'dtype': dtype.name, 'buffer': np.ascontiguousarray(array, dtype=dtype.newbyteorder('<'))}
+
+
+def get_column_data_list(column_buffer: Dict[str, Any], is_index: bool) -> List[Any]:
+    """
+    Returns the values in a column buffer as they are written in the JSON sheet data, 
+    which is what df.to_json writes them as, except that missing values in the data
+    (but not the index) are written as 'NaN'. See convert_df_to_parsed_json.
+    """
+    buffer = column_buffer['buffer']
+    if column_buffer['dtype'] == 'bool':
+        return buffer.astype(bool).tolist()
+    if column_buffer['dtype'] != 'float64':
+        return buffer.tolist()
+
+    column_data = json.loads(pd.Series(buffer).to_json(orient='values'))
+    if is_index:
+        return column_data
+    return ['NaN' if value is None else value for value in column_data]
+
+
+def _encode_sheet_data_array(sheet_data_array: List[Dict[str, Any]], encode_column_data: Callable[[Any, bool], Any]) -> List[Dict[str, Any]]:
+    # NOTE: we make copies, so we don't modify the cached sheet data
+    encoded_sheet_data_array = []
+    for sheet_data in sheet_data_array:
+        encoded_sheet_data_array.append({
+            **sheet_data,
+            'data': [
+                {**column_data, 'columnData': encode_column_data(column_data['columnData'], False)}
+                for column_data in sheet_data['data']
+            ],
+            'index': encode_column_data(sheet_data['index'], True)
+        })
+    return encoded_sheet_data_array
+
+
+def _encode_column_data_as_list(column_data: Any, is_index: bool) -> Any:
+    if not isinstance(column_data, dict):
+        return column_data
+    return get_column_data_list(column_data, is_index)
+
+
+def encode_sheet_data(sheet_data: Dict[str, Any]) -> str:
+    """
+    Turns the sheet data of a single sheet, created with use_column_buffers=True, into 
+    JSON, writing each column buffer as a list of its values.
+    """
+    return json.dumps(_encode_sheet_data_array([sheet_data], _encode_column_data_as_list)[0], cls=NpEncoder)
+
+
+def join_encoded_sheet_data(encoded_sheet_data: List[str]) -> str:
+    """
+    Joins the JSON of each sheet (from encode_sheet_data) into the JSON of the sheet data 
+    array, exactly as json.dumps would write it.
+    """
+    return '[' + ', '.join(encoded_sheet_data) + ']'
+
+
+def encode_sheet_data_array(sheet_data_array: List[Dict[str, Any]]) -> str:
+    """
+    Turns a sheet data array created with use_column_buffers=True into JSON, writing
+    each column buffer as a list of its values.
+    """
+    return join_encoded_sheet_data([encode_sheet_data(sheet_data) for sheet_data in sheet_data_array])
+
+
+def encode_sheet_data_array_with_buffers(sheet_data_array: List[Dict[str, Any]]) -> Tuple[str, List[memoryview]]:
+    """
+    Turns a sheet data array created with use_column_buffers=True into JSON and the 
+    list of buffers to send alongside it. In the JSON, each column buffer is replaced 
+    with the index of its buffer in this list:
+    {
+        dtype: string;
+        bufferIndex: number;
+    }
+    """
+    buffers: List[memoryview] = []
+
+    def encode_column_data(column_data: Any, is_index: bool) -> Any:
+        if not isinstance(column_data, dict):
+            return column_data
+        buffers.append(memoryview(column_data['buffer']))
+        return {'dtype': column_data['dtype'], 'bufferIndex': len(buffers) - 1}
+
+    return json.dumps(_encode_sheet_data_array(sheet_data_array, encode_column_data), cls=NpEncoder), buffers
+
+
 def get_random_id() -> str:
     """
     Creates a new random ID for the user, which for any given user,
@@ -58,12 +58,12 @@ import { getAnalysisDataFromString, getSheetDataArrayFromString, getUserProfileF
  */
 export interface LabComm {
     send: (msg: Record<string, unknown>) => void,
-    onMsg: (msg: {content: {data: Record<string, unknown>}}) => void,
+    onMsg: (msg: {content: {data: Record<string, unknown>}, buffers?: (ArrayBuffer | ArrayBufferView)[]}) => void,
     open: () => void;
 }
 interface NotebookComm {
     send: (msg: Record<string, unknown>) => void,
-    on_msg: (handler: (msg: {content: {data: Record<string, unknown>}}) => void) => void,
+    on_msg: (handler: (msg: {content: {data: Record<string, unknown>}, buffers?: (ArrayBuffer | ArrayBufferView)[]}) => void) => void,
 }
 
 export type CommContainer = {
@@ -240,7 +240,8 @@ export async function getCommSend(kernelID: string, commTargetID: string): Promi
     const unconsumedResponses = getCommSend.unconsumedResponses || (getCommSend.unconsumedResponses = []);
 
     function receiveResponse(rawResponse: Record<string, unknown>): void {
-        unconsumedResponses.push((rawResponse as any).content.data as MitoResponse);
+        // The column buffers of the sheet data are sent as the buffers of the message
+        unconsumedResponses.push({...(rawResponse as any).content.data, buffers: (rawResponse as any).buffers} as MitoResponse);
     }
 
     function getResponseData<ResultType> (id: string, maxRetries = MAX_RETRIES): Promise<SendFunctionReturnType<ResultType>> {
@@ -285,7 +286,7 @@ export async function getCommSend(kernelID: string, commTargetID: string): Promi
                     const sharedVariables = response.shared_variables;
                     
                     return resolve({
-                        sheetDataArray: sharedVariables ? getSheetDataArrayFromString(sharedVariables.sheet_data_json) : undefined,
+                        sheetDataArray: sharedVariables ? getSheetDataArrayFromString(sharedVariables.sheet_data_json, response.buffers) : undefined,
                         analysisData: sharedVariables ? getAnalysisDataFromString(sharedVariables.analysis_data_json) : undefined,
                         userProfile: sharedVariables ? getUserProfileFromString(sharedVariables.user_profile_json) : undefined,
                         result: response['data'] as ResultType
@@ -304,7 +305,8 @@ export async function getCommSend(kernelID: string, commTargetID: string): Promi
         // We notably need to .call so that we can actually bind the comm.send function
         // to the correct `this`. We don't want `this` to be the MitoAPI object running 
         // this code, so we bind the comm object
-        _send.call(comm, msg);
+        // We let the backend know that it can send the sheet data with column buffers
+        _send.call(comm, {...msg, 'accepts_sheet_data_buffers': true});
 
         // Wait for the response, if we should
         const response = await getResponseData<ResultType>(msg.id as string, MAX_RETRIES);
@@ -101,11 +101,106 @@ export const getArgs = (analysisToReplayName: string | undefined): Promise<strin
 
 
 
-export const getSheetDataArrayFromString = (sheet_data_json: string): SheetData[] => {
+// The typed arrays that the column buffers are read as, by the dtype of the column buffer
+const COLUMN_BUFFER_TYPED_ARRAYS = {
+    'bool': Uint8Array,
+    'int8': Int8Array,
+    'int16': Int16Array,
+    'int32': Int32Array,
+    'uint8': Uint8Array,
+    'uint16': Uint16Array,
+    'uint32': Uint32Array,
+    'float64': Float64Array,
+}
+const COLUMN_BUFFER_BIGINT_TYPED_ARRAYS = {
+    'int64': BigInt64Array,
+    'uint64': BigUint64Array,
+}
+
+type ColumnBuffer = {
+    dtype: keyof typeof COLUMN_BUFFER_TYPED_ARRAYS | keyof typeof COLUMN_BUFFER_BIGINT_TYPED_ARRAYS,
+    bufferIndex: number,
+}
+
+const isColumnBuffer = (columnData: unknown): columnData is ColumnBuffer => {
+    return typeof columnData === 'object' && columnData !== null && !Array.isArray(columnData);
+}
+
+/**
+ * Reads a column buffer into the same values that the column would have had
+ * if it was sent as JSON, where missing values are 'NaN' in the data and null 
+ * in the index. 64 bit integers that cannot be represented exactly as a number
+ * are read as strings, so that they are not rounded.
+ */
+const readColumnBuffer = (columnBuffer: ColumnBuffer, buffers: (ArrayBuffer | ArrayBufferView)[], isIndex: boolean): (number | boolean | string | null)[] => {
+    const buffer = buffers[columnBuffer.bufferIndex];
+    const bytesPerElement = columnBuffer.dtype === 'int64' || columnBuffer.dtype === 'uint64' 
+        ? 8 
+        : COLUMN_BUFFER_TYPED_ARRAYS[columnBuffer.dtype].BYTES_PER_ELEMENT;
+
+    let arrayBuffer: ArrayBuffer;
+    let byteOffset = 0;
+    let byteLength: number;
+    if (ArrayBuffer.isView(buffer)) {
+        arrayBuffer = buffer.buffer as ArrayBuffer;
+        byteOffset = buffer.byteOffset;
+        byteLength = buffer.byteLength;
+    } else {
+        arrayBuffer = buffer;
+        byteLength = buffer.byteLength;
+    }
+
+    // Typed arrays must start at a multiple of their element size, so we copy
+    // the buffer if it is not aligned
+    if (byteOffset % bytesPerElement !== 0) {
+        arrayBuffer = arrayBuffer.slice(byteOffset, byteOffset + byteLength);
+        byteOffset = 0;
+    }
+    const length = byteLength / bytesPerElement;
+
+    if (columnBuffer.dtype === 'int64' || columnBuffer.dtype === 'uint64') {
+        const BigIntTypedArray = COLUMN_BUFFER_BIGINT_TYPED_ARRAYS[columnBuffer.dtype];
+        const bigIntArray: ArrayLike<bigint> = new BigIntTypedArray(arrayBuffer, byteOffset, length);
+        return Array.from(bigIntArray, value => {
+            const numberValue = Number(value);
+            return Number.isSafeInteger(numberValue) ? numberValue : value.toString();
+        });
+    }
+
+    const TypedArray = COLUMN_BUFFER_TYPED_ARRAYS[columnBuffer.dtype];
+    const typedArray: ArrayLike<number> = new TypedArray(arrayBuffer, byteOffset, length);
+    if (columnBuffer.dtype === 'bool') {
+        return Array.from(typedArray, value => value !== 0);
+    }
+    const missingValue = isIndex ? null : 'NaN';
+    return Array.from(typedArray, value => Number.isFinite(value) ? value : missingValue);
+}
+
+/**
+ * Returns the sheet data array from the sheet_data_json. If the sheet data was sent
+ * with column buffers, then the buffers are passed as well, and the sheet_data_json 
+ * refers to them by index.
+ */
+export const getSheetDataArrayFromString = (sheet_data_json: string, buffers?: (ArrayBuffer | ArrayBufferView)[]): SheetData[] => {
     if (sheet_data_json.length === 0) {
         return []
     }
-    return JSON.parse(sheet_data_json);
+    const sheetDataArray: SheetData[] = JSON.parse(sheet_data_json);
+    if (buffers === undefined || buffers.length === 0) {
+        return sheetDataArray;
+    }
+
+    sheetDataArray.forEach(sheetData => {
+        sheetData.data.forEach(columnData => {
+            if (isColumnBuffer(columnData.columnData)) {
+                columnData.columnData = readColumnBuffer(columnData.columnData, buffers, false) as (number | boolean | string)[];
+            }
+        })
+        if (isColumnBuffer(sheetData.index)) {
+            sheetData.index = readColumnBuffer(sheetData.index, buffers, true) as (number | string)[];
+        }
+    })
+    return sheetDataArray;
 }
 
 export const getUserProfileFromString = (user_profile_json: string): UserProfile => {
@@ -14,7 +14,7 @@ import { convertFrontendtoBackendGraphParams } from "../components/taskpanes/Gra
 import { AvailableSnowflakeOptionsAndDefaults, SnowflakeCredentials, SnowflakeTableLocationAndWarehouse } from "../components/taskpanes/SnowflakeImport/SnowflakeImportTaskpane";
 import { SplitTextToColumnsParams } from "../components/taskpanes/SplitTextToColumns/SplitTextToColumnsTaskpane";
 import { StepImportData } from "../components/taskpanes/UpdateImports/UpdateImportsTaskpane";
-import { AnalysisData, BackendPivotParams, CodeOptions, CodeSnippetAPIResult, ColumnID, DataframeFormat, FeedbackID, FilterGroupType, FilterType, FormulaLocation, GraphID, GraphParamsFrontend, ParameterizableParams, SheetData, UIState, UserProfile } from "../types";
+import { AnalysisData, BackendPivotParams, CodeOptions, CodeSnippetAPIResult, ColumnID, CSVDownload, CSVDownloadChunk, DataframeFormat, FeedbackID, FilterGroupType, FilterType, FormulaLocation, GraphID, GraphParamsFrontend, ParameterizableParams, SheetData, SheetDataViewport, UIState, UserProfile } from "../types";
 import { SendFunction, SendFunctionErrorReturnType, SendFunctionSuccessReturnType } from "./send";
 
 
@@ -69,6 +69,8 @@ interface MitoSuccessOrInplaceErrorResponse {
         'user_profile_json': string
     }
     'data': unknown
+    // The column buffers that the sheet_data_json refers to, if the frontend accepts them
+    'buffers'?: (ArrayBuffer | ArrayBufferView)[]
 }
 interface MitoErrorModalResponse {
     event: 'error'
@@ -251,6 +253,50 @@ export class MitoAPI {
         })
     }
 
+    /*
+        Starts downloading the dataframe at sheetIndex as a CSV, which
+        is then pulled one chunk at a time with getDataframeAsCSVChunk, 
+        so that large dataframes are not sent in a single message
+    */
+    async getDataframeAsCSVDownload(sheetIndex: number, compress: boolean): Promise<MitoAPIResult<CSVDownload>> {
+        return await this.send<CSVDownload>({
+            'event': 'api_call',
+            'type': 'get_dataframe_as_csv_download',
+            'params': {
+                'sheet_index': sheetIndex,
+                'compress': compress
+            },
+        })
+    }
+
+    /*
+        Returns the chunk at chunkIndex of a CSV download. Chunks must be 
+        requested in order, but the last chunk can be requested again
+    */
+    async getDataframeAsCSVChunk(downloadID: string, chunkIndex: number): Promise<MitoAPIResult<CSVDownloadChunk>> {
+        return await this.send<CSVDownloadChunk>({
+            'event': 'api_call',
+            'type': 'get_dataframe_as_csv_chunk',
+            'params': {
+                'download_id': downloadID,
+                'chunk_index': chunkIndex
+            },
+        })
+    }
+
+    /*
+        Cancels a CSV download, so the backend stops producing chunks of it
+    */
+    async cancelDataframeAsCSVDownload(downloadID: string): Promise<MitoAPIResult<boolean>> {
+        return await this.send<boolean>({
+            'event': 'api_call',
+            'type': 'cancel_dataframe_as_csv_download',
+            'params': {
+                'download_id': downloadID
+            },
+        })
+    }
+
     /*
         Returns a string encoding of the excel file to download
 
@@ -511,6 +557,30 @@ export class MitoAPI {
         })
     }
 
+    /*
+        Gets the rows [startRow, endRow) of the columns [startColumn, endColumn)
+        of the sheet at sheetIndex, for paging through large sheets.
+    */
+    async getSheetDataViewport(
+        sheetIndex: number,
+        startRow: number,
+        endRow: number,
+        startColumn: number,
+        endColumn: number,
+    ): Promise<MitoAPIResult<SheetDataViewport>> {
+        return await this.send<SheetDataViewport>({
+            'event': 'api_call',
+            'type': 'get_sheet_data_viewport',
+            'params': {
+                'sheet_index': sheetIndex,
+                'start_row': startRow,
+                'end_row': endRow,
+                'start_column': startColumn,
+                'end_column': endColumn
+            },
+        })
+    }
+
     // AUTOGENERATED LINE: API GET (DO NOT DELETE)
 
 
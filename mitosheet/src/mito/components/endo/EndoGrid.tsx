@@ -2,7 +2,7 @@ import React, { useCallback, useEffect, useMemo, useRef, useState } from "react"
 import '../../../../css/endo/EndoGrid.css';
 import '../../../../css/sitewide/colors.css';
 import { MitoAPI } from "../../api/api";
-import { EditorState, Dimension, GridState, RendererTranslate, SheetData, SheetView, UIState, MitoSelection, AnalysisData } from "../../types";
+import { EditorState, Dimension, GridState, RendererTranslate, SheetData, SheetDataViewport, SheetView, UIState, MitoSelection, AnalysisData } from "../../types";
 import FormulaBar from "./FormulaBar";
 import { TaskpaneType } from "../taskpanes/taskpanes";
 import { getCellEditorInputCurrentSelection, getStartingFormula } from "./celleditor/cellEditorUtils";
@@ -13,7 +13,7 @@ import GridData from "./GridData";
 import IndexHeaders from "./IndexHeaders";
 import { equalSelections, getColumnIndexesInSelections, getIndexesFromMouseEvent, getIsCellSelected, getIsHeader, getNewSelectionAfterKeyPress, getNewSelectionAfterMouseUp, getSelectedRowLabelsWithEntireSelectedRow, isNavigationKeyPressed, isSelectionsOnlyColumnHeaders, isSelectionsOnlyIndexHeaders, reconciliateSelections, removeColumnFromSelections } from "./selectionUtils";
 import { calculateCurrentSheetView, calculateNewScrollPosition, calculateTranslate} from "./sheetViewUtils";
-import { firstNonNullOrUndefined, getColumnIDsArrayFromSheetDataArray } from "./utils";
+import { firstNonNullOrUndefined, getColumnIDsArrayFromSheetDataArray, getSheetDataWithViewport, isSheetDataViewportBacked } from "./utils";
 import { ensureCellVisible } from "./visibilityUtils";
 import { reconciliateWidthDataArray } from "./widthUtils";
 import FloatingCellEditor from "./celleditor/FloatingCellEditor";
@@ -27,6 +27,9 @@ export const MIN_WIDTH = 50;
 // The maximum number of rows sent in the sheet data by the backend
 export const MAX_ROWS = 1500;
 
+// How long we wait for scrolling to stop before fetching the rows scrolled to
+const FETCH_SHEET_DATA_VIEWPORT_DELAY_MS = 100;
+
 
 export const KEYS_TO_IGNORE_IF_PRESSED_ALONE = [
     'Shift',
@@ -102,6 +105,9 @@ function EndoGrid(props: {
     const [resizeObserver, ] = useState(() => new ResizeObserver(() => {
         resizeViewport();
     }))
+    // For sheets with more rows than are in their sheet data, the viewport of the sheet
+    // data that was last fetched, as well as the sheet data that it was fetched for
+    const [sheetDataViewport, setSheetDataViewport] = useState<{sheetData: SheetData, viewport: SheetDataViewport} | undefined>(undefined);
     
     // Destructure the props, so we access them more directly in the component below
     const {
@@ -112,17 +118,61 @@ function EndoGrid(props: {
         mitoAPI
     } = props;
 
-    const sheetData = sheetDataArray[sheetIndex];
+    // The sheet data sent by the backend, which only has the first MAX_ROWS rows of the sheet
+    const sentSheetData = sheetDataArray[sheetIndex];
+    // We only use the viewport if it was fetched for the current sheet data, as otherwise it 
+    // might be for a different sheet, or from before the sheet was edited
+    const viewport = sheetDataViewport?.sheetData === sentSheetData ? sheetDataViewport?.viewport : undefined;
+    const sheetData = useMemo(() => {
+        return sentSheetData !== undefined && viewport !== undefined ? getSheetDataWithViewport(sentSheetData, viewport) : sentSheetData;
+    }, [sentSheetData, viewport])
 
     const totalSize: Dimension = {
         width: gridState.widthDataArray[gridState.sheetIndex]?.totalWidth || 0,
-        height: DEFAULT_HEIGHT * Math.min(sheetData?.numRows || 0, MAX_ROWS)
+        height: DEFAULT_HEIGHT * (sheetData?.numRows || 0)
     }
     
     const currentSheetView: SheetView = useMemo(() => {
         return calculateCurrentSheetView(gridState)
     }, [gridState])
 
+    /*
+        An effect that fetches the rows that are scrolled to, if they are not
+        in the sheet data, which only has the first MAX_ROWS rows of the sheet.
+
+        We fetch MAX_ROWS rows around the rows that are displayed, once the user
+        stops scrolling, so that we never send more than this many rows at once.
+    */
+    useEffect(() => {
+        if (sentSheetData === undefined || !isSheetDataViewportBacked(sentSheetData)) {
+            return;
+        }
+
+        const startingRowIndex = currentSheetView.startingRowIndex;
+        const endingRowIndex = Math.min(startingRowIndex + currentSheetView.numRowsRendered, sentSheetData.numRows);
+        if (viewport !== undefined && viewport.startRow <= startingRowIndex && endingRowIndex <= viewport.endRow) {
+            return;
+        }
+        // If we scroll back to the rows in the sheet data, we display them rather than the viewport
+        if (endingRowIndex <= sentSheetData.index.length) {
+            if (viewport !== undefined) {
+                setSheetDataViewport(undefined);
+            }
+            return;
+        }
+
+        const fetchSheetDataViewport = async () => {
+            const startRow = Math.max(0, startingRowIndex - Math.floor((MAX_ROWS - currentSheetView.numRowsRendered) / 2));
+            const response = await mitoAPI.getSheetDataViewport(sheetIndex, startRow, startRow + MAX_ROWS, 0, sentSheetData.data.length);
+            if (!('error' in response)) {
+                setSheetDataViewport({sheetData: sentSheetData, viewport: response.result});
+            }
+        }
+        const timeout = setTimeout(() => {void fetchSheetDataViewport()}, FETCH_SHEET_DATA_VIEWPORT_DELAY_MS);
+
+        return () => clearTimeout(timeout);
+    }, [sentSheetData, sheetIndex, currentSheetView, viewport])
+
     const translate: RendererTranslate = useMemo(() => {
         return calculateTranslate(gridState);
     }, [gridState])
@@ -139,7 +189,7 @@ function EndoGrid(props: {
         setGridState(gridState => {
             return {
                 ...gridState,
-                selections: reconciliateSelections(gridState.sheetIndex, sheetIndex, gridState.selections, gridState.columnIDsArray[gridState.sheetIndex], sheetData),
+                selections: reconciliateSelections(gridState.sheetIndex, sheetIndex, gridState.selections, gridState.columnIDsArray[gridState.sheetIndex], sentSheetData),
                 widthDataArray: reconciliateWidthDataArray(gridState.widthDataArray, gridState.columnIDsArray, sheetDataArray),
                 columnIDsArray: getColumnIDsArrayFromSheetDataArray(sheetDataArray),
                 sheetIndex: sheetIndex,
@@ -147,7 +197,7 @@ function EndoGrid(props: {
                 copiedSelections: []
             }
         })
-    }, [sheetData, setGridState, sheetIndex])
+    }, [sentSheetData, setGridState, sheetIndex])
 
     // A helper function that should be run when the viewport changes sizes
     const resizeViewport = () => {
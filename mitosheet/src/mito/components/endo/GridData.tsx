@@ -9,6 +9,7 @@ import { formatCellData } from '../../utils/format';
 import { isNumberDtype } from '../../utils/dtypes';
 import { reconIsColumnCreated, reconIsColumnModified } from '../taskpanes/AITransformation/aiUtils';
 import { hexToRGBString } from '../../utils/colors';
+import { getConditionalFormat } from '../../utils/conditionalFormatting';
 
 
 export const EVEN_ROW_BACKGROUND_COLOR_DEFAULT = 'var(--mito-background)';
@@ -51,14 +52,12 @@ const GridData = (props: {
                             const columnIndex = currentSheetView.startingColumnIndex + _colIndex;
                             const columnID = columnIDs[columnIndex]
                             const columnDtype = props.sheetData?.data[columnIndex]?.columnDtype;
-                            const index = props.sheetData?.index[rowIndex] !== undefined ? props.sheetData?.index[rowIndex] : 0;
                             const columnFormatType = sheetData.dfFormat.columns[columnID]
                             const cellData = props.sheetData?.data[columnIndex]?.columnData[rowIndex];
                             const cellIsSelected = getIsCellSelected(props.gridState.selections, rowIndex, columnIndex);
                             const columnHeader = props.sheetData?.data[columnIndex]?.columnHeader;
 
-                            const conditionalFormatMap = sheetData?.conditionalFormattingResult.results[columnID];
-                            const conditionalFormat = conditionalFormatMap ? {...conditionalFormatMap[index]} : undefined;
+                            const conditionalFormat = getConditionalFormat(sheetData?.conditionalFormattingResult, columnID, rowIndex);
 
 
                             if (cellIsSelected && conditionalFormat?.backgroundColor !== undefined && conditionalFormat?.backgroundColor !== null) {
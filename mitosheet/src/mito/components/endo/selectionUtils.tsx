@@ -1,6 +1,5 @@
 import { BorderStyle, ColumnHeader, ColumnID, IndexLabel, MitoSelection, SheetData } from '../../types';
 import { isNumberDtype } from '../../utils/dtypes';
-import { MAX_ROWS } from './EndoGrid';
 
 
 /**
@@ -169,8 +168,8 @@ export const getNewSelectionAfterKeyPress = (selection: MitoSelection, e: Keyboa
     let startingColumnIndex = selection.startingColumnIndex;
     let endingColumnIndex = selection.endingColumnIndex;
 
-    // As we have at most MAX_ROWS rows in the sheet, don't go beyond that
-    const numRows = Math.min(sheetData?.numRows || 0, MAX_ROWS);
+    // Rows that are not in the sheet data are fetched as they are scrolled to, so we can go to any row
+    const numRows = sheetData?.numRows || 0;
     const numColumns = sheetData?.numColumns || 0;
     
     // If shift down, we extend, otherwise we bump
@@ -1,4 +1,4 @@
-import { ColumnFilters, ColumnFormatType, ColumnHeader, ColumnID, GridState, IndexLabel, SheetData, UIState } from "../../types";
+import { ColumnFilters, ColumnFormatType, ColumnHeader, ColumnID, GridState, IndexLabel, SheetData, SheetDataViewport, UIState } from "../../types";
 import { isBoolDtype, isDatetimeDtype, isFloatDtype, isIntDtype, isTimedeltaDtype } from "../../utils/dtypes";
 import { getFormulaStringFromFrontendFormula } from "./celleditor/cellEditorUtils";
 import { getWidthData } from "./widthUtils";
@@ -170,6 +170,42 @@ export const doesColumnExist = (columnID: ColumnID | undefined, sheetIndex: numb
     return columnID !== undefined && sheetDataArray[sheetIndex]?.columnDtypeMap[columnID] !== undefined
 }
 
+/* 
+    Determines if the sheet has more rows than are in its sheet data, in which case
+    the rest of the rows are fetched from the backend one viewport at a time
+*/
+export const isSheetDataViewportBacked = (sheetData: SheetData | undefined): boolean => {
+    return sheetData !== undefined && sheetData.numRows > sheetData.index.length;
+}
+
+/* 
+    Returns the sheet data with the data, index and conditional formatting of the 
+    viewport. These are sparse arrays, so that each row is still at its row index 
+    in the sheet, and so they can be read the same way as the rows of any sheet data.
+*/
+export const getSheetDataWithViewport = (sheetData: SheetData, viewport: SheetDataViewport): SheetData => {
+    const getRowsAtRowIndexes = <T,>(rows: T[]): T[] => {
+        const rowsAtRowIndexes: T[] = [];
+        rows.forEach((row, i) => {rowsAtRowIndexes[viewport.startRow + i] = row});
+        return rowsAtRowIndexes;
+    }
+
+    return {
+        ...sheetData,
+        data: sheetData.data.map((columnData, columnIndex) => {
+            return {
+                ...columnData,
+                columnData: getRowsAtRowIndexes(viewport.data[columnIndex]?.columnData || [])
+            }
+        }),
+        index: getRowsAtRowIndexes(viewport.index),
+        conditionalFormattingResult: {
+            ...viewport.conditionalFormattingResult,
+            startRow: viewport.startRow
+        }
+    }
+}
+
 /* 
     Determines if the sheet contains data
 */
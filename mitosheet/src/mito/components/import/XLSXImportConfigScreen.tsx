@@ -48,6 +48,7 @@ interface XLSXImportConfigScreenProps {
 
 export interface ExcelFileMetadata {
     sheet_names: string[]
+    sheet_sizes: Record<string, {num_rows: number, num_columns: number}>
     size: number,
 }
 
@@ -97,7 +98,7 @@ function XLSXImportConfigScreen(props: XLSXImportConfigScreenProps): JSX.Element
 
     // Load the metadata about the Excel file from the API
     const [fileMetadata, loading] = useStateFromAPIAsync<ExcelFileMetadata, string>(
-        {sheet_names: [], size: 0},
+        {sheet_names: [], sheet_sizes: {}, size: 0},
         async (filePath: string) => {
             const response = await props.mitoAPI.getExcelFileMetadata(filePath);
             return 'error' in response ? undefined : response.result;
@@ -156,10 +157,12 @@ function XLSXImportConfigScreen(props: XLSXImportConfigScreenProps): JSX.Element
                             }}
                         >
                             {fileMetadata.sheet_names.map((sheetName, idx) => {
+                                const sheetSize = fileMetadata.sheet_sizes[sheetName];
                                 return (
                                     <MultiToggleItem
                                         key={idx}
                                         title={sheetName}
+                                        rightText={sheetSize !== undefined ? `${sheetSize.num_rows} rows, ${sheetSize.num_columns} columns` : undefined}
                                         toggled={params.sheet_names.includes(sheetName)}
                                         onToggle={() => {
                                             props.setParams(prevParams => {
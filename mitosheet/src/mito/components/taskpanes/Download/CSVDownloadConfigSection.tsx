@@ -1,7 +1,8 @@
 import React from "react";
 import { MitoAPI } from "../../../api/api";
-import { SheetData, UIState } from "../../../types";
+import { CSVExportState, SheetData, UIState } from "../../../types";
 import DataframeSelect from "../../elements/DataframeSelect";
+import Toggle from "../../elements/Toggle";
 import Row from "../../layout/Row";
 
 
@@ -9,6 +10,7 @@ const CSVDownloadConfigSection = (props: {
     sheetDataArray: SheetData[]
     mitoAPI: MitoAPI
     selectedSheetIndex: number
+    exportState: CSVExportState
     setUIState: React.Dispatch<React.SetStateAction<UIState>>
 }): JSX.Element => {
 
@@ -23,11 +25,31 @@ const CSVDownloadConfigSection = (props: {
                         return {
                             ...prevUIState,
                             selectedSheetIndex: newSheetIndex,
-                            exportConfiguration: {exportType: 'csv'}
+                            exportConfiguration: {exportType: 'csv', compress: props.exportState.compress} as CSVExportState
                         }
                     })
                 }}
             />
+            <Row justify='space-between' align='center'>
+                <p className='text-header-3'>
+                    Compress with gzip
+                </p>
+                <Toggle
+                    value={props.exportState.compress ?? false}
+                    onChange={() => {
+                        props.setUIState(prevUIState => {
+                            return {
+                                ...prevUIState,
+                                exportConfiguration: {
+                                    ...prevUIState.exportConfiguration,
+                                    exportType: 'csv',
+                                    compress: !props.exportState.compress
+                                } as CSVExportState
+                            }
+                        })
+                    }}
+                />
+            </Row>
             <Row justify='space-around'>
                 <p className='ma-25px text-align-center'>
                     CSV exports will not reflect any formatting changes made in Mito.
@@ -1,13 +1,13 @@
 // Copyright (c) Mito
 // Distributed under the terms of the Modified BSD License.
 
-import React, { useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import DefaultTaskpane from '../DefaultTaskpane/DefaultTaskpane';
 import { MitoAPI } from '../../../api/api';
 
 // Import 
 import TextButton from '../../elements/TextButton';
-import { ColumnID, ExcelExportState, SheetData, UIState, UserProfile } from '../../../types';
+import { ColumnID, CSVExportState, ExcelExportState, SheetData, UIState, UserProfile } from '../../../types';
 import Row from '../../layout/Row';
 import Input from '../../elements/Input';
 import Select from '../../elements/Select';
@@ -21,6 +21,7 @@ import DefaultTaskpaneBody from '../DefaultTaskpane/DefaultTaskpaneBody';
 import DefaultEmptyTaskpane from '../DefaultTaskpane/DefaultEmptyTaskpane';
 import DefaultTaskpaneFooter from '../DefaultTaskpane/DefaultTaskpaneFooter';
 import { getInvalidFileNameError } from '../../../utils/filename';
+import { getDataframeAsCSVBlob } from '../../../utils/download';
 
 interface DownloadTaskpaneProps {
     uiState: UIState
@@ -61,6 +62,13 @@ const DownloadTaskpane = (props: DownloadTaskpaneProps): JSX.Element => {
     
     // The string that stores the file that actually should be downloaded
     const [exportHRef, setExportHref] = useState<string>('');
+
+    // The fraction of the CSV that has been pulled from the backend so far
+    const [csvDownloadProgress, setCSVDownloadProgress] = useState<number>(0);
+
+    // Incremented each time we start loading an export, so that a CSV download 
+    // can tell if it has been replaced by a newer one, and cancel itself
+    const loadExportIDRef = useRef<number>(0);
     
     const emptySheet = props.sheetDataArray.length === 0;
     const numRows = props.sheetDataArray[props.selectedSheetIndex]?.numRows;
@@ -71,13 +79,22 @@ const DownloadTaskpane = (props: DownloadTaskpaneProps): JSX.Element => {
             return;
         }
 
+        const loadExportID = ++loadExportIDRef.current;
+
         if (props.uiState.exportConfiguration.exportType === 'csv') {
-            const response = await props.mitoAPI.getDataframeAsCSV(props.selectedSheetIndex);
-            const csvString = 'error' in response ? '' : response.result;
-            setExportHref(URL.createObjectURL(new Blob(
-                [ csvString ],
-                { type: 'text/csv' }
-            )));
+            // We pull the CSV in chunks, so large dataframes are not sent in a single message
+            setCSVDownloadProgress(0);
+            const csvBlob = await getDataframeAsCSVBlob(
+                props.mitoAPI,
+                props.selectedSheetIndex,
+                (props.uiState.exportConfiguration as CSVExportState).compress ?? false,
+                setCSVDownloadProgress,
+                () => loadExportIDRef.current !== loadExportID
+            );
+            if (csvBlob === undefined) {
+                return;
+            }
+            setExportHref(URL.createObjectURL(csvBlob));
         } else if (props.uiState.exportConfiguration.exportType === 'excel') {
             const response = await props.mitoAPI.getDataframesAsExcel((props.uiState.exportConfiguration as ExcelExportState).sheetIndexes);
             const excelString = 'error' in response ? '' : response.result;
@@ -98,6 +115,13 @@ const DownloadTaskpane = (props: DownloadTaskpaneProps): JSX.Element => {
         void loadExport();
     }, [props.uiState.exportConfiguration, props.selectedSheetIndex, props.sheetDataArray], 500)
 
+    // Cancel any CSV download that is still in progress when the taskpane closes
+    useEffect(() => {
+        return () => {
+            loadExportIDRef.current++;
+        }
+    }, [])
+
     const onDownload = () => {
         if (invalidFileNameWarning) {
             return;
@@ -121,7 +145,7 @@ const DownloadTaskpane = (props: DownloadTaskpaneProps): JSX.Element => {
         fileName = 'MitoExport';
     }
     if (props.uiState.exportConfiguration.exportType === 'csv') {
-        exportName = `${fileName}.csv`;
+        exportName = (props.uiState.exportConfiguration as CSVExportState).compress ? `${fileName}.csv.gz` : `${fileName}.csv`;
     } else if (props.uiState.exportConfiguration.exportType === 'excel') {
         exportName = `${fileName}.xlsx`;
     }
@@ -215,6 +239,7 @@ const DownloadTaskpane = (props: DownloadTaskpaneProps): JSX.Element => {
                             sheetDataArray={props.sheetDataArray}
                             mitoAPI={props.mitoAPI}
                             selectedSheetIndex={props.selectedSheetIndex}
+                            exportState={props.uiState.exportConfiguration as CSVExportState}
                             setUIState={props.setUIState}
                         /> 
                     }
@@ -241,7 +266,7 @@ const DownloadTaskpane = (props: DownloadTaskpaneProps): JSX.Element => {
                     download={exportName}
                     onClick={onDownload}
                 >
-                    {exportHRef === '' ? (<>Preparing data for download <LoadingDots /></>) : `Download ${props.uiState.exportConfiguration.exportType === 'csv' ? 'CSV file': 'Excel workbook'}`}
+                    {exportHRef === '' ? (<>Preparing data for download{props.uiState.exportConfiguration.exportType === 'csv' && csvDownloadProgress > 0 ? ` (${Math.round(csvDownloadProgress * 100)}%)` : ''} <LoadingDots /></>) : `Download ${props.uiState.exportConfiguration.exportType === 'csv' ? 'CSV file': 'Excel workbook'}`}
                 </TextButton>
             </DefaultTaskpaneFooter>
         </DefaultTaskpane>
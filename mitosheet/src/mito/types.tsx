@@ -261,9 +261,23 @@ export type ColumnID = string;
  */
 export type ColumnIDsMap = Record<ColumnID, ColumnHeader>;
 
+/**
+ * A format that applies to some of the displayed rows in a column. The bitmap is base64 
+ * encoded, and the i-th bit (in little endian bit order) is set if the format applies 
+ * to the i-th displayed row.
+ */
+export type ConditionalFormattingColumnResult = {
+    color: string | undefined, 
+    backgroundColor: string | undefined,
+    bitmap: string
+}
+
 export type ConditionalFormattingResult = {
     'invalid_conditional_formats': Record<string, ColumnID[] | undefined>,
-    'results': Record<ColumnID, Record<number | string, {color: string | undefined, backgroundColor: string | undefined} | undefined> | undefined>
+    // For each column, the formats that apply in order. If multiple apply to a cell, the last one is used
+    'results': Record<ColumnID, ConditionalFormattingColumnResult[] | undefined>
+    // The row that the first bit of each bitmap is for, if the results are for a viewport of the sheet
+    'startRow'?: number
 }
 
 type FormulaPart = {type: 'string part', string: string} 
@@ -317,6 +331,52 @@ export type SheetData = {
 };
 
 
+/**
+ * A viewport of rows [startRow, endRow) and columns [startColumn, endColumn) of 
+ * a sheet, which can be used to page through sheets larger than the sheet data.
+ * The data only contains the columns in the viewport, while the maps contain all
+ * columns in the sheet.
+ */
+export type SheetDataViewport = {
+    numRows: number,
+    numColumns: number,
+    startRow: number,
+    endRow: number,
+    startColumn: number,
+    endColumn: number,
+    data: {
+        columnID: ColumnID;
+        columnHeader: ColumnHeader;
+        columnDtype: string;
+        columnData: (string | number | boolean)[];
+    }[];
+    columnIDsMap: ColumnIDsMap;
+    columnDtypeMap: Record<ColumnID, string>;
+    index: IndexLabel[];
+    conditionalFormattingResult: ConditionalFormattingResult;
+};
+
+
+/**
+ * A download of a dataframe as a CSV, that is pulled from the backend one
+ * chunk at a time. If compress is true, each chunk is a base64 encoded piece
+ * of a gzip compressed CSV.
+ */
+export type CSVDownload = {
+    download_id: string,
+    num_chunks: number,
+    compress: boolean
+};
+
+export type CSVDownloadChunk = {
+    chunk: string,
+    chunk_index: number,
+    num_chunks: number,
+    progress: number,
+    done: boolean
+};
+
+
 export type GraphPreprocessingParams = {
     safety_filter_turned_on_by_user: boolean
 }
@@ -707,6 +767,7 @@ export enum MitoEnterpriseConfigKey {
     ANALYTICS_URL = 'MITO_CONFIG_ANALYTICS_URL',
     TELEMETRY = 'MITO_CONFIG_FEATURE_TELEMETRY',
     PRO = 'MITO_CONFIG_PRO',
+    MAX_STEP_STATES_MEMORY_MB = 'MITO_CONFIG_MAX_STEP_STATES_MEMORY_MB',
 }
 
 export type PublicInterfaceVersion = 1 | 2 | 3;
@@ -837,7 +898,7 @@ export interface MitoStateUpdaters {
 }
 
 export interface ExportState { fileName?: string, exportType: 'csv' | 'excel' }
-export interface CSVExportState extends ExportState { exportType: 'csv' }
+export interface CSVExportState extends ExportState { exportType: 'csv', compress?: boolean }
 export interface ExcelExportState extends ExportState { exportType: 'excel', sheetIndexes: number[] }
 
 export type ToolbarDropdowns = 'Edit' | 'Dataframes' | 'Columns' | 'Rows' | 'Graphs' | 'Format' | 'Code' | 'View' | 'Help';
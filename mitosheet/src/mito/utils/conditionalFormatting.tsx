@@ -0,0 +1,51 @@
+/* 
+    Utility functions for reading the results of conditional formatting.
+*/
+
+import { ColumnID, ConditionalFormattingColumnResult, ConditionalFormattingResult } from "../types";
+
+
+// We decode each bitmap once, rather than once for each cell we render
+const decodedBitmaps = new WeakMap<ConditionalFormattingColumnResult, Uint8Array>();
+
+const getDecodedBitmap = (columnResult: ConditionalFormattingColumnResult): Uint8Array => {
+    let decodedBitmap = decodedBitmaps.get(columnResult);
+    if (decodedBitmap === undefined) {
+        const binaryString = window.atob(columnResult.bitmap);
+        decodedBitmap = new Uint8Array(binaryString.length);
+        for (let i = 0; i < binaryString.length; i++) {
+            decodedBitmap[i] = binaryString.charCodeAt(i);
+        }
+        decodedBitmaps.set(columnResult, decodedBitmap);
+    }
+    return decodedBitmap;
+}
+
+/*
+    Returns the conditional format of the cell in the given column and displayed row, 
+    or undefined if no conditional format applies to it. If multiple formats apply
+    to the cell, the last one is used.
+*/
+export const getConditionalFormat = (
+    conditionalFormattingResult: ConditionalFormattingResult | undefined, 
+    columnID: ColumnID, 
+    rowIndex: number
+): {color: string | undefined, backgroundColor: string | undefined} | undefined => {
+    const columnResults = conditionalFormattingResult?.results[columnID];
+    if (columnResults === undefined) {
+        return undefined;
+    }
+
+    const bitIndex = rowIndex - (conditionalFormattingResult?.startRow || 0);
+    if (bitIndex < 0) {
+        return undefined;
+    }
+
+    for (let i = columnResults.length - 1; i >= 0; i--) {
+        const decodedBitmap = getDecodedBitmap(columnResults[i]);
+        if ((decodedBitmap[bitIndex >> 3] >> (bitIndex & 7)) & 1) {
+            return {color: columnResults[i].color, backgroundColor: columnResults[i].backgroundColor};
+        }
+    }
+    return undefined;
+}
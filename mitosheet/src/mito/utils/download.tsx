@@ -0,0 +1,59 @@
+import { MitoAPI } from "../api/api";
+
+// The number of times we ask again for a chunk of a download that
+// did not come back, as the API drops calls when it is busy
+const MAX_CHUNK_RETRIES = 3;
+
+/*
+    Pulls the dataframe at sheetIndex from the backend as a CSV, one chunk at a time,
+    and returns it as a Blob. If compress is true, the Blob is a gzip compressed CSV.
+
+    onProgress is called with the fraction of the chunks received after each chunk.
+    If isCancelled returns true, the download is cancelled on the backend and undefined
+    is returned, as it is if the download fails. Once all the chunks are received, the
+    download is cancelled on the backend too, as it is kept there until then.
+*/
+export const getDataframeAsCSVBlob = async (
+    mitoAPI: MitoAPI,
+    sheetIndex: number,
+    compress: boolean,
+    onProgress: (progress: number) => void,
+    isCancelled: () => boolean
+): Promise<Blob | undefined> => {
+    const downloadResponse = await mitoAPI.getDataframeAsCSVDownload(sheetIndex, compress);
+    if ('error' in downloadResponse || !downloadResponse.result) {
+        return undefined;
+    }
+    const download = downloadResponse.result;
+
+    const parts: (string | Uint8Array)[] = [];
+    let chunkIndex = 0;
+    let retries = 0;
+    while (chunkIndex < download.num_chunks) {
+        if (isCancelled()) {
+            void mitoAPI.cancelDataframeAsCSVDownload(download.download_id);
+            return undefined;
+        }
+
+        const chunkResponse = await mitoAPI.getDataframeAsCSVChunk(download.download_id, chunkIndex);
+        if ('error' in chunkResponse || !chunkResponse.result) {
+            retries++;
+            if (retries > MAX_CHUNK_RETRIES) {
+                void mitoAPI.cancelDataframeAsCSVDownload(download.download_id);
+                return undefined;
+            }
+            continue;
+        }
+
+        const chunk = chunkResponse.result;
+        parts.push(download.compress ? Uint8Array.from(window.atob(chunk.chunk), c => c.charCodeAt(0)) : chunk.chunk);
+        onProgress(chunk.progress);
+        chunkIndex++;
+        retries = 0;
+    }
+
+    // The backend keeps a finished download in case the last chunk is lost, so we let it go
+    void mitoAPI.cancelDataframeAsCSVDownload(download.download_id);
+
+    return new Blob(parts, { type: download.compress ? 'application/gzip' : 'text/csv' });
+}